@@ -13,6 +13,35 @@ CREATE_COMMENT_DOCS = {
             "description": "Comentário criado com sucesso",
             "content": {"application/json": {"example": {"id": 1, "status": "pending"}}},
         },
+        413: {
+            "description": "Imagem ou requisição acima do tamanho máximo",
+            "content": {
+                "application/json": {
+                    "examples": {
+                        "image_too_large": {
+                            "summary": "Imagem muito grande",
+                            "value": {"detail": "Imagem excede o tamanho máximo de 10 MB"},
+                        },
+                        "request_too_large": {
+                            "summary": "Total de imagens muito grande",
+                            "value": {
+                                "detail": "O total das imagens excede o limite de 30 MB por requisição"
+                            },
+                        },
+                    }
+                }
+            },
+        },
+        415: {
+            "description": "Arquivo não é uma imagem JPEG, PNG, WebP ou HEIC (verificado pelo conteúdo)",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "detail": "Formato de arquivo não suportado. Envie imagens JPEG, PNG, WebP ou HEIC"
+                    }
+                }
+            },
+        },
         422: {
             "description": "Erro de validação nos dados enviados",
             "content": {
@@ -30,6 +59,10 @@ CREATE_COMMENT_DOCS = {
                                 "detail": "Problema com imagens: Uma ou mais imagens têm formato inválido"
                             },
                         },
+                        "corrupt_image": {
+                            "summary": "Imagem corrompida ou truncada",
+                            "value": {"detail": "Imagem corrompida ou incompleta"},
+                        },
                         "accessibility_ids_error": {
                             "summary": "IDs de acessibilidade inválidos",
                             "value": {
@@ -233,6 +266,65 @@ UPDATE_COMMENT_STATUS_DOCS = {
     "tags": ["Comentários"],
 }
 
+# Documentação para o endpoint de moderação em lote
+UPDATE_COMMENTS_STATUS_BATCH_DOCS = {
+    "summary": "Aprova ou rejeita vários comentários",
+    "description": "Endpoint protegido para administradores. Aplica o mesmo status ('approved' ou 'rejected') a até 100 comentários pendentes em uma única transação. O resultado de cada ID é informado individualmente: IDs inexistentes ou que não estão pendentes não impedem o processamento dos demais.",
+    "responses": {
+        200: {
+            "description": "Lote processado. Consulte `success` de cada ID.",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "results": [
+                            {"id": 1, "success": True, "status": "approved", "detail": None},
+                            {
+                                "id": 2,
+                                "success": False,
+                                "status": None,
+                                "detail": "Comentário não está com status 'pending'",
+                            },
+                            {
+                                "id": 999,
+                                "success": False,
+                                "status": None,
+                                "detail": "Comentário não encontrado",
+                            },
+                        ]
+                    }
+                }
+            },
+        },
+        401: {
+            "description": "Não autenticado",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "Token de autenticação não fornecido"}
+                }
+            },
+        },
+        422: {
+            "description": "Erro de validação",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "detail": "Status 'pending' não é válido. Status válidos: 'pending', 'approved', 'rejected'"
+                    }
+                }
+            },
+        },
+        500: {
+            "description": "Erro interno do servidor",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "Erro ao atualizar comentário"}
+                }
+            },
+        },
+    },
+    "tags": ["Comentários"],
+}
+
 # Documentação para o endpoint de deletar comentário
 DELETE_COMMENT_DOCS = {
     "summary": "Exclui um comentário",
@@ -320,6 +412,71 @@ GET_COMMENT_DOCS = {
     "tags": ["Comentários"],
 }
 
+# Documentação para o endpoint de leitura em lote
+GET_COMMENTS_BATCH_DOCS = {
+    "summary": "Busca vários comentários por ID",
+    "description": "Recupera vários comentários aprovados de uma vez (até 50 IDs separados por vírgula), indexados pelo ID, com imagens e ícones. As imagens de todos os comentários são assinadas em uma única chamada ao storage. IDs inexistentes ou de comentários não aprovados são listados em 'not_found'.",
+    "responses": {
+        200: {
+            "description": "Comentários retornados com sucesso.",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "comments": {
+                            "1": {
+                                "id": 1,
+                                "user_name": "João Silva",
+                                "rating": 5,
+                                "comment": "Excelente local, muito acessível!",
+                                "location_id": 123,
+                                "status": "approved",
+                                "images": [
+                                    {
+                                        "id": "6a9c217f-3d21-4a90-896a-2a2cb3dc53a8",
+                                        "url": "https://example.com/image1.jpg",
+                                        "thumbnail_url": "https://example.com/image1_thumb.webp",
+                                        "medium_url": "https://example.com/image1_medium.webp",
+                                    }
+                                ],
+                                "created_at": "2023-10-01T12:00:00Z",
+                                "comment_icons": [
+                                    {
+                                        "id": 1,
+                                        "name": "Elogio",
+                                        "icon_url": "https://example.com/icons/elogio.png",
+                                    }
+                                ],
+                            }
+                        },
+                        "not_found": [2],
+                    }
+                }
+            },
+        },
+        422: {
+            "description": "Erro de validação",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "detail": "Parâmetro 'ids' deve conter até 50 IDs inteiros separados por vírgula"
+                    }
+                }
+            },
+        },
+        500: {
+            "description": "Erro interno do servidor",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "detail": "Ocorreu um erro interno no processamento dos comentários."
+                    }
+                }
+            },
+        },
+    },
+    "tags": ["Comentários"],
+}
+
 # Documentação para o endpoint de listar comentários por localização
 GET_COMMENTS_BY_LOCATION_DOCS = {
     "summary": "Lista comentários por ID de localização",
@@ -500,6 +657,24 @@ CREATE_COMMENT_ICON_DOCS = {
         401: {
             "description": "Não autenticado",
         },
+        413: {
+            "description": "Imagem acima do tamanho máximo",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "Imagem excede o tamanho máximo de 10 MB"}
+                }
+            },
+        },
+        415: {
+            "description": "Arquivo não é uma imagem JPEG, PNG, WebP ou HEIC (verificado pelo conteúdo)",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "detail": "Formato de arquivo não suportado. Envie imagens JPEG, PNG, WebP ou HEIC"
+                    }
+                }
+            },
+        },
         422: {
             "description": "Erro de validação",
         },
@@ -565,6 +740,24 @@ UPDATE_COMMENT_ICON_DOCS = {
         404: {
             "description": "Ícone não encontrado",
         },
+        413: {
+            "description": "Imagem acima do tamanho máximo",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "Imagem excede o tamanho máximo de 10 MB"}
+                }
+            },
+        },
+        415: {
+            "description": "Arquivo não é uma imagem JPEG, PNG, WebP ou HEIC (verificado pelo conteúdo)",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "detail": "Formato de arquivo não suportado. Envie imagens JPEG, PNG, WebP ou HEIC"
+                    }
+                }
+            },
+        },
         422: {
             "description": "Erro de validação",
         },
@@ -0,0 +1,128 @@
+"""DTOs de resposta dos comentários.
+
+Os services não alteram entidades ORM para devolver URLs assinadas: leem as
+linhas do banco, resolvem as URLs em lote (um mapa caminho -> URL) e montam
+estes registros imutáveis com as funções abaixo. As entidades continuam
+limpas (nada de URLs assinadas gravadas no próximo commit) e as respostas
+montadas, sem estado de sessão, podem ser compartilhadas e guardadas em cache.
+
+Os schemas de resposta validam os DTOs por atributo (`from_attributes`).
+"""
+
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from acesso_livre_api.src.comments.utils import build_images
+from acesso_livre_api.src.locations.schemas import ImageResponse
+
+
+@dataclass(frozen=True, slots=True)
+class CommentIconDTO:
+    """Ícone de comentário com a URL (pública ou assinada) resolvida."""
+
+    id: int
+    name: str
+    icon_url: str
+
+
+@dataclass(frozen=True, slots=True)
+class CommentDTO:
+    """Comentário das listagens e da moderação, com imagens e ícones resolvidos."""
+
+    id: int
+    user_name: str
+    rating: int
+    comment: str
+    location_id: int | None
+    status: str
+    images: tuple[ImageResponse, ...]
+    created_at: datetime
+    comment_icons: tuple[CommentIconDTO, ...] = ()
+
+
+@dataclass(frozen=True, slots=True)
+class CommentDetailDTO:
+    """Comentário aprovado de GET /comments/{id}, com as URLs assinadas das imagens."""
+
+    id: int
+    user_name: str
+    rating: int
+    comment: str
+    images: tuple[str, ...]
+    created_at: datetime
+    location_id: int | None
+
+
+@dataclass(frozen=True, slots=True)
+class RecentCommentDTO:
+    """Comentário recente com o nome e a nota do local."""
+
+    location_name: str
+    location_rating: float
+    user_name: str
+    description: str
+
+
+Row = Mapping[str, Any]
+
+
+def icon_paths(rows: Iterable[Row]) -> list[str]:
+    """Caminhos de ícone distintos das linhas, na ordem em que aparecem."""
+    return list(dict.fromkeys(row["icon_url"] for row in rows if row["icon_url"]))
+
+
+def image_paths(rows: Iterable[Row]) -> list[str]:
+    """Caminhos de imagem distintos das linhas de comentário."""
+    return list(dict.fromkeys(path for row in rows for path in row["images"] or []))
+
+
+def build_icon(row: Row, url_map: Mapping[str, str]) -> CommentIconDTO:
+    """Monta o ícone; sem URL resolvida, mantém o caminho original."""
+    return CommentIconDTO(
+        id=row["id"],
+        name=row["name"],
+        icon_url=url_map.get(row["icon_url"], row["icon_url"]),
+    )
+
+
+def build_comment(
+    row: Row,
+    url_map: Mapping[str, str],
+    icons: Iterable[CommentIconDTO] = (),
+) -> CommentDTO:
+    """Monta o comentário com as imagens (original e variantes) do mapa de URLs."""
+    return CommentDTO(
+        id=row["id"],
+        user_name=row["user_name"],
+        rating=row["rating"],
+        comment=row["comment"],
+        location_id=row["location_id"],
+        status=row["status"],
+        images=tuple(build_images(row["images"] or [], url_map)),
+        created_at=row["created_at"],
+        comment_icons=tuple(icons),
+    )
+
+
+def build_comment_detail(row: Row, url_map: Mapping[str, str]) -> CommentDetailDTO:
+    """Monta o detalhe do comentário; imagens sem URL assinada são omitidas."""
+    return CommentDetailDTO(
+        id=row["id"],
+        user_name=row["user_name"],
+        rating=row["rating"],
+        comment=row["comment"],
+        images=tuple(url_map[path] for path in row["images"] or [] if path in url_map),
+        created_at=row["created_at"],
+        location_id=row["location_id"],
+    )
+
+
+def build_recent_comment(row: Row) -> RecentCommentDTO:
+    return RecentCommentDTO(
+        location_name=row["location_name"],
+        location_rating=row["location_rating"],
+        user_name=row["user_name"],
+        description=row["description"],
+    )
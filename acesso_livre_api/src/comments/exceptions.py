@@ -14,6 +14,16 @@ class CommentNotFoundException(HTTPException):
         )
 
 
+class CommentQueryInvalidException(HTTPException):
+    """Exceção levantada quando os parâmetros de consulta de comentários são inválidos."""
+
+    def __init__(self, detail: str = "Parâmetros de consulta inválidos") -> None:
+        super().__init__(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+            detail=detail,
+        )
+
+
 class CommentStatusInvalidException(HTTPException):
     """Exceção levantada quando o status do comentário é inválido."""
 
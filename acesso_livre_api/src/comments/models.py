@@ -6,10 +6,12 @@ from sqlalchemy import (
     Column,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     String,
     Table,
     Text,
+    text,
 )
 from sqlalchemy.dialects.postgresql import JSON
 from sqlalchemy.orm import relationship
@@ -32,11 +34,28 @@ comment_comment_icons_association = Table(
 )
 
 
+# Documento de busca full-text (Postgres) dos comentários. A mesma expressão é
+# usada pelo índice GIN parcial (apenas aprovados) e pela consulta de busca.
+COMMENT_SEARCH_VECTOR = "to_tsvector('portuguese', comment)"
+
+
+def _utcnow() -> datetime.datetime:
+    return datetime.datetime.now(datetime.timezone.utc)
+
+
 class Comment(Base):
     __tablename__ = "comments"
     __table_args__ = (
         CheckConstraint('rating >= 1 AND rating <= 5', name='rating_range'),
         CheckConstraint('status IN (\'pending\', \'approved\', \'rejected\')', name='status_values'),
+        Index(
+            "ix_comments_search",
+            text(COMMENT_SEARCH_VECTOR),
+            postgresql_using="gin",
+            postgresql_where=text("status = 'approved'"),
+        ).ddl_if(dialect="postgresql"),
+        # Sincronização incremental (GET /sync): aprovados alterados após o cursor
+        Index("ix_comments_status_updated_at", "status", "updated_at"),
     )
 
     id = Column(Integer, primary_key=True, index=True)
@@ -47,6 +66,9 @@ class Comment(Base):
     status = Column(String(50), nullable=False, default=CommentStatus.PENDING)
     images = Column(JSON, nullable=True)
     created_at = Column(DateTime(timezone=True), nullable=False)
+    updated_at = Column(
+        DateTime(timezone=True), nullable=False, default=_utcnow, onupdate=_utcnow
+    )
 
     # Relacionamento com Location
     location = relationship('Location', back_populates='comments')
@@ -67,7 +89,10 @@ class CommentIcon(Base):
     icon_url = Column(String, nullable=False)
     created_at = Column(DateTime, default=datetime.datetime.utcnow)
     updated_at = Column(
-        DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow
+        DateTime,
+        default=datetime.datetime.utcnow,
+        onupdate=datetime.datetime.utcnow,
+        index=True,
     )
 
     # Relacionamento many-to-many com Comment
@@ -20,7 +20,9 @@ from acesso_livre_api.src.comments.exceptions import (
 from acesso_livre_api.src.database import get_db
 from acesso_livre_api.src.locations import service as location_service
 from acesso_livre_api.src.locations.exceptions import LocationNotFoundException
+from acesso_livre_api.src.responses import ORJSONResponse
 from acesso_livre_api.storage import upload_image
+from acesso_livre_api.storage.exceptions import UploadException
 
 from ..func_log import log_message
 
@@ -61,14 +63,14 @@ async def create_comment(
             comment_icon_ids=parsed_icon_ids,
         )
 
-        await location_service.get_location_by_id(db, location_id)
+        await location_service.ensure_location_exists(db, location_id)
 
         new_comment = await service.create_comment(
             db=db, comment=comment_data, images=images
         )
         log_message(f"Comentário criado com sucesso para localização {location_id} por usuário '{user_name}'", level="info", logger_name="acesso_livre_api")
         return new_comment
-    except (LocationNotFoundException, CommentRatingInvalidException):
+    except (LocationNotFoundException, CommentRatingInvalidException, UploadException):
         log_message(f"Falha ao criar comentário para localização {location_id} por usuário '{user_name}'", level="error", logger_name="acesso_livre_api")
         raise
     except Exception as e:
@@ -95,7 +97,7 @@ async def get_comments_with_status_pending(
         schemas.CommentResponseOnlyStatusPending.model_validate(comment)
         for comment in db_comments
     ]
-    return schemas.CommentListResponse(comments=comments)
+    return ORJSONResponse(schemas.CommentListResponse(comments=comments))
 
 
 @router.get(
@@ -120,11 +122,35 @@ async def get_all_comments_by_location_id(
         schemas.CommentResponse.model_validate(comment) for comment in db_comments
     ]
 
-    return schemas.CommentListByLocationResponse(
-        comments=comments, accessibility_items=accessibility_items
+    return ORJSONResponse(
+        schemas.CommentListByLocationResponse(
+            comments=comments, accessibility_items=accessibility_items
+        )
     )
 
 
+@router.patch(
+    "/status:batch",
+    response_model=schemas.CommentBatchStatusResponse,
+    **docs.UPDATE_COMMENTS_STATUS_BATCH_DOCS,
+)
+@dependencies.require_auth
+async def update_comments_status_batch(
+    batch: schemas.CommentBatchStatusUpdate,
+    db: Session = Depends(get_db),
+    authenticated_user: bool = dependencies.authenticated_user,
+):
+    try:
+        results = await service.update_comments_status_batch(db, batch)
+        return schemas.CommentBatchStatusResponse(results=results)
+    except (CommentStatusInvalidException, CommentUpdateException):
+        log_message(f"Falha na moderação em lote de {len(batch.ids)} comentários", level="error", logger_name="acesso_livre_api")
+        raise
+    except Exception:
+        log_message(f"Erro na moderação em lote de {len(batch.ids)} comentários", level="error", logger_name="acesso_livre_api")
+        raise CommentUpdateException()
+
+
 @router.patch(
     "/{comment_id}/status",
     response_model=schemas.CommentResponseOnlyStatusPending,
@@ -186,13 +212,7 @@ async def get_recent_comments(
     try:
         db_comments = await service.get_recent_comments(db, limit)
         comments = [
-            schemas.RecentCommentResponse(
-                location_name=comment.location.name,
-                location_rating=comment.location.avg_rating or 0.0,
-                user_name=comment.user_name,
-                description=comment.comment,
-            )
-            for comment in db_comments
+            schemas.RecentCommentResponse.model_validate(comment) for comment in db_comments
         ]
         log_message(f"Recuperados {len(comments)} comentários recentes", level="info", logger_name="acesso_livre_api")
         return schemas.RecentCommentsListResponse(comments=comments)
@@ -201,6 +221,22 @@ async def get_recent_comments(
         raise CommentGenericException()
 
 
+@router.get(
+    "/batch",
+    response_model=schemas.CommentBatchResponse,
+    **docs.GET_COMMENTS_BATCH_DOCS,
+)
+async def get_comments_batch(
+    ids: str = Query(
+        ..., description="IDs dos comentários separados por vírgula (ex: 1,4,7), até 50"
+    ),
+    db: Session = Depends(get_db),
+):
+    batch = await service.get_comments_batch(db, ids)
+    log_message(f"Recuperados {len(batch.comments)} comentários em lote: ids={ids}", level="info", logger_name="acesso_livre_api")
+    return ORJSONResponse(batch)
+
+
 @router.get(
     "/{comment_id}",
     response_model=schemas.CommentResponseWithLocationId,
@@ -257,10 +293,12 @@ async def create_comment_icon(
 ):
     """Criar um novo ícone de comentário."""
     try:
-        icon_url = await upload_image.upload_image(image)
+        icon_url = await upload_image.upload_image(image, with_variants=False, db=db)
         db_icon = await service.create_comment_icon(db=db, name=name, icon_url=icon_url)
         log_message(f"Novo ícone de comentário criado: {name}", level="info", logger_name="acesso_livre_api")
         return db_icon
+    except UploadException:
+        raise
     except Exception as e:
         log_message(f"Erro ao criar ícone de comentário: {str(e)}", level="error", logger_name="acesso_livre_api")
         raise CommentGenericException()
@@ -319,6 +357,8 @@ async def update_comment_icon(
             db=db, icon_id=icon_id, name=name, image=image
         )
         return updated_icon
+    except UploadException:
+        raise
     except Exception as e:
         log_message(
             f"Erro ao atualizar ícone de comentário {icon_id}: {str(e)}",
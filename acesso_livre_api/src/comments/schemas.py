@@ -1,6 +1,6 @@
 from datetime import datetime
 from enum import Enum
-from typing import List, Optional, Union
+from typing import Dict, List, Optional, Union
 
 from pydantic import BaseModel, Field, ConfigDict
 from acesso_livre_api.src.locations.schemas import ImageResponse
@@ -50,6 +50,28 @@ class CommentUpdateStatus(BaseModel):
     status: CommentStatus
 
 
+# Limite de IDs por requisição de moderação em lote
+MAX_BATCH_STATUS_IDS = 100
+
+
+class CommentBatchStatusUpdate(BaseModel):
+    """Schema para aprovar ou rejeitar vários comentários de uma vez."""
+    ids: List[int] = Field(..., min_length=1, max_length=MAX_BATCH_STATUS_IDS)
+    status: CommentStatus
+
+
+class CommentBatchStatusResult(BaseModel):
+    """Resultado da moderação de um comentário do lote."""
+    id: int
+    success: bool
+    status: Optional[CommentStatus] = None
+    detail: Optional[str] = None
+
+
+class CommentBatchStatusResponse(BaseModel):
+    results: List[CommentBatchStatusResult]
+
+
 class CommentResponseWithLocationId(BaseModel):
     id: int
     user_name: str
@@ -94,6 +116,20 @@ class CommentResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+# Limite de IDs por leitura em lote (GET /comments/batch)
+MAX_BATCH_GET_IDS = 50
+
+
+class CommentBatchResponse(BaseModel):
+    """Schema para resposta da leitura em lote (GET /comments/batch).
+
+    `comments` é indexado pelo ID; IDs inexistentes ou de comentários não
+    aprovados ficam em `not_found`.
+    """
+    comments: Dict[int, CommentResponse] = Field(default={})
+    not_found: List[int] = Field(default=[])
+
+
 class CommentListByLocationResponse(BaseModel):
     comments: List[CommentResponse]
     accessibility_items: List[dict] = Field(default=[])
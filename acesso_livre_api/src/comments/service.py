@@ -2,18 +2,26 @@ import logging
 from datetime import UTC, datetime
 from collections.abc import Iterable
 
-from sqlalchemy import exc as sqlalchemy_exc, select
+from sqlalchemy import delete, exc as sqlalchemy_exc, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from acesso_livre_api.src.comments import models, schemas
+from acesso_livre_api.src.comments import dto, models, schemas
 from acesso_livre_api.src.comments.utils import (
     extract_image_id,
     find_image_path_by_id,
-    get_images_with_ids,
+    sign_image_paths,
 )
 
-from acesso_livre_api.src.locations.service import update_location_average_rating
+from acesso_livre_api.src.locations.map_snapshot import invalidate_map_snapshot
+from acesso_livre_api.src.locations.service import (
+    link_location_images,
+    update_location_average_rating,
+    update_locations_average_rating,
+)
+from acesso_livre_api.src.locations.search_index import search_index
+from acesso_livre_api.src.sync.models import SyncEntity
+from acesso_livre_api.src.sync.service import record_tombstones
 from acesso_livre_api.src.comments.exceptions import (
     CommentCreateException,
     CommentDeleteException,
@@ -22,6 +30,7 @@ from acesso_livre_api.src.comments.exceptions import (
     CommentNotFoundException,
     CommentNotPendingException,
     CommentPermissionDeniedException,
+    CommentQueryInvalidException,
     CommentRatingInvalidException,
     CommentStatusInvalidException,
     CommentUpdateException,
@@ -29,8 +38,14 @@ from acesso_livre_api.src.comments.exceptions import (
     ImageNotFoundException,
 )
 from acesso_livre_api.storage import upload_image
-from acesso_livre_api.storage.delete_image import delete_image, delete_images
-from acesso_livre_api.storage.get_url import get_signed_url, get_signed_urls
+from acesso_livre_api.storage.exceptions import UploadException
+from acesso_livre_api.storage.client import icon_bucket_name
+from acesso_livre_api.storage.get_url import get_icon_urls, get_signed_url, get_signed_urls
+from acesso_livre_api.storage.dedup import (
+    discard_unreferenced,
+    managed_paths,
+    release_objects,
+)
 from fastapi import UploadFile
 
 from acesso_livre_api.src.locations import models as location_models
@@ -57,33 +72,100 @@ def _safe_list(value) -> list:
     return []
 
 
+# Colunas das respostas de comentário: as leituras usam linhas (RowMapping), sem
+# montar entidades ORM nem passar pelo identity map, e as convertem em DTOs.
+_COMMENT_LIST_COLUMNS = (
+    models.Comment.id,
+    models.Comment.user_name,
+    models.Comment.rating,
+    models.Comment.comment,
+    models.Comment.location_id,
+    models.Comment.status,
+    models.Comment.images,
+    models.Comment.created_at,
+)
+
+_COMMENT_ICON_COLUMNS = (
+    models.CommentIcon.id,
+    models.CommentIcon.name,
+    models.CommentIcon.icon_url,
+)
+
+
+async def _icon_url_map(paths: list[str]) -> dict[str, str]:
+    """Resolve as URLs (públicas ou assinadas) dos ícones em uma chamada."""
+    if not paths:
+        return {}
+    resolved = await get_icon_urls(paths)
+    return {path: url for path, url in zip(paths, resolved) if url is not None}
+
+
+async def _build_comments(db: AsyncSession, rows, icon_rows) -> list[dto.CommentDTO]:
+    """Monta os DTOs, resolvendo em lote as URLs de imagens e ícones."""
+    image_url_map = await sign_image_paths(db, dto.image_paths(rows))
+    icon_url_map = await _icon_url_map(dto.icon_paths(icon_rows))
+
+    icons_by_comment: dict[int, list[dto.CommentIconDTO]] = {}
+    for icon_row in icon_rows:
+        icons_by_comment.setdefault(icon_row["comment_id"], []).append(
+            dto.build_icon(icon_row, icon_url_map)
+        )
+    return [
+        dto.build_comment(row, image_url_map, icons_by_comment.get(row["id"], ()))
+        for row in rows
+    ]
+
+
+async def _get_icon_rows(db: AsyncSession, comment_ids: list[int]):
+    """Busca os ícones dos comentários em uma consulta."""
+    if not comment_ids:
+        return []
+
+    association = models.comment_comment_icons_association
+    result = await db.execute(
+        select(association.c.comment_id, *_COMMENT_ICON_COLUMNS)
+        .join(models.CommentIcon, models.CommentIcon.id == association.c.icon_id)
+        .where(association.c.comment_id.in_(comment_ids))
+        .order_by(association.c.comment_id, models.CommentIcon.id)
+    )
+    return result.mappings().all()
+
+
+async def _list_comments(
+    db: AsyncSession, *criteria, skip: int, limit: int
+) -> list[dto.CommentDTO]:
+    """Lista comentários (mais recentes primeiro) com imagens e ícones resolvidos."""
+    result = await db.execute(
+        select(*_COMMENT_LIST_COLUMNS)
+        .where(*criteria)
+        .order_by(models.Comment.created_at.desc())
+        .offset(skip)
+        .limit(limit)
+    )
+    rows = result.mappings().all()
+    if not rows:
+        return []
+
+    icon_rows = await _get_icon_rows(db, [row["id"] for row in rows])
+    return await _build_comments(db, rows, icon_rows)
+
+
 async def get_comment(db: AsyncSession, comment_id: int):
     try:
-        stmt = (
-            select(models.Comment)
-            .options(selectinload(models.Comment.comment_icons))
-            .where(models.Comment.id == comment_id, models.Comment.status == "approved")
+        stmt = select(*_COMMENT_LIST_COLUMNS).where(
+            models.Comment.id == comment_id, models.Comment.status == "approved"
         )
         result = await db.execute(stmt)
-        comment = result.unique().scalars().first()
+        row = result.mappings().first()
 
-        if not comment:
+        if not row:
             log_message(f"Comentário {comment_id} não encontrado", level="error", logger_name="acesso_livre_api")
             raise CommentNotFoundException()
 
-        if comment.images is None:
-            comment.images = []
-        else:
-            signed_urls = await get_signed_urls(comment.images)
-            # Filter out images with failed signed URLs
-            comment.images = [url for url in signed_urls if url is not None]
-
-        # Processar ícones de comentário para obter signed URLs
-        for icon in _safe_list(getattr(comment, "comment_icons", None)):
-                if icon.icon_url:
-                    signed_urls = await get_signed_urls([icon.icon_url])
-                    if signed_urls and signed_urls[0] is not None:
-                        icon.icon_url = signed_urls[0]
+        paths = list(row["images"] or [])
+        signed_urls = await get_signed_urls(paths) if paths else []
+        url_map = {path: url for path, url in zip(paths, signed_urls) if url is not None}
+        comment = dto.build_comment_detail(row, url_map)
 
         log_message(f"Comentário {comment_id} recuperado com sucesso", level="info", logger_name="acesso_livre_api")
         return comment
@@ -97,22 +179,78 @@ async def get_comment(db: AsyncSession, comment_id: int):
         raise CommentNotFoundException()
 
 
+def _parse_comment_ids(value: str) -> list[int]:
+    """IDs distintos do parâmetro `ids`, na ordem recebida."""
+    try:
+        comment_ids = list(
+            dict.fromkeys(int(part) for part in value.split(",") if part.strip())
+        )
+    except ValueError:
+        comment_ids = []
+    if (
+        not comment_ids
+        or len(comment_ids) > schemas.MAX_BATCH_GET_IDS
+        or min(comment_ids) < 1
+    ):
+        raise CommentQueryInvalidException(
+            f"Parâmetro 'ids' deve conter até {schemas.MAX_BATCH_GET_IDS} "
+            "IDs inteiros separados por vírgula"
+        )
+    return comment_ids
+
+
+async def get_comments_batch(db: AsyncSession, ids: str) -> schemas.CommentBatchResponse:
+    """Comentários aprovados, indexados pelo ID.
+
+    Busca comentários e ícones com consultas `IN` e assina as imagens de todos
+    os comentários em uma única chamada.
+
+    Raises:
+        CommentQueryInvalidException: Se `ids` for inválido
+    """
+    comment_ids = _parse_comment_ids(ids)
+
+    try:
+        result = await db.execute(
+            select(*_COMMENT_LIST_COLUMNS).where(
+                models.Comment.id.in_(comment_ids),
+                models.Comment.status == "approved",
+                models.Comment.location_id.isnot(None),
+            )
+        )
+        rows = result.mappings().all()
+        icon_rows = await _get_icon_rows(db, [row["id"] for row in rows])
+        comments = {
+            comment.id: comment for comment in await _build_comments(db, rows, icon_rows)
+        }
+
+        return schemas.CommentBatchResponse(
+            comments={
+                comment_id: schemas.CommentResponse.model_validate(comments[comment_id])
+                for comment_id in comment_ids
+                if comment_id in comments
+            },
+            not_found=[i for i in comment_ids if i not in comments],
+        )
+
+    except Exception as e:
+        logger.error("Erro ao obter comentários em lote %s: %s", comment_ids, str(e))
+        raise CommentGenericException()
+
 
 async def create_comment(
     db: AsyncSession,
     comment: schemas.CommentCreate,
     images: list[UploadFile] | None = None,
 ):
+    image_list: list[str] = []
     try:
         if comment.rating < 1 or comment.rating > 5:
             log_message(f"Avaliação inválida fornecida: {comment.rating}", level="error", logger_name="acesso_livre_api")
             raise CommentRatingInvalidException(comment.rating)
 
-        image_list = []
-        if images:
-            for img in images:
-                upload_image_path = await upload_image.upload_image(img)
-                image_list.append(upload_image_path)
+        # Uploads em paralelo e deduplicados por conteúdo; se algum falhar, os já enviados são removidos
+        image_list = await upload_image.upload_images(images or [], db=db)
 
         data = comment.model_dump(exclude={"comment_icon_ids"})
         data["images"] = image_list
@@ -139,13 +277,17 @@ async def create_comment(
         log_message(f"Comentário criado com sucesso para localização {comment.location_id}", level="info", logger_name="acesso_livre_api")
         return db_comment
 
-    except (CommentRatingInvalidException, CommentImagesInvalidException):
+    except (CommentRatingInvalidException, CommentImagesInvalidException, UploadException):
         log_message("Falha ao criar comentário devido a dados inválidos", level="error", logger_name="acesso_livre_api")
         raise
     except Exception as e:
         log_message(f"Erro ao criar comentário: {str(e)}", level="error", logger_name="acesso_livre_api")
         logger.error("Erro ao criar comentário: %s", str(e))
         await db.rollback()
+        # O comentário não foi salvo: as imagens enviadas ficariam órfãs no storage
+        # (as reutilizadas de outros comentários continuam referenciadas)
+        if image_list:
+            await discard_unreferenced(db, image_list)
         raise CommentCreateException()
 
 
@@ -154,33 +296,12 @@ async def get_comments_with_status_pending(
     db: AsyncSession, skip: int = 0, limit: int = 10
 ):
     try:
-        stmt = (
-            select(models.Comment)
-            .options(selectinload(models.Comment.comment_icons))
-            .where(models.Comment.status == "pending")
-            .order_by(models.Comment.created_at.desc())
-            .offset(skip)
-            .limit(limit)
+        comments = await _list_comments(
+            db, models.Comment.status == "pending", skip=skip, limit=limit
         )
-        result = await db.execute(stmt)
-        comments = result.unique().scalars().all()
-
         if not comments:
             return []
 
-        for comment in comments:
-            if comment.images is None:
-                comment.images = []
-            else:
-                comment.images = await get_images_with_ids(comment.images)
-            
-            # Processar ícones de comentário para obter signed URLs
-            for icon in _safe_list(getattr(comment, "comment_icons", None)):
-                    if icon.icon_url:
-                        signed_urls = await get_signed_urls([icon.icon_url])
-                        if signed_urls and signed_urls[0] is not None:
-                            icon.icon_url = signed_urls[0]
-                            
         log_message(f"{len(comments)} comentários pendentes recuperados com sucesso", level="info", logger_name="acesso_livre_api")
         return comments
 
@@ -191,6 +312,22 @@ async def get_comments_with_status_pending(
 
 
 
+async def _comment_response(
+    db: AsyncSession, comment: models.Comment, status: str, with_images: bool = True
+) -> dto.CommentDTO:
+    """Monta o DTO de resposta a partir da entidade carregada, sem alterá-la."""
+    row = {column.key: getattr(comment, column.key) for column in _COMMENT_LIST_COLUMNS}
+    row["status"] = status
+    if not with_images:
+        row["images"] = None
+    icon_rows = [
+        {"comment_id": comment.id, "id": icon.id, "name": icon.name, "icon_url": icon.icon_url}
+        for icon in _safe_list(getattr(comment, "comment_icons", None))
+    ]
+    [response] = await _build_comments(db, [row], icon_rows)
+    return response
+
+
 async def update_comment_status(
     db: AsyncSession, comment_id: int, new_status: schemas.CommentUpdateStatus
 ):
@@ -229,45 +366,36 @@ async def update_comment_status(
             log_message(f"Comentário {comment_id} não está pendente para atualização", level="error", logger_name="acesso_livre_api")
             raise CommentNotPendingException(comment_id, comment.status)
 
-        comment.status = status_value
-        await db.commit()
-        # Não é necessário fazer refresh neste ponto
-
         if status_value == "approved":
-            await update_location_average_rating(db, comment.location_id, comment.rating)
-
-            if comment.images and len(comment.images) > 0:
-                stmt_location = (
-                    select(location_models.Location)
-                    .options(selectinload(location_models.Location.images))
-                    .where(location_models.Location.id == comment.location_id)
+            # Aprovação em uma única transação de UPDATEs: status (só se ainda
+            # pendente, contra aprovações concorrentes), média e galeria do local
+            result_status = await db.execute(
+                update(models.Comment)
+                .where(
+                    models.Comment.id == comment_id,
+                    models.Comment.status == "pending",
                 )
-                result_location = await db.execute(stmt_location)
-                location = result_location.scalars().first()
-
-                if location:
-                    if location.images is None:
-                        location.images = []
+                .values(status=status_value)
+                .returning(models.Comment.id)
+            )
+            if result_status.scalar_one_or_none() is None:
+                await db.rollback()
+                raise CommentNotPendingException(comment_id)
 
-                    for image_path in comment.images:
-                        if image_path not in location.images:
-                            location.images.append(image_path)
+            await update_location_average_rating(db, comment.location_id)
+            await link_location_images(
+                db, comment.location_id, dict.fromkeys(comment.images or [], comment.id)
+            )
+            await db.commit()
 
-                await db.commit()
+            invalidate_map_snapshot()
+            if search_index.active:
+                search_index.upsert_comment(comment.id, comment.location_id, comment.comment)
 
         elif status_value == "rejected":
-            # Deletar imagens do storage antes de deletar o comentário
+            # Referências liberadas; objetos sem uso vão para o outbox, na mesma transação
             if comment.images:
-                try:
-                    await delete_images(comment.images)
-                    log_message(f"Imagens do comentário {comment_id} deletadas com sucesso antes de excluir o comentário", level="info", logger_name="acesso_livre_api")
-                except Exception as e:
-                    logger.warning(
-                        "Falha ao deletar imagens do comentário %s: %s. "
-                        "Prosseguindo com exclusão do comentário.",
-                        comment_id, str(e)
-                    )
-                    log_message(f"Falha ao deletar imagens do comentário {comment_id}: {str(e)}. Prosseguindo com exclusão do comentário.", level="warning", logger_name="acesso_livre_api")
+                await release_objects(db, comment.images)
 
             # Deletar o comentário do banco de dados
             await db.delete(comment)
@@ -278,17 +406,10 @@ async def update_comment_status(
                 comment_id,
             )
             log_message(f"Comentário {comment_id} rejeitado e deletado com sucesso", level="info", logger_name="acesso_livre_api")
-            return comment
+            # As imagens do comentário rejeitado já foram liberadas
+            return await _comment_response(db, comment, status_value, with_images=False)
 
-        if comment.images is None:
-            comment.images = []
-        
-        # Processar ícones de comentário para obter signed URLs
-        for icon in _safe_list(getattr(comment, "comment_icons", None)):
-                if icon.icon_url:
-                    signed_urls = await get_signed_urls([icon.icon_url])
-                    if signed_urls and signed_urls[0] is not None:
-                        icon.icon_url = signed_urls[0]
+        response = await _comment_response(db, comment, status_value)
 
         logger.info(
             "Comentário %s atualizado com sucesso para status %s",
@@ -296,7 +417,7 @@ async def update_comment_status(
             status_value,
         )
         log_message(f"Comentário {comment_id} atualizado com sucesso para status '{status_value}'", level="info", logger_name="acesso_livre_api")
-        return comment
+        return response
 
 
     except (
@@ -320,6 +441,195 @@ async def update_comment_status(
         raise CommentUpdateException()
 
 
+async def update_comments_status_batch(
+    db: AsyncSession, batch: schemas.CommentBatchStatusUpdate
+) -> list[schemas.CommentBatchStatusResult]:
+    """Aprova ou rejeita vários comentários pendentes em uma única transação.
+
+    Aprovações: um UPDATE com guarda de status para todos os IDs, um UPDATE
+    agrupado das médias dos locais afetados e a galeria de cada local.
+    Rejeições: as linhas pendentes são travadas, apagadas em lote e todas as
+    imagens são liberadas de uma vez (deleções enfileiradas no outbox).
+
+    Returns:
+        Um resultado por ID, na ordem recebida (IDs repetidos são ignorados)
+    """
+    status_value = batch.status.value
+    if status_value not in ["approved", "rejected"]:
+        raise CommentStatusInvalidException(status_value)
+
+    ids = list(dict.fromkeys(batch.ids))
+    try:
+        if status_value == "approved":
+            result = await db.execute(
+                update(models.Comment)
+                .where(models.Comment.id.in_(ids), models.Comment.status == "pending")
+                .values(status=status_value)
+                .returning(
+                    models.Comment.id,
+                    models.Comment.location_id,
+                    models.Comment.comment,
+                    models.Comment.images,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            processed = result.all()
+
+            # Caminho -> comentário de origem; o primeiro comentário com a imagem vence.
+            # Comentários sem local (local excluído) não têm média nem galeria
+            images_by_location: dict[int, dict[str, int]] = {}
+            for row in processed:
+                if row.location_id is None:
+                    continue
+                sources = images_by_location.setdefault(row.location_id, {})
+                for path in row.images or []:
+                    sources.setdefault(path, row.id)
+
+            await update_locations_average_rating(db, images_by_location.keys())
+            # Ordem fixa de travamento das linhas dos locais
+            for location_id in sorted(images_by_location):
+                await link_location_images(db, location_id, images_by_location[location_id])
+        else:
+            result = await db.execute(
+                select(models.Comment.id, models.Comment.images)
+                .where(models.Comment.id.in_(ids), models.Comment.status == "pending")
+                .with_for_update()
+            )
+            processed = result.all()
+            processed_ids = [row.id for row in processed]
+
+            if processed_ids:
+                await release_objects(
+                    db, [path for row in processed for path in row.images or []]
+                )
+                await db.execute(
+                    delete(models.comment_comment_icons_association).where(
+                        models.comment_comment_icons_association.c.comment_id.in_(
+                            processed_ids
+                        )
+                    )
+                )
+                await db.execute(
+                    delete(models.Comment)
+                    .where(models.Comment.id.in_(processed_ids))
+                    .execution_options(synchronize_session=False)
+                )
+
+        # Distingue, com uma consulta, IDs inexistentes de comentários já processados
+        processed_ids = {row.id for row in processed}
+        remaining = [comment_id for comment_id in ids if comment_id not in processed_ids]
+        existing: set[int] = set()
+        if remaining:
+            result_existing = await db.execute(
+                select(models.Comment.id).where(models.Comment.id.in_(remaining))
+            )
+            existing = set(result_existing.scalars())
+
+        await db.commit()
+
+    except sqlalchemy_exc.SQLAlchemyError as e:
+        logger.error("Erro de banco de dados na moderação em lote: %s", str(e))
+        await db.rollback()
+        log_message(f"Erro de banco de dados na moderação em lote: {str(e)}", level="error", logger_name="acesso_livre_api")
+        raise CommentUpdateException()
+    except Exception as e:
+        logger.error("Erro inesperado na moderação em lote: %s", str(e))
+        await db.rollback()
+        log_message(f"Erro inesperado na moderação em lote: {str(e)}", level="error", logger_name="acesso_livre_api")
+        raise CommentUpdateException()
+
+    if status_value == "approved" and processed:
+        invalidate_map_snapshot()
+        if search_index.active:
+            for row in processed:
+                if row.location_id is not None:
+                    search_index.upsert_comment(row.id, row.location_id, row.comment)
+
+    results = []
+    for comment_id in ids:
+        if comment_id in processed_ids:
+            results.append(
+                schemas.CommentBatchStatusResult(
+                    id=comment_id, success=True, status=status_value
+                )
+            )
+        elif comment_id in existing:
+            results.append(
+                schemas.CommentBatchStatusResult(
+                    id=comment_id,
+                    success=False,
+                    detail="Comentário não está com status 'pending'",
+                )
+            )
+        else:
+            results.append(
+                schemas.CommentBatchStatusResult(
+                    id=comment_id, success=False, detail="Comentário não encontrado"
+                )
+            )
+
+    log_message(
+        f"Moderação em lote: {len(processed_ids)} de {len(ids)} comentários atualizados para '{status_value}'",
+        level="info",
+        logger_name="acesso_livre_api",
+    )
+    return results
+
+
+async def _hand_over_gallery_rows(
+    db: AsyncSession, comment: models.Comment, paths: Iterable[str] | None = None
+) -> None:
+    """Passa as linhas da galeria que vieram do comentário para outro comentário
+    aprovado do mesmo local que tenha a mesma imagem.
+
+    Com a deduplicação, comentários diferentes podem ter o mesmo caminho, mas a
+    galeria guarda uma linha só, do primeiro comentário aprovado. As linhas sem
+    outra origem continuam com o comentário (e saem junto com ele).
+    """
+    if not comment.location_id:
+        return
+
+    LocationImage = location_models.LocationImage
+    stmt = select(LocationImage.path).where(
+        LocationImage.location_id == comment.location_id,
+        LocationImage.comment_id == comment.id,
+    )
+    if paths is not None:
+        stmt = stmt.where(LocationImage.path.in_(list(paths)))
+    result = await db.execute(stmt)
+    owned = set(result.scalars().all())
+    if not owned:
+        return
+
+    result = await db.execute(
+        select(models.Comment.id, models.Comment.images)
+        .where(
+            models.Comment.location_id == comment.location_id,
+            models.Comment.status == "approved",
+            models.Comment.id != comment.id,
+            models.Comment.images.isnot(None),
+        )
+        .order_by(models.Comment.id)
+    )
+    new_sources: dict[str, int] = {}
+    for other_id, images in result.all():
+        for path in images or []:
+            if path in owned:
+                new_sources.setdefault(path, other_id)
+
+    for path, other_id in new_sources.items():
+        await db.execute(
+            update(LocationImage)
+            .where(
+                LocationImage.location_id == comment.location_id,
+                LocationImage.path == path,
+                LocationImage.comment_id == comment.id,
+            )
+            .values(comment_id=other_id)
+            .execution_options(synchronize_session=False)
+        )
+
+
 async def delete_comment(
     db: AsyncSession, comment_id: int, user_permissions: bool = True
 ):
@@ -336,20 +646,19 @@ async def delete_comment(
             log_message(f"Comentário {comment_id} não encontrado para exclusão", level="error", logger_name="acesso_livre_api")
             raise CommentNotFoundException()
 
-        # Deletar imagens do storage antes de deletar o comentário
+        # Referências liberadas; objetos sem uso vão para o outbox, na mesma transação
         if comment.images:
-            try:
-                await delete_images(comment.images)
-            except Exception as e:
-                logger.warning(
-                    "Falha ao deletar imagens do comentário %s: %s. "
-                    "Prosseguindo com exclusão do comentário.",
-                    comment_id, str(e)
-                )
-                log_message(f"Falha ao deletar imagens do comentário {comment_id}: {str(e)}. Prosseguindo com exclusão do comentário.", level="warning", logger_name="acesso_livre_api")
+            await release_objects(db, comment.images)
+
+        # Só comentários aprovados chegam aos clientes da sincronização
+        if comment.status == "approved":
+            await record_tombstones(db, SyncEntity.COMMENT, [comment_id])
 
+        # A exclusão remove em cascata as linhas da galeria que ainda forem dele
+        await _hand_over_gallery_rows(db, comment)
         await db.delete(comment)
         await db.commit()
+        search_index.remove_comment(comment_id)
 
         log_message(f"Comentário {comment_id} deletado com sucesso", level="info", logger_name="acesso_livre_api")
         return True
@@ -375,36 +684,16 @@ async def get_all_comments_by_location_id(
     location_id: int, skip: int, limit: int, db: AsyncSession
 ):
     try:
-        stmt = (
-            select(models.Comment)
-            .options(selectinload(models.Comment.comment_icons))
-            .where(
-                models.Comment.location_id == location_id,
-                models.Comment.status == "approved",
-            )
-            .order_by(models.Comment.created_at.desc())
-            .offset(skip)
-            .limit(limit)
+        comments = await _list_comments(
+            db,
+            models.Comment.location_id == location_id,
+            models.Comment.status == "approved",
+            skip=skip,
+            limit=limit,
         )
-        result = await db.execute(stmt)
-        comments = result.unique().scalars().all()
-
         if not comments:
             return []
 
-        for comment in comments:
-            if comment.images is None:
-                comment.images = []
-            else:
-                comment.images = await get_images_with_ids(comment.images)
-            
-            # Processar ícones de comentário para obter signed URLs
-            for icon in _safe_list(getattr(comment, "comment_icons", None)):
-                    if icon.icon_url:
-                        signed_urls = await get_signed_urls([icon.icon_url])
-                        if signed_urls and signed_urls[0] is not None:
-                            icon.icon_url = signed_urls[0]
-
         log_message(f"{len(comments)} comentários recuperados para o local {location_id}", level="info", logger_name="acesso_livre_api")
         return comments
 
@@ -424,51 +713,23 @@ async def get_all_comments_with_accessibility_items(
     Retorna uma tupla com (comentários, itens_de_acessibilidade).
     """
     try:
-        # Buscar comentários
-        stmt = (
-            select(models.Comment)
-            .options(selectinload(models.Comment.comment_icons))
-            .where(
-                models.Comment.location_id == location_id,
-                models.Comment.status == "approved",
-            )
-            .order_by(models.Comment.created_at.desc())
-            .offset(skip)
-            .limit(limit)
+        comments = await _list_comments(
+            db,
+            models.Comment.location_id == location_id,
+            models.Comment.status == "approved",
+            skip=skip,
+            limit=limit,
         )
-        result = await db.execute(stmt)
-        comments = result.unique().scalars().all()
 
-        # Processar imagens dos comentários
-        for comment in comments:
-            if comment.images is None:
-                comment.images = []
-            else:
-                comment.images = await get_images_with_ids(comment.images)
-            
-            # Processar ícones de comentário para obter signed URLs
-            for icon in _safe_list(getattr(comment, "comment_icons", None)):
-                    if icon.icon_url:
-                        signed_urls = await get_signed_urls([icon.icon_url])
-                        if signed_urls and signed_urls[0] is not None:
-                            icon.icon_url = signed_urls[0]
-
-        # Buscar itens de acessibilidade da localização
-        stmt_location = (
-            select(location_models.Location)
-            .options(selectinload(location_models.Location.accessibility_items))
-            .where(location_models.Location.id == location_id)
+        # Buscar itens de acessibilidade da localização (apenas id e nome)
+        association = location_models.location_accessibility_association
+        result_items = await db.execute(
+            select(location_models.AccessibilityItem.id, location_models.AccessibilityItem.name)
+            .join(association, association.c.item_id == location_models.AccessibilityItem.id)
+            .where(association.c.location_id == location_id)
+            .order_by(location_models.AccessibilityItem.id)
         )
-        result_location = await db.execute(stmt_location)
-        location = result_location.scalars().first()
-        
-        accessibility_items = []
-        if location and location.accessibility_items:
-            # Converter accessibility_items para lista de dicts
-            accessibility_items = [
-                {"id": item.id, "name": item.name}
-                for item in location.accessibility_items
-            ]
+        accessibility_items = [dict(row) for row in result_items.mappings().all()]
 
         return comments, accessibility_items
 
@@ -484,42 +745,34 @@ async def get_all_comments_with_accessibility_items(
 
 
 async def get_recent_comments(db: AsyncSession, limit: int = 3):
+    """Comentários aprovados mais recentes, com nome e nota do local.
+
+    Lê apenas as colunas de `RecentCommentResponse`; imagens e ícones não fazem
+    parte da resposta e não são assinados.
+    """
     try:
         stmt = (
-            select(models.Comment)
-            .options(
-                selectinload(models.Comment.location),
-                selectinload(models.Comment.comment_icons)
+            select(
+                location_models.Location.name.label("location_name"),
+                func.coalesce(location_models.Location.avg_rating, 0.0).label(
+                    "location_rating"
+                ),
+                models.Comment.user_name,
+                models.Comment.comment.label("description"),
+            )
+            .join(
+                location_models.Location,
+                location_models.Location.id == models.Comment.location_id,
             )
             .where(models.Comment.status == "approved")
             .order_by(models.Comment.created_at.desc())
             .limit(limit)
         )
         result = await db.execute(stmt)
-        comments = result.unique().scalars().all()
+        comments = [dto.build_recent_comment(row) for row in result.mappings().all()]
 
         if not comments:
             return []
-        
-        for comment in comments:
-            if comment.images is None:
-                comment.images = []
-            else:
-                signed_urls = await get_signed_urls(comment.images)
-                # Filter out images with failed signed URLs
-                comment.images = [url for url in signed_urls if url is not None]
-
-            # Campo legado usado em mocks/testes unitários
-            if hasattr(comment, "icon_url") and getattr(comment, "icon_url"):
-                signed_urls = await get_signed_urls([comment.icon_url])
-                if signed_urls and signed_urls[0] is not None:
-                    comment.icon_url = signed_urls[0]
-            
-            for icon in _safe_list(getattr(comment, "comment_icons", None)):
-                    if icon.icon_url:
-                        signed_urls = await get_signed_urls([icon.icon_url])
-                        if signed_urls and signed_urls[0] is not None:
-                            icon.icon_url = signed_urls[0]
 
         log_message(f"{len(comments)} comentários recentes recuperados", level="info", logger_name="acesso_livre_api")
         return comments
@@ -564,29 +817,38 @@ async def delete_comment_image(
         if not target_comment or not image_path:
             raise ImageNotFoundException(image_id)
 
-        # Deletar do storage
-        try:
-            await delete_image(image_path)
-        except Exception as e:
-            logger.warning(
-                "Falha ao deletar imagem %s do storage: %s. Prosseguindo com remoção do banco.",
-                image_id, str(e)
-            )
-            log_message(f"Falha ao deletar imagem {image_id} do storage: {str(e)}. Prosseguindo com remoção do banco.", level="warning", logger_name="acesso_livre_api")
-
         # Remover do array de imagens do comentário
         target_comment.images = [img for img in target_comment.images if img != image_path]
-        
-        # Também remover da location se existir
+
+        # Remover da galeria do local só a linha que veio deste comentário; se
+        # outro comentário aprovado tiver a mesma imagem, a linha passa para ele
+        LocationImage = location_models.LocationImage
         if target_comment.location_id:
-            stmt_location = select(location_models.Location).where(
-                location_models.Location.id == target_comment.location_id
+            await _hand_over_gallery_rows(db, target_comment, [image_path])
+            await db.execute(
+                delete(LocationImage)
+                .where(
+                    LocationImage.location_id == target_comment.location_id,
+                    LocationImage.path == image_path,
+                    LocationImage.comment_id == target_comment.id,
+                )
+                .execution_options(synchronize_session=False)
             )
-            result_location = await db.execute(stmt_location)
-            location = result_location.scalars().first()
-            
-            if location and location.images:
-                location.images = [img for img in location.images if img != image_path]
+
+        # Objetos com contagem de referências são sempre liberados (o contador decide);
+        # caminhos sem registro são removidos direto, então só quando nada mais os usa
+        still_referenced = any(
+            comment.id != target_comment.id and image_path in (comment.images or [])
+            for comment in comments
+        )
+        if not still_referenced:
+            result_rows = await db.execute(
+                select(LocationImage.id).where(LocationImage.path == image_path).limit(1)
+            )
+            still_referenced = result_rows.first() is not None
+        if not still_referenced or await managed_paths(db, [image_path]):
+            # Remoção do storage agendada no outbox se não houver outro uso
+            await release_objects(db, [image_path])
 
         await db.commit()
         
@@ -641,29 +903,15 @@ async def create_comment_icon(db: AsyncSession, name: str, icon_url: str):
 
 
 async def get_all_comment_icons(db: AsyncSession):
-    """Obter todos os ícones de comentário com signed URLs."""
+    """Obter todos os ícones de comentário com suas URLs (públicas ou assinadas)."""
     try:
-        stmt = select(models.CommentIcon)
-        result = await db.execute(stmt)
-        icons = result.scalars().all()
-
-        # Obter signed URLs para os ícones
-        icon_urls = [icon.icon_url for icon in icons if icon.icon_url]
-        signed_urls_list = await get_signed_urls(icon_urls) if icon_urls else []
+        result = await db.execute(select(*_COMMENT_ICON_COLUMNS))
+        rows = result.mappings().all()
 
-        # Mapear icon_url para signed_url (ignorar valores None)
-        icon_url_mapping = {
-            url: signed_url
-            for url, signed_url in zip(icon_urls, signed_urls_list)
-            if signed_url is not None
-        }
-
-        # Atualizar os ícones com signed URLs (manter original se falhou)
-        for icon in icons:
-            if icon.icon_url in icon_url_mapping:
-                icon.icon_url = icon_url_mapping[icon.icon_url]
-
-        return icons
+        # URLs públicas montadas localmente (ou signed URLs, sem bucket público);
+        # sem URL resolvida, o ícone mantém o caminho original
+        url_map = await _icon_url_map(dto.icon_paths(rows))
+        return [dto.build_icon(row, url_map) for row in rows]
 
     except Exception as e:
         logger.error("Erro ao obter ícones de comentário: %s", str(e))
@@ -674,20 +922,16 @@ async def get_all_comment_icons(db: AsyncSession):
 async def get_comment_icon_by_id(db: AsyncSession, icon_id: int):
     """Obter um ícone de comentário pelo ID."""
     try:
-        stmt = select(models.CommentIcon).where(models.CommentIcon.id == icon_id)
+        stmt = select(*_COMMENT_ICON_COLUMNS).where(models.CommentIcon.id == icon_id)
         result = await db.execute(stmt)
-        icon = result.scalars().first()
+        row = result.mappings().first()
 
-        if not icon:
+        if not row:
             raise CommentGenericException()
 
-        # Obter signed URL
-        if icon.icon_url:
-            signed_urls = await get_signed_urls([icon.icon_url])
-            if signed_urls and signed_urls[0] is not None:
-                icon.icon_url = signed_urls[0]
-
-        return icon
+        # Obter a URL do ícone
+        url_map = await _icon_url_map(dto.icon_paths([row]))
+        return dto.build_icon(row, url_map)
 
     except Exception as e:
         logger.error("Erro ao obter ícone de comentário %s: %s", icon_id, str(e))
@@ -715,43 +959,33 @@ async def update_comment_icon(
 
         if image:
             # Upload da nova imagem
-            new_icon_url = await upload_image.upload_image(image)
+            new_icon_url = await upload_image.upload_image(image, with_variants=False, db=db)
 
-            # Deletar imagem antiga se existir
+            # Referência da imagem antiga liberada; sem outro uso, o outbox a remove
             if icon.icon_url:
-                try:
-                    await delete_image(icon.icon_url)
-                except Exception as e:
-                    logger.warning(
-                        "Falha ao deletar imagem antiga %s do ícone %s: %s",
-                        icon.icon_url,
-                        icon_id,
-                        str(e),
-                    )
-                    log_message(
-                        f"Falha ao deletar imagem antiga {icon.icon_url} do ícone {icon_id}: {str(e)}",
-                        level="warning",
-                        logger_name="acesso_livre_api",
-                    )
+                await release_objects(
+                    db, [icon.icon_url], include_variants=False, bucket=icon_bucket_name()
+                )
 
             icon.icon_url = new_icon_url
 
         await db.commit()
         await db.refresh(icon)
 
-        # Obter signed URL para retorno
-        if icon.icon_url:
-            signed_urls = await get_signed_urls([icon.icon_url])
-            if signed_urls and signed_urls[0] is not None:
-                icon.icon_url = signed_urls[0]
+        # Obter a URL do ícone para retorno (a entidade mantém o caminho)
+        row = {"id": icon.id, "name": icon.name, "icon_url": icon.icon_url}
+        response = dto.build_icon(row, await _icon_url_map(dto.icon_paths([row])))
 
         log_message(
             f"Ícone de comentário {icon_id} atualizado com sucesso",
             level="info",
             logger_name="acesso_livre_api",
         )
-        return icon
+        return response
 
+    except UploadException:
+        await db.rollback()
+        raise
     except sqlalchemy_exc.SQLAlchemyError as e:
         logger.error(
             "Erro de banco de dados ao atualizar ícone de comentário %s: %s",
@@ -788,17 +1022,13 @@ async def delete_comment_icon(db: AsyncSession, icon_id: int):
         if not icon:
             raise CommentGenericException()
 
-        # Tentar deletar do storage
+        # Referência liberada; remoção do storage agendada no outbox se não houver outro uso
         if icon.icon_url:
-            try:
-                await delete_image(icon.icon_url)
-            except Exception as e:
-                logger.warning(
-                    "Falha ao deletar ícone %s do storage: %s. Prosseguindo com remoção do banco.",
-                    icon_id, str(e)
-                )
-                log_message(f"Falha ao deletar ícone {icon_id} do storage: {str(e)}. Prosseguindo com remoção do banco.", level="warning", logger_name="acesso_livre_api")
+            await release_objects(
+                db, [icon.icon_url], include_variants=False, bucket=icon_bucket_name()
+            )
 
+        await record_tombstones(db, SyncEntity.COMMENT_ICON, [icon_id])
         await db.delete(icon)
         await db.commit()
         
@@ -1,7 +1,12 @@
 import os
+from collections.abc import Container, Iterable, Mapping
+
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from acesso_livre_api.src.comments import schemas
+from acesso_livre_api.storage.dedup import paths_with_variants
 from acesso_livre_api.storage.get_url import get_signed_urls
+from acesso_livre_api.storage.image_processing import variant_path
 
 
 def extract_image_id(file_path: str) -> str:
@@ -14,23 +19,68 @@ def extract_image_id(file_path: str) -> str:
     return name_without_ext
 
 
-async def get_images_with_ids(file_paths: list[str]) -> list[schemas.ImageResponse]:
-    """Converte lista de paths em lista de ImageResponse com IDs e signed URLs."""
+def image_url_paths(
+    file_paths: Iterable[str], with_variants: Container[str] = ()
+) -> list[str]:
+    """Caminhos assinados para exibir as imagens: originais e, das imagens em
+    `with_variants`, os thumbs e mediums."""
+    file_paths = list(dict.fromkeys(file_paths))
+    variant_sources = [path for path in file_paths if path in with_variants]
+    thumb_paths = [variant_path(path, "thumb") for path in variant_sources]
+    medium_paths = [variant_path(path, "medium") for path in variant_sources]
+    return file_paths + thumb_paths + medium_paths
+
+
+async def sign_image_paths(db: AsyncSession, file_paths: Iterable[str]) -> dict[str, str]:
+    """Assina o original e as variantes de todas as imagens em uma única chamada.
+
+    Variantes só são assinadas para imagens que as têm (registradas em
+    `stored_objects`); imagens anteriores ao pipeline ficam sem thumb/medium.
+
+    Returns:
+        Mapa caminho -> URL assinada (caminhos cuja assinatura falhou ficam de fora)
+    """
+    file_paths = list(dict.fromkeys(file_paths))
     if not file_paths:
-        return []
-    
-    signed_urls = await get_signed_urls(file_paths)
-    
-    # Filter out images where signed URL generation failed (None)
+        return {}
+    paths = image_url_paths(file_paths, await paths_with_variants(db, file_paths))
+    signed_urls = await get_signed_urls(paths)
+    return {path: url for path, url in zip(paths, signed_urls) if url is not None}
+
+
+def build_images(
+    file_paths: Iterable[str], url_map: Mapping[str, str]
+) -> list[schemas.ImageResponse]:
+    """Monta as ImageResponse a partir dos caminhos e do mapa de URLs assinadas.
+
+    Imagens cujo original não foi assinado são omitidas; variantes ausentes
+    (imagens anteriores ao pipeline de variantes) ficam nulas.
+    """
     return [
         schemas.ImageResponse(
             id=extract_image_id(path),
-            url=url
+            url=url_map[path],
+            thumbnail_url=url_map.get(variant_path(path, "thumb")),
+            medium_url=url_map.get(variant_path(path, "medium")),
         )
-        for path, url in zip(file_paths, signed_urls) if url is not None
+        for path in file_paths
+        if path in url_map
     ]
 
 
+async def get_images_with_ids(
+    db: AsyncSession, file_paths: list[str]
+) -> list[schemas.ImageResponse]:
+    """Converte lista de paths em lista de ImageResponse com IDs e signed URLs.
+
+    Assina o original e as variantes existentes (thumb/medium) de todas as imagens de uma vez.
+    """
+    if not file_paths:
+        return []
+
+    return build_images(file_paths, await sign_image_paths(db, file_paths))
+
+
 def find_image_path_by_id(images: list[str], image_id: str) -> str | None:
     """Encontra o path completo da imagem pelo ID (UUID)."""
     for path in images:
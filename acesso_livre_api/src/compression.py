@@ -0,0 +1,160 @@
+"""Compressão gzip/brotli das respostas da API.
+
+`CompressionMiddleware` negocia a codificação pelo `Accept-Encoding` (brotli
+tem preferência sobre gzip quando o cliente aceita os dois com o mesmo peso)
+e comprime respostas a partir de `settings.compression_minimum_size` bytes;
+respostas menores saem sem compressão, já que o ganho não compensa a CPU.
+
+Respostas que já trazem `Content-Encoding` passam intactas: é o caso das
+entradas de cache guardadas já comprimidas (`PrecompressedBody`), em que a
+compressão, com nível mais alto, é feita uma vez por preenchimento do cache
+em vez de a cada requisição.
+"""
+
+import gzip
+from dataclasses import dataclass, field
+
+import brotli
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipMiddleware, GZipResponder, IdentityResponder
+from starlette.responses import Response
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from acesso_livre_api.src.config import settings
+
+# Níveis por requisição: bom ganho com pouca CPU
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+# Entradas de cache são comprimidas uma vez, com níveis mais altos. Acima de 9
+# o brotli fica dezenas de vezes mais lento sem ganho no JSON do mapa
+PRECOMPRESSED_GZIP_LEVEL = 9
+PRECOMPRESSED_BROTLI_QUALITY = 9
+
+# Ordem de preferência em caso de empate no peso (q) do Accept-Encoding
+_ENCODINGS = ("br", "gzip")
+
+
+def negotiate_encoding(accept_encoding: str | None) -> str | None:
+    """Escolhe a codificação ("br" ou "gzip") aceita pelo cliente, ou None."""
+    if not accept_encoding:
+        return None
+
+    qualities: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding] = quality
+
+    best, best_quality = None, 0.0
+    for encoding in _ENCODINGS:
+        quality = qualities.get(encoding, qualities.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+class BrotliResponder(IdentityResponder):
+    """Responder do Starlette que comprime o corpo (inclusive em streaming) com brotli."""
+
+    content_encoding = "br"
+
+    def __init__(self, app: ASGIApp, minimum_size: int, quality: int = BROTLI_QUALITY):
+        super().__init__(app, minimum_size)
+        self.compressor = brotli.Compressor(quality=quality)
+
+    def apply_compression(self, body: bytes, *, more_body: bool) -> bytes:
+        compressed = self.compressor.process(body)
+        if more_body:
+            return compressed + self.compressor.flush()
+        return compressed + self.compressor.finish()
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """GZipMiddleware do Starlette com negociação de brotli."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int | None = None,
+        compresslevel: int = GZIP_LEVEL,
+        brotli_quality: int = BROTLI_QUALITY,
+    ) -> None:
+        if minimum_size is None:
+            minimum_size = settings.compression_minimum_size
+        super().__init__(app, minimum_size=minimum_size, compresslevel=compresslevel)
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding"))
+        responder: ASGIApp
+        if encoding == "br":
+            responder = BrotliResponder(
+                self.app, self.minimum_size, quality=self.brotli_quality
+            )
+        elif encoding == "gzip":
+            responder = GZipResponder(
+                self.app, self.minimum_size, compresslevel=self.compresslevel
+            )
+        else:
+            responder = IdentityResponder(self.app, self.minimum_size)
+
+        await responder(scope, receive, send)
+
+
+@dataclass(frozen=True, slots=True)
+class PrecompressedBody:
+    """Corpo de resposta guardado em cache já comprimido em cada codificação."""
+
+    body: bytes
+    media_type: str = "application/json"
+    encoded: dict[str, bytes] = field(default_factory=dict)
+
+    @classmethod
+    def build(
+        cls,
+        body: bytes,
+        media_type: str = "application/json",
+        minimum_size: int | None = None,
+    ) -> "PrecompressedBody":
+        """Comprime o corpo com gzip e brotli, se ele atingir o tamanho mínimo."""
+        if minimum_size is None:
+            minimum_size = settings.compression_minimum_size
+        encoded = {}
+        if len(body) >= minimum_size:
+            encoded = {
+                "br": brotli.compress(body, quality=PRECOMPRESSED_BROTLI_QUALITY),
+                # mtime fixo: o mesmo corpo gera sempre os mesmos bytes
+                "gzip": gzip.compress(
+                    body, compresslevel=PRECOMPRESSED_GZIP_LEVEL, mtime=0
+                ),
+            }
+        return cls(body=body, media_type=media_type, encoded=encoded)
+
+    def response(self, accept_encoding: str | None) -> Response:
+        """Resposta na melhor codificação aceita pelo cliente.
+
+        Sem codificação aceita, o corpo sai sem compressão e o middleware
+        apenas acrescenta o `Vary`, como em qualquer resposta.
+        """
+        encoding = negotiate_encoding(accept_encoding) if self.encoded else None
+        if encoding is None:
+            return Response(self.body, media_type=self.media_type)
+        return Response(
+            self.encoded[encoding],
+            media_type=self.media_type,
+            headers={"content-encoding": encoding, "vary": "Accept-Encoding"},
+        )
@@ -15,7 +15,15 @@ class Settings(BaseSettings):
     bucket_name: str
     bucket_endpoint_url: str
     bucket_secret_key: str
+    # Bucket público para ícones (URLs estáveis, sem assinatura). Sem ele, os
+    # ícones ficam no bucket privado e são servidos com signed URLs
+    public_bucket_name: str | None = None
+    # JWT secret do projeto Supabase: assina as URLs localmente, sem chamada
+    # ao storage. Sem ele, cada URL não cacheada é pedida ao Supabase
+    storage_jwt_secret: str | None = None
     mode: str = "prod"
+    # Respostas menores que isso (em bytes) saem sem gzip/brotli
+    compression_minimum_size: int = 1024
     # EmailJS Configuration
     emailjs_service_id: str
     emailjs_template_id: str
@@ -34,4 +34,14 @@ async def get_db():
         finally:
             log_message("Database session closed.", level="debug", logger_name="acesso_livre_api")
             await session.close()
-            
+
+
+def is_postgres(db) -> bool:
+    """Indica se a sessão está ligada a um banco PostgreSQL.
+
+    Usado para escolher consultas otimizadas específicas do Postgres,
+    mantendo um caminho compatível com o SQLite usado nos testes.
+    """
+    bind = getattr(db, "bind", None)
+    dialect = getattr(bind, "dialect", None)
+    return getattr(dialect, "name", None) == "postgresql"
@@ -82,7 +82,14 @@ CREATE_LOCATION_DOCS = {
 # Documentação para o endpoint GET / (listar locations)
 LIST_LOCATIONS_DOCS = {
     "summary": "Listar locais",
-    "description": "Retorna uma lista paginada de locais com suas coordenadas top e left.",
+    "description": (
+        "Retorna uma lista paginada de locais com suas coordenadas top e left. "
+        "Use `bbox=min_top,min_left,max_top,max_left` para buscar apenas os locais "
+        "visíveis em um viewport e `near=top,left` para ordenar pelos mais próximos "
+        "(os N mais próximos, com N = `limit`). Use `items=1,4,7` para filtrar por itens "
+        "de acessibilidade, com `match=all` (todos os itens, padrão) ou `match=any` "
+        "(qualquer um). Os filtros podem ser combinados."
+    ),
     "responses": {
         200: {
             "description": "Lista de locais retornada com sucesso",
@@ -109,6 +116,167 @@ LIST_LOCATIONS_DOCS = {
                 }
             },
         },
+        422: {
+            "description": "Parâmetros de consulta inválidos",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "detail": "Parâmetro 'bbox' deve conter 4 números separados por vírgula"
+                    }
+                }
+            },
+        },
+        500: {
+            "description": "Erro interno do servidor",
+            "content": {
+                "application/json": {"example": {"detail": "Erro interno do servidor"}}
+            },
+        },
+    },
+}
+
+# Documentação para o endpoint GET /map (snapshot do mapa)
+GET_LOCATIONS_MAP_DOCS = {
+    "summary": "Snapshot do mapa",
+    "description": (
+        "Retorna todos os locais em um único payload colunar, com id, nome, coordenadas "
+        "top e left, média de avaliação e IDs dos itens de acessibilidade. As listas são "
+        "alinhadas por índice. O snapshot fica em cache, já comprimido em gzip e brotli "
+        "(conforme o Accept-Encoding), e só é regenerado quando locais ou avaliações mudam."
+    ),
+    "responses": {
+        200: {
+            "description": "Snapshot do mapa retornado com sucesso",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "ids": [1, 2],
+                        "names": ["Shopping Center Norte", "Praça Central"],
+                        "tops": [45.2, 78.5],
+                        "lefts": [120.8, 95.3],
+                        "avg_ratings": [4.5, 0.0],
+                        "accessibility_item_ids": [[1, 3], []],
+                    }
+                }
+            },
+        },
+        500: {
+            "description": "Erro interno do servidor",
+            "content": {
+                "application/json": {"example": {"detail": "Erro interno do servidor"}}
+            },
+        },
+    },
+}
+
+# Documentação para o endpoint GET /search (busca textual)
+SEARCH_LOCATIONS_DOCS = {
+    "summary": "Buscar locais por texto",
+    "description": (
+        "Busca textual no nome e na descrição dos locais e no texto dos comentários "
+        "aprovados. Aceita a sintaxe de busca web (termos, \"frase exata\", -exclusão, "
+        "or) e retorna os locais ordenados por relevância, com paginação via skip e limit."
+    ),
+    "responses": {
+        200: {
+            "description": "Resultados da busca retornados com sucesso",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "locations": [
+                            {
+                                "id": 1,
+                                "name": "Shopping Center Norte",
+                                "description": "Shopping com rampas de acesso e elevadores",
+                                "top": 45.2,
+                                "left": 120.8,
+                                "rank": 0.6079,
+                            }
+                        ]
+                    }
+                }
+            },
+        },
+        422: {
+            "description": "Erro de validação",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "detail": [
+                            {
+                                "field": "filter",
+                                "message": "String should have at most 100 characters",
+                            }
+                        ]
+                    }
+                }
+            },
+        },
+        500: {
+            "description": "Erro interno do servidor",
+            "content": {
+                "application/json": {"example": {"detail": "Erro interno do servidor"}}
+            },
+        },
+    },
+}
+
+# Documentação para o endpoint GET /batch (leitura em lote)
+GET_LOCATIONS_BATCH_DOCS = {
+    "summary": "Obter vários locais por ID",
+    "description": (
+        "Retorna os detalhes de vários locais de uma vez (até 100 IDs separados por "
+        "vírgula), indexados pelo ID, no mesmo formato de GET /locations/{id}. Os "
+        "locais são lidos com poucas consultas e as imagens de todos eles são "
+        "assinadas em uma única chamada ao storage. IDs inexistentes são listados "
+        "em `not_found`."
+    ),
+    "responses": {
+        200: {
+            "description": "Locais retornados com sucesso",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "locations": {
+                            "1": {
+                                "id": 1,
+                                "name": "Shopping Center Norte",
+                                "description": "Grande centro comercial com acesso para cadeirantes",
+                                "images": [
+                                    {
+                                        "id": "6a9c217f-3d21-4a90-896a-2a2cb3dc53a8",
+                                        "url": "https://storage.example.com/image1.jpg",
+                                        "thumbnail_url": "https://storage.example.com/image1_thumb.webp",
+                                        "medium_url": "https://storage.example.com/image1_medium.webp",
+                                    }
+                                ],
+                                "avg_rating": 4.2,
+                                "top": 45.2,
+                                "left": 120.8,
+                                "accessibility_items": [
+                                    {
+                                        "id": 1,
+                                        "name": "Rampa de acesso",
+                                        "icon_url": "https://storage.example.com/ramp-icon.svg",
+                                    }
+                                ],
+                            }
+                        },
+                        "not_found": [7],
+                    }
+                }
+            },
+        },
+        422: {
+            "description": "Parâmetro 'ids' inválido",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "detail": "Parâmetro 'ids' deve conter até 100 IDs inteiros separados por vírgula"
+                    }
+                }
+            },
+        },
         500: {
             "description": "Erro interno do servidor",
             "content": {
@@ -135,6 +303,8 @@ GET_LOCATION_DOCS = {
                             {
                                 "id": "6a9c217f-3d21-4a90-896a-2a2cb3dc53a8",
                                 "url": "https://storage.example.com/image1.jpg",
+                                "thumbnail_url": "https://storage.example.com/image1_thumb.webp",
+                                "medium_url": "https://storage.example.com/image1_medium.webp",
                             },
                             {
                                 "id": "7b9d328g-4e32-5b01-9b7b-3b3dc4ed64b9",
@@ -309,6 +479,24 @@ CREATE_ACCESSIBILITY_ITEM_DOCS = {
                 }
             },
         },
+        413: {
+            "description": "Imagem acima do tamanho máximo",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "Imagem excede o tamanho máximo de 10 MB"}
+                }
+            },
+        },
+        415: {
+            "description": "Arquivo não é uma imagem JPEG, PNG, WebP ou HEIC (verificado pelo conteúdo)",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "detail": "Formato de arquivo não suportado. Envie imagens JPEG, PNG, WebP ou HEIC"
+                    }
+                }
+            },
+        },
         422: {
             "description": "Erro de validação",
             "content": {
@@ -404,3 +592,68 @@ GET_ACCESSIBILITY_ITEM_DOCS = {
         },
     },
 }
+
+
+# Documentação para o endpoint POST /{location_id}/accessibility-items/{item_id} (vincular item)
+LINK_ACCESSIBILITY_ITEM_DOCS = {
+    "summary": "Vincular item de acessibilidade a um local",
+    "description": "Vincula um item de acessibilidade existente a um local. A operação é idempotente.",
+    "responses": {
+        200: {
+            "description": "Item vinculado com sucesso",
+            "content": {
+                "application/json": {
+                    "example": {"location_id": 1, "accessibility_item_ids": [1, 4]}
+                }
+            },
+        },
+        401: {
+            "description": "Token de autenticação obrigatório",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "Token de autenticação obrigatório"}
+                }
+            },
+        },
+        404: {
+            "description": "Local ou item de acessibilidade não encontrado",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "Item de acessibilidade não encontrado"}
+                }
+            },
+        },
+    },
+}
+
+# Documentação para o endpoint DELETE /{location_id}/accessibility-items/{item_id} (desvincular item)
+UNLINK_ACCESSIBILITY_ITEM_DOCS = {
+    "summary": "Desvincular item de acessibilidade de um local",
+    "description": "Remove o vínculo entre um item de acessibilidade e um local.",
+    "responses": {
+        200: {
+            "description": "Item desvinculado com sucesso",
+            "content": {
+                "application/json": {
+                    "example": {"location_id": 1, "accessibility_item_ids": [4]}
+                }
+            },
+        },
+        401: {
+            "description": "Token de autenticação obrigatório",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "Token de autenticação obrigatório"}
+                }
+            },
+        },
+        404: {
+            "description": "Item não vinculado ao local",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "Item de acessibilidade não encontrado"}
+                }
+            },
+        },
+    },
+}
@@ -67,6 +67,16 @@ class LocationGenericException(LocationException):
         )
 
 
+class LocationQueryInvalidException(LocationException):
+    """Exceção lançada quando os parâmetros de consulta de locations são inválidos"""
+
+    def __init__(self, detail: str = "Parâmetros de consulta inválidos"):
+        super().__init__(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+            detail=detail,
+        )
+
+
 class AccessibilityItemNotFoundException(LocationException):
     """Exceção lançada quando um item de acessibilidade não é encontrado"""
 
@@ -0,0 +1,100 @@
+"""Índice bitmap em memória dos itens de acessibilidade de cada local.
+
+Para cada item de acessibilidade guarda um bitset (um `int` do Python) em que o
+bit N está ligado quando o local de ID N possui o item. Filtros como "locais
+com rampa E banheiro acessível" viram interseções de bitsets em vez de joins
+em `location_accessibility`.
+
+O índice é carregado da tabela associativa no primeiro uso, mantido pelo
+service quando itens são vinculados ou desvinculados e quando locais são
+removidos, e recarregado quando expira (ver `memory_index`).
+"""
+
+import asyncio
+from functools import reduce
+from operator import and_, or_
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from acesso_livre_api.src.locations import models
+from acesso_livre_api.src.locations.memory_index import ReloadableIndex
+
+
+def _bits_to_ids(bits: int) -> list[int]:
+    ids = []
+    while bits:
+        lowest = bits & -bits
+        ids.append(lowest.bit_length() - 1)
+        bits ^= lowest
+    return ids
+
+
+class AccessibilityItemBitmapIndex(ReloadableIndex):
+    """Bitset de locais por item de acessibilidade."""
+
+    _state_attrs = ("_bitmaps",)
+
+    def __init__(self):
+        super().__init__()
+        self._bitmaps: dict[int, int] = {}
+
+    def link(self, location_id: int, item_id: int) -> None:
+        self._record("link", location_id, item_id)
+        self._bitmaps[item_id] = self._bitmaps.get(item_id, 0) | (1 << location_id)
+
+    def unlink(self, location_id: int, item_id: int) -> None:
+        self._record("unlink", location_id, item_id)
+        self._unlink(location_id, item_id)
+
+    def _unlink(self, location_id: int, item_id: int) -> None:
+        bits = self._bitmaps.get(item_id, 0) & ~(1 << location_id)
+        if bits:
+            self._bitmaps[item_id] = bits
+        else:
+            self._bitmaps.pop(item_id, None)
+
+    def remove_location(self, location_id: int) -> None:
+        self._record("remove_location", location_id)
+        for item_id in list(self._bitmaps):
+            self._unlink(location_id, item_id)
+
+    def match_all(self, item_ids: list[int]) -> list[int]:
+        """IDs (ordenados) dos locais que possuem todos os itens."""
+        if not item_ids:
+            return []
+        bitmaps = [self._bitmaps.get(item_id, 0) for item_id in item_ids]
+        return _bits_to_ids(reduce(and_, bitmaps))
+
+    def match_any(self, item_ids: list[int]) -> list[int]:
+        """IDs (ordenados) dos locais que possuem ao menos um dos itens."""
+        bitmaps = [self._bitmaps.get(item_id, 0) for item_id in item_ids]
+        return _bits_to_ids(reduce(or_, bitmaps, 0))
+
+
+item_index = AccessibilityItemBitmapIndex()
+_load_lock = asyncio.Lock()
+
+
+async def ensure_item_index(db: AsyncSession) -> AccessibilityItemBitmapIndex:
+    """Carrega o índice a partir do banco se ainda não estiver carregado ou tiver expirado."""
+    if not item_index.stale:
+        return item_index
+
+    async with _load_lock:
+        if not item_index.stale:
+            return item_index
+
+        async def build() -> AccessibilityItemBitmapIndex:
+            association = models.location_accessibility_association
+            stmt = select(association.c.location_id, association.c.item_id)
+            result = await db.execute(stmt)
+
+            fresh = AccessibilityItemBitmapIndex()
+            for location_id, item_id in result.all():
+                fresh.link(location_id, item_id)
+            return fresh
+
+        await item_index.reload(build)
+
+    return item_index
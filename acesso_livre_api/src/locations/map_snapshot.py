@@ -0,0 +1,94 @@
+"""Snapshot em memória de todos os pins do mapa (GET /locations/map).
+
+O snapshot é montado com duas consultas (colunas dos locais e associações com
+itens de acessibilidade) e fica em cache até que um local, sua avaliação ou
+seus itens mudem. O TTL funciona apenas como rede de segurança para outros
+workers, que não recebem a invalidação feita neste processo.
+
+O cache guarda o snapshot já serializado e comprimido (gzip e brotli): o
+custo de serializar e comprimir é pago uma vez por preenchimento do cache, e
+cada requisição só escolhe os bytes da codificação aceita pelo cliente.
+"""
+
+import asyncio
+import logging
+
+from cachetools import TTLCache
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from acesso_livre_api.src.compression import PrecompressedBody
+from acesso_livre_api.src.locations import models, schemas
+
+logger = logging.getLogger(__name__)
+
+_SNAPSHOT_KEY = "map"
+
+# Cache do snapshot: um único item, TTL de 5 minutos
+_snapshot_cache: TTLCache = TTLCache(maxsize=1, ttl=300)
+_snapshot_lock = asyncio.Lock()
+
+# Incrementado a cada invalidação para descartar snapshots montados
+# concorrentemente com uma escrita
+_generation = 0
+
+
+def invalidate_map_snapshot() -> None:
+    """Descarta o snapshot atual; o próximo acesso monta um novo."""
+    global _generation
+    _generation += 1
+    _snapshot_cache.clear()
+
+
+async def _build_map_snapshot(db: AsyncSession) -> schemas.LocationMapResponse:
+    stmt_locations = select(
+        models.Location.id,
+        models.Location.name,
+        models.Location.top,
+        models.Location.left,
+        models.Location.avg_rating,
+    ).order_by(models.Location.id)
+    result_locations = await db.execute(stmt_locations)
+    rows = result_locations.all()
+
+    association = models.location_accessibility_association
+    stmt_items = select(association.c.location_id, association.c.item_id).order_by(
+        association.c.location_id, association.c.item_id
+    )
+    result_items = await db.execute(stmt_items)
+
+    items_by_location: dict[int, list[int]] = {}
+    for location_id, item_id in result_items.all():
+        items_by_location.setdefault(location_id, []).append(item_id)
+
+    return schemas.LocationMapResponse(
+        ids=[row.id for row in rows],
+        names=[row.name for row in rows],
+        tops=[row.top for row in rows],
+        lefts=[row.left for row in rows],
+        avg_ratings=[row.avg_rating or 0.0 for row in rows],
+        accessibility_item_ids=[items_by_location.get(row.id, []) for row in rows],
+    )
+
+
+async def get_map_snapshot(db: AsyncSession) -> PrecompressedBody:
+    """Retorna o snapshot do mapa, montando-o apenas em caso de cache miss."""
+    snapshot = _snapshot_cache.get(_SNAPSHOT_KEY)
+    if snapshot is not None:
+        return snapshot
+
+    async with _snapshot_lock:
+        # Double-check: outra task pode ter montado o snapshot enquanto esperávamos
+        snapshot = _snapshot_cache.get(_SNAPSHOT_KEY)
+        if snapshot is not None:
+            return snapshot
+
+        generation = _generation
+        locations_map = await _build_map_snapshot(db)
+        snapshot = PrecompressedBody.build(locations_map.model_dump_json().encode())
+
+        if generation == _generation:
+            _snapshot_cache[_SNAPSHOT_KEY] = snapshot
+            logger.debug("Snapshot do mapa montado com %s locais", len(locations_map.ids))
+
+        return snapshot
@@ -0,0 +1,76 @@
+"""Recarga dos índices em memória dos locais (espacial, de itens e de busca).
+
+Cada índice é montado a partir do banco em uma estrutura nova e trocado de
+uma vez quando a consulta termina, sem nunca ser esvaziado no meio do
+caminho. As escritas feitas pelo service enquanto a consulta está em
+andamento ficam registradas em um diário e são reaplicadas na estrutura nova
+antes da troca, para não se perderem caso a consulta tenha lido o banco antes
+delas.
+
+Como o snapshot do mapa, o índice expira depois de `INDEX_TTL` segundos. A
+manutenção incremental só vale para o processo que fez a escrita; o TTL é a
+rede de segurança para os outros workers.
+"""
+
+import time
+from collections.abc import Awaitable, Callable
+from typing import Self
+
+# Mesmo TTL do snapshot do mapa (5 minutos)
+INDEX_TTL = 300.0
+
+
+class ReloadableIndex:
+    """Base dos índices em memória recarregados periodicamente do banco.
+
+    As subclasses listam em `_state_attrs` os atributos com os dados do
+    índice e chamam `_record` no início de cada método que o altera.
+    """
+
+    _state_attrs: tuple[str, ...] = ()
+
+    def __init__(self, ttl: float = INDEX_TTL):
+        self.ttl = ttl
+        self.loaded = False
+        self._loaded_at = 0.0
+        self._journal: list[tuple[str, tuple]] | None = None
+
+    @property
+    def stale(self) -> bool:
+        """Indica se o índice ainda não foi carregado ou já expirou."""
+        return not self.loaded or time.monotonic() - self._loaded_at >= self.ttl
+
+    @property
+    def active(self) -> bool:
+        """Indica se o índice está carregado ou sendo carregado."""
+        return self.loaded or self._journal is not None
+
+    def clear(self) -> None:
+        """Esvazia o índice e marca-o como não carregado."""
+        for attr in self._state_attrs:
+            getattr(self, attr).clear()
+        self.loaded = False
+        self._loaded_at = 0.0
+        self._journal = None
+
+    def _record(self, method: str, *args) -> None:
+        if self._journal is not None:
+            self._journal.append((method, args))
+
+    async def reload(self, build: Callable[[], Awaitable[Self]]) -> None:
+        """Monta um índice novo com `build` e troca os dados deste por ele."""
+        self._journal = []
+        try:
+            fresh = await build()
+        except BaseException:
+            self._journal = None
+            raise
+
+        # Sem await daqui em diante: a troca é atômica para o event loop
+        for method, args in self._journal or ():
+            getattr(fresh, method)(*args)
+        for attr in self._state_attrs:
+            setattr(self, attr, getattr(fresh, attr))
+        self.loaded = True
+        self._loaded_at = time.monotonic()
+        self._journal = None
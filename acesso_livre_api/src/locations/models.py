@@ -1,6 +1,17 @@
 import datetime
 
-from sqlalchemy import JSON, Column, DateTime, Float, ForeignKey, Integer, String, Table
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Table,
+    UniqueConstraint,
+    text,
+)
 from sqlalchemy.orm import relationship
 
 from ..database import Base
@@ -14,19 +25,38 @@ location_accessibility_association = Table(
 )
 
 
+# Documento de busca full-text (Postgres): nome com peso A, descrição com peso B.
+# A mesma expressão é usada pelo índice GIN e pela consulta de busca.
+LOCATION_SEARCH_VECTOR = (
+    "(setweight(to_tsvector('portuguese', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('portuguese', coalesce(description, '')), 'B'))"
+)
+
+
 class Location(Base):
     __tablename__ = "locations"
+    __table_args__ = (
+        Index(
+            "ix_locations_search",
+            text(LOCATION_SEARCH_VECTOR),
+            postgresql_using="gin",
+        ).ddl_if(dialect="postgresql"),
+    )
 
     id = Column(Integer, primary_key=True)
     name = Column(String, nullable=False)
     description = Column(String, nullable=False)
-    images = Column(JSON, nullable=True)
     avg_rating = Column(Float, default=0.0, nullable=True)
     top = Column(Float, nullable=False)
     left = Column(Float, nullable=False)
     created_at = Column(DateTime, default=datetime.datetime.utcnow)
+    # Também é atualizado ao vincular/desvincular itens de acessibilidade, para
+    # a sincronização incremental (GET /sync)
     updated_at = Column(
-        DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow
+        DateTime,
+        default=datetime.datetime.utcnow,
+        onupdate=datetime.datetime.utcnow,
+        index=True,
     )
 
     # Relacionamento many-to-many com AccessibilityItem
@@ -40,12 +70,44 @@ class Location(Base):
     comments = relationship("Comment", back_populates="location")
 
 
+class LocationImage(Base):
+    """Imagem da galeria de um local, na ordem em que foi incluída.
+
+    `comment_id` indica o comentário aprovado de onde a imagem veio: a linha
+    compartilha a referência do comentário ao objeto no storage e é removida
+    junto com ele. Linhas sem comentário de origem (galerias anteriores à
+    tabela) são liberadas ao excluir o local.
+    """
+
+    __tablename__ = "location_images"
+    __table_args__ = (
+        UniqueConstraint("location_id", "path", name="uq_location_images_path"),
+        Index("ix_location_images_location_position", "location_id", "position"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    location_id = Column(
+        Integer, ForeignKey("locations.id", ondelete="CASCADE"), nullable=False
+    )
+    path = Column(String, nullable=False)
+    position = Column(Integer, nullable=False)
+    comment_id = Column(
+        Integer, ForeignKey("comments.id", ondelete="CASCADE"), nullable=True, index=True
+    )
+
+
 class AccessibilityItem(Base):
     __tablename__ = "accessibility_items"
 
     id = Column(Integer, primary_key=True)
     name = Column(String, nullable=False)
     icon_url = Column(String)
+    updated_at = Column(
+        DateTime,
+        default=datetime.datetime.utcnow,
+        onupdate=datetime.datetime.utcnow,
+        index=True,
+    )
 
     # Relacionamento many-to-many com Location
     locations = relationship(
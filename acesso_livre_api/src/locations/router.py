@@ -1,9 +1,10 @@
-from fastapi import APIRouter, Depends, Path, Query, File, UploadFile, Form
+from fastapi import APIRouter, Depends, Path, Query, File, UploadFile, Form, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from acesso_livre_api.src.admins import dependencies
 from acesso_livre_api.src.database import get_db
 from acesso_livre_api.src.locations import docs, schemas, service
+from acesso_livre_api.src.responses import ORJSONResponse
 from acesso_livre_api.storage import upload_image
 
 from ..func_log import log_message
@@ -38,7 +39,7 @@ async def create_accessibility_item(
     db: AsyncSession = Depends(get_db),
 ):
     # Fazer upload para o storage
-    icon_url = await upload_image.upload_image(image)
+    icon_url = await upload_image.upload_image(image, with_variants=False, db=db)
 
     # Criar o item com o path
     item_data = schemas.AccessibilityItemCreate(name=name, icon_url=icon_url)
@@ -71,17 +72,128 @@ async def get_accessibility_item_by_id(
     return item
 
 
+@router.post(
+    "/{location_id}/accessibility-items/{item_id}",
+    response_model=schemas.LocationAccessibilityItemsResponse,
+    **docs.LINK_ACCESSIBILITY_ITEM_DOCS,
+)
+@dependencies.require_auth
+async def add_accessibility_item_to_location(
+    location_id: int = Path(..., gt=0),
+    item_id: int = Path(..., gt=0),
+    authenticated_user: bool = dependencies.authenticated_user,
+    db: AsyncSession = Depends(get_db),
+):
+    result = await service.add_accessibility_item_to_location(
+        db=db, location_id=location_id, item_id=item_id
+    )
+    log_message(f"Item de acessibilidade {item_id} vinculado à localização {location_id}", level="info", logger_name="acesso_livre_api")
+    return result
+
+
+@router.delete(
+    "/{location_id}/accessibility-items/{item_id}",
+    response_model=schemas.LocationAccessibilityItemsResponse,
+    **docs.UNLINK_ACCESSIBILITY_ITEM_DOCS,
+)
+@dependencies.require_auth
+async def remove_accessibility_item_from_location(
+    location_id: int = Path(..., gt=0),
+    item_id: int = Path(..., gt=0),
+    authenticated_user: bool = dependencies.authenticated_user,
+    db: AsyncSession = Depends(get_db),
+):
+    result = await service.remove_accessibility_item_from_location(
+        db=db, location_id=location_id, item_id=item_id
+    )
+    log_message(f"Item de acessibilidade {item_id} desvinculado da localização {location_id}", level="info", logger_name="acesso_livre_api")
+    return result
+
+
 @router.get("/", response_model=schemas.LocationListResponse, **docs.LIST_LOCATIONS_DOCS)
 async def list_all_locations(
+    skip: int = Query(0, ge=0, description="Número de registros a pular"),
+    limit: int = Query(
+        20, ge=1, le=100, description="Número máximo de registros a retornar"
+    ),
+    bbox: str | None = Query(
+        None,
+        description="Viewport no formato min_top,min_left,max_top,max_left",
+    ),
+    near: str | None = Query(
+        None,
+        description="Ponto top,left; retorna os locais mais próximos primeiro",
+    ),
+    items: str | None = Query(
+        None,
+        description="IDs dos itens de acessibilidade separados por vírgula (ex: 1,4,7)",
+    ),
+    match: str = Query(
+        "all",
+        pattern="^(all|any)$",
+        description="'all' exige todos os itens, 'any' aceita qualquer um deles",
+    ),
+    db: AsyncSession = Depends(get_db),
+):
+    locations = await service.get_all_locations(
+        db=db, skip=skip, limit=limit, bbox=bbox, near=near, items=items, match=match
+    )
+    log_message(
+        f"Recuperadas localizações: skip={skip}, limit={limit}, bbox={bbox}, near={near}, "
+        f"items={items}, match={match}",
+        level="info",
+        logger_name="acesso_livre_api",
+    )
+    return ORJSONResponse(schemas.LocationListResponse(locations=locations))
+
+
+@router.get("/map", response_model=schemas.LocationMapResponse, **docs.GET_LOCATIONS_MAP_DOCS)
+async def get_locations_map(request: Request, db: AsyncSession = Depends(get_db)):
+    snapshot = await service.get_locations_map(db=db)
+    log_message("Recuperado snapshot do mapa", level="info", logger_name="acesso_livre_api")
+    # Snapshot já serializado e comprimido no cache: só escolhe a codificação
+    return snapshot.response(request.headers.get("accept-encoding"))
+
+
+@router.get(
+    "/search", response_model=schemas.LocationSearchResponse, **docs.SEARCH_LOCATIONS_DOCS
+)
+async def search_locations(
+    filter: str = Query(
+        ..., min_length=1, max_length=100, description="Texto a ser buscado"
+    ),
     skip: int = Query(0, ge=0, description="Número de registros a pular"),
     limit: int = Query(
         20, ge=1, le=100, description="Número máximo de registros a retornar"
     ),
     db: AsyncSession = Depends(get_db),
 ):
-    locations = await service.get_all_locations(db=db, skip=skip, limit=limit)
-    log_message(f"Recuperadas localizações: skip={skip}, limit={limit}", level="info", logger_name="acesso_livre_api")
-    return schemas.LocationListResponse(locations=locations)
+    locations = await service.search_locations(db=db, query=filter, skip=skip, limit=limit)
+    log_message(
+        f"Busca de localizações: filter={filter}, skip={skip}, limit={limit}",
+        level="info",
+        logger_name="acesso_livre_api",
+    )
+    return ORJSONResponse(schemas.LocationSearchResponse(locations=locations))
+
+
+@router.get(
+    "/batch", response_model=schemas.LocationBatchResponse, **docs.GET_LOCATIONS_BATCH_DOCS
+)
+async def get_locations_batch(
+    ids: str = Query(
+        ...,
+        description="IDs dos locais separados por vírgula (ex: 1,4,7), até 100",
+    ),
+    db: AsyncSession = Depends(get_db),
+):
+    batch = await service.get_locations_batch(db=db, ids=ids)
+    log_message(
+        f"Recuperadas {len(batch.locations)} localizações em lote: ids={ids}",
+        level="info",
+        logger_name="acesso_livre_api",
+    )
+    return ORJSONResponse(batch)
 
 
 @router.get(
@@ -94,19 +206,19 @@ async def get_location_by_id(
     skip: int = Query(
         0,
         ge=0,
-        description="Número de comentários a pular (não retornado, usado apenas para consolidar imagens)",
+        deprecated=True,
+        description="Ignorado: a galeria do local já inclui as imagens dos comentários aprovados",
     ),
     limit: int = Query(
         20,
         ge=1,
         le=100,
-        description="Número máximo de comentários a considerar para consolidar imagens",
+        deprecated=True,
+        description="Ignorado: a galeria do local já inclui as imagens dos comentários aprovados",
     ),
     db: AsyncSession = Depends(get_db),
 ):
-    location = await service.get_location_by_id(
-        db=db, location_id=location_id, skip=skip, limit=limit
-    )
+    location = await service.get_location_by_id(db=db, location_id=location_id)
     log_message(f"Recuperada localização com ID {location_id}", level="info", logger_name="acesso_livre_api")
     return location
 
@@ -141,6 +253,6 @@ async def delete_location(
     authenticated_user: bool = dependencies.authenticated_user,
     db: AsyncSession = Depends(get_db),
 ):
-    result = await service.delete_location(db=db, location_id=location_id)
+    await service.delete_location(db=db, location_id=location_id)
     log_message(f"Localização com ID {location_id} deletada", level="info", logger_name="acesso_livre_api")
-    return result
+    return schemas.LocationDeleteResponse(message="Local deletado com sucesso")
@@ -1,12 +1,18 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel, ConfigDict, Field
 
 
 class ImageResponse(BaseModel):
-    """Schema para resposta de imagem."""
+    """Schema para resposta de imagem.
+
+    `thumbnail_url` e `medium_url` apontam para as variantes WebP geradas no
+    upload; são nulas para imagens enviadas antes do pipeline de variantes.
+    """
     id: str
     url: str
+    thumbnail_url: Optional[str] = None
+    medium_url: Optional[str] = None
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -87,6 +93,13 @@ class AccessibilityItemResponseList(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class LocationAccessibilityItemsResponse(BaseModel):
+    """Schema com os IDs dos itens de acessibilidade vinculados a um local."""
+
+    location_id: int
+    accessibility_item_ids: List[int] = Field(default=[])
+
+
 class LocationListResponse(BaseModel):
     """Schema para resposta da listagem de locations (GET /locations)."""
 
@@ -95,6 +108,35 @@ class LocationListResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class LocationSearchResult(LocationBase):
+    """Schema de um local encontrado pela busca textual, com sua relevância."""
+
+    rank: float = Field(default=0.0, ge=0.0)
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class LocationSearchResponse(BaseModel):
+    """Schema para resposta da busca textual de locations (GET /locations/search)."""
+
+    locations: List[LocationSearchResult] = Field(default=[])
+
+
+class LocationMapResponse(BaseModel):
+    """Schema colunar com todos os pins do mapa (GET /locations/map).
+
+    Cada lista é alinhada por índice: o i-ésimo elemento de cada coluna
+    pertence ao mesmo local.
+    """
+
+    ids: List[int] = Field(default=[])
+    names: List[str] = Field(default=[])
+    tops: List[float] = Field(default=[])
+    lefts: List[float] = Field(default=[])
+    avg_ratings: List[float] = Field(default=[])
+    accessibility_item_ids: List[List[int]] = Field(default=[])
+
+
 class LocationDetailResponse(LocationBase):
     """Schema para resposta dos detalhes de um location específico (GET /locations/{id})."""
 
@@ -105,6 +147,20 @@ class LocationDetailResponse(LocationBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+# Limite de IDs por requisição de leitura em lote (GET /locations/batch)
+MAX_BATCH_LOCATION_IDS = 100
+
+
+class LocationBatchResponse(BaseModel):
+    """Schema para resposta da leitura em lote (GET /locations/batch).
+
+    `locations` é indexado pelo ID do local; IDs inexistentes ficam em `not_found`.
+    """
+
+    locations: Dict[int, LocationDetailResponse] = Field(default={})
+    not_found: List[int] = Field(default=[])
+
+
 class LocationsQueryParams(BaseModel):
     """Schema para query parameters da listagem de locations."""
 
@@ -0,0 +1,192 @@
+"""Índice invertido em memória para a busca textual de locais.
+
+É o fallback da busca full-text do Postgres (tsvector + GIN) para o SQLite
+usado nos testes e em desenvolvimento. Indexa o nome e a descrição de cada
+local e o texto dos comentários aprovados; um local é retornado quando seu
+próprio texto ou algum de seus comentários aprovados contém todos os termos
+da busca, como no `websearch_to_tsquery` do Postgres.
+
+O ranking é um TF-IDF simples, com o nome do local pesando mais que a
+descrição e que os comentários.
+
+O índice só é mantido pelos services depois de começar a ser carregado (no
+Postgres a busca não o usa) e é recarregado quando expira (ver
+`memory_index`).
+"""
+
+import asyncio
+import math
+import re
+import unicodedata
+from collections import Counter, defaultdict
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from acesso_livre_api.src.comments import models as comment_models
+from acesso_livre_api.src.locations import models
+from acesso_livre_api.src.locations.memory_index import ReloadableIndex
+
+# Pesos por campo, equivalentes aos pesos A/B/D do setweight no Postgres
+NAME_WEIGHT = 1.0
+DESCRIPTION_WEIGHT = 0.4
+COMMENT_WEIGHT = 0.1
+
+_STOPWORDS = frozenset(
+    "a ao aos as com da das de do dos e em na nas no nos o os ou para pela pelas "
+    "pelo pelos por que se um uma umas uns".split()
+)
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text: str | None) -> list[str]:
+    """Normaliza o texto (minúsculas, sem acentos) e extrai os termos."""
+    if not text:
+        return []
+
+    normalized = unicodedata.normalize("NFKD", text.lower())
+    normalized = "".join(c for c in normalized if not unicodedata.combining(c))
+
+    terms = []
+    for token in _TOKEN_RE.findall(normalized):
+        if token in _STOPWORDS:
+            continue
+        # Stemming mínimo: plural regular ("rampas" -> "rampa")
+        if len(token) > 3 and token.endswith("s"):
+            token = token[:-1]
+        terms.append(token)
+    return terms
+
+
+class InvertedIndex(ReloadableIndex):
+    """Índice invertido de termos para documentos de locais e comentários."""
+
+    _state_attrs = ("_postings", "_documents")
+
+    def __init__(self):
+        super().__init__()
+        self._postings: dict[str, dict[tuple[str, int], float]] = defaultdict(dict)
+        self._documents: dict[tuple[str, int], tuple[int, Counter]] = {}
+
+    def _add(
+        self, key: tuple[str, int], location_id: int, fields: list[tuple[str, float]]
+    ):
+        self._remove(key)
+
+        weights: Counter = Counter()
+        for text, weight in fields:
+            for term in tokenize(text):
+                weights[term] += weight
+        if not weights:
+            return
+
+        self._documents[key] = (location_id, weights)
+        for term, weight in weights.items():
+            self._postings[term][key] = weight
+
+    def _remove(self, key: tuple[str, int]) -> None:
+        document = self._documents.pop(key, None)
+        if document is None:
+            return
+
+        for term in document[1]:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(key, None)
+                if not postings:
+                    del self._postings[term]
+
+    def upsert_location(
+        self, location_id: int, name: str, description: str | None
+    ) -> None:
+        self._record("upsert_location", location_id, name, description)
+        self._add(
+            ("location", location_id),
+            location_id,
+            [(name, NAME_WEIGHT), (description, DESCRIPTION_WEIGHT)],
+        )
+
+    def remove_location(self, location_id: int) -> None:
+        """Remove o local e todos os comentários associados a ele."""
+        self._record("remove_location", location_id)
+        keys = [
+            key
+            for key, (doc_location, _) in self._documents.items()
+            if doc_location == location_id
+        ]
+        for key in keys:
+            self._remove(key)
+
+    def upsert_comment(self, comment_id: int, location_id: int, text: str) -> None:
+        self._record("upsert_comment", comment_id, location_id, text)
+        self._add(("comment", comment_id), location_id, [(text, COMMENT_WEIGHT)])
+
+    def remove_comment(self, comment_id: int) -> None:
+        self._record("remove_comment", comment_id)
+        self._remove(("comment", comment_id))
+
+    def search(self, query: str) -> list[tuple[int, float]]:
+        """Retorna (location_id, score) dos locais encontrados, do mais relevante ao menos."""
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+
+        postings = [self._postings.get(term) for term in terms]
+        if any(not p for p in postings):
+            return []
+
+        total_documents = len(self._documents)
+        # Começa pelo termo mais raro para reduzir a interseção
+        postings.sort(key=len)
+        matching = set(postings[0]).intersection(*postings[1:])
+
+        scores: dict[int, float] = defaultdict(float)
+        for key in matching:
+            location_id = self._documents[key][0]
+            for term_postings in postings:
+                idf = math.log(1 + total_documents / len(term_postings))
+                scores[location_id] += term_postings[key] * idf
+
+        return sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+
+
+search_index = InvertedIndex()
+_load_lock = asyncio.Lock()
+
+
+async def ensure_search_index(db: AsyncSession) -> InvertedIndex:
+    """Carrega o índice a partir do banco se ainda não estiver carregado ou tiver expirado."""
+    if not search_index.stale:
+        return search_index
+
+    async with _load_lock:
+        if not search_index.stale:
+            return search_index
+
+        async def build() -> InvertedIndex:
+            result_locations = await db.execute(
+                select(
+                    models.Location.id, models.Location.name, models.Location.description
+                )
+            )
+            result_comments = await db.execute(
+                select(
+                    comment_models.Comment.id,
+                    comment_models.Comment.location_id,
+                    comment_models.Comment.comment,
+                ).where(
+                    comment_models.Comment.status == "approved",
+                    comment_models.Comment.location_id.isnot(None),
+                )
+            )
+
+            fresh = InvertedIndex()
+            for location_id, name, description in result_locations.all():
+                fresh.upsert_location(location_id, name, description)
+            for comment_id, location_id, text in result_comments.all():
+                fresh.upsert_comment(comment_id, location_id, text)
+            return fresh
+
+        await search_index.reload(build)
+
+    return search_index
@@ -1,13 +1,40 @@
+import datetime
 import logging
-
-from sqlalchemy import exc as sqlalchemy_exc, select
+import math
+from collections.abc import Iterable, Mapping
+
+from sqlalchemy import (
+    Float,
+    cast,
+    delete,
+    exc as sqlalchemy_exc,
+    func,
+    insert,
+    select,
+    text,
+    update,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 from acesso_livre_api.src.comments import models as comment_models
+from acesso_livre_api.src.database import is_postgres
 from acesso_livre_api.src.locations import exceptions, models, schemas
-from acesso_livre_api.src.comments.utils import get_images_with_ids
-from acesso_livre_api.storage.get_url import get_signed_url, get_signed_urls
-from acesso_livre_api.storage.delete_image import delete_images
+from acesso_livre_api.src.locations.item_index import ensure_item_index, item_index
+from acesso_livre_api.src.locations.spatial_index import ensure_spatial_index, spatial_index
+from acesso_livre_api.src.locations.search_index import ensure_search_index, search_index
+from acesso_livre_api.src.locations.map_snapshot import (
+    get_map_snapshot,
+    invalidate_map_snapshot,
+)
+from acesso_livre_api.src.comments.utils import (
+    build_images,
+    get_images_with_ids,
+    sign_image_paths,
+)
+from acesso_livre_api.src.sync.models import SyncEntity
+from acesso_livre_api.src.sync.service import record_tombstones
+from acesso_livre_api.storage.get_url import get_icon_url, get_icon_urls
+from acesso_livre_api.storage.dedup import release_objects
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +47,10 @@ async def create_location(db: AsyncSession, location: schemas.LocationCreate):
         db.add(db_location)
         await db.commit()
         await db.refresh(db_location)
+        spatial_index.upsert(db_location.id, db_location.top, db_location.left)
+        if search_index.active:
+            search_index.upsert_location(db_location.id, db_location.name, db_location.description)
+        invalidate_map_snapshot()
 
         return db_location
 
@@ -33,18 +64,200 @@ async def create_location(db: AsyncSession, location: schemas.LocationCreate):
         raise exceptions.LocationCreateException()
 
 
-async def get_all_locations(db: AsyncSession, skip: int = 0, limit: int = 20):
+# Maior valor absoluto aceito para top/left nos filtros de bbox e near
+MAX_QUERY_COORDINATE = 1_000_000.0
+
+
+def _parse_coordinates(value: str, expected: int, param: str) -> list[float]:
     try:
-        stmt = select(models.Location).offset(skip).limit(limit)
-        result = await db.execute(stmt)
-        locations = result.scalars().all()
-        return locations
+        coordinates = [float(part) for part in value.split(",")]
+    except ValueError:
+        raise exceptions.LocationQueryInvalidException(
+            f"Parâmetro '{param}' deve conter {expected} números separados por vírgula"
+        )
+    if len(coordinates) != expected or not all(math.isfinite(c) for c in coordinates):
+        raise exceptions.LocationQueryInvalidException(
+            f"Parâmetro '{param}' deve conter {expected} números separados por vírgula"
+        )
+    if any(abs(c) > MAX_QUERY_COORDINATE for c in coordinates):
+        raise exceptions.LocationQueryInvalidException(
+            f"Parâmetro '{param}' deve conter coordenadas entre "
+            f"-{MAX_QUERY_COORDINATE:g} e {MAX_QUERY_COORDINATE:g}"
+        )
+    return coordinates
+
+
+# Colunas de `LocationBase`: as listagens leem só elas, como linhas (RowMapping)
+# imutáveis, sem montar entidades ORM nem passar pelo identity map.
+_LOCATION_LIST_COLUMNS = (
+    models.Location.id,
+    models.Location.name,
+    models.Location.description,
+    models.Location.top,
+    models.Location.left,
+)
+
+
+async def _get_locations_by_ids(db: AsyncSession, location_ids: list[int]):
+    """Busca locais pelos IDs preservando a ordem recebida."""
+    if not location_ids:
+        return []
+
+    stmt = select(*_LOCATION_LIST_COLUMNS).where(models.Location.id.in_(location_ids))
+    result = await db.execute(stmt)
+    locations_by_id = {row["id"]: row for row in result.mappings().all()}
+    return [locations_by_id[i] for i in location_ids if i in locations_by_id]
+
+
+def _parse_item_ids(value: str) -> list[int]:
+    try:
+        item_ids = [int(part) for part in value.split(",") if part.strip()]
+    except ValueError:
+        item_ids = []
+    if not item_ids:
+        raise exceptions.LocationQueryInvalidException(
+            "Parâmetro 'items' deve conter IDs inteiros separados por vírgula"
+        )
+    return item_ids
+
+
+async def get_all_locations(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 20,
+    bbox: str | None = None,
+    near: str | None = None,
+    items: str | None = None,
+    match: str = "all",
+):
+    """Lista locais, opcionalmente filtrando por viewport, proximidade e itens.
 
+    - bbox: "min_top,min_left,max_top,max_left" — locais dentro do retângulo.
+    - near: "top,left" — locais ordenados do mais próximo ao mais distante.
+    - items: "1,4,7" — locais com todos (match="all") ou algum (match="any")
+      dos itens de acessibilidade.
+    """
+    try:
+        if bbox is None and near is None and items is None:
+            stmt = select(*_LOCATION_LIST_COLUMNS).offset(skip).limit(limit)
+            result = await db.execute(stmt)
+            return result.mappings().all()
+
+        # IDs ordenados que satisfazem os filtros; None significa "sem filtro"
+        candidates = None
+
+        if items is not None:
+            item_ids = _parse_item_ids(items)
+            bitmap_index = await ensure_item_index(db)
+            if match == "any":
+                candidates = bitmap_index.match_any(item_ids)
+            else:
+                candidates = bitmap_index.match_all(item_ids)
+
+        if bbox is not None or near is not None:
+            index = await ensure_spatial_index(db)
+
+            if bbox is not None:
+                min_top, min_left, max_top, max_left = _parse_coordinates(bbox, 4, "bbox")
+                if min_top > max_top or min_left > max_left:
+                    raise exceptions.LocationQueryInvalidException(
+                        "Parâmetro 'bbox' deve estar no formato min_top,min_left,max_top,max_left"
+                    )
+                in_bbox = index.query_bbox(min_top, min_left, max_top, max_left)
+                if candidates is None:
+                    candidates = in_bbox
+                else:
+                    allowed = set(candidates)
+                    candidates = [i for i in in_bbox if i in allowed]
+
+            if near is not None:
+                top, left = _parse_coordinates(near, 2, "near")
+                location_ids = index.nearest(
+                    top,
+                    left,
+                    skip + limit,
+                    candidates=set(candidates) if candidates is not None else None,
+                )[skip:]
+                return await _get_locations_by_ids(db, location_ids)
+
+        return await _get_locations_by_ids(db, candidates[skip : skip + limit])
+
+    except exceptions.LocationQueryInvalidException:
+        raise
     except Exception as e:
         logger.error(f"Erro ao obter localizações: {str(e)}")
         raise exceptions.LocationGenericException()
 
 
+async def get_locations_map(db: AsyncSession):
+    try:
+        return await get_map_snapshot(db)
+
+    except Exception as e:
+        logger.error("Erro ao obter snapshot do mapa: %s", str(e))
+        raise exceptions.LocationGenericException()
+
+
+_SEARCH_LOCATIONS_SQL = text(
+    f"""
+    WITH q AS (
+        SELECT websearch_to_tsquery('portuguese', :query) AS query
+    ),
+    matches AS (
+        SELECT id AS location_id, ts_rank({models.LOCATION_SEARCH_VECTOR}, q.query) AS rank
+        FROM locations, q
+        WHERE {models.LOCATION_SEARCH_VECTOR} @@ q.query
+        UNION ALL
+        -- Sem setweight, o texto dos comentários tem peso D (0.1) no ts_rank
+        SELECT location_id, ts_rank({comment_models.COMMENT_SEARCH_VECTOR}, q.query)
+        FROM comments, q
+        WHERE status = 'approved'
+          AND location_id IS NOT NULL
+          AND {comment_models.COMMENT_SEARCH_VECTOR} @@ q.query
+    ),
+    ranked AS (
+        SELECT location_id, SUM(rank) AS rank
+        FROM matches
+        GROUP BY location_id
+    )
+    SELECT l.id, l.name, l.description, l.top, l."left", ranked.rank
+    FROM ranked
+    JOIN locations l ON l.id = ranked.location_id
+    ORDER BY ranked.rank DESC, l.id
+    OFFSET :skip LIMIT :limit
+    """
+)
+
+
+async def search_locations(db: AsyncSession, query: str, skip: int = 0, limit: int = 20):
+    """Busca textual em nome, descrição e comentários aprovados dos locais.
+
+    No Postgres usa tsvector com índices GIN (configuração 'portuguese'); nos
+    demais bancos usa o índice invertido em memória. Resultados ordenados por
+    relevância.
+    """
+    try:
+        if is_postgres(db):
+            result = await db.execute(
+                _SEARCH_LOCATIONS_SQL,
+                {"query": query, "skip": skip, "limit": limit},
+            )
+            return [schemas.LocationSearchResult(**row) for row in result.mappings().all()]
+
+        index = await ensure_search_index(db)
+        ranked = index.search(query)[skip : skip + limit]
+        ranks = dict(ranked)
+        locations = await _get_locations_by_ids(db, [location_id for location_id, _ in ranked])
+        return [
+            schemas.LocationSearchResult(**location, rank=ranks[location["id"]])
+            for location in locations
+        ]
+
+    except Exception as e:
+        logger.error("Erro ao buscar localizações por '%s': %s", query, str(e))
+        raise exceptions.LocationGenericException()
+
+
 async def create_accessibility_item(
     db: AsyncSession, item: schemas.AccessibilityItemCreate
 ):
@@ -73,13 +286,14 @@ async def get_all_accessibility_items(db: AsyncSession):
         items = result.scalars().all()
 
         icon_urls = [item.icon_url for item in items if item.icon_url]
-        get_signed_urls_list = await get_signed_urls(icon_urls)
-        
+        # Ícones são públicos: URLs montadas localmente, sem assinatura (ver get_icon_urls)
+        item_urls = await get_icon_urls(icon_urls)
+
         # Filter out None values (failed signed URLs)
-        valid_signed_urls = [url for url in get_signed_urls_list if url is not None]
+        valid_urls = [url for url in item_urls if url is not None]
 
         return schemas.AccessibilityItemResponseList(
-            accessibility_items=valid_signed_urls
+            accessibility_items=valid_urls
         )
 
     except Exception as e:
@@ -98,8 +312,8 @@ async def get_accessibility_item_by_id(db: AsyncSession, item_id: int):
         if not item:
             raise exceptions.LocationNotFoundException()
 
-        # get_signed_url now returns None on failure
-        image_url = await get_signed_url(item.icon_url) if item.icon_url else None
+        # get_icon_url returns None on failure
+        image_url = await get_icon_url(item.icon_url) if item.icon_url else None
         return schemas.AccessibilityItemResponse(
             id=item.id, name=item.name, icon_url=image_url or ""
         )
@@ -109,87 +323,261 @@ async def get_accessibility_item_by_id(db: AsyncSession, item_id: int):
         raise exceptions.LocationGenericException()
 
 
-async def get_location_by_id(
-    db: AsyncSession, location_id: int, skip: int = 0, limit: int = 20
+async def add_accessibility_item_to_location(
+    db: AsyncSession, location_id: int, item_id: int
 ):
     try:
-        stmt = (
-            select(models.Location)
-            .options(selectinload(models.Location.accessibility_items))
-            .where(models.Location.id == location_id)
+        location_exists = await db.scalar(
+            select(models.Location.id).where(models.Location.id == location_id)
         )
-        result = await db.execute(stmt)
-        location = result.unique().scalar_one_or_none()
-
-        if not location:
+        if not location_exists:
             raise exceptions.LocationNotFoundException()
 
-        await db.refresh(location, attribute_names=["images", "avg_rating"])
-        location_images_raw = list(location.images) if location.images else []
-        location_avg_rating = location.avg_rating if location.avg_rating else 0.0
-
-        stmt_comments = (
-            select(comment_models.Comment)
-            .where(
-                comment_models.Comment.location_id == location_id,
-                comment_models.Comment.status == "approved",
+        item_exists = await db.scalar(
+            select(models.AccessibilityItem.id).where(models.AccessibilityItem.id == item_id)
+        )
+        if not item_exists:
+            raise exceptions.AccessibilityItemNotFoundException()
+
+        association = models.location_accessibility_association
+        already_linked = await db.scalar(
+            select(association.c.item_id).where(
+                association.c.location_id == location_id,
+                association.c.item_id == item_id,
             )
-            .order_by(comment_models.Comment.created_at.desc())
-            .offset(skip)
-            .limit(limit)
         )
-        result_comments = await db.execute(stmt_comments)
-        comments = result_comments.scalars().all()
+        if not already_linked:
+            await db.execute(
+                insert(association).values(location_id=location_id, item_id=item_id)
+            )
+            await _touch_location(db, location_id)
+            await db.commit()
 
-        all_location_images = list(location_images_raw)
+        item_index.link(location_id, item_id)
+        invalidate_map_snapshot()
 
-        for comment in comments:
-            await db.refresh(comment, attribute_names=["images"])
-            comment_images_raw = list(comment.images) if comment.images else []
+        return await _get_location_item_ids(db, location_id)
+
+    except (exceptions.LocationNotFoundException, exceptions.AccessibilityItemNotFoundException):
+        raise
+    except Exception as e:
+        logger.error(
+            "Erro ao vincular item %s à localização %s: %s", item_id, location_id, str(e)
+        )
+        await db.rollback()
+        raise exceptions.LocationUpdateException()
 
-            for img in comment_images_raw:
-                if img not in all_location_images:
-                    all_location_images.append(img)
 
-        location_images_with_ids = (
-            await get_images_with_ids(all_location_images) if all_location_images else []
+async def remove_accessibility_item_from_location(
+    db: AsyncSession, location_id: int, item_id: int
+):
+    try:
+        association = models.location_accessibility_association
+        result = await db.execute(
+            delete(association).where(
+                association.c.location_id == location_id,
+                association.c.item_id == item_id,
+            )
         )
+        if result.rowcount == 0:
+            raise exceptions.AccessibilityItemNotFoundException()
+        await _touch_location(db, location_id)
+        await db.commit()
 
-        accessibility_items_icons = [
-            item.icon_url for item in location.accessibility_items if item.icon_url
-        ]
-        accessibility_items_signed_urls = (
-            await get_signed_urls(accessibility_items_icons)
-            if accessibility_items_icons
-            else []
+        item_index.unlink(location_id, item_id)
+        invalidate_map_snapshot()
+
+        return await _get_location_item_ids(db, location_id)
+
+    except exceptions.AccessibilityItemNotFoundException:
+        raise
+    except Exception as e:
+        logger.error(
+            "Erro ao desvincular item %s da localização %s: %s", item_id, location_id, str(e)
         )
+        await db.rollback()
+        raise exceptions.LocationUpdateException()
 
-        # Criar um mapping de icon_url para signed_url (ignorar None)
-        icon_url_mapping = {
-            url: signed_url
-            for url, signed_url in zip(accessibility_items_icons, accessibility_items_signed_urls)
-            if signed_url is not None
-        }
 
-        response_data = schemas.LocationDetailResponse(
-            id=location.id,
-            name=location.name,
-            description=location.description,
-            top=location.top,
-            left=location.left,
-            images=location_images_with_ids,
-            avg_rating=location_avg_rating,
-            accessibility_items=[
-                schemas.AccessibilityItemResponse(
-                    id=item.id,
-                    name=item.name,
-                    icon_url=icon_url_mapping.get(item.icon_url, ""),
-                )
-                for item in location.accessibility_items
-            ],
+async def _touch_location(db: AsyncSession, location_id: int) -> None:
+    """Atualiza `updated_at` do local quando só as associações mudaram (ver GET /sync)."""
+    await db.execute(
+        update(models.Location)
+        .where(models.Location.id == location_id)
+        .values(updated_at=datetime.datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def _get_location_item_ids(db: AsyncSession, location_id: int):
+    association = models.location_accessibility_association
+    result = await db.execute(
+        select(association.c.item_id)
+        .where(association.c.location_id == location_id)
+        .order_by(association.c.item_id)
+    )
+    return schemas.LocationAccessibilityItemsResponse(
+        location_id=location_id, accessibility_item_ids=list(result.scalars().all())
+    )
+
+
+# Monta o detalhe do local em uma única ida ao banco: dados do local, itens de
+# acessibilidade e a galeria (linhas de location_images, na ordem de inclusão).
+_LOCATION_DETAIL_SQL = text(
+    """
+    SELECT
+        loc.id,
+        loc.name,
+        loc.description,
+        loc.top,
+        loc."left",
+        loc.avg_rating,
+        (
+            SELECT COALESCE(json_agg(li.path ORDER BY li.position), '[]'::json)
+            FROM location_images li
+            WHERE li.location_id = loc.id
+        ) AS images,
+        (
+            SELECT COALESCE(
+                json_agg(
+                    json_build_object('id', ai.id, 'name', ai.name, 'icon_url', ai.icon_url)
+                    ORDER BY ai.id
+                ),
+                '[]'::json
+            )
+            FROM location_accessibility la
+            JOIN accessibility_items ai ON ai.id = la.item_id
+            WHERE la.location_id = loc.id
+        ) AS accessibility_items
+    FROM locations loc
+    WHERE loc.id = :location_id
+    """
+)
+
+
+async def _fetch_location_detail_postgres(
+    db: AsyncSession, location_id: int
+) -> dict | None:
+    """Busca o detalhe do local com uma única consulta usando agregação JSON."""
+    result = await db.execute(_LOCATION_DETAIL_SQL, {"location_id": location_id})
+    row = result.mappings().first()
+    if not row:
+        return None
+
+    return {
+        "id": row["id"],
+        "name": row["name"],
+        "description": row["description"],
+        "top": row["top"],
+        "left": row["left"],
+        "avg_rating": row["avg_rating"],
+        "images": list(row["images"] or []),
+        "accessibility_items": list(row["accessibility_items"] or []),
+    }
+
+
+async def _fetch_location_detail_orm(
+    db: AsyncSession, location_id: int
+) -> dict | None:
+    """Busca o detalhe do local com consultas ORM (compatível com SQLite)."""
+    stmt = (
+        select(models.Location)
+        .options(selectinload(models.Location.accessibility_items))
+        .where(models.Location.id == location_id)
+    )
+    result = await db.execute(stmt)
+    location = result.unique().scalar_one_or_none()
+
+    if not location:
+        return None
+
+    await db.refresh(location, attribute_names=["avg_rating"])
+    result_images = await db.execute(
+        select(models.LocationImage.path)
+        .where(models.LocationImage.location_id == location_id)
+        .order_by(models.LocationImage.position)
+    )
+
+    return {
+        "id": location.id,
+        "name": location.name,
+        "description": location.description,
+        "top": location.top,
+        "left": location.left,
+        "avg_rating": location.avg_rating,
+        "images": list(result_images.scalars().all()),
+        "accessibility_items": [
+            {"id": item.id, "name": item.name, "icon_url": item.icon_url}
+            for item in location.accessibility_items
+        ],
+    }
+
+
+async def ensure_location_exists(db: AsyncSession, location_id: int) -> None:
+    """Valida que o local existe com uma única consulta pela chave primária.
+
+    Usada onde só a existência importa (criação de comentários), sem montar o
+    detalhe do local nem assinar imagens.
+    """
+    stmt = select(models.Location.id).where(models.Location.id == location_id)
+    result = await db.execute(stmt)
+    if result.scalar_one_or_none() is None:
+        raise exceptions.LocationNotFoundException()
+
+
+async def _icon_url_mapping(icon_paths: list[str]) -> dict[str, str]:
+    """Resolve as URLs dos ícones em uma chamada (caminhos sem URL ficam de fora)."""
+    signed_urls = await get_icon_urls(icon_paths) if icon_paths else []
+    return {
+        url: signed_url
+        for url, signed_url in zip(icon_paths, signed_urls)
+        if signed_url is not None
+    }
+
+
+def _location_detail_response(
+    location: Mapping,
+    images: list[schemas.ImageResponse],
+    icon_url_map: Mapping[str, str],
+) -> schemas.LocationDetailResponse:
+    """Monta o detalhe do local com as imagens e as URLs de ícones já resolvidas."""
+    return schemas.LocationDetailResponse(
+        id=location["id"],
+        name=location["name"],
+        description=location["description"],
+        top=location["top"],
+        left=location["left"],
+        images=images,
+        avg_rating=location["avg_rating"] or 0.0,
+        accessibility_items=[
+            schemas.AccessibilityItemResponse(
+                id=item["id"],
+                name=item["name"],
+                icon_url=icon_url_map.get(item["icon_url"], ""),
+            )
+            for item in location["accessibility_items"]
+        ],
+    )
+
+
+async def get_location_by_id(db: AsyncSession, location_id: int):
+    try:
+        if is_postgres(db):
+            location = await _fetch_location_detail_postgres(db, location_id)
+        else:
+            location = await _fetch_location_detail_orm(db, location_id)
+
+        if not location:
+            raise exceptions.LocationNotFoundException()
+
+        location_images_with_ids = (
+            await get_images_with_ids(db, location["images"]) if location["images"] else []
+        )
+        icon_url_map = await _icon_url_mapping(
+            [item["icon_url"] for item in location["accessibility_items"] if item["icon_url"]]
         )
 
-        return response_data
+        return _location_detail_response(location, location_images_with_ids, icon_url_map)
 
     except exceptions.LocationNotFoundException:
         raise
@@ -198,6 +586,108 @@ async def get_location_by_id(
         raise exceptions.LocationNotFoundException()
 
 
+def _parse_location_ids(value: str) -> list[int]:
+    """IDs distintos do parâmetro `ids`, na ordem recebida."""
+    try:
+        location_ids = list(
+            dict.fromkeys(int(part) for part in value.split(",") if part.strip())
+        )
+    except ValueError:
+        location_ids = []
+    if (
+        not location_ids
+        or len(location_ids) > schemas.MAX_BATCH_LOCATION_IDS
+        or min(location_ids) < 1
+    ):
+        raise exceptions.LocationQueryInvalidException(
+            f"Parâmetro 'ids' deve conter até {schemas.MAX_BATCH_LOCATION_IDS} "
+            "IDs inteiros separados por vírgula"
+        )
+    return location_ids
+
+
+async def get_locations_batch(db: AsyncSession, ids: str) -> schemas.LocationBatchResponse:
+    """Detalhes de vários locais, indexados pelo ID.
+
+    Faz uma consulta `IN` por tabela (locais, itens de acessibilidade e
+    galerias), assina as imagens de todos os locais em uma única chamada e
+    resolve os ícones dos itens em outra.
+
+    Raises:
+        LocationQueryInvalidException: Se `ids` for inválido
+    """
+    location_ids = _parse_location_ids(ids)
+
+    try:
+        result = await db.execute(
+            select(*_LOCATION_LIST_COLUMNS, models.Location.avg_rating).where(
+                models.Location.id.in_(location_ids)
+            )
+        )
+        locations = {
+            row["id"]: {**row, "images": [], "accessibility_items": []}
+            for row in result.mappings().all()
+        }
+
+        if locations:
+            association = models.location_accessibility_association
+            result = await db.execute(
+                select(
+                    association.c.location_id,
+                    models.AccessibilityItem.id,
+                    models.AccessibilityItem.name,
+                    models.AccessibilityItem.icon_url,
+                )
+                .join(
+                    models.AccessibilityItem,
+                    models.AccessibilityItem.id == association.c.item_id,
+                )
+                .where(association.c.location_id.in_(locations))
+                .order_by(association.c.location_id, models.AccessibilityItem.id)
+            )
+            for row in result.mappings().all():
+                locations[row["location_id"]]["accessibility_items"].append(row)
+
+            result = await db.execute(
+                select(models.LocationImage.location_id, models.LocationImage.path)
+                .where(models.LocationImage.location_id.in_(locations))
+                .order_by(models.LocationImage.location_id, models.LocationImage.position)
+            )
+            for location_id, path in result.all():
+                locations[location_id]["images"].append(path)
+
+        image_url_map = await sign_image_paths(
+            db, [path for location in locations.values() for path in location["images"]]
+        )
+        icon_url_map = await _icon_url_mapping(
+            list(
+                dict.fromkeys(
+                    item["icon_url"]
+                    for location in locations.values()
+                    for item in location["accessibility_items"]
+                    if item["icon_url"]
+                )
+            )
+        )
+
+        return schemas.LocationBatchResponse(
+            locations={
+                location_id: _location_detail_response(
+                    locations[location_id],
+                    build_images(locations[location_id]["images"], image_url_map),
+                    icon_url_map,
+                )
+                for location_id in location_ids
+                if location_id in locations
+            },
+            not_found=[i for i in location_ids if i not in locations],
+        )
+
+    except Exception as e:
+        logger.error("Erro ao obter localizações em lote %s: %s", location_ids, str(e))
+        raise exceptions.LocationGenericException()
+
+
 async def update_location(
     db: AsyncSession, location_id: int, location_update: schemas.LocationUpdate
 ):
@@ -218,9 +708,11 @@ async def update_location(
             setattr(location, field, value)
         await db.commit()
         await db.refresh(location)
+        spatial_index.upsert(location.id, location.top, location.left)
+        if search_index.active:
+            search_index.upsert_location(location.id, location.name, location.description)
+        invalidate_map_snapshot()
 
-        if location.images is None:
-            location.images = []
         if location.avg_rating is None:
             location.avg_rating = 0.0
 
@@ -255,20 +747,38 @@ async def delete_location(db: AsyncSession, location_id: int):
         if not location:
             raise exceptions.LocationNotFoundException()
 
-        if location.images:
-            try:
-                await delete_images(location.images)
-                logger.info(f"Imagens da localização {location_id} deletadas com sucesso")
-            except Exception as e:
-                logger.warning(
-                    "Falha ao deletar imagens da localização %s: %s. "
-                    "Prosseguindo com exclusão da localização.",
-                    location_id,
-                    str(e),
-                )
+        # Imagens vindas de comentários seguem referenciadas por eles; só as
+        # linhas sem comentário de origem têm referência própria a liberar
+        result_images = await db.execute(
+            select(models.LocationImage.path).where(
+                models.LocationImage.location_id == location_id,
+                models.LocationImage.comment_id.is_(None),
+            )
+        )
+        legacy_images = result_images.scalars().all()
+        # Referências liberadas; objetos sem uso vão para o outbox, na mesma transação
+        if legacy_images:
+            await release_objects(db, legacy_images)
+
+        # Os comentários aprovados do local deixam de ser exibidos junto com ele
+        result_comments = await db.execute(
+            select(comment_models.Comment.id).where(
+                comment_models.Comment.location_id == location_id,
+                comment_models.Comment.status == "approved",
+            )
+        )
+        await record_tombstones(
+            db, SyncEntity.COMMENT, result_comments.scalars().all()
+        )
+        await record_tombstones(db, SyncEntity.LOCATION, [location_id])
 
+        # As linhas de location_images são removidas em cascata pelo banco
         await db.delete(location)
         await db.commit()
+        spatial_index.remove(location_id)
+        item_index.remove_location(location_id)
+        search_index.remove_location(location_id)
+        invalidate_map_snapshot()
         return True
 
     except exceptions.LocationNotFoundException:
@@ -285,50 +795,97 @@ async def delete_location(db: AsyncSession, location_id: int):
         raise exceptions.LocationDeleteException()
 
 
-async def update_location_average_rating(
-    db: AsyncSession, location_id: int, new_value: float
-):
-    try:
-        stmt = select(models.Location).where(models.Location.id == location_id)
-        result = await db.execute(stmt)
-        location = result.scalar_one_or_none()
+async def update_location_average_rating(db: AsyncSession, location_id: int) -> None:
+    """Recalcula a média de avaliação do local com um único UPDATE.
 
-        if not location:
-            return
+    Ver `update_locations_average_rating`.
+    """
+    await update_locations_average_rating(db, [location_id])
 
-        stmt_count = select(comment_models.Comment).where(
-            comment_models.Comment.location_id == location_id,
-            comment_models.Comment.status == "approved",
-        )
-        result_count = await db.execute(stmt_count)
-        count_approved = len(result_count.scalars().all())
 
-        current_avg = location.avg_rating or 0.0
+async def update_locations_average_rating(
+    db: AsyncSession, location_ids: Iterable[int]
+) -> None:
+    """Recalcula a média de avaliação de vários locais com um único UPDATE.
 
-        count_previous = count_approved - 1
+    A média vem de um AVG correlacionado sobre os comentários aprovados de cada
+    local, então o valor é exato mesmo com aprovações concorrentes. Não faz
+    commit: roda na transação do chamador, que deve chamar
+    `invalidate_map_snapshot` após o commit.
+    """
+    # Comentários sem local (location_id nulo) não afetam nenhuma média
+    location_ids = sorted({i for i in location_ids if i is not None})
+    if not location_ids:
+        return
 
-        location.avg_rating = ((current_avg * count_previous) + new_value) / (
-            count_approved
+    avg_rating = (
+        select(func.avg(comment_models.Comment.rating))
+        .where(
+            comment_models.Comment.location_id == models.Location.id,
+            comment_models.Comment.status == "approved",
         )
-
-        await db.commit()
-        await db.refresh(location)
-        return location
-    except exceptions.LocationNotFoundException:
-        raise
-    except sqlalchemy_exc.SQLAlchemyError as e:
-        logger.error(
-            "Erro de banco de dados ao atualizar média de avaliação da localização %s: %s",
-            location_id,
-            str(e),
+        .scalar_subquery()
+    )
+    await db.execute(
+        update(models.Location)
+        .where(models.Location.id.in_(location_ids))
+        .values(avg_rating=cast(avg_rating, Float))
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def link_location_images(
+    db: AsyncSession, location_id: int | None, sources: Mapping[str, int]
+) -> None:
+    """Acrescenta imagens ao fim da galeria do local, sem duplicar, sem commit.
+
+    A linha do local é travada (`FOR UPDATE` no Postgres) para que aprovações
+    concorrentes no mesmo local não disputem as mesmas posições.
+
+    Args:
+        db: Sessão da transação de aprovação
+        location_id: Local da galeria (comentários sem local são ignorados)
+        sources: Caminho de cada imagem -> id do comentário de origem, em ordem
+    """
+    if location_id is None or not sources:
+        return
+
+    result = await db.execute(
+        select(models.Location.id)
+        .where(models.Location.id == location_id)
+        .with_for_update()
+    )
+    if result.scalar_one_or_none() is None:
+        return
+
+    result = await db.execute(
+        select(models.LocationImage.path).where(
+            models.LocationImage.location_id == location_id,
+            models.LocationImage.path.in_(list(sources)),
         )
-        await db.rollback()
-        raise exceptions.LocationUpdateException()
-    except Exception as e:
-        logger.error(
-            "Erro inesperado ao atualizar média de avaliação da localização %s: %s",
-            location_id,
-            str(e),
+    )
+    existing = set(result.scalars().all())
+    new_paths = [path for path in sources if path not in existing]
+    if not new_paths:
+        return
+
+    result = await db.execute(
+        select(func.max(models.LocationImage.position)).where(
+            models.LocationImage.location_id == location_id
         )
-        await db.rollback()
-        raise exceptions.LocationUpdateException()
+    )
+    last_position = result.scalar_one_or_none()
+    start = 0 if last_position is None else last_position + 1
+
+    await db.execute(
+        insert(models.LocationImage),
+        [
+            {
+                "location_id": location_id,
+                "path": path,
+                "position": start + offset,
+                "comment_id": sources[path],
+            }
+            for offset, path in enumerate(new_paths)
+        ],
+    )
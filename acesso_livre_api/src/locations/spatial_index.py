@@ -0,0 +1,208 @@
+"""Índice espacial em memória sobre as coordenadas (top, left) dos locais.
+
+Usa uma grade uniforme: cada célula guarda os IDs dos locais cujas coordenadas
+caem nela. Consultas por viewport (bbox) visitam apenas as células que
+intersectam a área, e a busca dos N mais próximos expande anéis de células a
+partir do ponto consultado.
+
+O índice é carregado do banco no primeiro uso, mantido incrementalmente pelo
+service em cada criação, atualização e exclusão de local e recarregado quando
+expira (ver `memory_index`).
+"""
+
+import asyncio
+import heapq
+import math
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from acesso_livre_api.src.locations import models
+from acesso_livre_api.src.locations.memory_index import ReloadableIndex
+
+# Tamanho da célula da grade, na mesma unidade das coordenadas top/left
+_CELL_SIZE = 10.0
+
+
+class SpatialGridIndex(ReloadableIndex):
+    """Grade uniforme que mapeia células para IDs de locais."""
+
+    _state_attrs = ("_cells", "_points")
+
+    def __init__(self, cell_size: float = _CELL_SIZE):
+        super().__init__()
+        self.cell_size = cell_size
+        self._cells: dict[tuple[int, int], set[int]] = {}
+        self._points: dict[int, tuple[float, float]] = {}
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def _cell_of(self, top: float, left: float) -> tuple[int, int]:
+        return (math.floor(top / self.cell_size), math.floor(left / self.cell_size))
+
+    def upsert(self, location_id: int, top: float, left: float) -> None:
+        """Insere um local ou move-o para novas coordenadas."""
+        self._record("upsert", location_id, top, left)
+        self._discard(location_id)
+        self._points[location_id] = (top, left)
+        self._cells.setdefault(self._cell_of(top, left), set()).add(location_id)
+
+    def remove(self, location_id: int) -> None:
+        """Remove um local do índice (ignora IDs desconhecidos)."""
+        self._record("remove", location_id)
+        self._discard(location_id)
+
+    def _discard(self, location_id: int) -> None:
+        point = self._points.pop(location_id, None)
+        if point is None:
+            return
+
+        cell = self._cell_of(*point)
+        bucket = self._cells.get(cell)
+        if bucket is not None:
+            bucket.discard(location_id)
+            if not bucket:
+                del self._cells[cell]
+
+    def query_bbox(
+        self, min_top: float, min_left: float, max_top: float, max_left: float
+    ) -> list[int]:
+        """Retorna os IDs dentro do retângulo (bordas inclusivas), ordenados."""
+        min_row, min_col = self._cell_of(min_top, min_left)
+        max_row, max_col = self._cell_of(max_top, max_left)
+
+        # Em áreas maiores que o conjunto ocupado, percorrer as células
+        # ocupadas é mais barato que percorrer a área inteira
+        area = (max_row - min_row + 1) * (max_col - min_col + 1)
+        if area > len(self._cells):
+            cells = [
+                ids
+                for (row, col), ids in self._cells.items()
+                if min_row <= row <= max_row and min_col <= col <= max_col
+            ]
+        else:
+            cells = [
+                self._cells[(row, col)]
+                for row in range(min_row, max_row + 1)
+                for col in range(min_col, max_col + 1)
+                if (row, col) in self._cells
+            ]
+
+        found = []
+        for ids in cells:
+            for location_id in ids:
+                top, left = self._points[location_id]
+                if min_top <= top <= max_top and min_left <= left <= max_left:
+                    found.append(location_id)
+
+        return sorted(found)
+
+    def nearest(
+        self,
+        top: float,
+        left: float,
+        n: int,
+        candidates: set[int] | None = None,
+    ) -> list[int]:
+        """Retorna até N IDs mais próximos do ponto, do mais perto ao mais longe.
+
+        Se `candidates` for informado, apenas esses IDs são considerados.
+        """
+        if n <= 0 or not self._points:
+            return []
+
+        origin_row, origin_col = self._cell_of(top, left)
+        rows = [row for row, _ in self._cells]
+        cols = [col for _, col in self._cells]
+        max_ring = max(
+            abs(origin_row - min(rows)),
+            abs(origin_row - max(rows)),
+            abs(origin_col - min(cols)),
+            abs(origin_col - max(cols)),
+        )
+
+        # A busca por anéis visita até (2 * max_ring + 1)² células e só para
+        # cedo depois de achar N pontos. Se essa área passa do número de
+        # pontos (ponto longe dos locais ou grade esparsa) ou se não há mais
+        # que N candidatos, comparar as distâncias de todos sai mais barato.
+        if (2 * max_ring + 1) ** 2 > len(self._points) or (
+            candidates is not None and len(candidates) <= n
+        ):
+            return self._nearest_scan(top, left, n, candidates)
+
+        # Max-heap (distância negada) com os N melhores encontrados até agora
+        best: list[tuple[float, int]] = []
+
+        for ring in range(max_ring + 1):
+            # Qualquer ponto em um anel >= ring está a pelo menos (ring - 1) células
+            if len(best) == n and -best[0][0] <= (ring - 1) * self.cell_size:
+                break
+
+            for cell in self._ring_cells(origin_row, origin_col, ring):
+                for location_id in self._cells.get(cell, ()):
+                    if candidates is not None and location_id not in candidates:
+                        continue
+                    point_top, point_left = self._points[location_id]
+                    distance = math.hypot(point_top - top, point_left - left)
+                    entry = (-distance, -location_id)
+                    if len(best) < n:
+                        heapq.heappush(best, entry)
+                    elif entry > best[0]:
+                        heapq.heapreplace(best, entry)
+
+        return [-location_id for _, location_id in sorted(best, reverse=True)]
+
+    def _nearest_scan(
+        self, top: float, left: float, n: int, candidates: set[int] | None
+    ) -> list[int]:
+        """Busca dos N mais próximos comparando todos os pontos (ou candidatos)."""
+        if candidates is None:
+            location_ids = self._points
+        else:
+            location_ids = [i for i in candidates if i in self._points]
+
+        def key(location_id: int) -> tuple[float, int]:
+            point_top, point_left = self._points[location_id]
+            return (math.hypot(point_top - top, point_left - left), location_id)
+
+        return heapq.nsmallest(n, location_ids, key=key)
+
+    @staticmethod
+    def _ring_cells(row: int, col: int, ring: int):
+        if ring == 0:
+            yield (row, col)
+            return
+        for c in range(col - ring, col + ring + 1):
+            yield (row - ring, c)
+            yield (row + ring, c)
+        for r in range(row - ring + 1, row + ring):
+            yield (r, col - ring)
+            yield (r, col + ring)
+
+
+spatial_index = SpatialGridIndex()
+_load_lock = asyncio.Lock()
+
+
+async def ensure_spatial_index(db: AsyncSession) -> SpatialGridIndex:
+    """Carrega o índice a partir do banco se ainda não estiver carregado ou tiver expirado."""
+    if not spatial_index.stale:
+        return spatial_index
+
+    async with _load_lock:
+        if not spatial_index.stale:
+            return spatial_index
+
+        async def build() -> SpatialGridIndex:
+            stmt = select(models.Location.id, models.Location.top, models.Location.left)
+            result = await db.execute(stmt)
+
+            fresh = SpatialGridIndex(spatial_index.cell_size)
+            for location_id, top, left in result.all():
+                fresh.upsert(location_id, top, left)
+            return fresh
+
+        await spatial_index.reload(build)
+
+    return spatial_index
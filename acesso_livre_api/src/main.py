@@ -1,3 +1,5 @@
+from contextlib import asynccontextmanager
+
 from .func_log import setup_logger, log_message
 
 from fastapi import FastAPI, Request, status
@@ -8,10 +10,27 @@ from fastapi.responses import JSONResponse
 from .admins.router import router as admins_router
 from .comments.router import router as comments_router
 from .locations.router import router as locations_router
+from .sync.router import router as sync_router
 from .openapi_config import create_custom_openapi
-from .database import engine, Base
+from .compression import CompressionMiddleware
+from .responses import ORJSONResponse
+from .database import AsyncSessionLocal, engine, Base
+from acesso_livre_api.storage.image_processing import shutdown_image_pool
+from acesso_livre_api.storage.middleware import UploadSizeLimitMiddleware
+from acesso_livre_api.storage.outbox import start_outbox_worker, stop_outbox_worker
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Worker que drena o outbox de deleções do storage
+    start_outbox_worker(AsyncSessionLocal)
+    yield
+    await stop_outbox_worker()
+    # Encerra os processos do pipeline de imagens
+    shutdown_image_pool()
 
-app = FastAPI()
+
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 
 # Configuração do logger com rotatividade
 logger = setup_logger(
@@ -64,7 +83,14 @@ app.openapi = create_custom_openapi(app)
 app.include_router(admins_router, prefix="/api/admins", tags=["Administração"])
 app.include_router(comments_router, prefix="/api/comments")
 app.include_router(locations_router, prefix="/api/locations", tags=["Locais"])
+app.include_router(sync_router, prefix="/api/sync", tags=["Sincronização"])
+
+
+# Comprime com brotli/gzip as respostas acima do tamanho mínimo
+app.add_middleware(CompressionMiddleware)
 
+# Rejeita uploads grandes demais antes de o multipart ser lido
+app.add_middleware(UploadSizeLimitMiddleware)
 
 app.add_middleware(
     CORSMiddleware,
@@ -0,0 +1,25 @@
+"""Classe de resposta JSON padrão da API.
+
+`ORJSONResponse` é a `default_response_class` do app: o conteúdo já
+convertido pelo FastAPI (response_model) é serializado com orjson em vez de
+`json.dumps`. Rotas com respostas grandes podem devolver
+`ORJSONResponse(modelo)` diretamente: o modelo Pydantic já validado vai
+direto para bytes pelo serializador do pydantic-core (o mesmo de
+`model_dump_json`), sem a revalidação e a conversão para dicts do FastAPI.
+O `response_model` da rota continua documentando o schema no OpenAPI.
+"""
+
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+class ORJSONResponse(JSONResponse):
+    """JSONResponse serializada com orjson ou, para modelos, pelo pydantic-core."""
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.__pydantic_serializer__.to_json(content)
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
@@ -0,0 +1,79 @@
+"""Módulo de documentação para endpoints de sincronização.
+
+Contém todas as definições de documentação OpenAPI/Swagger
+para manter o código do router limpo e organizado.
+"""
+
+# Documentação para o endpoint GET / (sincronização incremental)
+GET_SYNC_DOCS = {
+    "summary": "Sincronização incremental",
+    "description": (
+        "Retorna os locais, itens de acessibilidade, ícones de comentário e comentários "
+        "aprovados alterados depois do cursor `since`, e em `deleted` os IDs das entidades "
+        "excluídas no mesmo período. Sem `since`, retorna todos os dados (`full: true`) e "
+        "o cliente substitui o cache local. O `cursor` da resposta deve ser enviado como "
+        "`since` na próxima chamada; ele recua alguns segundos em relação ao horário do "
+        "servidor, então alterações recentes podem se repetir e devem ser aplicadas por ID. "
+        "As URLs das imagens são assinadas e expiram."
+    ),
+    "responses": {
+        200: {
+            "description": "Alterações retornadas com sucesso",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "cursor": "2026-10-19T18:04:00Z",
+                        "full": False,
+                        "locations": [
+                            {
+                                "id": 1,
+                                "name": "Shopping Center Norte",
+                                "description": "Shopping com rampas e elevadores",
+                                "top": 45.2,
+                                "left": 120.8,
+                                "avg_rating": 4.5,
+                                "accessibility_item_ids": [1, 3],
+                            }
+                        ],
+                        "accessibility_items": [],
+                        "comment_icons": [],
+                        "comments": [
+                            {
+                                "id": 10,
+                                "location_id": 1,
+                                "user_name": "Maria",
+                                "rating": 5,
+                                "comment": "Entrada com rampa e piso tátil",
+                                "images": [],
+                                "created_at": "2026-10-19T17:30:00Z",
+                                "comment_icon_ids": [2],
+                            }
+                        ],
+                        "deleted": {
+                            "locations": [],
+                            "accessibility_items": [],
+                            "comment_icons": [],
+                            "comments": [7],
+                        },
+                    }
+                }
+            },
+        },
+        400: {
+            "description": "Cursor no futuro",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "Cursor de sincronização inválido"}
+                }
+            },
+        },
+        500: {
+            "description": "Erro interno do servidor",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "Erro interno ao sincronizar os dados"}
+                }
+            },
+        },
+    },
+}
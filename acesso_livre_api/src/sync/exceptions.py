@@ -0,0 +1,37 @@
+from fastapi import HTTPException, status
+
+
+class SyncException(HTTPException):
+    """Classe base para todas as exceções do módulo de sincronização"""
+
+    def __init__(
+        self,
+        status_code: int,
+        detail: str,
+        headers: dict[str, str] | None = None,
+    ):
+        super().__init__(
+            status_code=status_code,
+            detail=detail,
+            headers=headers,
+        )
+
+
+class SyncCursorInvalidException(SyncException):
+    """Exceção lançada quando o cursor informado está no futuro"""
+
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor de sincronização inválido",
+        )
+
+
+class SyncGenericException(SyncException):
+    """Exceção lançada quando ocorre erro geral na sincronização"""
+
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro interno ao sincronizar os dados",
+        )
@@ -0,0 +1,34 @@
+import datetime
+from enum import Enum
+
+from sqlalchemy import Column, DateTime, Integer, String
+
+from ..database import Base
+
+
+class SyncEntity(str, Enum):
+    LOCATION = "location"
+    ACCESSIBILITY_ITEM = "accessibility_item"
+    COMMENT_ICON = "comment_icon"
+    COMMENT = "comment"
+
+
+def _utcnow() -> datetime.datetime:
+    return datetime.datetime.now(datetime.timezone.utc)
+
+
+class Tombstone(Base):
+    """Registro de uma entidade excluída, para a sincronização incremental.
+
+    Exclusões são físicas; a linha é gravada na mesma transação que remove a
+    entidade e informa aos clientes de GET /sync o que apagar do cache local.
+    """
+
+    __tablename__ = "sync_tombstones"
+
+    id = Column(Integer, primary_key=True)
+    entity = Column(String(50), nullable=False)
+    entity_id = Column(Integer, nullable=False)
+    deleted_at = Column(
+        DateTime(timezone=True), nullable=False, default=_utcnow, index=True
+    )
@@ -0,0 +1,30 @@
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from acesso_livre_api.src.database import get_db
+from acesso_livre_api.src.responses import ORJSONResponse
+from acesso_livre_api.src.sync import docs, schemas, service
+
+from ..func_log import log_message
+
+router = APIRouter()
+
+
+@router.get("", response_model=schemas.SyncResponse, **docs.GET_SYNC_DOCS)
+async def sync_changes(
+    since: datetime | None = Query(
+        None,
+        description="Cursor retornado pela sincronização anterior (ISO 8601); vazio para carga completa",
+    ),
+    db: AsyncSession = Depends(get_db),
+):
+    changes = await service.get_changes(db=db, since=since)
+    log_message(
+        f"Sincronização desde {since}: {len(changes.locations)} locais, "
+        f"{len(changes.comments)} comentários",
+        level="info",
+        logger_name="acesso_livre_api",
+    )
+    return ORJSONResponse(changes)
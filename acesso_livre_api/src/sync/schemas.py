@@ -0,0 +1,81 @@
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from acesso_livre_api.src.locations.schemas import ImageResponse
+
+
+class SyncLocation(BaseModel):
+    """Local alterado, com os campos do mapa e da listagem."""
+
+    id: int
+    name: str
+    description: str
+    top: float
+    left: float
+    avg_rating: float = Field(default=0.0, ge=0.0, le=5.0)
+    accessibility_item_ids: List[int] = Field(default=[])
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class SyncAccessibilityItem(BaseModel):
+    """Item de acessibilidade alterado, com a URL do ícone resolvida."""
+
+    id: int
+    name: str
+    icon_url: Optional[str] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class SyncCommentIcon(BaseModel):
+    """Ícone de comentário alterado, com a URL resolvida."""
+
+    id: int
+    name: str
+    icon_url: str
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class SyncComment(BaseModel):
+    """Comentário aprovado alterado, com as imagens assinadas."""
+
+    id: int
+    location_id: int
+    user_name: str
+    rating: int
+    comment: str
+    images: List[ImageResponse] = Field(default=[])
+    created_at: datetime
+    comment_icon_ids: List[int] = Field(default=[])
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class SyncDeleted(BaseModel):
+    """IDs das entidades excluídas após o cursor (tombstones)."""
+
+    locations: List[int] = Field(default=[])
+    accessibility_items: List[int] = Field(default=[])
+    comment_icons: List[int] = Field(default=[])
+    comments: List[int] = Field(default=[])
+
+
+class SyncResponse(BaseModel):
+    """Schema para resposta da sincronização incremental (GET /sync).
+
+    `cursor` deve ser enviado como `since` na próxima sincronização. Com
+    `full` verdadeiro a resposta traz todos os dados e o cliente substitui o
+    cache local; caso contrário, aplica as alterações e remove os excluídos.
+    """
+
+    cursor: datetime
+    full: bool
+    locations: List[SyncLocation] = Field(default=[])
+    accessibility_items: List[SyncAccessibilityItem] = Field(default=[])
+    comment_icons: List[SyncCommentIcon] = Field(default=[])
+    comments: List[SyncComment] = Field(default=[])
+    deleted: SyncDeleted = Field(default_factory=SyncDeleted)
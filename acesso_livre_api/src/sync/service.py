@@ -0,0 +1,217 @@
+"""Sincronização incremental dos dados do app (GET /sync).
+
+Locais, itens de acessibilidade, ícones de comentário e comentários têm
+`updated_at`, e as exclusões (físicas) ficam registradas em
+`sync_tombstones`. Com um cursor, a resposta traz apenas o que mudou depois
+dele; sem cursor, traz todos os dados.
+
+O cursor devolvido é o início da leitura menos `CURSOR_OVERLAP`: uma
+transação que gravou `updated_at` antes desse instante, mas cujo commit só
+ocorreu depois da leitura, ainda aparece na sincronização seguinte. Os
+clientes aplicam as alterações por ID, então repetir as linhas dessa janela
+é inofensivo.
+"""
+
+import logging
+from collections.abc import Iterable
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from acesso_livre_api.src.comments import dto
+from acesso_livre_api.src.comments import models as comment_models
+from acesso_livre_api.src.comments.utils import build_images, sign_image_paths
+from acesso_livre_api.src.locations import models as location_models
+from acesso_livre_api.src.sync import models, schemas
+from acesso_livre_api.src.sync.exceptions import (
+    SyncCursorInvalidException,
+    SyncGenericException,
+)
+from acesso_livre_api.storage.get_url import get_icon_urls
+
+logger = logging.getLogger(__name__)
+
+CURSOR_OVERLAP = timedelta(seconds=60)
+
+
+async def record_tombstones(
+    db: AsyncSession, entity: models.SyncEntity, entity_ids: Iterable[int]
+) -> None:
+    """Registra a exclusão das entidades, sem commit (na transação do chamador)."""
+    rows = [
+        {"entity": entity.value, "entity_id": entity_id}
+        for entity_id in dict.fromkeys(entity_ids)
+    ]
+    if rows:
+        await db.execute(insert(models.Tombstone), rows)
+
+
+def _naive_utc(moment: datetime) -> datetime:
+    """Converte para UTC sem fuso, como nas colunas `DateTime` sem timezone."""
+    return moment.astimezone(UTC).replace(tzinfo=None)
+
+
+async def _changed_locations(db: AsyncSession, since: datetime | None):
+    Location = location_models.Location
+    criteria = [] if since is None else [Location.updated_at > _naive_utc(since)]
+    result = await db.execute(
+        select(
+            Location.id,
+            Location.name,
+            Location.description,
+            Location.top,
+            Location.left,
+            func.coalesce(Location.avg_rating, 0.0).label("avg_rating"),
+        )
+        .where(*criteria)
+        .order_by(Location.id)
+    )
+    rows = result.mappings().all()
+    if not rows:
+        return []
+
+    association = location_models.location_accessibility_association
+    result = await db.execute(
+        select(association.c.location_id, association.c.item_id)
+        .where(association.c.location_id.in_(select(Location.id).where(*criteria)))
+        .order_by(association.c.location_id, association.c.item_id)
+    )
+    items_by_location: dict[int, list[int]] = {}
+    for location_id, item_id in result.all():
+        items_by_location.setdefault(location_id, []).append(item_id)
+
+    return [
+        schemas.SyncLocation(
+            **row, accessibility_item_ids=items_by_location.get(row["id"], [])
+        )
+        for row in rows
+    ]
+
+
+async def _changed_rows(db: AsyncSession, model, since: datetime | None):
+    """Linhas (id, name, icon_url) de itens ou ícones alterados após o cursor."""
+    criteria = [] if since is None else [model.updated_at > _naive_utc(since)]
+    result = await db.execute(
+        select(model.id, model.name, model.icon_url).where(*criteria).order_by(model.id)
+    )
+    return result.mappings().all()
+
+
+async def _changed_comments(db: AsyncSession, since: datetime | None):
+    Comment = comment_models.Comment
+    criteria = [Comment.status == "approved", Comment.location_id.isnot(None)]
+    if since is not None:
+        criteria.append(Comment.updated_at > since)
+    result = await db.execute(
+        select(
+            Comment.id,
+            Comment.location_id,
+            Comment.user_name,
+            Comment.rating,
+            Comment.comment,
+            Comment.images,
+            Comment.created_at,
+        )
+        .where(*criteria)
+        .order_by(Comment.id)
+    )
+    rows = result.mappings().all()
+    if not rows:
+        return []
+
+    association = comment_models.comment_comment_icons_association
+    result = await db.execute(
+        select(association.c.comment_id, association.c.icon_id)
+        .where(association.c.comment_id.in_(select(Comment.id).where(*criteria)))
+        .order_by(association.c.comment_id, association.c.icon_id)
+    )
+    icons_by_comment: dict[int, list[int]] = {}
+    for comment_id, icon_id in result.all():
+        icons_by_comment.setdefault(comment_id, []).append(icon_id)
+
+    # Imagens de todos os comentários assinadas em uma única chamada
+    url_map = await sign_image_paths(db, dto.image_paths(rows))
+    return [
+        schemas.SyncComment(
+            **{**row, "images": build_images(row["images"] or [], url_map)},
+            comment_icon_ids=icons_by_comment.get(row["id"], []),
+        )
+        for row in rows
+    ]
+
+
+async def _deleted_since(db: AsyncSession, since: datetime | None) -> schemas.SyncDeleted:
+    if since is None:
+        return schemas.SyncDeleted()
+
+    result = await db.execute(
+        select(models.Tombstone.entity, models.Tombstone.entity_id)
+        .where(models.Tombstone.deleted_at > since)
+        .order_by(models.Tombstone.id)
+    )
+    deleted: dict[str, list[int]] = {}
+    for entity, entity_id in result.all():
+        deleted.setdefault(entity, []).append(entity_id)
+
+    return schemas.SyncDeleted(
+        locations=deleted.get(models.SyncEntity.LOCATION.value, []),
+        accessibility_items=deleted.get(models.SyncEntity.ACCESSIBILITY_ITEM.value, []),
+        comment_icons=deleted.get(models.SyncEntity.COMMENT_ICON.value, []),
+        comments=deleted.get(models.SyncEntity.COMMENT.value, []),
+    )
+
+
+async def get_changes(
+    db: AsyncSession, since: datetime | None = None
+) -> schemas.SyncResponse:
+    """Retorna o que mudou depois de `since` (ou tudo, sem cursor) e o próximo cursor.
+
+    Raises:
+        SyncCursorInvalidException: Se o cursor estiver no futuro
+    """
+    started_at = datetime.now(UTC)
+    if since is not None:
+        # Cursores sem fuso são tratados como UTC
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=UTC)
+        if since > started_at:
+            raise SyncCursorInvalidException()
+
+    try:
+        locations = await _changed_locations(db, since)
+        item_rows = await _changed_rows(db, location_models.AccessibilityItem, since)
+        icon_rows = await _changed_rows(db, comment_models.CommentIcon, since)
+        comments = await _changed_comments(db, since)
+        deleted = await _deleted_since(db, since)
+
+        # Ícones de itens e de comentários resolvidos em uma única chamada
+        icon_paths = dto.icon_paths([*item_rows, *icon_rows])
+        resolved = await get_icon_urls(icon_paths) if icon_paths else []
+        icon_url_map = {
+            path: url for path, url in zip(icon_paths, resolved) if url is not None
+        }
+
+        return schemas.SyncResponse(
+            cursor=started_at - CURSOR_OVERLAP,
+            full=since is None,
+            locations=locations,
+            accessibility_items=[
+                schemas.SyncAccessibilityItem(
+                    id=row["id"],
+                    name=row["name"],
+                    icon_url=icon_url_map.get(row["icon_url"]),
+                )
+                for row in item_rows
+            ],
+            comment_icons=[
+                schemas.SyncCommentIcon.model_validate(dto.build_icon(row, icon_url_map))
+                for row in icon_rows
+            ],
+            comments=comments,
+            deleted=deleted,
+        )
+
+    except Exception as e:
+        logger.error("Erro ao sincronizar alterações desde %s: %s", since, str(e))
+        raise SyncGenericException()
@@ -1,3 +1,4 @@
+import httpx
 import supabase
 
 from acesso_livre_api.src.config import settings
@@ -9,3 +10,34 @@ def supabase_client() -> supabase.AClient:
     key: str = settings.bucket_secret_key
     client: supabase.AClient = supabase.create_client(url, key)
     return client
+
+
+def storage_http_client() -> httpx.AsyncClient:
+    """Create an async HTTP client for direct calls to the Supabase Storage REST API.
+
+    Used where the SDK would force the whole payload into memory (streamed uploads).
+    """
+    return httpx.AsyncClient(timeout=httpx.Timeout(60.0, connect=10.0))
+
+
+def storage_object_url(path: str, bucket: str | None = None) -> str:
+    """Return the Storage REST URL of an object in the bucket."""
+    base_url = settings.bucket_endpoint_url.rstrip("/")
+    return f"{base_url}/storage/v1/object/{bucket or settings.bucket_name}/{path}"
+
+
+def storage_public_url(path: str, bucket: str | None = None) -> str:
+    """Return the public URL of an object in a public bucket (built locally, no request)."""
+    base_url = settings.bucket_endpoint_url.rstrip("/")
+    return f"{base_url}/storage/v1/object/public/{bucket or icon_bucket_name()}/{path}"
+
+
+def icon_bucket_name() -> str:
+    """Return the bucket for icons: the public bucket, when configured, or the photos bucket."""
+    return settings.public_bucket_name or settings.bucket_name
+
+
+def storage_auth_headers() -> dict[str, str]:
+    """Return the authentication headers expected by the Storage REST API."""
+    key = settings.bucket_secret_key
+    return {"Authorization": f"Bearer {key}", "apikey": key}
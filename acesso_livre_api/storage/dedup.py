@@ -0,0 +1,236 @@
+"""Deduplicação de uploads por conteúdo, com contagem de referências.
+
+`upload_image` calcula o SHA-256 do arquivo enquanto ele é recebido e, antes de
+processar e enviar a imagem, tenta adquirir um objeto já armazenado com o mesmo
+conteúdo. Todas as operações rodam na transação do chamador: se ela for
+desfeita, os incrementos e registros somem junto e o objeto recém-enviado fica
+sem referência (o GC do storage o remove).
+
+Os services não removem objetos diretamente: chamam `release_objects`, que
+decrementa o contador e só enfileira a deleção no outbox quando a última
+referência é liberada. Caminhos sem registro em `stored_objects` (uploads
+anteriores à deduplicação) são enfileirados diretamente, como antes.
+"""
+
+import asyncio
+import weakref
+from collections import Counter
+from collections.abc import Iterable
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects.postgresql import insert as postgres_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from acesso_livre_api.src.config import settings
+from acesso_livre_api.src.database import is_postgres
+from acesso_livre_api.storage.delete_image import delete_images
+from acesso_livre_api.storage.models import StoredObject
+from acesso_livre_api.storage.outbox import enqueue_deletions
+
+# Uploads paralelos (upload_images) compartilham a sessão do chamador, que não
+# aceita operações concorrentes: os comandos de cada sessão são serializados.
+_session_locks: "weakref.WeakKeyDictionary[AsyncSession, asyncio.Lock]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _lock_for(db: AsyncSession) -> asyncio.Lock:
+    lock = _session_locks.get(db)
+    if lock is None:
+        lock = _session_locks[db] = asyncio.Lock()
+    return lock
+
+
+async def acquire_object(
+    db: AsyncSession,
+    content_hash: str,
+    with_variants: bool,
+    bucket: str | None = None,
+) -> str | None:
+    """Adiciona uma referência ao objeto com esse conteúdo, se ele já existir.
+
+    O incremento e a leitura do caminho são um único UPDATE ... RETURNING, então
+    uma liberação concorrente que remova a linha faz a aquisição falhar (e o
+    chamador envia o arquivo normalmente) em vez de reutilizar um objeto que
+    está sendo apagado.
+
+    Returns:
+        Caminho do objeto existente, ou None se o conteúdo ainda não foi armazenado
+    """
+    stmt = (
+        update(StoredObject)
+        .where(
+            StoredObject.bucket == (bucket or settings.bucket_name),
+            StoredObject.content_hash == content_hash,
+            StoredObject.with_variants == with_variants,
+        )
+        .values(refcount=StoredObject.refcount + 1)
+        .returning(StoredObject.path)
+        .execution_options(synchronize_session=False)
+    )
+    async with _lock_for(db):
+        result = await db.execute(stmt)
+        return result.scalar_one_or_none()
+
+
+async def register_object(
+    db: AsyncSession,
+    content_hash: str,
+    with_variants: bool,
+    path: str,
+    bucket: str | None = None,
+) -> None:
+    """Registra um objeto recém-enviado com uma referência.
+
+    Se outro upload do mesmo conteúdo registrou o objeto primeiro, o registro é
+    ignorado e este caminho segue sem contagem (é removido direto ao ser liberado).
+    """
+    insert = postgres_insert if is_postgres(db) else sqlite_insert
+    stmt = (
+        insert(StoredObject)
+        .values(
+            bucket=bucket or settings.bucket_name,
+            content_hash=content_hash,
+            with_variants=with_variants,
+            path=path,
+            refcount=1,
+        )
+        .on_conflict_do_nothing()
+    )
+    async with _lock_for(db):
+        await db.execute(stmt)
+
+
+async def release_objects(
+    db: AsyncSession,
+    file_paths: Iterable[str],
+    include_variants: bool = True,
+    bucket: str | None = None,
+) -> None:
+    """Libera uma referência de cada caminho, sem commit (transação do chamador).
+
+    Objetos cuja contagem chega a zero têm o registro removido e são enfileirados
+    no outbox de deleções; caminhos sem registro são enfileirados diretamente.
+
+    Args:
+        db: Sessão da transação que remove as referências
+        file_paths: Caminhos liberados (um caminho repetido libera várias referências)
+        include_variants: Para caminhos sem registro, também remove as variantes
+        bucket: Bucket dos objetos (padrão: settings.bucket_name)
+    """
+    bucket = bucket or settings.bucket_name
+    counts = Counter(path for path in file_paths if path)
+    if not counts:
+        return
+
+    # Agrupa por quantidade liberada para decrementar com um UPDATE por grupo
+    by_count: dict[int, list[str]] = {}
+    for path, count in counts.items():
+        by_count.setdefault(count, []).append(path)
+
+    managed: set[str] = set()
+    freed: list[tuple[str, bool]] = []
+    async with _lock_for(db):
+        for count, paths in by_count.items():
+            result = await db.execute(
+                update(StoredObject)
+                .where(StoredObject.bucket == bucket, StoredObject.path.in_(paths))
+                .values(refcount=StoredObject.refcount - count)
+                .returning(
+                    StoredObject.path, StoredObject.refcount, StoredObject.with_variants
+                )
+                .execution_options(synchronize_session=False)
+            )
+            for path, refcount, with_variants in result.all():
+                managed.add(path)
+                if refcount <= 0:
+                    freed.append((path, with_variants))
+
+        if freed:
+            await db.execute(
+                delete(StoredObject)
+                .where(
+                    StoredObject.bucket == bucket,
+                    StoredObject.path.in_([path for path, _ in freed]),
+                )
+                .execution_options(synchronize_session=False)
+            )
+
+    enqueue_deletions(db, [path for path, variants in freed if variants], bucket=bucket)
+    enqueue_deletions(
+        db,
+        [path for path, variants in freed if not variants],
+        bucket=bucket,
+        include_variants=False,
+    )
+    enqueue_deletions(
+        db,
+        [path for path in counts if path not in managed],
+        bucket=bucket,
+        include_variants=include_variants,
+    )
+
+
+async def managed_paths(
+    db: AsyncSession, file_paths: Iterable[str], bucket: str | None = None
+) -> set[str]:
+    """Caminhos, entre os informados, com contagem de referências em `stored_objects`."""
+    paths = list(dict.fromkeys(path for path in file_paths if path))
+    if not paths:
+        return set()
+
+    result = await db.execute(
+        select(StoredObject.path).where(
+            StoredObject.bucket == (bucket or settings.bucket_name),
+            StoredObject.path.in_(paths),
+        )
+    )
+    return set(result.scalars())
+
+
+async def paths_with_variants(
+    db: AsyncSession, file_paths: Iterable[str], bucket: str | None = None
+) -> set[str]:
+    """Caminhos, entre os informados, que têm as variantes thumb/medium no storage.
+
+    Toda foto enviada pelo pipeline é registrada em `stored_objects` com
+    `with_variants`; caminhos sem registro (uploads anteriores ao pipeline)
+    não têm variantes e são assinados só no original.
+    """
+    paths = list(dict.fromkeys(path for path in file_paths if path))
+    if not paths:
+        return set()
+
+    result = await db.execute(
+        select(StoredObject.path).where(
+            StoredObject.bucket == (bucket or settings.bucket_name),
+            StoredObject.with_variants.is_(True),
+            StoredObject.path.in_(paths),
+        )
+    )
+    return set(result.scalars())
+
+
+async def discard_unreferenced(
+    db: AsyncSession, file_paths: list[str], bucket: str | None = None
+) -> None:
+    """Remove do storage uploads cuja transação foi desfeita.
+
+    Deve ser chamada após o rollback: objetos reutilizados continuam registrados
+    (e referenciados por outras linhas) e são mantidos; os recém-enviados
+    perderam o registro junto com a transação e são removidos.
+    """
+    if not file_paths:
+        return
+
+    bucket = bucket or settings.bucket_name
+    result = await db.execute(
+        select(StoredObject.path).where(
+            StoredObject.bucket == bucket, StoredObject.path.in_(file_paths)
+        )
+    )
+    shared = set(result.scalars())
+    unreferenced = [path for path in file_paths if path not in shared]
+    if unreferenced:
+        await delete_images(unreferenced, bucket=bucket)
@@ -2,13 +2,35 @@ import asyncio
 import logging
 from fastapi.concurrency import run_in_threadpool
 from acesso_livre_api.storage.client import supabase_client
+from acesso_livre_api.storage.dependencies import REMOVE_BATCH_SIZE
 from acesso_livre_api.src.config import settings
+from acesso_livre_api.storage.image_processing import with_variant_paths
 
 logger = logging.getLogger(__name__)
 
 _semaphore = asyncio.Semaphore(10)  # Máximo 10 requisições paralelas
 
 
+async def remove_objects(file_paths: list[str], bucket: str | None = None) -> None:
+    """Remove vários objetos do bucket com uma única chamada `remove([...])`.
+
+    Args:
+        file_paths: Caminhos dos objetos no bucket
+        bucket: Bucket de origem (padrão: settings.bucket_name)
+
+    Raises:
+        Exception: Qualquer erro retornado pelo storage é propagado
+    """
+    if not file_paths:
+        return
+
+    def _remove():
+        client = supabase_client()
+        return client.storage.from_(bucket or settings.bucket_name).remove(file_paths)
+
+    await run_in_threadpool(_remove)
+
+
 async def delete_image(file_path: str) -> bool:
     """Deleta uma imagem do Supabase storage.
     
@@ -18,44 +40,62 @@ async def delete_image(file_path: str) -> bool:
     Returns:
         True se a deleção foi bem sucedida, False caso contrário
     """
+    results = await delete_images([file_path], include_variants=False)
+    return results[file_path]
+
+
+async def _remove_chunk(file_paths: list[str], bucket: str | None) -> dict[str, bool]:
     async with _semaphore:
         try:
-            def _delete_image():
-                client = supabase_client()
-                response = client.storage.from_(settings.bucket_name).remove([file_path])
-                return response
+            await remove_objects(file_paths, bucket=bucket)
+            return dict.fromkeys(file_paths, True)
+        except Exception as e:
+            logger.error(f"Erro ao deletar {len(file_paths)} imagens: {str(e)}")
+            return dict.fromkeys(file_paths, False)
 
-            await run_in_threadpool(_delete_image)
-            logger.info(f"Imagem {file_path} deletada com sucesso")
-            return True
 
-        except Exception as e:
-            logger.error(f"Erro ao deletar imagem {file_path}: {str(e)}")
-            return False
+async def delete_images(
+    file_paths: list[str],
+    include_variants: bool = True,
+    bucket: str | None = None,
+) -> dict[str, bool]:
+    """Deleta múltiplas imagens do Supabase storage em chamadas `remove` em lote.
 
+    Os caminhos são agrupados em blocos de REMOVE_BATCH_SIZE e cada bloco é
+    removido com uma única requisição; os blocos rodam em paralelo, limitados
+    pelo semáforo do módulo.
 
-async def delete_images(file_paths: list[str]) -> bool:
-    """Deleta múltiplas imagens do Supabase storage.
-    
     Args:
         file_paths: Lista de nomes de arquivos a serem deletados
-    
+        include_variants: Também deleta as variantes (thumb/medium) de cada imagem
+        bucket: Bucket dos arquivos (padrão: settings.bucket_name)
+
     Returns:
-        True se todas as deleções foram bem sucedidas, False se alguma falhou
+        Resultado por caminho: True se a deleção foi bem sucedida, False se falhou
     """
     if not file_paths:
-        return True
+        return {}
 
-    results = await asyncio.gather(
-        *[delete_image(path) for path in file_paths],
-        return_exceptions=True
+    if include_variants:
+        file_paths = with_variant_paths(file_paths)
+    file_paths = list(dict.fromkeys(file_paths))
+
+    chunks = [
+        file_paths[start : start + REMOVE_BATCH_SIZE]
+        for start in range(0, len(file_paths), REMOVE_BATCH_SIZE)
+    ]
+    chunk_results = await asyncio.gather(
+        *[_remove_chunk(chunk, bucket) for chunk in chunks]
     )
 
-    # Verifica se todas as deleções foram bem sucedidas
-    success = all(result is True for result in results)
-    
-    if not success:
-        failed_count = sum(1 for r in results if r is not True)
+    results: dict[str, bool] = {}
+    for chunk_result in chunk_results:
+        results.update(chunk_result)
+
+    failed_count = sum(1 for success in results.values() if not success)
+    if failed_count:
         logger.warning(f"{failed_count} de {len(file_paths)} imagens falharam ao deletar")
-    
-    return success
+    else:
+        logger.info(f"{len(file_paths)} imagens deletadas em {len(chunks)} requisições")
+
+    return results
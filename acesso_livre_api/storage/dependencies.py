@@ -6,3 +6,21 @@ ALLOWED_MIME_TYPES = [
     "image/heic",
     "image/heif",
 ]
+
+# Tamanho dos blocos lidos do UploadFile e enviados ao storage (256 KiB)
+UPLOAD_CHUNK_SIZE = 256 * 1024
+
+# Tamanho máximo de uma imagem enviada (10 MiB)
+MAX_IMAGE_SIZE = 10 * 1024 * 1024
+
+# Soma máxima das imagens enviadas em uma mesma requisição (30 MiB)
+MAX_REQUEST_IMAGES_SIZE = 30 * 1024 * 1024
+
+# Corpo máximo de uma requisição multipart: imagens + campos do formulário
+MAX_REQUEST_BODY_SIZE = MAX_REQUEST_IMAGES_SIZE + 1024 * 1024
+
+# Bytes lidos do início do arquivo para identificar o formato real
+MAGIC_BYTES_SIZE = 16
+
+# Caminhos por chamada `remove([...])` do storage
+REMOVE_BATCH_SIZE = 100
@@ -0,0 +1,69 @@
+from fastapi import HTTPException, status
+
+from acesso_livre_api.storage.dependencies import (
+    MAX_IMAGE_SIZE,
+    MAX_REQUEST_IMAGES_SIZE,
+)
+
+
+def _megabytes(size: int) -> int:
+    return size // (1024 * 1024)
+
+
+class UploadException(HTTPException):
+    """Classe base para as exceções de validação de uploads"""
+
+    def __init__(
+        self,
+        status_code: int,
+        detail: str,
+        headers: dict[str, str] | None = None,
+    ):
+        super().__init__(
+            status_code=status_code,
+            detail=detail,
+            headers=headers,
+        )
+
+
+class UnsupportedImageTypeException(UploadException):
+    """Exceção lançada quando o conteúdo do arquivo não é de um formato de imagem aceito"""
+
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Formato de arquivo não suportado. Envie imagens JPEG, PNG, WebP ou HEIC",
+        )
+
+
+class InvalidImageException(UploadException):
+    """Exceção lançada quando o arquivo tem assinatura de imagem, mas não pode ser decodificado"""
+
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+            detail="Imagem corrompida ou incompleta",
+        )
+
+
+class ImageTooLargeException(UploadException):
+    """Exceção lançada quando uma imagem excede o tamanho máximo por arquivo"""
+
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+            detail=f"Imagem excede o tamanho máximo de {_megabytes(MAX_IMAGE_SIZE)} MB",
+        )
+
+
+class UploadTooLargeException(UploadException):
+    """Exceção lançada quando o total enviado na requisição excede o limite"""
+
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+            detail=(
+                "O total das imagens excede o limite de "
+                f"{_megabytes(MAX_REQUEST_IMAGES_SIZE)} MB por requisição"
+            ),
+        )
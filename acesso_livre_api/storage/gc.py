@@ -0,0 +1,306 @@
+"""Coleta de objetos órfãos dos buckets de imagens e de ícones.
+
+O upload acontece antes do commit (criação de comentários e rotas de ícones),
+então uma falha no banco deixa no bucket objetos que nada referencia. Este job
+percorre o bucket página por página, monta o conjunto de caminhos referenciados
+pelo banco e remove os objetos sem referência mais antigos que o período de
+carência (que protege uploads cujo commit ainda está em andamento).
+
+O bucket de imagens é sempre varrido; o bucket público de ícones
+(`PUBLIC_BUCKET_NAME`), quando configurado, também.
+
+Uso:
+    python -m acesso_livre_api.storage.gc [--dry-run] [--grace-hours 24]
+"""
+
+import argparse
+import asyncio
+import logging
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from typing import Protocol
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from acesso_livre_api.src.comments import models as comment_models
+from acesso_livre_api.src.config import settings
+from acesso_livre_api.src.database import AsyncSessionLocal
+from acesso_livre_api.src.locations import models as location_models
+from acesso_livre_api.storage.client import supabase_client
+from acesso_livre_api.storage.delete_image import delete_images
+from acesso_livre_api.storage.image_processing import with_variant_paths
+from acesso_livre_api.storage.models import StorageDeletion, StoredObject
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_GRACE_PERIOD = timedelta(hours=24)
+LIST_PAGE_SIZE = 1000
+
+
+@dataclass(frozen=True, slots=True)
+class BucketObject:
+    """Objeto listado no bucket."""
+
+    path: str
+    created_at: datetime | None
+
+
+class Bucket(Protocol):
+    """Operações de bucket usadas pelo GC (implementadas pelo Supabase e por fakes)."""
+
+    async def list_page(self, prefix: str, limit: int, offset: int) -> list[dict]: ...
+
+    async def remove(self, paths: list[str]) -> dict[str, bool]: ...
+
+
+class SupabaseBucket:
+    """Bucket do Supabase Storage."""
+
+    def __init__(self, name: str | None = None):
+        self.name = name or settings.bucket_name
+
+    async def list_page(self, prefix: str, limit: int, offset: int) -> list[dict]:
+        def _list():
+            client = supabase_client()
+            return client.storage.from_(self.name).list(
+                prefix,
+                {
+                    "limit": limit,
+                    "offset": offset,
+                    "sortBy": {"column": "name", "order": "asc"},
+                },
+            )
+
+        return await run_in_threadpool(_list)
+
+    async def remove(self, paths: list[str]) -> dict[str, bool]:
+        return await delete_images(paths, include_variants=False, bucket=self.name)
+
+    async def exists(self, path: str) -> bool:
+        def _exists():
+            return supabase_client().storage.from_(self.name).exists(path)
+
+        return await run_in_threadpool(_exists)
+
+    async def download(self, path: str) -> bytes:
+        def _download():
+            return supabase_client().storage.from_(self.name).download(path)
+
+        return await run_in_threadpool(_download)
+
+    async def upload(self, path: str, data: bytes, content_type: str) -> None:
+        def _upload():
+            supabase_client().storage.from_(self.name).upload(
+                path, data, {"content-type": content_type, "upsert": "false"}
+            )
+
+        await run_in_threadpool(_upload)
+
+
+@dataclass
+class GCReport:
+    """Resultado de uma execução do GC."""
+
+    dry_run: bool
+    scanned: int = 0
+    referenced: int = 0
+    too_recent: int = 0
+    orphaned: list[str] = field(default_factory=list)
+    deleted: int = 0
+    failed: int = 0
+
+
+def _parse_timestamp(value: str | None) -> datetime | None:
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=UTC)
+
+
+async def iter_bucket_objects(bucket: Bucket, page_size: int = LIST_PAGE_SIZE):
+    """Percorre todos os objetos do bucket, página por página (pastas incluídas)."""
+    prefixes = [""]
+    while prefixes:
+        prefix = prefixes.pop()
+        offset = 0
+        while True:
+            page = await bucket.list_page(prefix, page_size, offset)
+            for entry in page:
+                path = f"{prefix}/{entry['name']}" if prefix else entry["name"]
+                # Pastas são listadas sem id; seus objetos vêm em outra listagem
+                if entry.get("id") is None:
+                    prefixes.append(path)
+                    continue
+                yield BucketObject(path, _parse_timestamp(entry.get("created_at")))
+
+            if len(page) < page_size:
+                break
+            offset += page_size
+
+
+def _paths(values: Iterable) -> set[str]:
+    return {value for value in values if value}
+
+
+async def referenced_paths(db: AsyncSession, bucket: str | None = None) -> set[str]:
+    """Caminhos referenciados pelo banco no bucket: imagens (com variantes), ícones,
+    objetos deduplicados e o outbox.
+
+    O bucket público de ícones só guarda ícones, então nele as imagens de
+    comentários e locais não contam.
+    """
+    bucket = bucket or settings.bucket_name
+    icons_only = bucket != settings.bucket_name
+
+    images: set[str] = set()
+    if not icons_only:
+        result = await db.execute(
+            select(comment_models.Comment.images).where(
+                comment_models.Comment.images.isnot(None)
+            )
+        )
+        for paths in result.scalars():
+            images.update(_paths(paths or []))
+
+        result = await db.execute(select(location_models.LocationImage.path).distinct())
+        images.update(_paths(result.scalars()))
+
+    # Objetos registrados na deduplicação podem ser reutilizados por novos uploads
+    result = await db.execute(
+        select(StoredObject.path, StoredObject.with_variants).where(
+            StoredObject.bucket == bucket
+        )
+    )
+    icons: set[str] = set()
+    for path, with_variants in result.all():
+        (images if with_variants else icons).add(path)
+
+    referenced = set(with_variant_paths(sorted(images)))
+    referenced.update(icons)
+
+    for column in (
+        location_models.AccessibilityItem.icon_url,
+        comment_models.CommentIcon.icon_url,
+    ):
+        result = await db.execute(select(column))
+        referenced.update(_paths(result.scalars()))
+
+    # Objetos já enfileirados no outbox serão removidos pelo worker
+    result = await db.execute(
+        select(StorageDeletion.path).where(StorageDeletion.bucket == bucket)
+    )
+    referenced.update(_paths(result.scalars()))
+    return referenced
+
+
+async def collect_garbage(
+    db: AsyncSession,
+    bucket: Bucket,
+    grace_period: timedelta = DEFAULT_GRACE_PERIOD,
+    dry_run: bool = False,
+    page_size: int = LIST_PAGE_SIZE,
+    bucket_name: str | None = None,
+) -> GCReport:
+    """Remove do bucket os objetos sem referência no banco.
+
+    A listagem termina antes de qualquer remoção, para que a paginação por
+    offset não pule objetos.
+
+    Args:
+        db: Sessão do banco
+        bucket: Bucket a ser varrido
+        grace_period: Idade mínima de um objeto órfão para ser removido
+        dry_run: Apenas relata os órfãos, sem remover
+        page_size: Objetos por página de listagem
+        bucket_name: Nome do bucket varrido (padrão: settings.bucket_name)
+    """
+    report = GCReport(dry_run=dry_run)
+    referenced = await referenced_paths(db, bucket_name)
+    cutoff = datetime.now(UTC) - grace_period
+
+    async for obj in iter_bucket_objects(bucket, page_size):
+        report.scanned += 1
+        if obj.path in referenced:
+            report.referenced += 1
+        elif obj.created_at is None or obj.created_at > cutoff:
+            report.too_recent += 1
+        else:
+            report.orphaned.append(obj.path)
+
+    if report.orphaned and not dry_run:
+        results = await bucket.remove(report.orphaned)
+        report.deleted = sum(1 for path in report.orphaned if results.get(path))
+        report.failed = len(report.orphaned) - report.deleted
+
+    logger.info(
+        "GC do bucket %s%s: %s objetos, %s referenciados, %s recentes, %s órfãos, "
+        "%s removidos, %s falhas",
+        bucket_name or settings.bucket_name,
+        " (dry-run)" if dry_run else "",
+        report.scanned,
+        report.referenced,
+        report.too_recent,
+        len(report.orphaned),
+        report.deleted,
+        report.failed,
+    )
+    return report
+
+
+def gc_bucket_names() -> list[str]:
+    """Buckets varridos pelo GC: o de imagens e, se configurado, o público de ícones."""
+    names = [settings.bucket_name]
+    if (
+        settings.public_bucket_name
+        and settings.public_bucket_name != settings.bucket_name
+    ):
+        names.append(settings.public_bucket_name)
+    return names
+
+
+async def main(argv: list[str] | None = None) -> list[GCReport]:
+    parser = argparse.ArgumentParser(
+        description="Remove objetos órfãos dos buckets de imagens e de ícones"
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="apenas lista os órfãos, sem remover"
+    )
+    parser.add_argument(
+        "--grace-hours",
+        type=float,
+        default=DEFAULT_GRACE_PERIOD.total_seconds() / 3600,
+        help="idade mínima, em horas, de um órfão para ser removido (padrão: 24)",
+    )
+    args = parser.parse_args(argv)
+
+    reports = []
+    for name in gc_bucket_names():
+        async with AsyncSessionLocal() as db:
+            report = await collect_garbage(
+                db,
+                SupabaseBucket(name),
+                grace_period=timedelta(hours=args.grace_hours),
+                dry_run=args.dry_run,
+                bucket_name=name,
+            )
+
+        for path in report.orphaned:
+            print(f"{name}/{path}")
+        print(
+            f"{name}: {report.scanned} objetos, {len(report.orphaned)} órfãos, "
+            f"{report.deleted} removidos, {report.failed} falhas"
+            + (" (dry-run)" if report.dry_run else "")
+        )
+        reports.append(report)
+    return reports
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
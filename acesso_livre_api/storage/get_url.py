@@ -1,11 +1,15 @@
 import asyncio
 import logging
+import time
+from urllib.parse import quote
+
 from cachetools import TTLCache
 from fastapi.concurrency import run_in_threadpool
+from jose import jwt
 
 logger = logging.getLogger(__name__)
 from acesso_livre_api.src.config import settings
-from acesso_livre_api.storage.client import supabase_client
+from acesso_livre_api.storage.client import storage_public_url, supabase_client
 
 _semaphore = asyncio.Semaphore(10)  # Máximo 10 requisições paralelas
 
@@ -14,11 +18,38 @@ _url_cache: TTLCache = TTLCache(maxsize=1000, ttl=3300)
 _cache_lock = asyncio.Lock()
 
 
+def sign_url_locally(
+    file_path: str, expires_in: int = 3600, bucket: str | None = None
+) -> str:
+    """Builds a Supabase Storage signed URL locally, without a network call.
+
+    Produces the same format as `create_signed_url`: a HS256 JWT with the
+    object URL (`{bucket}/{path}`) and expiry, signed with the project's JWT
+    secret (`storage_jwt_secret`), sent as the `token` query parameter.
+    """
+    bucket = bucket or settings.bucket_name
+    issued_at = int(time.time())
+    token = jwt.encode(
+        {
+            "url": f"{bucket}/{file_path}",
+            "iat": issued_at,
+            "exp": issued_at + expires_in,
+        },
+        settings.storage_jwt_secret,
+        algorithm="HS256",
+    )
+    base_url = settings.bucket_endpoint_url.rstrip("/")
+    return f"{base_url}/storage/v1/object/sign/{bucket}/{quote(file_path)}?token={token}"
+
+
 async def get_signed_url(file_path: str, expires_in: int = 3600) -> str:
     """Returns a signed URL for a file in Supabase storage that expires after a given time.
     
     Uses in-memory cache to avoid repeated calls to Supabase for the same file.
     Cache TTL is 55 minutes (5 minutes before the signed URL expires).
+
+    With `storage_jwt_secret` configured the URL is signed locally (CPU only);
+    otherwise it is requested from Supabase.
     """
     # Verificar cache primeiro
     cache_key = f"{file_path}:{expires_in}"
@@ -27,7 +58,18 @@ async def get_signed_url(file_path: str, expires_in: int = 3600) -> str:
         if cache_key in _url_cache:
             logger.debug(f"Cache HIT for {file_path}")
             return _url_cache[cache_key]
-    
+
+    if settings.storage_jwt_secret:
+        # Assinatura local: sem semáforo nem threadpool, não há chamada de rede
+        try:
+            signed_url = sign_url_locally(file_path, expires_in)
+        except Exception as e:
+            logger.error("Error signing URL locally for %s: %s", file_path, str(e))
+            return None
+        async with _cache_lock:
+            _url_cache[cache_key] = signed_url
+        return signed_url
+
     async with _semaphore:  # Controla concorrência
         try:
             # Double-check cache após adquirir semaphore (outra task pode ter preenchido)
@@ -57,12 +99,81 @@ async def get_signed_url(file_path: str, expires_in: int = 3600) -> str:
 
 
 async def get_signed_urls(file_paths: list[str], expires_in: int = 3600) -> list[str]:
-    """Returns a list of signed URLs for multiple files in Supabase storage."""
+    """Returns a list of signed URLs for multiple files in Supabase storage.
+
+    Cached URLs are reused; the remaining files are signed locally when
+    `storage_jwt_secret` is configured, or otherwise requested from Supabase
+    in a single `create_signed_urls` call.
+    """
     if not file_paths:
         return []
 
-    signed_urls = await asyncio.gather(
-        *[get_signed_url(path, expires_in) for path in file_paths]
-    )
+    if settings.storage_jwt_secret:
+        return await asyncio.gather(
+            *[get_signed_url(path, expires_in) for path in file_paths]
+        )
+
+    signed: dict[str, str | None] = {}
+    async with _cache_lock:
+        for path in file_paths:
+            cache_key = f"{path}:{expires_in}"
+            if cache_key in _url_cache:
+                signed[path] = _url_cache[cache_key]
+
+    missing = [path for path in dict.fromkeys(file_paths) if path not in signed]
+    if missing:
+        signed.update(await _request_signed_urls(missing, expires_in))
+
+    return [signed.get(path) for path in file_paths]
+
+
+async def _request_signed_urls(
+    file_paths: list[str], expires_in: int
+) -> dict[str, str | None]:
+    """Requests signed URLs for several files from Supabase in one call and caches them."""
+    async with _semaphore:
+        def _create_signed_urls():
+            client = supabase_client()
+            return client.storage.from_(settings.bucket_name).create_signed_urls(
+                file_paths, expires_in
+            )
+
+        try:
+            response = await run_in_threadpool(_create_signed_urls)
+        except Exception as e:
+            logger.error("Error getting signed URLs for %d files: %s", len(file_paths), str(e))
+            return {}
+
+    signed = {
+        item["path"]: item.get("signedURL")
+        for item in response
+        if not item.get("error")
+    }
+    async with _cache_lock:
+        for path, signed_url in signed.items():
+            if signed_url:
+                _url_cache[f"{path}:{expires_in}"] = signed_url
+    logger.debug("Cache MISS - stored %d signed URLs", len(signed))
+    return signed
+
+
+async def get_icon_urls(file_paths: list[str]) -> list[str | None]:
+    """Returns URLs for icons (public UI assets, not user photos).
+
+    With `public_bucket_name` configured the icons live in a public bucket and
+    their URLs are stable and built locally, without any call to Supabase.
+    Otherwise they fall back to signed URLs like photos.
+    """
+    if not file_paths:
+        return []
+
+    if settings.public_bucket_name:
+        return [storage_public_url(path) if path else None for path in file_paths]
+
+    return await get_signed_urls(file_paths)
+
 
-    return signed_urls
+async def get_icon_url(file_path: str) -> str | None:
+    """Returns the URL of a single icon (see `get_icon_urls`)."""
+    urls = await get_icon_urls([file_path])
+    return urls[0]
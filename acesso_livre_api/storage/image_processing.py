@@ -0,0 +1,156 @@
+"""Pipeline de processamento de imagens executado no upload.
+
+Cada imagem enviada é decodificada com o Pillow em um pool de processos (para
+não bloquear o event loop) e gera:
+
+- o original sanitizado: orientação do EXIF aplicada e metadados removidos;
+  HEIC/HEIF é convertido para WebP, os demais formatos são mantidos;
+- as variantes `thumb` e `medium` em WebP, gravadas ao lado do original com o
+  mesmo UUID (`<uuid>_thumb.webp`, `<uuid>_medium.webp`).
+
+A troca de dados com o pool é feita por arquivos temporários, então apenas
+caminhos atravessam a fronteira entre processos.
+"""
+
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+from pillow_heif import register_heif_opener
+
+register_heif_opener()
+
+# Maior lado, em pixels, de cada variante gerada
+VARIANT_SIZES = {
+    "thumb": 320,
+    "medium": 1280,
+}
+VARIANT_FORMAT = "webp"
+
+WEBP_QUALITY = 80
+JPEG_QUALITY = 90
+
+# Formato de saída do original por formato de entrada (Pillow): extensão e MIME
+_ORIGINAL_OUTPUT = {
+    "JPEG": ("jpg", "image/jpeg"),
+    "PNG": ("png", "image/png"),
+    "WEBP": ("webp", "image/webp"),
+    "HEIF": ("webp", "image/webp"),
+}
+
+# Evita decodificar "bombas de descompressão" (dimensões absurdas em poucos bytes)
+Image.MAX_IMAGE_PIXELS = 50_000_000
+
+_POOL_WORKERS = 2
+_pool: ProcessPoolExecutor | None = None
+
+
+class InvalidImageError(ValueError):
+    """O arquivo enviado não pôde ser decodificado como imagem."""
+
+
+@dataclass(frozen=True, slots=True)
+class ProcessedFile:
+    """Arquivo gerado pelo pipeline, pronto para envio ao storage."""
+
+    filename: str
+    path: str
+    content_type: str
+
+
+def variant_path(file_path: str, variant: str) -> str:
+    """Caminho da variante de uma imagem ('abc.jpg', 'thumb') -> 'abc_thumb.webp'."""
+    stem = os.path.splitext(file_path)[0]
+    return f"{stem}_{variant}.{VARIANT_FORMAT}"
+
+
+def with_variant_paths(file_paths: list[str]) -> list[str]:
+    """Expande uma lista de originais com os caminhos de todas as suas variantes."""
+    return [
+        path
+        for file_path in file_paths
+        for path in (file_path, *(variant_path(file_path, v) for v in VARIANT_SIZES))
+    ]
+
+
+def _save(image: Image.Image, path: str, image_format: str) -> None:
+    if image_format == "JPEG":
+        image.convert("RGB").save(path, "JPEG", quality=JPEG_QUALITY, optimize=True)
+    elif image_format == "PNG":
+        image.save(path, "PNG", optimize=True)
+    else:
+        image.save(path, "WEBP", quality=WEBP_QUALITY, method=4)
+
+
+def process_image(
+    source_path: str, output_dir: str, image_id: str, with_variants: bool = True
+) -> list[ProcessedFile]:
+    """Gera o original sanitizado e as variantes (executado no pool de processos).
+
+    Returns:
+        Arquivos gerados; o primeiro é sempre o original.
+    """
+    try:
+        with Image.open(source_path) as opened:
+            source_format = opened.format
+            if source_format not in _ORIGINAL_OUTPUT:
+                raise InvalidImageError(f"Unsupported image format: {source_format}")
+            # Aplica a orientação do EXIF diretamente nos pixels
+            image = ImageOps.exif_transpose(opened)
+            image.load()
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError) as e:
+        raise InvalidImageError(f"Invalid image: {e}") from e
+
+    if image.mode not in ("RGB", "RGBA", "L", "LA"):
+        image = image.convert("RGBA" if image.has_transparency_data else "RGB")
+    # Remove EXIF/XMP (GPS, modelo do aparelho...); só o perfil de cor é mantido
+    image.info = {key: value for key, value in image.info.items() if key == "icc_profile"}
+
+    extension, content_type = _ORIGINAL_OUTPUT[source_format]
+    output_format = "WEBP" if extension == "webp" else source_format
+    original_name = f"{image_id}.{extension}"
+    original_path = os.path.join(output_dir, original_name)
+    _save(image, original_path, output_format)
+    files = [ProcessedFile(original_name, original_path, content_type)]
+
+    if with_variants:
+        for variant, max_side in VARIANT_SIZES.items():
+            resized = image.copy()
+            resized.thumbnail((max_side, max_side), Image.Resampling.LANCZOS)
+            name = variant_path(original_name, variant)
+            path = os.path.join(output_dir, name)
+            _save(resized, path, "WEBP")
+            files.append(ProcessedFile(name, path, "image/webp"))
+
+    return files
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        # "spawn" evita herdar threads e conexões do processo da API via fork
+        _pool = ProcessPoolExecutor(
+            max_workers=_POOL_WORKERS, mp_context=multiprocessing.get_context("spawn")
+        )
+    return _pool
+
+
+async def run_image_pipeline(
+    source_path: str, output_dir: str, image_id: str, with_variants: bool = True
+) -> list[ProcessedFile]:
+    """Executa `process_image` no pool de processos sem bloquear o event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _get_pool(), process_image, source_path, output_dir, image_id, with_variants
+    )
+
+
+def shutdown_image_pool() -> None:
+    """Encerra o pool de processos (chamado no shutdown da aplicação)."""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=True, cancel_futures=True)
+        _pool = None
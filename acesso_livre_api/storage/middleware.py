@@ -0,0 +1,64 @@
+"""Middleware que limita o tamanho do corpo de requisições multipart.
+
+O Starlette lê o multipart inteiro (para memória ou arquivo temporário) antes
+de a rota ser executada, então os limites aplicados em `upload_image` chegam
+tarde demais para poupar o worker. Este middleware rejeita o upload antes do
+parse: pelo `Content-Length` declarado, sem ler o corpo, ou, quando o
+cabeçalho não é enviado (transfer-encoding chunked), assim que os bytes
+recebidos ultrapassam o limite.
+"""
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from acesso_livre_api.storage.dependencies import MAX_REQUEST_BODY_SIZE
+from acesso_livre_api.storage.exceptions import UploadTooLargeException
+
+
+class UploadSizeLimitMiddleware:
+    """Rejeita com 413 requisições multipart maiores que `max_body_size`."""
+
+    def __init__(self, app: ASGIApp, max_body_size: int = MAX_REQUEST_BODY_SIZE):
+        self.app = app
+        self.max_body_size = max_body_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        content_type = headers.get(b"content-type", b"")
+        if not content_type.startswith(b"multipart/form-data"):
+            await self.app(scope, receive, send)
+            return
+
+        content_length = headers.get(b"content-length")
+        if content_length is not None and content_length.isdigit():
+            if int(content_length) > self.max_body_size:
+                await self._reject(scope, receive, send)
+                return
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body_size:
+                    # O FastAPI repassa HTTPExceptions levantadas durante o parse do corpo
+                    raise UploadTooLargeException()
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+    @staticmethod
+    async def _reject(scope: Scope, receive: Receive, send: Send) -> None:
+        exception = UploadTooLargeException()
+        response = JSONResponse(
+            {"detail": exception.detail},
+            status_code=exception.status_code,
+            headers={"connection": "close"},
+        )
+        await response(scope, receive, send)
@@ -0,0 +1,61 @@
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    Index,
+    Integer,
+    String,
+    Text,
+    UniqueConstraint,
+    func,
+)
+
+from acesso_livre_api.src.database import Base
+
+
+class StorageDeletion(Base):
+    """Objeto do storage aguardando remoção (outbox de deleções).
+
+    As linhas são inseridas na mesma transação que remove a referência ao
+    objeto e drenadas em lote pelo worker de `storage.outbox`.
+    """
+
+    __tablename__ = "storage_deletion_outbox"
+    __table_args__ = (
+        Index("ix_storage_deletion_outbox_next_attempt_at", "next_attempt_at"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    bucket = Column(String, nullable=False)
+    path = Column(String, nullable=False)
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime(timezone=True), nullable=False, default=func.now())
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), nullable=False, default=func.now())
+
+
+class StoredObject(Base):
+    """Objeto do storage endereçado pelo conteúdo (deduplicação de uploads).
+
+    Uploads com o mesmo SHA-256 reutilizam o objeto já existente em vez de
+    criar outro; `refcount` conta as linhas do banco que referenciam o caminho.
+    Quando a última referência é liberada, a linha é removida e o objeto vai
+    para o outbox de deleções.
+    """
+
+    __tablename__ = "stored_objects"
+    __table_args__ = (
+        UniqueConstraint(
+            "bucket", "content_hash", "with_variants", name="uq_stored_objects_content"
+        ),
+        UniqueConstraint("bucket", "path", name="uq_stored_objects_path"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    bucket = Column(String, nullable=False)
+    content_hash = Column(String(64), nullable=False)
+    # Originais de fotos têm variantes thumb/medium; ícones não
+    with_variants = Column(Boolean, nullable=False)
+    path = Column(String, nullable=False)
+    refcount = Column(Integer, nullable=False, default=1)
+    created_at = Column(DateTime(timezone=True), nullable=False, default=func.now())
@@ -0,0 +1,178 @@
+"""Outbox de deleções do storage.
+
+Os services não removem objetos do storage durante a requisição: chamam
+`enqueue_deletions` antes do commit, de modo que a remoção fica registrada na
+mesma transação que apaga a referência ao objeto. Um worker em background
+(iniciado no lifespan da aplicação) drena a tabela em lotes, usando chamadas
+`remove([...])` em lote por bucket, e reagenda as falhas com backoff
+exponencial. Assim nenhum objeto fica órfão por uma falha momentânea do storage
+e a requisição não espera pelo Supabase.
+"""
+
+import asyncio
+import logging
+from collections import defaultdict
+from collections.abc import Callable, Iterable
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from acesso_livre_api.src.config import settings
+from acesso_livre_api.storage.delete_image import delete_images
+from acesso_livre_api.storage.image_processing import with_variant_paths
+from acesso_livre_api.storage.models import StorageDeletion
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 100
+POLL_INTERVAL_SECONDS = 5.0
+
+# Backoff das falhas: 30s, 1min, 2min, ... limitado a 1h
+BACKOFF_BASE_SECONDS = 30
+BACKOFF_MAX_SECONDS = 60 * 60
+
+
+def enqueue_deletions(
+    db: AsyncSession,
+    file_paths: Iterable[str],
+    bucket: str | None = None,
+    include_variants: bool = True,
+) -> None:
+    """Registra objetos para remoção, sem commit (faz parte da transação do chamador).
+
+    Args:
+        db: Sessão da transação que remove as referências aos objetos
+        file_paths: Caminhos dos objetos no bucket
+        bucket: Bucket dos objetos (padrão: settings.bucket_name)
+        include_variants: Também remove as variantes (thumb/medium) de cada imagem
+    """
+    paths = [path for path in file_paths if path]
+    if not paths:
+        return
+    if include_variants:
+        paths = with_variant_paths(paths)
+
+    bucket = bucket or settings.bucket_name
+    db.add_all([StorageDeletion(bucket=bucket, path=path, attempts=0) for path in paths])
+
+
+def backoff_delay(attempts: int) -> timedelta:
+    """Intervalo até a próxima tentativa após `attempts` falhas."""
+    seconds = min(BACKOFF_BASE_SECONDS * 2 ** (attempts - 1), BACKOFF_MAX_SECONDS)
+    return timedelta(seconds=seconds)
+
+
+async def process_outbox_batch(db: AsyncSession, batch_size: int = BATCH_SIZE) -> int:
+    """Processa um lote de deleções vencidas.
+
+    As linhas são travadas com `FOR UPDATE SKIP LOCKED` (no Postgres), então
+    várias instâncias da API podem drenar o outbox em paralelo.
+
+    Returns:
+        Quantidade de deleções processadas (com sucesso ou reagendadas)
+    """
+    now = datetime.now(UTC)
+    stmt = (
+        select(StorageDeletion)
+        .where(StorageDeletion.next_attempt_at <= now)
+        .order_by(StorageDeletion.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    result = await db.execute(stmt)
+    entries = result.scalars().all()
+    if not entries:
+        await db.rollback()
+        return 0
+
+    by_bucket: dict[str, list[StorageDeletion]] = defaultdict(list)
+    for entry in entries:
+        by_bucket[entry.bucket].append(entry)
+
+    done_ids: list[int] = []
+    for bucket, bucket_entries in by_bucket.items():
+        results = await delete_images(
+            [entry.path for entry in bucket_entries],
+            include_variants=False,
+            bucket=bucket,
+        )
+        failed = 0
+        for entry in bucket_entries:
+            if results.get(entry.path):
+                done_ids.append(entry.id)
+                continue
+            failed += 1
+            entry.attempts += 1
+            entry.next_attempt_at = now + backoff_delay(entry.attempts)
+            entry.last_error = "Falha na remoção do storage"
+
+        if failed:
+            logger.warning(
+                "Falha ao remover %s objetos do bucket %s. Nova tentativa agendada",
+                failed,
+                bucket,
+            )
+
+    if done_ids:
+        await db.execute(
+            delete(StorageDeletion)
+            .where(StorageDeletion.id.in_(done_ids))
+            .execution_options(synchronize_session=False)
+        )
+    await db.commit()
+
+    logger.info(
+        "Outbox do storage: %s objetos removidos, %s reagendados",
+        len(done_ids),
+        len(entries) - len(done_ids),
+    )
+    return len(entries)
+
+
+async def run_outbox_worker(
+    session_factory: Callable[[], AsyncSession],
+    poll_interval: float = POLL_INTERVAL_SECONDS,
+    batch_size: int = BATCH_SIZE,
+) -> None:
+    """Drena o outbox continuamente até ser cancelado.
+
+    Lotes cheios são processados em sequência; quando não há trabalho vencido o
+    worker espera `poll_interval` segundos antes de consultar de novo.
+    """
+    while True:
+        try:
+            async with session_factory() as db:
+                processed = await process_outbox_batch(db, batch_size)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error("Erro ao processar o outbox do storage: %s", str(e))
+            processed = 0
+
+        if processed < batch_size:
+            await asyncio.sleep(poll_interval)
+
+
+_worker_task: asyncio.Task | None = None
+
+
+def start_outbox_worker(session_factory: Callable[[], AsyncSession]) -> None:
+    """Inicia o worker do outbox (chamado no startup da aplicação)."""
+    global _worker_task
+    if _worker_task is None or _worker_task.done():
+        _worker_task = asyncio.create_task(run_outbox_worker(session_factory))
+
+
+async def stop_outbox_worker() -> None:
+    """Cancela o worker do outbox (chamado no shutdown da aplicação)."""
+    global _worker_task
+    if _worker_task is None:
+        return
+
+    _worker_task.cancel()
+    try:
+        await _worker_task
+    except asyncio.CancelledError:
+        pass
+    _worker_task = None
@@ -0,0 +1,202 @@
+"""Cópia dos ícones existentes para o bucket público (`PUBLIC_BUCKET_NAME`).
+
+Com o bucket público configurado, as URLs dos ícones apontam para ele, mas os
+ícones enviados antes da configuração continuam no bucket de imagens. Este
+job copia para o bucket público cada ícone referenciado pelo banco que ainda
+não esteja lá e passa para ele os registros de deduplicação desses ícones,
+para que liberações e novos uploads usem o bucket certo.
+
+Deve ser executado antes de configurar `PUBLIC_BUCKET_NAME` na API (e pode
+ser repetido depois, sem efeito para ícones já copiados). As cópias antigas
+ficam no bucket de imagens até o GC removê-las, depois que os ícones forem
+excluídos.
+
+Uso:
+    python -m acesso_livre_api.storage.publish_icons [--dry-run] [--bucket NOME]
+"""
+
+import argparse
+import asyncio
+import logging
+import mimetypes
+from dataclasses import dataclass, field
+from typing import Protocol
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from acesso_livre_api.src.comments import models as comment_models
+from acesso_livre_api.src.config import settings
+from acesso_livre_api.src.database import AsyncSessionLocal
+from acesso_livre_api.src.locations import models as location_models
+from acesso_livre_api.storage.gc import SupabaseBucket
+from acesso_livre_api.storage.models import StoredObject
+
+logger = logging.getLogger(__name__)
+
+
+class CopyableBucket(Protocol):
+    """Operações de bucket usadas na cópia (implementadas pelo Supabase e por fakes)."""
+
+    name: str
+
+    async def exists(self, path: str) -> bool: ...
+
+    async def download(self, path: str) -> bytes: ...
+
+    async def upload(self, path: str, data: bytes, content_type: str) -> None: ...
+
+
+@dataclass
+class PublishReport:
+    """Resultado de uma execução da cópia."""
+
+    dry_run: bool
+    copied: list[str] = field(default_factory=list)
+    already_public: int = 0
+    missing: list[str] = field(default_factory=list)
+    failed: list[str] = field(default_factory=list)
+    registrations_moved: int = 0
+
+
+async def icon_paths(db: AsyncSession) -> list[str]:
+    """Caminhos de todos os ícones referenciados pelo banco, sem repetição."""
+    paths: set[str] = set()
+    for column in (
+        location_models.AccessibilityItem.icon_url,
+        comment_models.CommentIcon.icon_url,
+    ):
+        result = await db.execute(select(column).where(column.isnot(None)).distinct())
+        paths.update(path for path in result.scalars() if path)
+    return sorted(paths)
+
+
+async def _move_registrations(
+    db: AsyncSession, paths: list[str], source: str, target: str
+) -> int:
+    """Passa para o bucket público os registros de deduplicação dos ícones copiados.
+
+    Registros cujo conteúdo já está registrado no bucket público ficam onde estão.
+    """
+    if not paths:
+        return 0
+
+    public = aliased(StoredObject)
+    taken = select(public.content_hash).where(
+        public.bucket == target, public.with_variants.is_(False)
+    )
+    result = await db.execute(
+        update(StoredObject)
+        .where(
+            StoredObject.bucket == source,
+            StoredObject.with_variants.is_(False),
+            StoredObject.path.in_(paths),
+            StoredObject.content_hash.not_in(taken),
+        )
+        .values(bucket=target)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
+async def publish_icons(
+    db: AsyncSession,
+    source: CopyableBucket,
+    target: CopyableBucket,
+    dry_run: bool = False,
+) -> PublishReport:
+    """Copia para `target` os ícones referenciados que ainda só existem em `source`.
+
+    Args:
+        db: Sessão do banco
+        source: Bucket de imagens, onde os ícones antigos foram enviados
+        target: Bucket público de ícones
+        dry_run: Apenas relata o que seria copiado
+    """
+    report = PublishReport(dry_run=dry_run)
+    published: list[str] = []
+
+    for path in await icon_paths(db):
+        try:
+            if await target.exists(path):
+                report.already_public += 1
+                published.append(path)
+                continue
+            if not await source.exists(path):
+                report.missing.append(path)
+                continue
+            if dry_run:
+                report.copied.append(path)
+                continue
+
+            content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+            await target.upload(path, await source.download(path), content_type)
+        except Exception as e:
+            logger.error("Falha ao copiar o ícone %s: %s", path, str(e))
+            report.failed.append(path)
+            continue
+
+        report.copied.append(path)
+        published.append(path)
+
+    if not dry_run:
+        report.registrations_moved = await _move_registrations(
+            db, published, source.name, target.name
+        )
+        await db.commit()
+
+    logger.info(
+        "Cópia de ícones para %s%s: %s copiados, %s já públicos, %s ausentes, %s falhas",
+        target.name,
+        " (dry-run)" if dry_run else "",
+        len(report.copied),
+        report.already_public,
+        len(report.missing),
+        len(report.failed),
+    )
+    return report
+
+
+async def main(argv: list[str] | None = None) -> PublishReport:
+    parser = argparse.ArgumentParser(
+        description="Copia os ícones existentes para o bucket público"
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="apenas lista os ícones a copiar"
+    )
+    parser.add_argument(
+        "--bucket",
+        default=settings.public_bucket_name,
+        help="bucket público de destino (padrão: PUBLIC_BUCKET_NAME)",
+    )
+    args = parser.parse_args(argv)
+    if not args.bucket:
+        parser.error("informe --bucket ou configure PUBLIC_BUCKET_NAME")
+
+    async with AsyncSessionLocal() as db:
+        report = await publish_icons(
+            db,
+            SupabaseBucket(settings.bucket_name),
+            SupabaseBucket(args.bucket),
+            dry_run=args.dry_run,
+        )
+
+    for path in report.copied:
+        print(path)
+    for path in report.missing:
+        print(f"ausente: {path}")
+    for path in report.failed:
+        print(f"falha: {path}")
+    print(
+        f"{len(report.copied)} copiados, {report.already_public} já públicos, "
+        f"{len(report.missing)} ausentes, {len(report.failed)} falhas, "
+        f"{report.registrations_moved} registros movidos"
+        + (" (dry-run)" if report.dry_run else "")
+    )
+    return report
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
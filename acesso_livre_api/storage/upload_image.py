@@ -1,32 +1,305 @@
+import asyncio
+import hashlib
 import logging
+import os
+import tempfile
+import time
 import uuid
+from collections.abc import AsyncIterator
+
 from fastapi import UploadFile
 from fastapi.concurrency import run_in_threadpool
-from acesso_livre_api.storage.client import supabase_client
-from acesso_livre_api.storage.dependencies import ALLOWED_MIME_TYPES
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from acesso_livre_api.src.config import settings
+from acesso_livre_api.storage.client import (
+    icon_bucket_name,
+    storage_auth_headers,
+    storage_http_client,
+    storage_object_url,
+)
+from acesso_livre_api.storage.dedup import acquire_object, register_object
+from acesso_livre_api.storage.delete_image import delete_images
+from acesso_livre_api.storage.dependencies import (
+    ALLOWED_MIME_TYPES,
+    MAGIC_BYTES_SIZE,
+    MAX_IMAGE_SIZE,
+    MAX_REQUEST_IMAGES_SIZE,
+    UPLOAD_CHUNK_SIZE,
+)
+from acesso_livre_api.storage.exceptions import (
+    ImageTooLargeException,
+    InvalidImageException,
+    UnsupportedImageTypeException,
+    UploadTooLargeException,
+)
+from acesso_livre_api.storage.image_processing import (
+    InvalidImageError,
+    ProcessedFile,
+    run_image_pipeline,
+)
 
-async def upload_image(file: UploadFile) -> str:
-    """Uploads an image file to Supabase storage and returns the unique_filename."""
-    try:
-        client = supabase_client()
-        file_extension = file.filename.split(".")[-1]
-        unique_filename = f"{uuid.uuid4()}.{file_extension}"
-        file_content = await run_in_threadpool(file.file.read)
-
-        if file.content_type not in ALLOWED_MIME_TYPES:
-            raise ValueError("Unsupported file type")
-
-        # avoid blocking the event loop.
-        await run_in_threadpool(
-            client.storage.from_("acesso-livre-bucket").upload,
-            path=unique_filename,
-            file=file_content,
-            file_options={"content-type": file.content_type},
+logger = logging.getLogger(__name__)
+
+_semaphore = asyncio.Semaphore(5)  # Máximo 5 uploads paralelos
+
+# Brands do box `ftyp` dos contêineres HEIF (ISO/IEC 23008-12)
+_HEIC_BRANDS = {b"heic", b"heix", b"hevc", b"hevx"}
+_HEIF_BRANDS = {b"mif1", b"msf1", b"heim", b"heis"}
+
+
+def sniff_image_type(header: bytes) -> str | None:
+    """Identifies the image format from its magic bytes.
+
+    Args:
+        header: First bytes of the file (at least MAGIC_BYTES_SIZE when available)
+
+    Returns:
+        The MIME type of the detected format, or None if it is not a supported image
+    """
+    if header.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if header.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        return "image/webp"
+    if header[4:8] == b"ftyp":
+        brand = header[8:12]
+        if brand in _HEIC_BRANDS:
+            return "image/heic"
+        if brand in _HEIF_BRANDS:
+            return "image/heif"
+    return None
+
+
+async def _iter_chunks(
+    file: UploadFile, header: bytes, hasher: "hashlib._Hash"
+) -> AsyncIterator[bytes]:
+    """Yields the upload in fixed-size chunks, enforcing the size limit and hashing while streaming."""
+    total = len(header)
+    hasher.update(header)
+    yield header
+
+    while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+        total += len(chunk)
+        if total > MAX_IMAGE_SIZE:
+            raise ImageTooLargeException()
+        hasher.update(chunk)
+        yield chunk
+
+
+async def _write_to_disk(chunks: AsyncIterator[bytes], path: str) -> None:
+    with open(path, "wb") as output:
+        async for chunk in chunks:
+            await run_in_threadpool(output.write, chunk)
+
+
+async def _iter_file(path: str) -> AsyncIterator[bytes]:
+    with open(path, "rb") as source:
+        while chunk := await run_in_threadpool(source.read, UPLOAD_CHUNK_SIZE):
+            yield chunk
+
+
+async def _upload_processed_file(processed: ProcessedFile, bucket: str) -> str:
+    """Streams a file generated by the pipeline to storage in chunks."""
+    headers = {
+        **storage_auth_headers(),
+        "Content-Type": processed.content_type,
+        "Content-Length": str(os.path.getsize(processed.path)),
+        "Cache-Control": "max-age=3600",
+        "x-upsert": "false",
+    }
+
+    async with storage_http_client() as client:
+        response = await client.post(
+            storage_object_url(processed.filename, bucket),
+            content=_iter_file(processed.path),
+            headers=headers,
         )
+        response.raise_for_status()
+
+    return processed.filename
+
+
+async def upload_image(
+    file: UploadFile, with_variants: bool = True, db: AsyncSession | None = None
+) -> str:
+    """Uploads an image file to Supabase storage and returns the unique_filename.
+
+    The upload is streamed in chunks of UPLOAD_CHUNK_SIZE bytes to a temporary
+    file, processed in the image pipeline (EXIF stripped, HEIC converted to
+    WebP, thumb/medium variants) and each output is streamed to storage, so
+    memory per upload stays bounded in the API process regardless of the image
+    size.
+
+    The client-sent content type is not trusted: only the first MAGIC_BYTES_SIZE
+    bytes are read to sniff the real format, and the declared size is checked,
+    before anything is written. The size limit is enforced again while streaming.
+
+    With a database session the upload is content-addressed: the SHA-256 computed
+    while streaming is looked up in `stored_objects` and identical content reuses
+    the existing object (no processing, no upload), adding a reference in the
+    caller's transaction.
+
+    Args:
+        file: Uploaded image
+        with_variants: Also generate the thumb/medium variants. Disabled for icons,
+            which are stored in the icon bucket (`icon_bucket_name`)
+        db: Session of the transaction that will reference the image (enables dedup)
+
+    Raises:
+        UnsupportedImageTypeException: The content is not a supported image (415)
+        InvalidImageException: The image is corrupt or truncated (422)
+        ImageTooLargeException: The file exceeds MAX_IMAGE_SIZE (413)
+    """
+    path, _ = await _store_image(file, with_variants, db)
+    return path
 
-        return unique_filename
+
+async def _store_image(
+    file: UploadFile, with_variants: bool, db: AsyncSession | None
+) -> tuple[str, bool]:
+    """Implementation of `upload_image`.
+
+    Returns:
+        The stored path and whether a new object was uploaded (False when reused)
+    """
+    bucket = settings.bucket_name if with_variants else icon_bucket_name()
+    try:
+        if file.size is not None and file.size > MAX_IMAGE_SIZE:
+            raise ImageTooLargeException()
+
+        await file.seek(0)
+        header = await file.read(MAGIC_BYTES_SIZE)
+        sniffed_type = sniff_image_type(header)
+        if sniffed_type not in ALLOWED_MIME_TYPES:
+            raise UnsupportedImageTypeException()
+        if sniffed_type != file.content_type:
+            logger.info(
+                "Tipo declarado %s difere do conteúdo de %s (%s)",
+                file.content_type,
+                file.filename,
+                sniffed_type,
+            )
+
+        with tempfile.TemporaryDirectory(prefix="upload-") as workdir:
+            source_path = os.path.join(workdir, "source")
+            hasher = hashlib.sha256()
+            await _write_to_disk(_iter_chunks(file, header, hasher), source_path)
+            content_hash = hasher.hexdigest()
+
+            if db is not None:
+                existing_path = await acquire_object(
+                    db, content_hash, with_variants, bucket
+                )
+                if existing_path:
+                    logger.info(
+                        "Conteúdo de %s já armazenado; reutilizando %s",
+                        file.filename,
+                        existing_path,
+                    )
+                    return existing_path, False
+
+            try:
+                processed_files = await run_image_pipeline(
+                    source_path, workdir, str(uuid.uuid4()), with_variants
+                )
+            except InvalidImageError as e:
+                # Assinatura de imagem válida, mas conteúdo corrompido ou truncado
+                logger.info("Imagem %s não pôde ser decodificada: %s", file.filename, e)
+                raise InvalidImageException() from e
+
+            results = await asyncio.gather(
+                *[
+                    _upload_processed_file(processed, bucket)
+                    for processed in processed_files
+                ],
+                return_exceptions=True,
+            )
+
+        uploaded = [result for result in results if isinstance(result, str)]
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if errors:
+            # Original e variantes são tudo ou nada
+            await delete_images(uploaded, include_variants=False, bucket=bucket)
+            raise errors[0]
+
+        path = processed_files[0].filename
+        if db is not None:
+            await register_object(db, content_hash, with_variants, path, bucket)
+        return path, True
 
     except Exception as e:
         logging.error(f"Error uploading image: {str(e)}")
         raise e
+
+
+async def _timed_upload(file: UploadFile, db: AsyncSession | None) -> tuple[str, bool]:
+    async with _semaphore:
+        started = time.perf_counter()
+        unique_filename, created = await _store_image(file, True, db)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        logger.info(
+            "Upload de %s (%s bytes) concluído em %.1f ms como %s",
+            file.filename,
+            file.size,
+            elapsed_ms,
+            unique_filename,
+        )
+        return unique_filename, created
+
+
+async def upload_images(
+    files: list[UploadFile], db: AsyncSession | None = None
+) -> list[str]:
+    """Envia várias imagens ao storage em paralelo (tudo ou nada).
+
+    Os uploads rodam concorrentemente, limitados pelo semáforo do módulo. Se
+    algum falhar, as imagens enviadas por esta chamada são removidas do storage
+    (objetos reutilizados pela deduplicação são mantidos) e a primeira exceção é
+    propagada. A soma dos tamanhos declarados é validada contra
+    MAX_REQUEST_IMAGES_SIZE antes de qualquer byte ser lido.
+
+    Args:
+        files: Imagens enviadas
+        db: Sessão da transação que vai referenciar as imagens (habilita a deduplicação)
+
+    Returns:
+        Nomes únicos dos arquivos, na mesma ordem de `files`
+
+    Raises:
+        UploadTooLargeException: O total das imagens excede o limite por requisição (413)
+    """
+    if not files:
+        return []
+
+    declared_total = sum(file.size or 0 for file in files)
+    if declared_total > MAX_REQUEST_IMAGES_SIZE:
+        raise UploadTooLargeException()
+
+    started = time.perf_counter()
+    results = await asyncio.gather(
+        *[_timed_upload(file, db) for file in files], return_exceptions=True
+    )
+
+    stored = [result for result in results if isinstance(result, tuple)]
+    errors = [result for result in results if isinstance(result, BaseException)]
+    if errors:
+        created = [path for path, is_new in stored if is_new]
+        logger.warning(
+            "%s de %s uploads falharam; removendo %s imagens já enviadas",
+            len(errors),
+            len(files),
+            len(created),
+        )
+        await delete_images(created)
+        raise errors[0]
+
+    uploaded = [path for path, _ in stored]
+
+    logger.info(
+        "%s imagens enviadas em %.1f ms",
+        len(uploaded),
+        (time.perf_counter() - started) * 1000,
+    )
+    return uploaded
@@ -0,0 +1,128 @@
+"""create location images table
+
+Revision ID: 2d6e8f1b4a90
+Revises: 8b3e5d0a6c21
+Create Date: 2026-10-19 18:05:12.204318
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "2d6e8f1b4a90"
+down_revision: Union[str, Sequence[str], None] = "8b3e5d0a6c21"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+locations = sa.table(
+    "locations",
+    sa.column("id", sa.Integer),
+    sa.column("images", sa.JSON),
+)
+comments = sa.table(
+    "comments",
+    sa.column("id", sa.Integer),
+    sa.column("location_id", sa.Integer),
+    sa.column("status", sa.String),
+    sa.column("images", sa.JSON),
+    sa.column("created_at", sa.DateTime),
+)
+
+
+def _paths(value) -> list[str]:
+    if not isinstance(value, list):
+        return []
+    return [path for path in value if isinstance(path, str) and path]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    location_images = op.create_table(
+        "location_images",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("location_id", sa.Integer(), nullable=False),
+        sa.Column("path", sa.String(), nullable=False),
+        sa.Column("position", sa.Integer(), nullable=False),
+        sa.Column("comment_id", sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(["location_id"], ["locations.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["comment_id"], ["comments.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("location_id", "path", name="uq_location_images_path"),
+    )
+    op.create_index(
+        "ix_location_images_location_position",
+        "location_images",
+        ["location_id", "position"],
+    )
+    op.create_index(
+        op.f("ix_location_images_comment_id"), "location_images", ["comment_id"]
+    )
+
+    # Backfill: a galeria mantém a ordem do JSON e recebe, em seguida, as imagens
+    # de comentários aprovados que ainda não estavam nela (o detalhe do local já
+    # as exibia). A origem de cada imagem é o comentário aprovado mais antigo do
+    # local que a contém; imagens sem comentário ficam com comment_id nulo.
+    bind = op.get_bind()
+    comment_rows = bind.execute(
+        sa.select(comments.c.id, comments.c.location_id, comments.c.images)
+        .where(comments.c.status == "approved", comments.c.location_id.isnot(None))
+        .order_by(comments.c.created_at, comments.c.id)
+    ).all()
+    sources: dict[int, dict[str, int]] = {}
+    for comment_id, location_id, images in comment_rows:
+        by_path = sources.setdefault(location_id, {})
+        for path in _paths(images):
+            by_path.setdefault(path, comment_id)
+
+    rows = []
+    for location_id, images in bind.execute(
+        sa.select(locations.c.id, locations.c.images).order_by(locations.c.id)
+    ).all():
+        by_path = sources.get(location_id, {})
+        gallery = dict.fromkeys(_paths(images))
+        gallery.update(dict.fromkeys(by_path))
+        rows.extend(
+            {
+                "location_id": location_id,
+                "path": path,
+                "position": position,
+                "comment_id": by_path.get(path),
+            }
+            for position, path in enumerate(gallery)
+        )
+    if rows:
+        op.bulk_insert(location_images, rows)
+
+    op.drop_column("locations", "images")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.add_column("locations", sa.Column("images", sa.JSON(), nullable=True))
+
+    location_images = sa.table(
+        "location_images",
+        sa.column("location_id", sa.Integer),
+        sa.column("path", sa.String),
+        sa.column("position", sa.Integer),
+    )
+    bind = op.get_bind()
+    galleries: dict[int, list[str]] = {}
+    for location_id, path in bind.execute(
+        sa.select(location_images.c.location_id, location_images.c.path).order_by(
+            location_images.c.location_id, location_images.c.position
+        )
+    ).all():
+        galleries.setdefault(location_id, []).append(path)
+    for location_id, paths in galleries.items():
+        bind.execute(
+            locations.update().where(locations.c.id == location_id).values(images=paths)
+        )
+
+    op.drop_index(op.f("ix_location_images_comment_id"), table_name="location_images")
+    op.drop_index("ix_location_images_location_position", table_name="location_images")
+    op.drop_table("location_images")
@@ -0,0 +1,58 @@
+"""create storage deletion outbox table
+
+Revision ID: 4f1a9c2d7e3b
+Revises: c9db842b4077
+Create Date: 2026-10-19 14:02:11.508214
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "4f1a9c2d7e3b"
+down_revision: Union[str, Sequence[str], None] = "c9db842b4077"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "storage_deletion_outbox",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("bucket", sa.String(), nullable=False),
+        sa.Column("path", sa.String(), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column(
+            "next_attempt_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    # O worker busca as deleções vencidas por next_attempt_at
+    op.create_index(
+        "ix_storage_deletion_outbox_next_attempt_at",
+        "storage_deletion_outbox",
+        ["next_attempt_at"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_storage_deletion_outbox_next_attempt_at",
+        table_name="storage_deletion_outbox",
+    )
+    op.drop_table("storage_deletion_outbox")
@@ -0,0 +1,79 @@
+"""add sync change tracking
+
+Revision ID: 5c1a9e7d3f24
+Revises: 2d6e8f1b4a90
+Create Date: 2026-10-19 21:12:40.518264
+
+"""
+
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "5c1a9e7d3f24"
+down_revision: Union[str, Sequence[str], None] = "2d6e8f1b4a90"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Comentários existentes: a última alteração conhecida é a criação
+    op.add_column(
+        "comments", sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True)
+    )
+    comments = sa.table(
+        "comments",
+        sa.column("created_at", sa.DateTime(timezone=True)),
+        sa.column("updated_at", sa.DateTime(timezone=True)),
+    )
+    op.execute(comments.update().values(updated_at=comments.c.created_at))
+    op.alter_column("comments", "updated_at", nullable=False)
+    op.create_index("ix_comments_status_updated_at", "comments", ["status", "updated_at"])
+
+    op.add_column(
+        "accessibility_items", sa.Column("updated_at", sa.DateTime(), nullable=True)
+    )
+    accessibility_items = sa.table(
+        "accessibility_items", sa.column("updated_at", sa.DateTime())
+    )
+    op.execute(
+        accessibility_items.update().values(
+            updated_at=datetime.now(timezone.utc).replace(tzinfo=None)
+        )
+    )
+    op.create_index(
+        op.f("ix_accessibility_items_updated_at"), "accessibility_items", ["updated_at"]
+    )
+
+    op.create_index(op.f("ix_locations_updated_at"), "locations", ["updated_at"])
+    op.create_index(op.f("ix_comment_icons_updated_at"), "comment_icons", ["updated_at"])
+
+    op.create_table(
+        "sync_tombstones",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("entity", sa.String(length=50), nullable=False),
+        sa.Column("entity_id", sa.Integer(), nullable=False),
+        sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_sync_tombstones_deleted_at"), "sync_tombstones", ["deleted_at"]
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_sync_tombstones_deleted_at"), table_name="sync_tombstones")
+    op.drop_table("sync_tombstones")
+    op.drop_index(op.f("ix_comment_icons_updated_at"), table_name="comment_icons")
+    op.drop_index(op.f("ix_locations_updated_at"), table_name="locations")
+    op.drop_index(
+        op.f("ix_accessibility_items_updated_at"), table_name="accessibility_items"
+    )
+    op.drop_column("accessibility_items", "updated_at")
+    op.drop_index("ix_comments_status_updated_at", table_name="comments")
+    op.drop_column("comments", "updated_at")
@@ -0,0 +1,47 @@
+"""create stored objects table
+
+Revision ID: 8b3e5d0a6c21
+Revises: 4f1a9c2d7e3b
+Create Date: 2026-10-19 16:40:37.912044
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "8b3e5d0a6c21"
+down_revision: Union[str, Sequence[str], None] = "4f1a9c2d7e3b"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "stored_objects",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("bucket", sa.String(), nullable=False),
+        sa.Column("content_hash", sa.String(length=64), nullable=False),
+        sa.Column("with_variants", sa.Boolean(), nullable=False),
+        sa.Column("path", sa.String(), nullable=False),
+        sa.Column("refcount", sa.Integer(), nullable=False, server_default="1"),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "bucket", "content_hash", "with_variants", name="uq_stored_objects_content"
+        ),
+        sa.UniqueConstraint("bucket", "path", name="uq_stored_objects_path"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("stored_objects")
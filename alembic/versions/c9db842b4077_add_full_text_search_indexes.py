@@ -0,0 +1,52 @@
+"""add full-text search indexes to locations and comments
+
+Revision ID: c9db842b4077
+Revises: ff9b0ca356e9
+Create Date: 2026-10-19 10:12:45.318220
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "c9db842b4077"
+down_revision: Union[str, Sequence[str], None] = "ff9b0ca356e9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Mesmas expressões de LOCATION_SEARCH_VECTOR e COMMENT_SEARCH_VECTOR nos models;
+# o Postgres só usa o índice quando a consulta repete a expressão exatamente.
+LOCATION_SEARCH_VECTOR = (
+    "(setweight(to_tsvector('portuguese', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('portuguese', coalesce(description, '')), 'B'))"
+)
+COMMENT_SEARCH_VECTOR = "to_tsvector('portuguese', comment)"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # GIN sobre o documento de busca dos locais (nome + descrição)
+    op.create_index(
+        "ix_locations_search",
+        "locations",
+        [sa.text(LOCATION_SEARCH_VECTOR)],
+        postgresql_using="gin",
+    )
+
+    # GIN parcial: apenas comentários aprovados entram na busca
+    op.create_index(
+        "ix_comments_search",
+        "comments",
+        [sa.text(COMMENT_SEARCH_VECTOR)],
+        postgresql_using="gin",
+        postgresql_where=sa.text("status = 'approved'"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_comments_search", table_name="comments")
+    op.drop_index("ix_locations_search", table_name="locations")
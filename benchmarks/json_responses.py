@@ -0,0 +1,149 @@
+"""Benchmark de CPU da serialização das maiores respostas JSON.
+
+Compara, por resposta, três caminhos de serialização:
+
+- padrão: o caminho anterior do FastAPI (validação pelo response_model,
+  conversão do modelo para dicts/listas e `json.dumps` do JSONResponse);
+- orjson: o mesmo caminho, com o `ORJSONResponse` como classe padrão;
+- direto: a rota devolve `ORJSONResponse(modelo)` e o pydantic-core
+  serializa o modelo direto para bytes.
+
+Uso (a partir da raiz do projeto, com as variáveis do .env carregadas):
+
+    python -m benchmarks.json_responses
+"""
+
+import asyncio
+import time
+from datetime import UTC, datetime, timedelta
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from acesso_livre_api.src.comments import schemas as comment_schemas
+from acesso_livre_api.src.locations import schemas as location_schemas
+from acesso_livre_api.src.responses import ORJSONResponse
+
+# Cada medição serializa a resposta N vezes; o menor tempo entre REPEAT é reportado
+ITERATIONS = 200
+REPEAT = 5
+
+_SIGNED = (
+    "https://project.supabase.co/storage/v1/object/sign/images/{}?token=" + "x" * 180
+)
+
+
+def _locations_payload() -> location_schemas.LocationListResponse:
+    """GET /locations com o limite máximo (100)."""
+    return location_schemas.LocationListResponse(
+        locations=[
+            {
+                "id": i,
+                "name": f"Local {i}",
+                "description": "Descrição detalhada do local e da sua acessibilidade. "
+                * 4,
+                "top": float(i % 1000),
+                "left": float(i // 1000),
+            }
+            for i in range(1, 101)
+        ]
+    )
+
+
+def _map_payload() -> location_schemas.LocationMapResponse:
+    """GET /locations/map com 10 mil locais."""
+    rows = range(1, 10_001)
+    return location_schemas.LocationMapResponse(
+        ids=list(rows),
+        names=[f"Local {i}" for i in rows],
+        tops=[float(i % 1000) for i in rows],
+        lefts=[float(i // 1000) for i in rows],
+        avg_ratings=[(i % 5) + 0.5 for i in rows],
+        accessibility_item_ids=[[1, 4, 7][: i % 4] for i in rows],
+    )
+
+
+def _comments_payload() -> comment_schemas.CommentListByLocationResponse:
+    """GET /comments/{location_id}/comments com o limite máximo (10), 5 imagens por comentário."""
+    now = datetime.now(UTC)
+    icon = {"id": 1, "name": "Elogio", "icon_url": _SIGNED.format("icon.png")}
+    comments = [
+        {
+            "id": i,
+            "user_name": f"Usuário {i}",
+            "rating": 1 + i % 5,
+            "comment": "Comentário sobre a acessibilidade do local. " * 10,
+            "location_id": 1,
+            "status": "approved",
+            "images": [
+                {
+                    "id": f"{i:04d}-{n}",
+                    "url": _SIGNED.format(f"{i:04d}-{n}.jpg"),
+                    "thumbnail_url": _SIGNED.format(f"{i:04d}-{n}_thumb.webp"),
+                    "medium_url": _SIGNED.format(f"{i:04d}-{n}_medium.webp"),
+                }
+                for n in range(5)
+            ],
+            "created_at": now - timedelta(hours=i),
+            "comment_icons": [icon, icon],
+        }
+        for i in range(10)
+    ]
+    return comment_schemas.CommentListByLocationResponse(
+        comments=comments,
+        accessibility_items=[{"id": i, "name": f"Item {i}"} for i in range(30)],
+    )
+
+
+async def _default(field, model):
+    content = await serialize_response(field=field, response_content=model)
+    return JSONResponse(content).body
+
+
+async def _orjson(field, model):
+    content = await serialize_response(field=field, response_content=model)
+    return ORJSONResponse(content).body
+
+
+async def _direct(field, model):
+    return ORJSONResponse(model).body
+
+
+async def _measure(render, field, model) -> float:
+    """Menor tempo de CPU por resposta, em microssegundos."""
+    timings = []
+    for _ in range(REPEAT):
+        started = time.process_time()
+        for _ in range(ITERATIONS):
+            await render(field, model)
+        timings.append((time.process_time() - started) / ITERATIONS)
+    return min(timings) * 1_000_000
+
+
+async def main() -> None:
+    print(f"{'resposta':>18} | {'tamanho':>11} | {'caminho':>7} | {'CPU (µs)':>10}")
+    for name, model in (
+        ("locations", _locations_payload()),
+        ("locations/map", _map_payload()),
+        ("comments", _comments_payload()),
+    ):
+        field = create_model_field(
+            name="Response_" + type(model).__name__, type_=type(model)
+        )
+        bodies = {await render(field, model) for render in (_orjson, _direct)}
+        # Os dois caminhos com orjson produzem exatamente os mesmos bytes
+        assert len(bodies) == 1
+        size = len(bodies.pop())
+        for label, render in (
+            ("padrão", _default),
+            ("orjson", _orjson),
+            ("direto", _direct),
+        ):
+            await _measure(render, field, model)  # aquecimento
+            cpu = await _measure(render, field, model)
+            print(f"{name:>18} | {size / 1024:>7.0f} KiB | {label:>7} | {cpu:>10.0f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
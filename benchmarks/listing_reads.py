@@ -0,0 +1,165 @@
+"""Benchmark de memória e latência das leituras de listagem.
+
+Compara, sobre 10 mil linhas em um SQLite temporário, a leitura antiga das
+listagens (entidades ORM completas, com descrição, imagens e timestamps, e
+`model_validate(from_attributes=True)` em cada uma) com a leitura projetada
+atual (apenas as colunas do schema de resposta, como linhas imutáveis, sem
+identity map). Cada medição usa uma sessão nova, como uma requisição.
+
+Uso (a partir da raiz do projeto, com as variáveis do .env carregadas):
+
+    python -m benchmarks.listing_reads
+"""
+
+import asyncio
+import os
+import tempfile
+import time
+import tracemalloc
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import selectinload
+
+from acesso_livre_api.src import main as _app  # noqa: F401 (registra todos os modelos)
+from acesso_livre_api.src.comments import schemas as comment_schemas
+from acesso_livre_api.src.comments import service as comment_service
+from acesso_livre_api.src.comments.models import Comment
+from acesso_livre_api.src.database import Base
+from acesso_livre_api.src.locations import schemas as location_schemas
+from acesso_livre_api.src.locations import service as location_service
+from acesso_livre_api.src.locations.models import Location
+
+ROWS = 10_000
+# Cada medição é repetida e o menor valor é reportado, para reduzir ruído
+REPEAT = 5
+
+
+async def _seed(engine) -> None:
+    now = datetime.now(UTC)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(
+            insert(Location),
+            [
+                {
+                    "id": i,
+                    "name": f"Local {i}",
+                    "description": "Descrição detalhada do local e da sua acessibilidade. "
+                    * 8,
+                    "avg_rating": 4.0,
+                    "top": float(i % 1000),
+                    "left": float(i // 1000),
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for i in range(1, ROWS + 1)
+            ],
+        )
+        await conn.execute(
+            insert(Comment),
+            [
+                {
+                    "user_name": f"Usuário {i}",
+                    "rating": 1 + i % 5,
+                    "comment": "Comentário sobre a acessibilidade do local. " * 6,
+                    "location_id": 1 + i % ROWS,
+                    "status": "approved",
+                    "images": [f"{i:08d}-a.jpg", f"{i:08d}-b.jpg"],
+                    "created_at": now - timedelta(seconds=i),
+                }
+                for i in range(ROWS)
+            ],
+        )
+
+
+async def _legacy_locations(db):
+    """Leitura anterior de GET /locations: entidades ORM completas."""
+    result = await db.execute(select(Location).offset(0).limit(ROWS))
+    return location_schemas.LocationListResponse(
+        locations=[
+            location_schemas.LocationBase.model_validate(location, from_attributes=True)
+            for location in result.scalars().all()
+        ]
+    )
+
+
+async def _projected_locations(db):
+    locations = await location_service.get_all_locations(db, skip=0, limit=ROWS)
+    return location_schemas.LocationListResponse(locations=locations)
+
+
+async def _legacy_recent_comments(db):
+    """Leitura anterior de GET /comments/recent: comentários com local e ícones."""
+    result = await db.execute(
+        select(Comment)
+        .options(selectinload(Comment.location), selectinload(Comment.comment_icons))
+        .where(Comment.status == "approved")
+        .order_by(Comment.created_at.desc())
+        .limit(ROWS)
+    )
+    return [
+        comment_schemas.RecentCommentResponse(
+            location_name=comment.location.name,
+            location_rating=comment.location.avg_rating or 0.0,
+            user_name=comment.user_name,
+            description=comment.comment,
+        )
+        for comment in result.unique().scalars().all()
+    ]
+
+
+async def _projected_recent_comments(db):
+    comments = await comment_service.get_recent_comments(db, limit=ROWS)
+    return [comment_schemas.RecentCommentResponse.model_validate(row) for row in comments]
+
+
+async def _measure(session_factory, read) -> tuple[int, float]:
+    """Pico de memória e tempo, medidos em execuções separadas (o tracemalloc
+    deixa a execução bem mais lenta)."""
+    peaks, durations = [], []
+    for _ in range(REPEAT):
+        async with session_factory() as db:
+            started = time.perf_counter()
+            await read(db)
+            durations.append(time.perf_counter() - started)
+        async with session_factory() as db:
+            tracemalloc.start()
+            await read(db)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        peaks.append(peak)
+    return min(peaks), min(durations)
+
+
+async def main() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{os.path.join(directory, 'listing.db')}"
+        )
+        await _seed(engine)
+        session_factory = async_sessionmaker(
+            engine, expire_on_commit=False, autoflush=False
+        )
+
+        print(
+            f"{'listagem':>18} | {'leitura':>9} | {'pico (KiB)':>10} | {'tempo (ms)':>10}"
+        )
+        for name, legacy, projected in (
+            ("locations", _legacy_locations, _projected_locations),
+            ("comments/recent", _legacy_recent_comments, _projected_recent_comments),
+        ):
+            for label, read in (("ORM", legacy), ("projetada", projected)):
+                # Aquecimento: compilação das consultas e caches do SQLAlchemy
+                await _measure(session_factory, read)
+                peak, duration = await _measure(session_factory, read)
+                print(
+                    f"{name:>18} | {label:>9} | {peak / 1024:>10.0f} | {duration * 1000:>10.1f}"
+                )
+
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
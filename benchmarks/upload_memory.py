@@ -0,0 +1,107 @@
+"""Benchmark de memória do upload de imagens.
+
+Compara o pico de memória alocada (tracemalloc) entre o upload antigo, que lia
+o arquivo inteiro para um `bytes` antes de enviá-lo, e o upload em streaming
+de `storage.upload_image`. O storage é substituído por um transport HTTP em
+memória que descarta os blocos recebidos, então apenas a memória do lado da
+API é medida; a decodificação e as variantes rodam no pool de processos do
+pipeline de imagens, fora do processo medido.
+
+Uso (a partir da raiz do projeto, com as variáveis do .env carregadas):
+
+    python -m benchmarks.upload_memory
+"""
+
+import asyncio
+import io
+import tempfile
+import tracemalloc
+from unittest.mock import patch
+
+import httpx
+from fastapi import UploadFile
+from PIL import Image
+from starlette.datastructures import Headers
+
+from acesso_livre_api.storage import upload_image as upload_module
+from acesso_livre_api.storage.image_processing import shutdown_image_pool
+
+SIZES_MB = [1, 3, 6]
+# Cada medição é repetida e o menor pico é reportado, para reduzir ruído do alocador
+REPEAT = 3
+
+
+class _DiscardingTransport(httpx.AsyncBaseTransport):
+    """Consome o corpo da requisição bloco a bloco sem guardá-lo."""
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        async for _ in request.stream:
+            pass
+        return httpx.Response(200, json={"Key": request.url.path})
+
+
+def _client_factory():
+    return httpx.AsyncClient(transport=_DiscardingTransport())
+
+
+def _jpeg_of_size(size: int) -> bytes:
+    """Gera um JPEG de ruído com aproximadamente `size` bytes (fotos reais são ruidosas)."""
+    side = 256
+    while True:
+        buffer = io.BytesIO()
+        Image.effect_noise((side, side), 64).convert("RGB").save(
+            buffer, "JPEG", quality=95
+        )
+        if buffer.tell() >= size:
+            return buffer.getvalue()
+        side = int(side * 1.1)
+
+
+def _spooled_upload(content: bytes) -> UploadFile:
+    # Mesmo spool usado pelo Starlette: arquivos grandes vão para o disco
+    spool = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+    spool.write(content)
+    spool.seek(0)
+    return UploadFile(
+        file=spool,
+        size=len(content),
+        filename="foto.jpg",
+        headers=Headers({"content-type": "image/jpeg"}),
+    )
+
+
+async def _legacy_upload(file: UploadFile) -> None:
+    """Reproduz o fluxo anterior: arquivo inteiro em memória antes do envio."""
+    content = file.file.read()
+    async with _client_factory() as client:
+        await client.post("http://storage.local/object", content=content)
+
+
+async def _measure(upload, content: bytes) -> int:
+    peaks = []
+    for _ in range(REPEAT):
+        file = _spooled_upload(content)
+        tracemalloc.start()
+        await upload(file)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        file.file.close()
+        peaks.append(peak)
+    return min(peaks)
+
+
+async def main() -> None:
+    print(f"{'tamanho':>8} | {'antes (KiB)':>12} | {'streaming (KiB)':>15}")
+    with patch.object(upload_module, "storage_http_client", _client_factory):
+        # Aquecimento: importações tardias, threadpool e pool de processos
+        await _measure(upload_module.upload_image, _jpeg_of_size(64 * 1024))
+        for size_mb in SIZES_MB:
+            content = _jpeg_of_size(size_mb * 1024 * 1024)
+            legacy = await _measure(_legacy_upload, content)
+            streamed = await _measure(upload_module.upload_image, content)
+            print(f"{size_mb:>6}MB | {legacy / 1024:>12.0f} | {streamed / 1024:>15.0f}")
+    shutdown_image_pool()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,57 @@
+import http from 'k6/http';
+import { check, sleep } from 'k6';
+import { Rate, Trend } from 'k6/metrics';
+
+// Métricas customizadas
+const errorRate = new Rate('errors');
+const searchTrend = new Trend('search_duration');
+
+// Configuração do teste: busca textual sob carga constante
+export const options = {
+    stages: [
+        { duration: '30s', target: 50 },   // Ramp-up para 50 VUs
+        { duration: '1m', target: 100 },   // Ramp-up para 100 VUs
+        { duration: '2m', target: 100 },   // Mantém 100 VUs por 2 minutos
+        { duration: '30s', target: 0 },    // Ramp-down
+    ],
+    thresholds: {
+        search_duration: ['p(95)<300'],    // 95% das buscas < 300ms
+        errors: ['rate<0.01'],             // Taxa de erro < 1%
+    },
+};
+
+const BASE_URL = __ENV.BASE_URL || 'https://acesso-livre-api.onrender.com';
+
+// Termos comuns de busca (inclui acentos, plurais e frases)
+const terms = [
+    'rampa',
+    'elevador',
+    'banheiro acessível',
+    'piso tátil',
+    'estacionamento',
+    'shopping',
+    'rampas de acesso',
+    '"banheiro adaptado"',
+];
+
+export default function () {
+    const term = terms[Math.floor(Math.random() * terms.length)];
+    const res = http.get(
+        `${BASE_URL}/api/locations/search?filter=${encodeURIComponent(term)}&limit=20`,
+        { tags: { name: 'search' } },
+    );
+    searchTrend.add(res.timings.duration);
+    check(res, {
+        'search status 200': (r) => r.status === 200,
+        'search has data': (r) => {
+            try {
+                return JSON.parse(r.body).locations !== undefined;
+            } catch {
+                return false;
+            }
+        },
+    });
+    errorRate.add(res.status !== 200);
+
+    sleep(0.5);
+}
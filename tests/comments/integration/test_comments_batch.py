@@ -0,0 +1,160 @@
+from datetime import UTC, datetime
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+
+from acesso_livre_api.src.comments.models import Comment
+from acesso_livre_api.src.locations.models import Location, LocationImage
+from acesso_livre_api.storage.models import StorageDeletion
+
+
+async def _create_comments(db_session, location_id, specs):
+    comments = [
+        Comment(
+            user_name="Usuário",
+            rating=rating,
+            comment="Comentário em lote",
+            location_id=location_id,
+            status=status,
+            images=images,
+            created_at=datetime.now(UTC),
+        )
+        for rating, status, images in specs
+    ]
+    db_session.add_all(comments)
+    await db_session.commit()
+    return [comment.id for comment in comments]
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_batch_approve_reports_each_id(
+    client: AsyncClient, created_location, admin_auth_header, db_session
+):
+    location_id = created_location["id"]
+    pending_a, pending_b, approved = await _create_comments(
+        db_session,
+        location_id,
+        [
+            (4, "pending", ["a.jpg"]),
+            (2, "pending", ["b.jpg", "a.jpg"]),
+            (5, "approved", []),
+        ],
+    )
+
+    response = await client.patch(
+        "/api/comments/status:batch",
+        json={
+            "ids": [pending_a, 9999, pending_b, approved, pending_a],
+            "status": "approved",
+        },
+        headers=admin_auth_header,
+    )
+
+    assert response.status_code == 200
+    results = {result["id"]: result for result in response.json()["results"]}
+    assert list(results) == [pending_a, 9999, pending_b, approved]
+    assert results[pending_a]["success"] is True
+    assert results[pending_a]["status"] == "approved"
+    assert results[pending_b]["success"] is True
+    assert results[9999] == {
+        "id": 9999,
+        "success": False,
+        "status": None,
+        "detail": "Comentário não encontrado",
+    }
+    assert results[approved]["success"] is False
+    assert "pending" in results[approved]["detail"]
+
+    db_session.expire_all()
+    location = await db_session.get(Location, location_id)
+    assert location.avg_rating == pytest.approx((4 + 2 + 5) / 3)
+    gallery = await db_session.execute(
+        select(LocationImage.path, LocationImage.comment_id)
+        .where(LocationImage.location_id == location_id)
+        .order_by(LocationImage.position)
+    )
+    assert gallery.all() == [("a.jpg", pending_a), ("b.jpg", pending_b)]
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_batch_approve_with_orphaned_comment(
+    client: AsyncClient, created_location, admin_auth_header, db_session
+):
+    location_id = created_location["id"]
+    # Comentário cujo local foi excluído (FK anulada) no mesmo lote de um comentário válido
+    orphan, valid = await _create_comments(
+        db_session,
+        location_id,
+        [(1, "pending", ["orphan.jpg"]), (4, "pending", ["valid.jpg"])],
+    )
+    db_session.expire_all()
+    (await db_session.get(Comment, orphan)).location_id = None
+    await db_session.commit()
+
+    response = await client.patch(
+        "/api/comments/status:batch",
+        json={"ids": [orphan, valid], "status": "approved"},
+        headers=admin_auth_header,
+    )
+
+    assert response.status_code == 200
+    assert all(result["success"] for result in response.json()["results"])
+
+    db_session.expire_all()
+    location = await db_session.get(Location, location_id)
+    assert location.avg_rating == pytest.approx(4)
+    gallery = await db_session.execute(select(LocationImage.path))
+    assert gallery.scalars().all() == ["valid.jpg"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_batch_reject_deletes_comments_and_enqueues_images(
+    client: AsyncClient, created_location, admin_auth_header, db_session
+):
+    ids = await _create_comments(
+        db_session,
+        created_location["id"],
+        [(3, "pending", ["x.jpg"]), (1, "pending", None)],
+    )
+
+    response = await client.patch(
+        "/api/comments/status:batch",
+        json={"ids": ids, "status": "rejected"},
+        headers=admin_auth_header,
+    )
+
+    assert response.status_code == 200
+    assert all(result["success"] for result in response.json()["results"])
+
+    remaining = await db_session.execute(select(Comment.id).where(Comment.id.in_(ids)))
+    assert remaining.scalars().all() == []
+    pending = await db_session.execute(select(StorageDeletion.path))
+    assert sorted(pending.scalars()) == ["x.jpg", "x_medium.webp", "x_thumb.webp"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_batch_rejects_pending_as_target_status(
+    client: AsyncClient, admin_auth_header
+):
+    response = await client.patch(
+        "/api/comments/status:batch",
+        json={"ids": [1], "status": "pending"},
+        headers=admin_auth_header,
+    )
+
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_batch_requires_auth(client: AsyncClient):
+    response = await client.patch(
+        "/api/comments/status:batch", json={"ids": [1], "status": "approved"}
+    )
+
+    assert response.status_code == 401
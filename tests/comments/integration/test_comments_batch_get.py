@@ -0,0 +1,94 @@
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from httpx import AsyncClient
+
+from acesso_livre_api.src.comments.models import Comment, CommentIcon
+from acesso_livre_api.src.config import settings
+from acesso_livre_api.storage.models import StoredObject
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_get_comments_batch_keyed_by_id(
+    client: AsyncClient, created_location, db_session
+):
+    icon = CommentIcon(name="Elogio", icon_url="elogio.svg")
+    comments = [
+        Comment(
+            user_name="Usuário",
+            rating=rating,
+            comment="Comentário",
+            location_id=created_location["id"],
+            status=status,
+            images=images,
+            created_at=datetime.now(UTC),
+            comment_icons=[icon],
+        )
+        for rating, status, images in [
+            (5, "approved", ["a.jpg", "shared.jpg"]),
+            (4, "approved", ["shared.jpg"]),
+            (3, "pending", ["pending.jpg"]),
+        ]
+    ]
+    db_session.add_all(comments)
+    db_session.add_all(
+        StoredObject(
+            bucket=settings.bucket_name,
+            content_hash=path[0] * 64,
+            with_variants=True,
+            path=path,
+        )
+        for path in ("a.jpg", "shared.jpg", "pending.jpg")
+    )
+    await db_session.commit()
+    first, second, pending = (comment.id for comment in comments)
+
+    with (
+        patch(
+            "acesso_livre_api.src.comments.utils.get_signed_urls",
+            new=AsyncMock(
+                side_effect=lambda paths: [f"https://signed/{p}" for p in paths]
+            ),
+        ) as mock_sign,
+        patch(
+            "acesso_livre_api.src.comments.service.get_icon_urls",
+            new=AsyncMock(side_effect=lambda paths: [f"https://cdn/{p}" for p in paths]),
+        ) as mock_icons,
+    ):
+        response = await client.get(
+            "/api/comments/batch", params={"ids": f"{second},{pending},{first},999"}
+        )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert list(data["comments"]) == [str(second), str(first)]
+    assert data["not_found"] == [pending, 999]
+
+    comment = data["comments"][str(first)]
+    assert comment["rating"] == 5
+    assert [image["url"] for image in comment["images"]] == [
+        "https://signed/a.jpg",
+        "https://signed/shared.jpg",
+    ]
+    assert comment["comment_icons"] == [
+        {"id": icon.id, "name": "Elogio", "icon_url": "https://cdn/elogio.svg"}
+    ]
+
+    # Imagens dos comentários aprovados assinadas uma única vez, sem o pendente
+    mock_sign.assert_awaited_once()
+    signed_paths = mock_sign.await_args.args[0]
+    assert len(signed_paths) == len(set(signed_paths)) == 6
+    assert not any("pending" in path for path in signed_paths)
+    assert comment["images"][0]["thumbnail_url"] == "https://signed/a_thumb.webp"
+    mock_icons.assert_awaited_once_with(["elogio.svg"])
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+@pytest.mark.parametrize("ids", ["", "abc", "-1", ",".join(str(i) for i in range(1, 52))])
+async def test_get_comments_batch_invalid_ids(client: AsyncClient, ids):
+    response = await client.get("/api/comments/batch", params={"ids": ids})
+
+    assert response.status_code == 422
@@ -1,5 +1,11 @@
+import io
+
 import pytest
 from httpx import AsyncClient
+from PIL import Image
+
+from acesso_livre_api.storage import upload_image as upload_module
+from acesso_livre_api.storage.image_processing import process_image
 
 
 @pytest.mark.asyncio
@@ -79,6 +85,27 @@ async def test_create_comment_invalid_rating(client: AsyncClient, created_locati
     assert response.status_code == 422
 
 
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_create_comment_does_not_render_location_detail(
+    client: AsyncClient, created_location, mocker
+):
+    """Testa que a criação só valida a existência do local, sem montar o detalhe."""
+    get_detail = mocker.patch(
+        "acesso_livre_api.src.locations.service.get_location_by_id"
+    )
+    comment_data = {
+        "user_name": "Test User",
+        "rating": 4,
+        "comment": "Sem render do detalhe.",
+        "location_id": created_location["id"],
+    }
+    response = await client.post("/api/comments/", data=comment_data)
+
+    assert response.status_code == 200
+    get_detail.assert_not_called()
+
+
 @pytest.mark.asyncio
 @pytest.mark.integration
 async def test_create_comment_nonexistent_location(client: AsyncClient):
@@ -573,3 +600,62 @@ async def test_get_recent_comments_only_approved(
     data = response.json()
     assert len(data["comments"]) == 1
     assert data["comments"][0]["user_name"] == "Approved User"
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_create_comment_rejects_fake_image(
+    client: AsyncClient, created_location, mocker
+):
+    """Testa que um arquivo que não é imagem é rejeitado com 415 antes do storage."""
+    mock_upload = mocker.patch(
+        "acesso_livre_api.storage.upload_image._upload_processed_file"
+    )
+    comment_data = {
+        "user_name": "Test User",
+        "rating": 5,
+        "comment": "Comentário com imagem falsa.",
+        "location_id": created_location["id"],
+    }
+
+    response = await client.post(
+        "/api/comments/",
+        data=comment_data,
+        files={"images": ("foto.jpg", b"%PDF-1.7 conteudo", "image/jpeg")},
+    )
+
+    assert response.status_code == 415
+    mock_upload.assert_not_called()
+
+    listed = await client.get(f"/api/comments/{created_location['id']}/comments")
+    assert listed.json()["comments"] == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_create_comment_rejects_truncated_jpeg(
+    client: AsyncClient, created_location, mocker
+):
+    """Testa que um JPEG truncado é rejeitado com 422, e não com erro interno."""
+    async def run_inline(*args):
+        return process_image(*args)
+
+    mocker.patch.object(upload_module, "run_image_pipeline", run_inline)
+    mock_upload = mocker.patch.object(upload_module, "_upload_processed_file")
+    buffer = io.BytesIO()
+    Image.new("RGB", (640, 480), (10, 120, 200)).save(buffer, "JPEG")
+
+    response = await client.post(
+        "/api/comments/",
+        data={
+            "user_name": "Test User",
+            "rating": 5,
+            "comment": "Comentário com imagem truncada.",
+            "location_id": created_location["id"],
+        },
+        files={"images": ("foto.jpg", buffer.getvalue()[:200], "image/jpeg")},
+    )
+
+    assert response.status_code == 422
+    assert response.json()["detail"] == "Imagem corrompida ou incompleta"
+    mock_upload.assert_not_called()
@@ -0,0 +1,162 @@
+from datetime import UTC, datetime
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+
+from acesso_livre_api.src.comments.models import Comment
+from acesso_livre_api.src.config import settings
+from acesso_livre_api.src.locations.models import LocationImage
+from acesso_livre_api.storage.models import StorageDeletion, StoredObject
+
+SHARED = "6a9c217f-3d21-4a90-896a-2a2cb3dc53a8.jpg"
+SHARED_ID = SHARED.removesuffix(".jpg")
+
+
+async def _approved_comments(db_session, location_id, count):
+    comments = [
+        Comment(
+            user_name="Usuário",
+            rating=5,
+            comment="Mesma foto",
+            location_id=location_id,
+            status="approved",
+            images=[SHARED],
+            created_at=datetime.now(UTC),
+        )
+        for _ in range(count)
+    ]
+    db_session.add_all(comments)
+    await db_session.flush()
+    return comments
+
+
+async def _gallery(db_session):
+    result = await db_session.execute(
+        select(LocationImage.path, LocationImage.comment_id)
+    )
+    return result.all()
+
+
+async def _pending_deletions(db_session):
+    result = await db_session.execute(select(StorageDeletion.path))
+    return sorted(result.scalars())
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_delete_image_keeps_gallery_entry_of_other_comment(
+    client: AsyncClient, created_location, admin_auth_header, db_session
+):
+    location_id = created_location["id"]
+    first, second = await _approved_comments(db_session, location_id, 2)
+    # Objeto deduplicado: uma referência por comentário; a galeria aponta para o segundo
+    db_session.add_all(
+        [
+            StoredObject(
+                bucket=settings.bucket_name,
+                content_hash="c" * 64,
+                with_variants=True,
+                path=SHARED,
+                refcount=2,
+            ),
+            LocationImage(
+                location_id=location_id, path=SHARED, position=0, comment_id=second.id
+            ),
+        ]
+    )
+    await db_session.commit()
+
+    # A busca pela imagem encontra o primeiro comentário
+    response = await client.delete(
+        f"/api/comments/images/{SHARED_ID}", headers=admin_auth_header
+    )
+
+    assert response.status_code == 200
+    images = await db_session.execute(
+        select(Comment.images).where(Comment.id == first.id)
+    )
+    assert images.scalar_one() == []
+    assert await _gallery(db_session) == [(SHARED, second.id)]
+    stored = (await db_session.execute(select(StoredObject.refcount))).scalar_one()
+    assert stored == 1
+    assert await _pending_deletions(db_session) == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_delete_image_moves_gallery_entry_to_other_comment(
+    client: AsyncClient, created_location, admin_auth_header, db_session
+):
+    location_id = created_location["id"]
+    first, second = await _approved_comments(db_session, location_id, 2)
+    db_session.add(
+        LocationImage(
+            location_id=location_id, path=SHARED, position=0, comment_id=first.id
+        )
+    )
+    await db_session.commit()
+
+    response = await client.delete(
+        f"/api/comments/images/{SHARED_ID}", headers=admin_auth_header
+    )
+
+    assert response.status_code == 200
+    assert await _gallery(db_session) == [(SHARED, second.id)]
+    # Caminho sem registro ainda usado pelo segundo comentário: nada vai para o outbox
+    assert await _pending_deletions(db_session) == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_delete_image_only_reference_enqueues_deletion(
+    client: AsyncClient, created_location, admin_auth_header, db_session
+):
+    location_id = created_location["id"]
+    [comment] = await _approved_comments(db_session, location_id, 1)
+    db_session.add(
+        LocationImage(
+            location_id=location_id, path=SHARED, position=0, comment_id=comment.id
+        )
+    )
+    await db_session.commit()
+
+    response = await client.delete(
+        f"/api/comments/images/{SHARED_ID}", headers=admin_auth_header
+    )
+
+    assert response.status_code == 200
+    assert await _gallery(db_session) == []
+    assert SHARED in await _pending_deletions(db_session)
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_delete_comment_hands_shared_gallery_entry_to_other_comment(
+    client: AsyncClient, created_location, admin_auth_header, db_session
+):
+    location_id = created_location["id"]
+    first, second = await _approved_comments(db_session, location_id, 2)
+    db_session.add_all(
+        [
+            StoredObject(
+                bucket=settings.bucket_name,
+                content_hash="c" * 64,
+                with_variants=True,
+                path=SHARED,
+                refcount=2,
+            ),
+            LocationImage(
+                location_id=location_id, path=SHARED, position=0, comment_id=first.id
+            ),
+        ]
+    )
+    await db_session.commit()
+
+    response = await client.delete(f"/api/comments/{first.id}", headers=admin_auth_header)
+
+    assert response.status_code == 200
+    assert await _gallery(db_session) == [(SHARED, second.id)]
+    stored = (await db_session.execute(select(StoredObject.refcount))).scalar_one()
+    assert stored == 1
+    assert await _pending_deletions(db_session) == []
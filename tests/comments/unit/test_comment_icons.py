@@ -4,7 +4,7 @@ from unittest.mock import Mock, AsyncMock, MagicMock, patch
 import pytest
 from sqlalchemy.exc import SQLAlchemyError
 
-from acesso_livre_api.src.comments import models, schemas
+from acesso_livre_api.src.comments import dto, models, schemas
 from acesso_livre_api.src.comments.exceptions import CommentGenericException
 from acesso_livre_api.src.comments.service import (
     create_comment_icon,
@@ -37,6 +37,12 @@ def mock_comment_icon():
     return icon
 
 
+@pytest.fixture
+def icon_row():
+    """Linha projetada de um ícone de comentário."""
+    return {"id": 1, "name": "Feedback", "icon_url": "icons/feedback.png"}
+
+
 class TestCreateCommentIcon:
     """Testes para create_comment_icon."""
 
@@ -76,38 +82,54 @@ class TestGetAllCommentIcons:
     """Testes para get_all_comment_icons."""
 
     @pytest.mark.asyncio
-    async def test_get_all_comment_icons_success(self, mock_db, mock_comment_icon):
+    async def test_get_all_comment_icons_success(self, mock_db, icon_row):
         """Testa obtenção bem-sucedida de todos os ícones."""
         mock_result = MagicMock()
-        mock_result.scalars.return_value.all.return_value = [mock_comment_icon]
+        mock_result.mappings.return_value.all.return_value = [icon_row]
         mock_db.execute = AsyncMock(return_value=mock_result)
 
         with patch(
-            "acesso_livre_api.src.comments.service.get_signed_urls"
+            "acesso_livre_api.src.comments.service.get_icon_urls"
         ) as mock_get_urls:
             mock_get_urls.return_value = ["signed_url"]
             
             result = await get_all_comment_icons(mock_db)
 
-            assert len(result) == 1
-            assert result[0] == mock_comment_icon
+            assert result == [dto.CommentIconDTO(id=1, name="Feedback", icon_url="signed_url")]
             mock_db.execute.assert_awaited_once()
 
+    @pytest.mark.asyncio
+    async def test_get_all_comment_icons_keeps_path_when_unresolved(self, mock_db, icon_row):
+        """Testa que, sem URL resolvida, o ícone mantém o caminho original."""
+        mock_result = MagicMock()
+        mock_result.mappings.return_value.all.return_value = [icon_row]
+        mock_db.execute = AsyncMock(return_value=mock_result)
+
+        with patch(
+            "acesso_livre_api.src.comments.service.get_icon_urls"
+        ) as mock_get_urls:
+            mock_get_urls.return_value = [None]
+
+            result = await get_all_comment_icons(mock_db)
+
+            assert result[0].icon_url == "icons/feedback.png"
+
     @pytest.mark.asyncio
     async def test_get_all_comment_icons_empty(self, mock_db):
         """Testa obtenção quando não há ícones."""
         mock_result = MagicMock()
-        mock_result.scalars.return_value.all.return_value = []
+        mock_result.mappings.return_value.all.return_value = []
         mock_db.execute = AsyncMock(return_value=mock_result)
 
         with patch(
-            "acesso_livre_api.src.comments.service.get_signed_urls"
+            "acesso_livre_api.src.comments.service.get_icon_urls"
         ) as mock_get_urls:
             mock_get_urls.return_value = []
             
             result = await get_all_comment_icons(mock_db)
 
             assert result == []
+            mock_get_urls.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_get_all_comment_icons_error(self, mock_db):
@@ -122,27 +144,27 @@ class TestGetCommentIconById:
     """Testes para get_comment_icon_by_id."""
 
     @pytest.mark.asyncio
-    async def test_get_comment_icon_by_id_success(self, mock_db, mock_comment_icon):
+    async def test_get_comment_icon_by_id_success(self, mock_db, icon_row):
         """Testa obtenção bem-sucedida de ícone por ID."""
         mock_result = MagicMock()
-        mock_result.scalars.return_value.first.return_value = mock_comment_icon
+        mock_result.mappings.return_value.first.return_value = icon_row
         mock_db.execute = AsyncMock(return_value=mock_result)
 
         with patch(
-            "acesso_livre_api.src.comments.service.get_signed_urls"
+            "acesso_livre_api.src.comments.service.get_icon_urls"
         ) as mock_get_urls:
             mock_get_urls.return_value = ["signed_url"]
             
             result = await get_comment_icon_by_id(mock_db, icon_id=1)
 
-            assert result == mock_comment_icon
+            assert result == dto.CommentIconDTO(id=1, name="Feedback", icon_url="signed_url")
             mock_db.execute.assert_awaited_once()
 
     @pytest.mark.asyncio
     async def test_get_comment_icon_by_id_not_found(self, mock_db):
         """Testa erro quando ícone não é encontrado."""
         mock_result = MagicMock()
-        mock_result.scalars.return_value.first.return_value = None
+        mock_result.mappings.return_value.first.return_value = None
         mock_db.execute = AsyncMock(return_value=mock_result)
 
         with pytest.raises(CommentGenericException):
@@ -159,12 +181,16 @@ class TestDeleteCommentIcon:
         mock_result.scalars.return_value.first.return_value = mock_comment_icon
         mock_db.execute = AsyncMock(return_value=mock_result)
 
-        with patch("acesso_livre_api.src.comments.service.delete_image") as mock_delete:
-            mock_delete.return_value = None
-            
+        with patch("acesso_livre_api.src.comments.service.release_objects", new_callable=AsyncMock) as mock_release:
             result = await delete_comment_icon(mock_db, icon_id=1)
 
             assert result is True
+            mock_release.assert_awaited_once_with(
+                mock_db,
+                [mock_comment_icon.icon_url],
+                include_variants=False,
+                bucket="bucket-name-test",
+            )
             mock_db.delete.assert_awaited_once()
             mock_db.commit.assert_awaited_once()
 
@@ -186,7 +212,7 @@ class TestDeleteCommentIcon:
         mock_db.execute = AsyncMock(return_value=mock_result)
         mock_db.commit = AsyncMock(side_effect=SQLAlchemyError("DB Error"))
 
-        with patch("acesso_livre_api.src.comments.service.delete_image"):
+        with patch("acesso_livre_api.src.comments.service.release_objects", new_callable=AsyncMock):
             with pytest.raises(CommentGenericException):
                 await delete_comment_icon(mock_db, icon_id=1)
 
@@ -41,7 +41,7 @@ class TestUpdateCommentIcon:
         mock_result.scalars.return_value.first.return_value = mock_comment_icon
         mock_db.execute = AsyncMock(return_value=mock_result)
 
-        with patch("acesso_livre_api.src.comments.service.get_signed_urls") as mock_get_urls:
+        with patch("acesso_livre_api.src.comments.service.get_icon_urls") as mock_get_urls:
             mock_get_urls.return_value = ["signed_url"]
             
             result = await update_comment_icon(
@@ -63,8 +63,8 @@ class TestUpdateCommentIcon:
         mock_image = Mock(spec=UploadFile)
 
         with patch("acesso_livre_api.src.comments.service.upload_image.upload_image") as mock_upload, \
-             patch("acesso_livre_api.src.comments.service.delete_image") as mock_delete, \
-             patch("acesso_livre_api.src.comments.service.get_signed_urls") as mock_get_urls:
+             patch("acesso_livre_api.src.comments.service.release_objects", new_callable=AsyncMock) as mock_release, \
+             patch("acesso_livre_api.src.comments.service.get_icon_urls") as mock_get_urls:
             
             mock_upload.return_value = "icons/new_feedback.png"
             mock_get_urls.return_value = ["signed_new_url"]
@@ -74,8 +74,13 @@ class TestUpdateCommentIcon:
             )
 
             assert result.icon_url == "signed_new_url"
-            mock_upload.assert_awaited_once_with(mock_image)
-            mock_delete.assert_awaited_once_with("icons/feedback.png")
+            mock_upload.assert_awaited_once_with(mock_image, with_variants=False, db=mock_db)
+            mock_release.assert_awaited_once_with(
+                mock_db,
+                ["icons/feedback.png"],
+                include_variants=False,
+                bucket="bucket-name-test",
+            )
             mock_db.commit.assert_awaited_once()
 
     @pytest.mark.asyncio
@@ -88,8 +93,8 @@ class TestUpdateCommentIcon:
         mock_image = Mock(spec=UploadFile)
 
         with patch("acesso_livre_api.src.comments.service.upload_image.upload_image") as mock_upload, \
-             patch("acesso_livre_api.src.comments.service.delete_image") as mock_delete, \
-             patch("acesso_livre_api.src.comments.service.get_signed_urls") as mock_get_urls:
+             patch("acesso_livre_api.src.comments.service.release_objects", new_callable=AsyncMock) as mock_release, \
+             patch("acesso_livre_api.src.comments.service.get_icon_urls") as mock_get_urls:
             
             mock_upload.return_value = "icons/new_feedback.png"
             mock_get_urls.return_value = ["signed_new_url"]
@@ -101,7 +106,7 @@ class TestUpdateCommentIcon:
             assert result.name == "Feedback Full Update"
             assert result.icon_url == "signed_new_url"
             mock_upload.assert_awaited_once()
-            mock_delete.assert_awaited_once()
+            mock_release.assert_awaited_once()
             mock_db.commit.assert_awaited_once()
 
     @pytest.mark.asyncio
@@ -128,28 +133,28 @@ class TestUpdateCommentIcon:
         mock_db.rollback.assert_awaited_once()
 
     @pytest.mark.asyncio
-    async def test_update_comment_icon_delete_image_error(self, mock_db, mock_comment_icon):
-        """Testa que erro na deleção de imagem não impede a atualização (apenas loga aviso)."""
+    async def test_update_comment_icon_does_not_call_storage_delete(self, mock_db, mock_comment_icon):
+        """Testa que a imagem antiga (sem registro de deduplicação) vai para o outbox em vez de ser removida na requisição."""
         mock_result = MagicMock()
         mock_result.scalars.return_value.first.return_value = mock_comment_icon
         mock_db.execute = AsyncMock(return_value=mock_result)
-        
+        mock_db.add_all = MagicMock()
+
         mock_image = Mock(spec=UploadFile)
 
         with patch("acesso_livre_api.src.comments.service.upload_image.upload_image") as mock_upload, \
-             patch("acesso_livre_api.src.comments.service.delete_image") as mock_delete, \
-             patch("acesso_livre_api.src.comments.service.get_signed_urls") as mock_get_urls:
-            
+             patch("acesso_livre_api.storage.delete_image.remove_objects") as mock_remove, \
+             patch("acesso_livre_api.src.comments.service.get_icon_urls") as mock_get_urls:
+
             mock_upload.return_value = "icons/new_feedback.png"
-            mock_delete.side_effect = Exception("Delete Error")
             mock_get_urls.return_value = ["signed_new_url"]
-            
+
             result = await update_comment_icon(
                 mock_db, icon_id=1, image=mock_image
             )
 
-            # Deve continuar com sucesso mesmo com erro na deleção
             assert result.icon_url == "signed_new_url"
-            mock_upload.assert_awaited_once()
-            mock_delete.assert_awaited_once()
-            mock_db.commit.assert_awaited_once()
\ No newline at end of file
+            mock_remove.assert_not_called()
+            (entries,), _ = mock_db.add_all.call_args
+            assert [entry.path for entry in entries] == ["icons/feedback.png"]
+            mock_db.commit.assert_awaited_once()
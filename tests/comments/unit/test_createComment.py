@@ -1,4 +1,4 @@
-from unittest.mock import MagicMock, AsyncMock
+from unittest.mock import MagicMock, AsyncMock, patch
 
 import pytest
 
@@ -56,3 +56,51 @@ async def test_create_comment_internal_error():
         await service.create_comment(db_mock, commentToUp)
 
     db_mock.rollback.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_create_comment_commit_failure_removes_uploaded_images():
+    db_mock = AsyncMock()
+    db_mock.add = MagicMock()
+    db_mock.commit.side_effect = Exception("Database error")
+
+    commentToUp = CommentCreate(
+        user_name="Ana Pereira", rating=5, comment="mocked comment", location_id=123
+    )
+
+    with patch(
+        "acesso_livre_api.src.comments.service.upload_image.upload_images",
+        new_callable=AsyncMock,
+        return_value=["a.jpg", "b.jpg"],
+    ), patch(
+        "acesso_livre_api.src.comments.service.discard_unreferenced", new_callable=AsyncMock
+    ) as mock_discard:
+        with pytest.raises(exceptions.CommentCreateException):
+            await service.create_comment(db_mock, commentToUp, images=[MagicMock(), MagicMock()])
+
+    mock_discard.assert_awaited_once_with(db_mock, ["a.jpg", "b.jpg"])
+    db_mock.rollback.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_create_comment_upload_failure_does_not_insert():
+    db_mock = AsyncMock()
+    db_mock.add = MagicMock()
+
+    commentToUp = CommentCreate(
+        user_name="Ana Pereira", rating=5, comment="mocked comment", location_id=123
+    )
+
+    with patch(
+        "acesso_livre_api.src.comments.service.upload_image.upload_images",
+        new_callable=AsyncMock,
+        side_effect=ValueError("Unsupported file type"),
+    ), patch(
+        "acesso_livre_api.src.comments.service.discard_unreferenced", new_callable=AsyncMock
+    ) as mock_discard:
+        with pytest.raises(exceptions.CommentCreateException):
+            await service.create_comment(db_mock, commentToUp, images=[MagicMock()])
+
+    db_mock.add.assert_not_called()
+    db_mock.commit.assert_not_awaited()
+    mock_discard.assert_not_awaited()
@@ -1,14 +1,21 @@
+from datetime import UTC, datetime
 from unittest.mock import MagicMock, AsyncMock, patch
 
 import pytest
+import pytest_asyncio
+from sqlalchemy import delete, select
 
 from acesso_livre_api.src.comments import service, exceptions
-from acesso_livre_api.src.comments.models import CommentStatus
+from acesso_livre_api.src.comments.models import Comment, CommentStatus
+from acesso_livre_api.src.config import settings
+from acesso_livre_api.src.database import Base
+from acesso_livre_api.storage.models import StorageDeletion
+from tests.conftest import TestingSessionLocal, init_db, test_engine
 
 
 @pytest.mark.asyncio
-@patch("acesso_livre_api.src.comments.service.delete_images", new_callable=AsyncMock)
-async def test_delete_comment_success(mock_delete_images):
+@patch("acesso_livre_api.src.comments.service.release_objects", new_callable=AsyncMock)
+async def test_delete_comment_success(mock_release):
     db_mock = AsyncMock()
 
     # create a comment to be deleted
@@ -27,7 +34,7 @@ async def test_delete_comment_success(mock_delete_images):
 
     await service.delete_comment(db_mock, comment_id=1)
 
-    mock_delete_images.assert_awaited_once_with(["image1.jpg"])
+    mock_release.assert_awaited_once_with(db_mock, ["image1.jpg"])
     db_mock.delete.assert_called_once_with(existing_comment)
     db_mock.commit.assert_awaited_once()
 
@@ -58,8 +65,8 @@ async def test_delete_comment_permission_denied():
 
 
 @pytest.mark.asyncio
-@patch("acesso_livre_api.src.comments.service.delete_images", new_callable=AsyncMock)
-async def test_delete_comment_db_error(mock_delete_images):
+@patch("acesso_livre_api.src.comments.service.release_objects", new_callable=AsyncMock)
+async def test_delete_comment_db_error(mock_release):
     db_mock = AsyncMock()
 
     # create a comment to be deleted
@@ -99,8 +106,8 @@ async def test_delete_comment_generic_exception():
 
 
 @pytest.mark.asyncio
-@patch("acesso_livre_api.src.comments.service.delete_images", new_callable=AsyncMock)
-async def test_delete_comment_without_images(mock_delete_images):
+@patch("acesso_livre_api.src.comments.service.release_objects", new_callable=AsyncMock)
+async def test_delete_comment_without_images(mock_release):
     db_mock = AsyncMock()
 
     # create a comment to be deleted without images
@@ -119,41 +126,54 @@ async def test_delete_comment_without_images(mock_delete_images):
 
     await service.delete_comment(db_mock, comment_id=1)
 
-    mock_delete_images.assert_not_awaited()
+    mock_release.assert_not_awaited()
     db_mock.delete.assert_called_once_with(existing_comment)
     db_mock.commit.assert_awaited_once()
 
 
-@pytest.mark.asyncio
-@patch("acesso_livre_api.src.comments.service.delete_images", new_callable=AsyncMock)
-async def test_delete_comment_image_deletion_fails_but_comment_deleted(mock_delete_images):
-    db_mock = AsyncMock()
+@pytest_asyncio.fixture(scope="function")
+async def session():
+    await init_db()
+    async with TestingSessionLocal() as db:
+        yield db
 
-    # create a comment to be deleted
-    existing_comment = MagicMock(
-        id=1,
+    async with test_engine.begin() as conn:
+        for table in reversed(Base.metadata.sorted_tables):
+            await conn.execute(delete(table))
+
+
+@pytest.mark.asyncio
+async def test_delete_comment_does_not_call_storage_in_request(session):
+    comment = Comment(
         user_name="test_user",
         rating=4,
         comment="Nice place.",
         status=CommentStatus.PENDING,
         images=["image1.jpg"],
+        created_at=datetime.now(UTC),
     )
+    session.add(comment)
+    await session.commit()
 
-    mock_result = MagicMock()
-    mock_result.scalars.return_value.first.return_value = existing_comment
-    db_mock.execute = AsyncMock(return_value=mock_result)
-    mock_delete_images.side_effect = Exception("Image deletion failed")
-
-    # A exclusão do comentário deve funcionar mesmo se a exclusão da imagem falhar
-    await service.delete_comment(db_mock, comment_id=1)
+    # O storage só é acionado depois, pelo worker do outbox
+    with patch("acesso_livre_api.storage.delete_image.supabase_client") as mock_storage:
+        await service.delete_comment(session, comment_id=comment.id)
 
-    mock_delete_images.assert_awaited_once_with(["image1.jpg"])
-    db_mock.delete.assert_called_once_with(existing_comment)
-    db_mock.commit.assert_awaited_once()
+    assert mock_storage.mock_calls == []
+    result = await session.execute(
+        select(StorageDeletion.bucket, StorageDeletion.path).order_by(StorageDeletion.id)
+    )
+    assert result.all() == [
+        (settings.bucket_name, "image1.jpg"),
+        (settings.bucket_name, "image1_thumb.webp"),
+        (settings.bucket_name, "image1_medium.webp"),
+    ]
+    result = await session.execute(select(Comment.id))
+    assert result.all() == []
 
 @pytest.mark.asyncio
-@patch("acesso_livre_api.src.comments.service.delete_images", new_callable=AsyncMock)
-async def test_delete_comment_without_images(mock_delete_images):
+@patch("acesso_livre_api.src.comments.service.release_objects", new_callable=AsyncMock)
+async def test_delete_comment_without_images(mock_release):
     """Testa exclusão de comentário sem imagens."""
     db_mock = AsyncMock()
 
@@ -172,18 +192,20 @@ async def test_delete_comment_without_images(mock_delete_images):
 
     await service.delete_comment(db_mock, comment_id=1)
 
-    # delete_images não deve ser chamado quando não há imagens
-    mock_delete_images.assert_not_awaited()
+    # Nada é enfileirado quando não há imagens
+    mock_release.assert_not_awaited()
     db_mock.delete.assert_called_once_with(existing_comment)
     db_mock.commit.assert_awaited_once()
 
 
 @pytest.mark.asyncio
-@patch("acesso_livre_api.src.comments.service.delete_images", new_callable=AsyncMock)
-async def test_delete_comment_image_deletion_fails_but_comment_deleted(mock_delete_images):
-    """Testa que o comentário é deletado mesmo quando a deleção de imagens falha."""
+@patch("acesso_livre_api.src.comments.service.release_objects", new_callable=AsyncMock)
+async def test_delete_comment_releases_images_before_commit(mock_release):
+    """Testa que a liberação das imagens é registrada na mesma transação da exclusão."""
     db_mock = AsyncMock()
-    mock_delete_images.side_effect = Exception("Storage error")
+    calls = []
+    mock_release.side_effect = lambda *args, **kwargs: calls.append("release")
+    db_mock.commit.side_effect = lambda: calls.append("commit")
 
     existing_comment = MagicMock(
         id=1,
@@ -198,9 +220,8 @@ async def test_delete_comment_image_deletion_fails_but_comment_deleted(mock_dele
     mock_result.scalars.return_value.first.return_value = existing_comment
     db_mock.execute = AsyncMock(return_value=mock_result)
 
-    # Mesmo com erro ao deletar imagens, o comentário deve ser excluído
     await service.delete_comment(db_mock, comment_id=1)
 
-    mock_delete_images.assert_awaited_once_with(["image1.jpg"])
+    mock_release.assert_awaited_once_with(db_mock, ["image1.jpg"])
     db_mock.delete.assert_called_once_with(existing_comment)
-    db_mock.commit.assert_awaited_once()
+    assert calls == ["release", "commit"]
@@ -1,32 +1,67 @@
+from datetime import UTC, datetime
 from unittest.mock import MagicMock, patch, AsyncMock
 
 import pytest
 
-from acesso_livre_api.src.comments import exceptions, service, schemas
+from acesso_livre_api.src.comments import dto, exceptions, service, schemas
+
+
+CREATED_AT = datetime(2026, 1, 1, tzinfo=UTC)
+
+
+def _comment_row(**overrides):
+    row = {
+        "id": 1,
+        "user_name": "Usuário",
+        "rating": 4,
+        "comment": "Comentário",
+        "location_id": 1,
+        "status": "approved",
+        "images": ["image1.jpg"],
+        "created_at": CREATED_AT,
+    }
+    row.update(overrides)
+    return row
+
+
+def _first_result(row):
+    result = MagicMock()
+    result.mappings.return_value.first.return_value = row
+    return result
 
 
 @pytest.mark.asyncio
-@patch("acesso_livre_api.src.comments.service.get_images_with_ids")
-@patch("acesso_livre_api.src.comments.service.get_signed_urls")
-async def test_get_comment_with_status_pending_success(mock_get_signed_urls, mock_get_images_with_ids):
+@patch("acesso_livre_api.src.comments.service.get_icon_urls", new_callable=AsyncMock)
+@patch("acesso_livre_api.src.comments.service.sign_image_paths", new_callable=AsyncMock)
+async def test_get_comment_with_status_pending_success(mock_sign_image_paths, mock_get_icon_urls):
     db_mock = AsyncMock()
-    mock_get_images_with_ids.return_value = [
-        schemas.ImageResponse(id="uuid1", url="signed_url_1"),
-        schemas.ImageResponse(id="uuid2", url="signed_url_2")
-    ]
-    mock_get_signed_urls.return_value = ["signed_icon_url"]
+    mock_sign_image_paths.side_effect = lambda db, paths: {path: f"signed_{path}" for path in paths}
+    mock_get_icon_urls.return_value = ["signed_icon.png"]
 
-    mock_comment_1 = MagicMock(images=["uuid1.jpg"], icon_url="icon1.jpg")
-    mock_comment_2 = MagicMock(images=["uuid2.jpg"], icon_url=None)
-
-    mock_result = MagicMock()
-    mock_result.unique.return_value.scalars.return_value.all.return_value = [mock_comment_1, mock_comment_2]
-    db_mock.execute = AsyncMock(return_value=mock_result)
+    comments_result = MagicMock()
+    comments_result.mappings.return_value.all.return_value = [
+        _comment_row(id=1, status="pending", images=["uuid1.jpg"]),
+        _comment_row(id=2, status="pending", images=None),
+    ]
+    icons_result = MagicMock()
+    icons_result.mappings.return_value.all.return_value = [
+        {"comment_id": 1, "id": 7, "name": "Elogio", "icon_url": "icon.png"},
+        {"comment_id": 2, "id": 7, "name": "Elogio", "icon_url": "icon.png"},
+    ]
+    db_mock.execute = AsyncMock(side_effect=[comments_result, icons_result])
 
     comments = await service.get_comments_with_status_pending(db_mock, skip=0, limit=10)
 
     assert len(comments) == 2
-    db_mock.execute.assert_awaited_once()
+    assert comments[0].images == (schemas.ImageResponse(id="uuid1", url="signed_uuid1.jpg"),)
+    assert comments[1].images == ()
+    assert comments[0].comment_icons == (
+        dto.CommentIconDTO(id=7, name="Elogio", icon_url="signed_icon.png"),
+    )
+    # Ícones de todos os comentários em uma consulta e uma resolução de URLs
+    assert db_mock.execute.await_count == 2
+    mock_sign_image_paths.assert_awaited_once_with(db_mock, ["uuid1.jpg"])
+    mock_get_icon_urls.assert_awaited_once_with(["icon.png"])
 
 
 @pytest.mark.asyncio
@@ -34,17 +69,16 @@ async def test_get_comment_with_status_pending_success(mock_get_signed_urls, moc
 async def test_get_comment_with_id(mock_get_signed_urls):
     db_mock = AsyncMock()
     comment_id = 1
-    expected_comment = MagicMock(images=["image1.jpg"], status="approved", icon_url=None)
+    row = _comment_row()
     mock_get_signed_urls.return_value = ["signed_url.jpg"]
-
-    mock_result = MagicMock()
-    mock_result.unique.return_value.scalars.return_value.first.return_value = expected_comment
-    db_mock.execute = AsyncMock(return_value=mock_result)
+    db_mock.execute = AsyncMock(return_value=_first_result(row))
 
     comment = await service.get_comment(db_mock, comment_id)
 
-    assert comment == expected_comment
-    assert comment.images == ["signed_url.jpg"]
+    assert isinstance(comment, dto.CommentDetailDTO)
+    assert comment.images == ("signed_url.jpg",)
+    # A linha lida do banco não recebe as URLs assinadas
+    assert row["images"] == ["image1.jpg"]
     mock_get_signed_urls.assert_called_once_with(["image1.jpg"])
     db_mock.execute.assert_awaited_once()
 
@@ -53,10 +87,7 @@ async def test_get_comment_with_id(mock_get_signed_urls):
 async def test_get_comment_not_found():
     db_mock = AsyncMock()
     comment_id = 999
-
-    mock_result = MagicMock()
-    mock_result.unique.return_value.scalars.return_value.first.return_value = None
-    db_mock.execute = AsyncMock(return_value=mock_result)
+    db_mock.execute = AsyncMock(return_value=_first_result(None))
 
     with pytest.raises(exceptions.CommentNotFoundException):
         await service.get_comment(db_mock, comment_id)
@@ -79,16 +110,10 @@ async def test_get_comment_generic_exception():
 async def test_get_comment_images_none(mock_get_signed_urls):
     db_mock = AsyncMock()
     comment_id = 1
-    expected_comment = MagicMock(images=None, status="approved", icon_url=None)
-    mock_get_signed_urls.return_value = []
-
-    mock_result = MagicMock()
-    mock_result.unique.return_value.scalars.return_value.first.return_value = expected_comment
-    db_mock.execute = AsyncMock(return_value=mock_result)
+    db_mock.execute = AsyncMock(return_value=_first_result(_comment_row(images=None)))
 
     comment = await service.get_comment(db_mock, comment_id)
 
-    assert comment.images == []
+    assert comment.images == ()
     mock_get_signed_urls.assert_not_called()
     db_mock.execute.assert_awaited_once()
-
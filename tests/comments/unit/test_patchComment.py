@@ -1,31 +1,38 @@
+from datetime import UTC, datetime
 from unittest.mock import MagicMock, patch, AsyncMock
 
 import pytest
 
-from acesso_livre_api.src.comments import schemas, service, exceptions
+from acesso_livre_api.src.comments import dto, schemas, service, exceptions
 from acesso_livre_api.src.comments.models import CommentStatus
 
 
 @pytest.mark.asyncio
+@patch("acesso_livre_api.src.comments.service.link_location_images", new_callable=AsyncMock)
 @patch(
     "acesso_livre_api.src.comments.service.update_location_average_rating",
     new_callable=AsyncMock,
 )
-@patch("acesso_livre_api.src.comments.service.get_signed_urls")
-async def test_patch_comment_success(mock_get_signed_urls, mock_update_avg):
+@patch("acesso_livre_api.src.comments.service.sign_image_paths", new_callable=AsyncMock)
+async def test_patch_comment_success(mock_sign_image_paths, mock_update_avg, mock_link_images):
     db_mock = AsyncMock()
-    mock_get_signed_urls.return_value = []
+    mock_sign_image_paths.return_value = {"image1.jpg": "signed_image1.jpg"}
 
     original_comment = MagicMock(
-        status=CommentStatus.PENDING,
-        location_id=1,
+        id=1,
+        user_name="Usuário",
         rating=4,
-        images=[],
-        icon_url=None
+        comment="Comentário",
+        location_id=1,
+        status=CommentStatus.PENDING,
+        images=["image1.jpg"],
+        created_at=datetime(2026, 1, 1, tzinfo=UTC),
+        comment_icons=[],
     )
 
     mock_result = MagicMock()
     mock_result.scalars.return_value.first.return_value = original_comment
+    mock_result.scalar_one_or_none.return_value = 1
     db_mock.execute = AsyncMock(return_value=mock_result)
 
     new_status = schemas.CommentUpdateStatus(status=CommentStatus.APPROVED)
@@ -33,9 +40,45 @@ async def test_patch_comment_success(mock_get_signed_urls, mock_update_avg):
         db_mock, comment_id=1, new_status=new_status
     )
 
-    assert updated_comment.status == CommentStatus.APPROVED
-    db_mock.commit.assert_awaited()
-    mock_update_avg.assert_awaited_once_with(db_mock, 1, 4)
+    assert isinstance(updated_comment, dto.CommentDTO)
+    assert updated_comment.status == "approved"
+    assert updated_comment.images == (
+        schemas.ImageResponse(id="image1", url="signed_image1.jpg"),
+    )
+    # A entidade não recebe as URLs assinadas
+    assert original_comment.images == ["image1.jpg"]
+    # Status, média e galeria do local confirmados num único commit
+    db_mock.commit.assert_awaited_once()
+    mock_update_avg.assert_awaited_once_with(db_mock, 1)
+    mock_link_images.assert_awaited_once_with(db_mock, 1, {"image1.jpg": 1})
+
+
+@pytest.mark.asyncio
+@patch("acesso_livre_api.src.comments.service.link_location_images", new_callable=AsyncMock)
+@patch(
+    "acesso_livre_api.src.comments.service.update_location_average_rating",
+    new_callable=AsyncMock,
+)
+async def test_patch_comment_approve_already_processed_concurrently(
+    mock_update_avg, mock_link_images
+):
+    """Testa que a guarda de status impede aprovar duas vezes o mesmo comentário."""
+    db_mock = AsyncMock()
+
+    comment = MagicMock(status=CommentStatus.PENDING, location_id=1, rating=4, images=[])
+    mock_find = MagicMock()
+    mock_find.scalars.return_value.first.return_value = comment
+    mock_update = MagicMock()
+    mock_update.scalar_one_or_none.return_value = None
+    db_mock.execute = AsyncMock(side_effect=[mock_find, mock_update])
+
+    new_status = schemas.CommentUpdateStatus(status=CommentStatus.APPROVED)
+    with pytest.raises(exceptions.CommentNotPendingException):
+        await service.update_comment_status(db_mock, comment_id=1, new_status=new_status)
+
+    mock_update_avg.assert_not_awaited()
+    mock_link_images.assert_not_awaited()
+    db_mock.commit.assert_not_awaited()
 
 
 @pytest.mark.asyncio
@@ -112,11 +155,8 @@ async def test_patch_comments_with_generic_exception(mock_update_avg):
 
 
 @pytest.mark.asyncio
-@patch(
-    "acesso_livre_api.src.comments.service.delete_images",
-    new_callable=AsyncMock,
-)
-async def test_patch_comment_reject_deletes_comment_and_images(mock_delete_images):
+@patch("acesso_livre_api.src.comments.service.release_objects", new_callable=AsyncMock)
+async def test_patch_comment_reject_deletes_comment_and_images(mock_release):
     db_mock = AsyncMock()
 
     comment_with_images = MagicMock(
@@ -129,15 +169,14 @@ async def test_patch_comment_reject_deletes_comment_and_images(mock_delete_image
     mock_result = MagicMock()
     mock_result.scalars.return_value.first.return_value = comment_with_images
     db_mock.execute = AsyncMock(return_value=mock_result)
-    mock_delete_images.return_value = True
 
     new_status = schemas.CommentUpdateStatus(status=CommentStatus.REJECTED)
     updated_comment = await service.update_comment_status(
         db_mock, comment_id=1, new_status=new_status
     )
 
-    # Verificar que delete_images foi chamado com as imagens do comentário
-    mock_delete_images.assert_awaited_once_with(["image1.jpg", "image2.jpg"])
+    # Verificar que a remoção das imagens foi enfileirada no outbox
+    mock_release.assert_awaited_once_with(db_mock, ["image1.jpg", "image2.jpg"])
     
     # Verificar que o comentário foi deletado
     db_mock.delete.assert_awaited_once_with(comment_with_images)
@@ -145,11 +184,8 @@ async def test_patch_comment_reject_deletes_comment_and_images(mock_delete_image
 
 
 @pytest.mark.asyncio
-@patch(
-    "acesso_livre_api.src.comments.service.delete_images",
-    new_callable=AsyncMock,
-)
-async def test_patch_comment_reject_without_images(mock_delete_images):
+@patch("acesso_livre_api.src.comments.service.release_objects", new_callable=AsyncMock)
+async def test_patch_comment_reject_without_images(mock_release):
     db_mock = AsyncMock()
 
     comment_without_images = MagicMock(
@@ -168,8 +204,8 @@ async def test_patch_comment_reject_without_images(mock_delete_images):
         db_mock, comment_id=1, new_status=new_status
     )
 
-    # Verificar que delete_images não foi chamado
-    mock_delete_images.assert_not_awaited()
+    # Verificar que nada foi enfileirado
+    mock_release.assert_not_awaited()
     
     # Verificar que o comentário foi deletado mesmo sem imagens
     db_mock.delete.assert_awaited_once_with(comment_without_images)
@@ -1,4 +1,4 @@
-from unittest.mock import Mock, AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
 from sqlalchemy.exc import SQLAlchemyError
 
@@ -15,49 +15,29 @@ def mock_db():
 
 
 @pytest.fixture
-def sample_location():
-    """Dados de exemplo para localização."""
-    location = Mock()
-    location.id = 1
-    location.name = "Biblioteca Municipal"
-    location.avg_rating = 4.5
-    location.description = "Uma biblioteca acessível"
-    return location
+def sample_row():
+    """Linha projetada de exemplo (colunas de RecentCommentResponse)."""
+    return {
+        "location_name": "Biblioteca Municipal",
+        "location_rating": 4.5,
+        "user_name": "João Silva",
+        "description": "Excelente local, muito acessível!",
+    }
 
 
-@pytest.fixture
-def sample_comment(sample_location):
-    """Dados de exemplo para comentário."""
-    comment = Mock()
-    comment.id = 1
-    comment.user_name = "João Silva"
-    comment.rating = 5
-    comment.comment = "Excelente local, muito acessível!"
-    comment.location_id = 1
-    comment.status = "approved"
-    comment.created_at = "2023-10-01T12:00:00Z"
-    comment.location = sample_location
-    comment.images = []
-    comment.icon_url = None
-    return comment
+def _rows_result(rows):
+    result = MagicMock()
+    result.mappings.return_value.all.return_value = rows
+    return result
 
 
 class TestGetRecentComments:
     """Testes para get_recent_comments."""
 
     @pytest.mark.asyncio
-    
-    @patch("acesso_livre_api.src.comments.service.get_signed_urls")
-    async def test_get_recent_comments_success(self, mock_get_signed_urls, mock_db, sample_comment):
+    async def test_get_recent_comments_success(self, mock_db, sample_row):
         """Testa obtenção bem-sucedida de comentários recentes."""
-        mock_get_signed_urls.return_value = []
-        
-        # Mock do execute retornando um result object
-        mock_result = MagicMock()
-        mock_result.unique.return_value.scalars.return_value.all.return_value = [
-            sample_comment
-        ]
-        mock_db.execute = AsyncMock(return_value=mock_result)
+        mock_db.execute = AsyncMock(return_value=_rows_result([sample_row]))
 
         result = await get_recent_comments(mock_db, limit=3)
 
@@ -68,49 +48,29 @@ class TestGetRecentComments:
     @pytest.mark.asyncio
     async def test_get_recent_comments_returns_empty_list(self, mock_db):
         """Testa quando não há comentários recentes."""
-        mock_result = MagicMock()
-        mock_result.unique.return_value.scalars.return_value.all.return_value = []
-        mock_db.execute.return_value = mock_result
+        mock_db.execute.return_value = _rows_result([])
 
         result = await get_recent_comments(mock_db, limit=3)
 
         assert result == []
 
     @pytest.mark.asyncio
-    
-    @patch("acesso_livre_api.src.comments.service.get_signed_urls")
-    async def test_get_recent_comments_with_multiple_comments(
-        self, mock_get_signed_urls, mock_db, sample_comment
-    ):
+    async def test_get_recent_comments_with_multiple_comments(self, mock_db, sample_row):
         """Testa obtenção de múltiplos comentários recentes."""
-        mock_get_signed_urls.return_value = []
-        
-        comment2 = Mock()
-        comment2.user_name = "Maria Santos"
-        comment2.comment = "Bom local!"
-        comment2.images = []
-        comment2.icon_url = None
-
-        comment3 = Mock()
-        comment3.user_name = "Pedro Oliveira"
-        comment3.comment = "Maravilhoso!"
-        comment3.images = []
-        comment3.icon_url = None
-
-        mock_result = MagicMock()
-        mock_result.unique.return_value.scalars.return_value.all.return_value = [
-            sample_comment,
-            comment2,
-            comment3,
+        rows = [
+            sample_row,
+            {**sample_row, "user_name": "Maria Santos", "description": "Bom local!"},
+            {**sample_row, "user_name": "Pedro Oliveira", "description": "Maravilhoso!"},
         ]
-        mock_db.execute = AsyncMock(return_value=mock_result)
+        mock_db.execute = AsyncMock(return_value=_rows_result(rows))
 
         result = await get_recent_comments(mock_db, limit=5)
 
-        assert len(result) == 3
-        assert result[0].user_name == "João Silva"
-        assert result[1].user_name == "Maria Santos"
-        assert result[2].user_name == "Pedro Oliveira"
+        assert [comment.user_name for comment in result] == [
+            "João Silva",
+            "Maria Santos",
+            "Pedro Oliveira",
+        ]
 
     @pytest.mark.asyncio
     async def test_get_recent_comments_database_error(self, mock_db):
@@ -129,106 +89,52 @@ class TestGetRecentComments:
             await get_recent_comments(mock_db, limit=3)
 
     @pytest.mark.asyncio
-    
-    @patch("acesso_livre_api.src.comments.service.get_signed_urls")
-    async def test_get_recent_comments_respects_limit(self, mock_get_signed_urls, mock_db, sample_comment):
-        """Testa se a função respeita o parâmetro limit."""
-        mock_get_signed_urls.return_value = []
-        
-        # Criar múltiplos comentários
-        comments = [sample_comment for _ in range(10)]
-
-        mock_result = MagicMock()
-        mock_result.unique.return_value.scalars.return_value.all.return_value = comments[
-            :5
-        ]
-        mock_db.execute = AsyncMock(return_value=mock_result)
+    async def test_get_recent_comments_respects_limit(self, mock_db, sample_row):
+        """Testa se a consulta usa o parâmetro limit."""
+        mock_db.execute = AsyncMock(return_value=_rows_result([sample_row] * 5))
 
         result = await get_recent_comments(mock_db, limit=5)
 
         assert len(result) == 5
+        stmt = mock_db.execute.await_args.args[0]
+        assert stmt._limit_clause.value == 5
 
     @pytest.mark.asyncio
-    
-    @patch("acesso_livre_api.src.comments.service.get_signed_urls")
-    async def test_get_recent_comments_default_limit(self, mock_get_signed_urls, mock_db, sample_comment):
+    async def test_get_recent_comments_default_limit(self, mock_db, sample_row):
         """Testa se o limite padrão é 3."""
-        mock_get_signed_urls.return_value = []
-        
-        comments = [sample_comment for _ in range(3)]
-
-        mock_result = MagicMock()
-        mock_result.unique.return_value.scalars.return_value.all.return_value = comments
-        mock_db.execute = AsyncMock(return_value=mock_result)
+        mock_db.execute = AsyncMock(return_value=_rows_result([sample_row] * 3))
 
         result = await get_recent_comments(mock_db)
 
         assert len(result) == 3
+        stmt = mock_db.execute.await_args.args[0]
+        assert stmt._limit_clause.value == 3
 
     @pytest.mark.asyncio
-    
-    @patch("acesso_livre_api.src.comments.service.get_signed_urls")
-    async def test_get_recent_comments_includes_location(
-        self, mock_get_signed_urls, mock_db, sample_comment, sample_location
-    ):
-        """Testa se os comentários incluem informações de localização."""
-        mock_get_signed_urls.return_value = []
-        
-        mock_result = MagicMock()
-        mock_result.unique.return_value.scalars.return_value.all.return_value = [
-            sample_comment
+    async def test_get_recent_comments_selects_only_response_columns(self, mock_db):
+        """Testa que a consulta lê só as colunas da resposta, com o local via JOIN."""
+        mock_db.execute = AsyncMock(return_value=_rows_result([]))
+
+        await get_recent_comments(mock_db, limit=3)
+
+        stmt = mock_db.execute.await_args.args[0]
+        assert [column.name for column in stmt.selected_columns] == [
+            "location_name",
+            "location_rating",
+            "user_name",
+            "description",
         ]
-        mock_db.execute = AsyncMock(return_value=mock_result)
-
-        result = await get_recent_comments(mock_db, limit=3)
-
-        assert len(result) == 1
-        assert result[0].location is not None
-        assert result[0].location.name == "Biblioteca Municipal"
-        assert result[0].location.avg_rating == 4.5
 
     @pytest.mark.asyncio
-    
-    @patch("acesso_livre_api.src.comments.service.get_signed_urls")
-    async def test_get_recent_comments_with_icon_urls(
-        self, mock_get_signed_urls, mock_db, sample_comment
-    ):
-        """Testa se múltiplos comentários com icon_url têm URLs assinadas corretamente."""
-        def mock_get_signed_urls_impl(urls):
-            return [f"signed_{url}" for url in urls]
-        
-        mock_get_signed_urls.side_effect = mock_get_signed_urls_impl
-        
-
-        comment1 = Mock()
-        comment1.user_name = "João Silva"
-        comment1.images = []
-        comment1.icon_url = "icon1.jpg"
-        comment1.status = "approved"
-
-        comment2 = Mock()
-        comment2.user_name = "Maria Santos"
-        comment2.images = []
-        comment2.icon_url = "icon2.jpg"
-        comment2.status = "approved"
-
-        comment3 = Mock()
-        comment3.user_name = "Pedro Oliveira"
-        comment3.images = []
-        comment3.icon_url = None
-        comment3.status = "approved"
-
-        mock_result = MagicMock()
-        mock_result.unique.return_value.scalars.return_value.all.return_value = [
-            comment1,
-            comment2,
-            comment3,
-        ]
-        mock_db.execute.return_value = mock_result
-
-        result = await get_recent_comments(mock_db, limit=5)
+    async def test_get_recent_comments_does_not_sign_urls(self, mock_db, sample_row):
+        """Testa que imagens e ícones, fora da resposta, não são assinados."""
+        mock_db.execute = AsyncMock(return_value=_rows_result([sample_row]))
+
+        with (
+            patch("acesso_livre_api.src.comments.service.get_signed_urls") as mock_signed,
+            patch("acesso_livre_api.src.comments.service.get_icon_urls") as mock_icons,
+        ):
+            await get_recent_comments(mock_db, limit=3)
 
-        assert len(result) == 3
-        assert result[0].icon_url == "signed_icon1.jpg"
-        assert result[1].icon_url == "signed_icon2.jpg"
-        assert result[2].icon_url is None
+        mock_signed.assert_not_called()
+        mock_icons.assert_not_called()
@@ -1,10 +1,11 @@
+from datetime import UTC, datetime
 from unittest.mock import Mock, MagicMock, AsyncMock, patch
 
 import pytest
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy import select
 
-from acesso_livre_api.src.comments import schemas, models
+from acesso_livre_api.src.comments import dto, schemas, models
 from acesso_livre_api.src.comments.exceptions import (
     CommentCreateException,
     CommentDeleteException,
@@ -26,6 +27,7 @@ from acesso_livre_api.src.comments.service import (
     get_comments_with_status_pending,
     update_comment_status,
 )
+from acesso_livre_api.src.comments.utils import get_images_with_ids
 
 
 @pytest.fixture
@@ -41,6 +43,22 @@ def mock_db():
     return m
 
 
+def _comment_row(**overrides):
+    """Linha projetada de comentário (colunas de _COMMENT_LIST_COLUMNS)."""
+    row = {
+        "id": 1,
+        "user_name": "Test User",
+        "rating": 5,
+        "comment": "Test comment",
+        "location_id": 1,
+        "status": "approved",
+        "images": None,
+        "created_at": datetime(2026, 1, 1, tzinfo=UTC),
+    }
+    row.update(overrides)
+    return row
+
+
 @pytest.fixture
 def sample_comment_data():
     """Dados de exemplo para comentário."""
@@ -111,25 +129,22 @@ class TestGetComment:
     async def test_get_comment_success(self, mock_get_signed_urls, mock_db):
         """Testa obtenção bem-sucedida de comentário."""
         mock_get_signed_urls.return_value = []
-        mock_comment = Mock()
-        mock_comment.images = None
-        mock_comment.icon_url = None
-
         mock_result = MagicMock()
-        mock_result.unique.return_value.scalars.return_value.first.return_value = mock_comment
+        mock_result.mappings.return_value.first.return_value = _comment_row()
         mock_db.execute = AsyncMock(return_value=mock_result)
 
         result = await get_comment(mock_db, 1)
 
-        assert result == mock_comment
-        assert mock_comment.images == []
+        assert isinstance(result, dto.CommentDetailDTO)
+        assert result.id == 1
+        assert result.images == ()
 
 
     @pytest.mark.asyncio
     async def test_get_comment_not_found(self, mock_db):
         """Testa comentário não encontrado."""
         mock_result = MagicMock()
-        mock_result.unique.return_value.scalars.return_value.first.return_value = None
+        mock_result.mappings.return_value.first.return_value = None
         mock_db.execute = AsyncMock(return_value=mock_result)
 
         with pytest.raises(CommentNotFoundException):
@@ -150,15 +165,17 @@ class TestDeleteComment:
     @pytest.mark.asyncio
     async def test_delete_comment_success(self, mock_db):
         """Testa exclusão bem-sucedida."""
-        mock_comment = Mock()
+        mock_comment = Mock(images=["foto.jpg"])
 
         mock_result = MagicMock()
         mock_result.scalars.return_value.first.return_value = mock_comment
         mock_db.execute = AsyncMock(return_value=mock_result)
 
-        result = await delete_comment(mock_db, 1, True)
+        with patch("acesso_livre_api.src.comments.service.release_objects", new_callable=AsyncMock) as mock_release:
+            result = await delete_comment(mock_db, 1, True)
 
         assert result is True
+        mock_release.assert_awaited_once_with(mock_db, ["foto.jpg"])
         mock_db.delete.assert_called_once_with(mock_comment)
         mock_db.commit.assert_awaited_once()
 
@@ -195,88 +212,87 @@ class TestDeleteComment:
 class TestGetAllCommentsWithAccessibilityItems:
     """Testes para get_all_comments_with_accessibility_items."""
 
+    @staticmethod
+    def _rows_result(rows):
+        result = MagicMock()
+        result.mappings.return_value.all.return_value = rows
+        return result
+
     @pytest.mark.asyncio
     async def test_get_comments_with_accessibility_items_success(self, mock_db):
         """Testa busca de comentários com itens de acessibilidade."""
-        mock_get_signed_urls_patch = "acesso_livre_api.src.comments.service.get_signed_urls"
-        mock_get_images_patch = "acesso_livre_api.src.comments.service.get_images_with_ids"
-        
-        mock_comment = Mock()
-        mock_comment.images = []
-        mock_comment.comment_icons = []
-
-        mock_location = Mock()
-        mock_item = Mock()
-        mock_item.id = 1
-        mock_item.name = "Bebedouro"
-        mock_location.accessibility_items = [mock_item]
-
-        # Mock para busca de comentários
-        mock_comments_result = MagicMock()
-        mock_comments_result.unique.return_value.scalars.return_value.all.return_value = [mock_comment]
-
-        # Mock para busca de localização
-        mock_location_result = MagicMock()
-        mock_location_result.scalars.return_value.first.return_value = mock_location
+        comment_row = _comment_row()
 
         mock_db.execute = AsyncMock(
-            side_effect=[mock_comments_result, mock_location_result]
+            side_effect=[
+                self._rows_result([comment_row]),
+                self._rows_result([]),
+                self._rows_result([{"id": 1, "name": "Bebedouro"}]),
+            ]
         )
 
-        with (
-            patch(mock_get_signed_urls_patch, new_callable=AsyncMock) as mock_get_signed_urls,
-            patch(mock_get_images_patch, new_callable=AsyncMock) as mock_get_images_with_ids
-        ):
-            mock_get_signed_urls.return_value = ["https://signed-url.com/icons/bebedouro.png"]
-            mock_get_images_with_ids.return_value = []
+        with patch(
+            "acesso_livre_api.src.comments.service.sign_image_paths", new_callable=AsyncMock
+        ) as mock_sign_image_paths:
+            mock_sign_image_paths.return_value = {}
 
             comments, accessibility_items = await get_all_comments_with_accessibility_items(
                 location_id=1, skip=0, limit=10, db=mock_db
             )
 
-            assert len(comments) == 1
-            assert len(accessibility_items) == 1
-            assert accessibility_items[0]["name"] == "Bebedouro"
+        assert len(comments) == 1
+        assert isinstance(comments[0], dto.CommentDTO)
+        assert comments[0].comment_icons == ()
+        assert accessibility_items == [{"id": 1, "name": "Bebedouro"}]
 
     @pytest.mark.asyncio
     async def test_get_comments_with_accessibility_items_no_items(self, mock_db):
         """Testa busca de comentários sem itens de acessibilidade."""
-        mock_get_signed_urls_patch = "acesso_livre_api.src.comments.service.get_signed_urls"
-        mock_get_images_patch = "acesso_livre_api.src.comments.service.get_images_with_ids"
-        
-        mock_comment = Mock()
-        mock_comment.images = []
-        mock_comment.comment_icons = []
-
-        mock_location = Mock()
-        mock_location.accessibility_items = []
-
-        # Mock para busca de comentários
-        mock_comments_result = MagicMock()
-        mock_comments_result.unique.return_value.scalars.return_value.all.return_value = [mock_comment]
-
-        # Mock para busca de localização
-        mock_location_result = MagicMock()
-        mock_location_result.scalars.return_value.first.return_value = mock_location
+        comment_row = _comment_row(images=[])
 
         mock_db.execute = AsyncMock(
-            side_effect=[mock_comments_result, mock_location_result]
+            side_effect=[
+                self._rows_result([comment_row]),
+                self._rows_result([]),
+                self._rows_result([]),
+            ]
         )
 
-        with (
-            patch(mock_get_signed_urls_patch, new_callable=AsyncMock) as mock_get_signed_urls,
-            patch(mock_get_images_patch, new_callable=AsyncMock) as mock_get_images_with_ids
-        ):
-            mock_get_signed_urls.return_value = []
-            mock_get_images_with_ids.return_value = []
+        with patch(
+            "acesso_livre_api.src.comments.service.sign_image_paths", new_callable=AsyncMock
+        ) as mock_sign_image_paths:
+            mock_sign_image_paths.return_value = {}
 
             comments, accessibility_items = await get_all_comments_with_accessibility_items(
                 location_id=1, skip=0, limit=10, db=mock_db
             )
 
+        assert len(comments) == 1
+        assert len(accessibility_items) == 0
 
-            assert len(comments) == 1
-            assert len(accessibility_items) == 0
+    @pytest.mark.asyncio
+    async def test_get_comments_with_accessibility_items_selects_columns(self, mock_db):
+        """Testa que a listagem lê colunas, sem carregar entidades ORM."""
+        mock_db.execute = AsyncMock(
+            side_effect=[self._rows_result([]), self._rows_result([])]
+        )
+
+        comments, _ = await get_all_comments_with_accessibility_items(
+            location_id=1, skip=0, limit=10, db=mock_db
+        )
+
+        assert comments == []
+        stmt = mock_db.execute.await_args_list[0].args[0]
+        assert [column.name for column in stmt.selected_columns] == [
+            "id",
+            "user_name",
+            "rating",
+            "comment",
+            "location_id",
+            "status",
+            "images",
+            "created_at",
+        ]
 
     @pytest.mark.asyncio
     async def test_get_comments_with_accessibility_items_error(self, mock_db):
@@ -287,3 +303,72 @@ class TestGetAllCommentsWithAccessibilityItems:
             await get_all_comments_with_accessibility_items(
                 location_id=1, skip=0, limit=10, db=mock_db
             )
+
+
+class TestGetImagesWithIds:
+    """Testes para a conversão de paths em ImageResponse com variantes."""
+
+    @pytest.mark.asyncio
+    async def test_signs_original_and_variants(self, mock_db):
+        """Testa que original, thumb e medium são assinados em uma única chamada."""
+        with patch(
+            "acesso_livre_api.src.comments.utils.paths_with_variants",
+            new=AsyncMock(return_value={"uuid1.jpg", "uuid2.png"}),
+        ), patch(
+            "acesso_livre_api.src.comments.utils.get_signed_urls", new_callable=AsyncMock
+        ) as mock_get_signed_urls:
+            mock_get_signed_urls.side_effect = lambda paths: [f"signed/{p}" for p in paths]
+
+            images = await get_images_with_ids(mock_db, ["uuid1.jpg", "uuid2.png"])
+
+        mock_get_signed_urls.assert_awaited_once_with(
+            [
+                "uuid1.jpg",
+                "uuid2.png",
+                "uuid1_thumb.webp",
+                "uuid2_thumb.webp",
+                "uuid1_medium.webp",
+                "uuid2_medium.webp",
+            ]
+        )
+        assert images[0] == schemas.ImageResponse(
+            id="uuid1",
+            url="signed/uuid1.jpg",
+            thumbnail_url="signed/uuid1_thumb.webp",
+            medium_url="signed/uuid1_medium.webp",
+        )
+        assert images[1].id == "uuid2"
+
+    @pytest.mark.asyncio
+    async def test_images_without_variants_sign_only_original(self, mock_db):
+        """Testa que imagens antigas, sem variantes, não têm variantes assinadas."""
+        with patch(
+            "acesso_livre_api.src.comments.utils.paths_with_variants",
+            new=AsyncMock(return_value={"new.jpg"}),
+        ), patch(
+            "acesso_livre_api.src.comments.utils.get_signed_urls", new_callable=AsyncMock
+        ) as mock_get_signed_urls:
+            mock_get_signed_urls.side_effect = lambda paths: [f"signed/{p}" for p in paths]
+
+            images = await get_images_with_ids(mock_db, ["old.jpg", "new.jpg"])
+
+        mock_get_signed_urls.assert_awaited_once_with(
+            ["old.jpg", "new.jpg", "new_thumb.webp", "new_medium.webp"]
+        )
+        assert images[0] == schemas.ImageResponse(id="old", url="signed/old.jpg")
+        assert images[1].thumbnail_url == "signed/new_thumb.webp"
+
+    @pytest.mark.asyncio
+    async def test_failed_variant_signing_is_none(self, mock_db):
+        """Testa que variantes cuja assinatura falhou retornam URLs nulas."""
+        with patch(
+            "acesso_livre_api.src.comments.utils.paths_with_variants",
+            new=AsyncMock(return_value={"img.jpg"}),
+        ), patch(
+            "acesso_livre_api.src.comments.utils.get_signed_urls", new_callable=AsyncMock
+        ) as mock_get_signed_urls:
+            mock_get_signed_urls.return_value = ["signed/img.jpg", None, None]
+
+            images = await get_images_with_ids(mock_db, ["img.jpg"])
+
+        assert images == [schemas.ImageResponse(id="img", url="signed/img.jpg")]
@@ -1,3 +1,4 @@
+import pytest
 import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
 from sqlalchemy import event
@@ -6,6 +7,10 @@ from sqlalchemy.orm import sessionmaker
 
 from acesso_livre_api.src.database import Base, get_db
 from acesso_livre_api.src.locations.models import AccessibilityItem
+from acesso_livre_api.src.locations.item_index import item_index
+from acesso_livre_api.src.locations.map_snapshot import invalidate_map_snapshot
+from acesso_livre_api.src.locations.search_index import search_index
+from acesso_livre_api.src.locations.spatial_index import spatial_index
 from acesso_livre_api.src.comments import models as comments_models
 from acesso_livre_api.src.admins import models as admins_models
 from acesso_livre_api.src.main import app
@@ -49,6 +54,20 @@ async def override_get_db():
 app.dependency_overrides[get_db] = override_get_db
 
 
+@pytest.fixture(autouse=True)
+def reset_location_caches():
+    """Limpa os caches em memória de locations, já que o banco é limpo a cada teste."""
+    invalidate_map_snapshot()
+    spatial_index.clear()
+    item_index.clear()
+    search_index.clear()
+    yield
+    invalidate_map_snapshot()
+    spatial_index.clear()
+    item_index.clear()
+    search_index.clear()
+
+
 @pytest_asyncio.fixture(scope="function")
 async def db_session():
     async with TestingSessionLocal() as session:
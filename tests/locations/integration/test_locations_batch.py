@@ -0,0 +1,123 @@
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from httpx import AsyncClient
+
+from acesso_livre_api.src.config import settings
+from acesso_livre_api.src.locations import models
+from acesso_livre_api.storage.models import StoredObject
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_get_locations_batch_keyed_by_id(
+    client: AsyncClient, db_session, created_accessibility_item
+):
+    first = models.Location(
+        name="Biblioteca",
+        description="Biblioteca central",
+        top=10.0,
+        left=20.0,
+        avg_rating=4.5,
+        accessibility_items=[created_accessibility_item],
+    )
+    second = models.Location(
+        name="Museu",
+        description="Museu histórico",
+        top=30.0,
+        left=40.0,
+        accessibility_items=[created_accessibility_item],
+    )
+    db_session.add_all([first, second])
+    await db_session.flush()
+    db_session.add_all(
+        [
+            models.LocationImage(location_id=first.id, path="a.jpg", position=0),
+            models.LocationImage(location_id=first.id, path="shared.jpg", position=1),
+            models.LocationImage(location_id=second.id, path="shared.jpg", position=0),
+            # Só a.jpg veio do pipeline com variantes; shared.jpg é anterior a ele
+            StoredObject(
+                bucket=settings.bucket_name,
+                content_hash="a" * 64,
+                with_variants=True,
+                path="a.jpg",
+            ),
+        ]
+    )
+    await db_session.commit()
+
+    with (
+        patch(
+            "acesso_livre_api.src.comments.utils.get_signed_urls",
+            new=AsyncMock(
+                side_effect=lambda paths: [f"https://signed/{p}" for p in paths]
+            ),
+        ) as mock_sign,
+        patch(
+            "acesso_livre_api.src.locations.service.get_icon_urls",
+            new=AsyncMock(side_effect=lambda paths: [f"https://cdn/{p}" for p in paths]),
+        ) as mock_icons,
+    ):
+        response = await client.get(
+            "/api/locations/batch",
+            params={"ids": f"{second.id},999,{first.id},{second.id}"},
+        )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert list(data["locations"]) == [str(second.id), str(first.id)]
+    assert data["not_found"] == [999]
+
+    biblioteca = data["locations"][str(first.id)]
+    assert biblioteca["name"] == "Biblioteca"
+    assert biblioteca["avg_rating"] == 4.5
+    assert biblioteca["images"] == [
+        {
+            "id": "a",
+            "url": "https://signed/a.jpg",
+            "thumbnail_url": "https://signed/a_thumb.webp",
+            "medium_url": "https://signed/a_medium.webp",
+        },
+        {
+            "id": "shared",
+            "url": "https://signed/shared.jpg",
+            "thumbnail_url": None,
+            "medium_url": None,
+        },
+    ]
+    assert biblioteca["accessibility_items"] == [
+        {
+            "id": created_accessibility_item.id,
+            "name": "Item Teste",
+            "icon_url": "https://cdn/icon.svg",
+        }
+    ]
+    assert data["locations"][str(second.id)]["avg_rating"] == 0.0
+
+    # Uma assinatura para a união das imagens (sem repetir a compartilhada) e uma para os ícones
+    mock_sign.assert_awaited_once_with(
+        ["a.jpg", "shared.jpg", "a_thumb.webp", "a_medium.webp"]
+    )
+    mock_icons.assert_awaited_once_with(["icon.svg"])
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_get_locations_batch_none_found(client: AsyncClient):
+    with patch("acesso_livre_api.src.comments.utils.get_signed_urls") as mock_sign:
+        response = await client.get("/api/locations/batch", params={"ids": "5,6"})
+
+    assert response.status_code == 200
+    assert response.json() == {"locations": {}, "not_found": [5, 6]}
+    mock_sign.assert_not_called()
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+@pytest.mark.parametrize(
+    "ids", ["", "abc", "1,x", "0", ",".join(str(i) for i in range(1, 102))]
+)
+async def test_get_locations_batch_invalid_ids(client: AsyncClient, ids):
+    response = await client.get("/api/locations/batch", params={"ids": ids})
+
+    assert response.status_code == 422
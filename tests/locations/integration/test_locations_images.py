@@ -0,0 +1,48 @@
+from unittest.mock import patch
+
+import pytest
+from httpx import AsyncClient
+
+from acesso_livre_api.src.config import settings
+from acesso_livre_api.src.locations import models
+from acesso_livre_api.storage.get_url import _url_cache
+from acesso_livre_api.storage.models import StoredObject
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_image_without_variants_has_null_variant_urls_with_local_signer(
+    client: AsyncClient, db_session
+):
+    location = models.Location(
+        name="Praça", description="Praça central", top=1.0, left=1.0
+    )
+    db_session.add(location)
+    await db_session.flush()
+    db_session.add_all(
+        [
+            # Imagem anterior ao pipeline: sem variantes nem registro em stored_objects
+            models.LocationImage(location_id=location.id, path="old.jpg", position=0),
+            models.LocationImage(location_id=location.id, path="new.jpg", position=1),
+            StoredObject(
+                bucket=settings.bucket_name,
+                content_hash="b" * 64,
+                with_variants=True,
+                path="new.jpg",
+            ),
+        ]
+    )
+    await db_session.commit()
+
+    _url_cache.clear()
+    with patch.object(settings, "storage_jwt_secret", "jwt-secret"):
+        response = await client.get(f"/api/locations/{location.id}")
+    _url_cache.clear()
+
+    assert response.status_code == 200
+    old, new = response.json()["images"]
+    assert "/object/sign/" in old["url"]
+    assert old["thumbnail_url"] is None
+    assert old["medium_url"] is None
+    assert "new_thumb.webp" in new["thumbnail_url"]
+    assert "new_medium.webp" in new["medium_url"]
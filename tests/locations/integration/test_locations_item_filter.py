@@ -0,0 +1,130 @@
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+
+from acesso_livre_api.src.locations import models
+
+
+async def _create_location(
+    client: AsyncClient, headers: dict, name: str, top: float = 1.0
+):
+    response = await client.post(
+        "/api/locations/",
+        json={"name": name, "description": "Descrição", "top": top, "left": 1.0},
+        headers=headers,
+    )
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+@pytest_asyncio.fixture(scope="function")
+async def accessibility_items(db_session):
+    ramp = models.AccessibilityItem(name="Rampa", icon_url="rampa.png")
+    bathroom = models.AccessibilityItem(
+        name="Banheiro acessível", icon_url="banheiro.png"
+    )
+    db_session.add_all([ramp, bathroom])
+    await db_session.commit()
+    return ramp.id, bathroom.id
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_link_and_filter_locations_by_items(
+    client: AsyncClient, admin_auth_header, accessibility_items
+):
+    ramp, bathroom = accessibility_items
+    both = await _create_location(client, admin_auth_header, "Completo")
+    only_ramp = await _create_location(client, admin_auth_header, "Só rampa")
+    await _create_location(client, admin_auth_header, "Nenhum")
+
+    for location_id, item_id in [(both, ramp), (both, bathroom), (only_ramp, ramp)]:
+        response = await client.post(
+            f"/api/locations/{location_id}/accessibility-items/{item_id}",
+            headers=admin_auth_header,
+        )
+        assert response.status_code == 200
+
+    response = await client.get("/api/locations/", params={"items": f"{ramp},{bathroom}"})
+    assert [loc["id"] for loc in response.json()["locations"]] == [both]
+
+    response = await client.get(
+        "/api/locations/", params={"items": f"{ramp},{bathroom}", "match": "any"}
+    )
+    assert [loc["id"] for loc in response.json()["locations"]] == [both, only_ramp]
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_unlink_updates_filter(
+    client: AsyncClient, admin_auth_header, accessibility_items
+):
+    ramp, _ = accessibility_items
+    location_id = await _create_location(client, admin_auth_header, "Biblioteca")
+
+    await client.post(
+        f"/api/locations/{location_id}/accessibility-items/{ramp}",
+        headers=admin_auth_header,
+    )
+    response = await client.get("/api/locations/", params={"items": str(ramp)})
+    assert len(response.json()["locations"]) == 1
+
+    response = await client.delete(
+        f"/api/locations/{location_id}/accessibility-items/{ramp}",
+        headers=admin_auth_header,
+    )
+    assert response.status_code == 200
+    assert response.json() == {"location_id": location_id, "accessibility_item_ids": []}
+
+    response = await client.get("/api/locations/", params={"items": str(ramp)})
+    assert response.json()["locations"] == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_link_unknown_item_returns_404(client: AsyncClient, admin_auth_header):
+    location_id = await _create_location(client, admin_auth_header, "Biblioteca")
+
+    response = await client.post(
+        f"/api/locations/{location_id}/accessibility-items/999", headers=admin_auth_header
+    )
+
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_link_requires_auth(client: AsyncClient):
+    response = await client.post("/api/locations/1/accessibility-items/1")
+
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_items_filter_combined_with_bbox(
+    client: AsyncClient, admin_auth_header, accessibility_items
+):
+    ramp, _ = accessibility_items
+    near = await _create_location(client, admin_auth_header, "Perto", top=5.0)
+    far = await _create_location(client, admin_auth_header, "Longe", top=95.0)
+    for location_id in (near, far):
+        await client.post(
+            f"/api/locations/{location_id}/accessibility-items/{ramp}",
+            headers=admin_auth_header,
+        )
+
+    response = await client.get(
+        "/api/locations/", params={"items": str(ramp), "bbox": "0,0,10,10"}
+    )
+
+    assert [loc["id"] for loc in response.json()["locations"]] == [near]
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+@pytest.mark.parametrize("params", [{"items": "a,b"}, {"items": "1", "match": "some"}])
+async def test_items_filter_invalid(client: AsyncClient, params):
+    response = await client.get("/api/locations/", params=params)
+
+    assert response.status_code == 422
@@ -0,0 +1,75 @@
+import pytest
+from httpx import AsyncClient
+
+from acesso_livre_api.src.locations import models
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_get_locations_map_empty(client: AsyncClient):
+    response = await client.get("/api/locations/map")
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "ids": [],
+        "names": [],
+        "tops": [],
+        "lefts": [],
+        "avg_ratings": [],
+        "accessibility_item_ids": [],
+    }
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_get_locations_map_columnar_payload(
+    client: AsyncClient, db_session, created_accessibility_item
+):
+    location = models.Location(
+        name="Biblioteca",
+        description="Biblioteca central",
+        top=10.0,
+        left=20.0,
+        avg_rating=4.5,
+        accessibility_items=[created_accessibility_item],
+    )
+    db_session.add(location)
+    await db_session.commit()
+
+    response = await client.get("/api/locations/map")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["ids"] == [location.id]
+    assert data["names"] == ["Biblioteca"]
+    assert data["tops"] == [10.0]
+    assert data["lefts"] == [20.0]
+    assert data["avg_ratings"] == [4.5]
+    assert data["accessibility_item_ids"] == [[created_accessibility_item.id]]
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_get_locations_map_is_cached_until_location_changes(
+    client: AsyncClient, db_session, admin_auth_header
+):
+    first = await client.get("/api/locations/map")
+    assert first.json()["ids"] == []
+
+    # Escrita direta no banco não invalida o cache
+    db_session.add(models.Location(name="Fora", description="d", top=1.0, left=1.0))
+    await db_session.commit()
+
+    cached = await client.get("/api/locations/map")
+    assert cached.json()["ids"] == []
+
+    # Criação pela API invalida o snapshot
+    response = await client.post(
+        "/api/locations/",
+        json={"name": "Reitoria", "description": "Prédio", "top": 5.0, "left": 6.0},
+        headers=admin_auth_header,
+    )
+    assert response.status_code == 201
+
+    refreshed = await client.get("/api/locations/map")
+    assert sorted(refreshed.json()["names"]) == ["Fora", "Reitoria"]
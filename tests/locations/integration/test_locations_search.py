@@ -0,0 +1,140 @@
+import pytest
+from httpx import AsyncClient
+
+from acesso_livre_api.src.locations.search_index import search_index
+
+
+async def _create_location(
+    client: AsyncClient, headers: dict, name: str, description: str
+):
+    response = await client.post(
+        "/api/locations/",
+        json={"name": name, "description": description, "top": 1.0, "left": 1.0},
+        headers=headers,
+    )
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_search_locations_by_name_and_description(
+    client: AsyncClient, admin_auth_header
+):
+    museum = await _create_location(
+        client, admin_auth_header, "Museu de Arte", "Acesso com rampas e elevador"
+    )
+    elevator = await _create_location(
+        client, admin_auth_header, "Elevador Panorâmico", "Vista da cidade"
+    )
+    await _create_location(client, admin_auth_header, "Praça", "Calçada irregular")
+
+    response = await client.get("/api/locations/search", params={"filter": "elevador"})
+
+    assert response.status_code == 200
+    results = response.json()["locations"]
+    assert [loc["id"] for loc in results] == [elevator, museum]
+    assert results[0]["rank"] > results[1]["rank"]
+
+    response = await client.get("/api/locations/search", params={"filter": "RAMPA"})
+    assert [loc["id"] for loc in response.json()["locations"]] == [museum]
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_search_includes_only_approved_comments(
+    client: AsyncClient, admin_auth_header
+):
+    location_id = await _create_location(
+        client, admin_auth_header, "Biblioteca", "Acervo municipal"
+    )
+    # Carrega o índice antes dos comentários para exercitar a manutenção incremental
+    await client.get("/api/locations/search", params={"filter": "biblioteca"})
+
+    comment_ids = []
+    for text in ["Banheiro adaptado no térreo", "Banheiro sujo"]:
+        response = await client.post(
+            "/api/comments/",
+            data={
+                "user_name": "Usuário",
+                "rating": 4,
+                "comment": text,
+                "location_id": location_id,
+            },
+        )
+        comment_ids.append(response.json()["id"])
+
+    response = await client.get("/api/locations/search", params={"filter": "banheiro"})
+    assert response.json()["locations"] == []
+
+    await client.patch(
+        f"/api/comments/{comment_ids[0]}/status",
+        json={"status": "approved"},
+        headers=admin_auth_header,
+    )
+    response = await client.get("/api/locations/search", params={"filter": "banheiro"})
+    assert [loc["id"] for loc in response.json()["locations"]] == [location_id]
+
+    await client.delete(f"/api/comments/{comment_ids[0]}", headers=admin_auth_header)
+    response = await client.get("/api/locations/search", params={"filter": "banheiro"})
+    assert response.json()["locations"] == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_search_pagination_and_index_maintenance(
+    client: AsyncClient, admin_auth_header
+):
+    ids = [
+        await _create_location(
+            client, admin_auth_header, f"Parque {i}", "Trilha acessível"
+        )
+        for i in range(3)
+    ]
+
+    response = await client.get(
+        "/api/locations/search", params={"filter": "parque", "skip": 1, "limit": 1}
+    )
+    assert [loc["id"] for loc in response.json()["locations"]] == [ids[1]]
+
+    await client.patch(
+        f"/api/locations/{ids[0]}", json={"name": "Jardim"}, headers=admin_auth_header
+    )
+    await client.delete(f"/api/locations/{ids[1]}", headers=admin_auth_header)
+
+    response = await client.get("/api/locations/search", params={"filter": "parque"})
+    assert [loc["id"] for loc in response.json()["locations"]] == [ids[2]]
+
+    response = await client.get("/api/locations/search", params={"filter": "jardim"})
+    assert [loc["id"] for loc in response.json()["locations"]] == [ids[0]]
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_writes_do_not_populate_unloaded_search_index(
+    client: AsyncClient, admin_auth_header
+):
+    location_id = await _create_location(
+        client, admin_auth_header, "Biblioteca", "Piso tátil"
+    )
+    await client.patch(
+        f"/api/locations/{location_id}",
+        json={"name": "Biblioteca Central"},
+        headers=admin_auth_header,
+    )
+
+    assert not search_index.loaded
+    assert search_index.search("biblioteca") == []
+
+    response = await client.get("/api/locations/search", params={"filter": "central"})
+    assert [loc["id"] for loc in response.json()["locations"]] == [location_id]
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_search_requires_filter(client: AsyncClient):
+    response = await client.get("/api/locations/search")
+    assert response.status_code == 422
+
+    response = await client.get("/api/locations/search", params={"filter": "x" * 101})
+    assert response.status_code == 422
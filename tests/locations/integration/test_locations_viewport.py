@@ -0,0 +1,97 @@
+import pytest
+from httpx import AsyncClient
+
+
+async def _create_location(
+    client: AsyncClient, headers: dict, name: str, top: float, left: float
+):
+    response = await client.post(
+        "/api/locations/",
+        json={"name": name, "description": "Descrição", "top": top, "left": left},
+        headers=headers,
+    )
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_list_locations_by_bbox(client: AsyncClient, admin_auth_header):
+    inside = await _create_location(client, admin_auth_header, "Dentro", 10.0, 10.0)
+    await _create_location(client, admin_auth_header, "Fora", 80.0, 80.0)
+
+    response = await client.get("/api/locations/", params={"bbox": "0,0,20,20"})
+
+    assert response.status_code == 200
+    assert [loc["id"] for loc in response.json()["locations"]] == [inside]
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_list_locations_near(client: AsyncClient, admin_auth_header):
+    far = await _create_location(client, admin_auth_header, "Longe", 90.0, 90.0)
+    near = await _create_location(client, admin_auth_header, "Perto", 1.0, 1.0)
+    middle = await _create_location(client, admin_auth_header, "Meio", 40.0, 40.0)
+
+    response = await client.get("/api/locations/", params={"near": "0,0", "limit": 2})
+
+    assert response.status_code == 200
+    assert [loc["id"] for loc in response.json()["locations"]] == [near, middle]
+    assert far not in [loc["id"] for loc in response.json()["locations"]]
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_viewport_index_follows_deletes(client: AsyncClient, admin_auth_header):
+    location_id = await _create_location(
+        client, admin_auth_header, "Temporário", 5.0, 5.0
+    )
+
+    response = await client.get("/api/locations/", params={"bbox": "0,0,10,10"})
+    assert len(response.json()["locations"]) == 1
+
+    await client.delete(f"/api/locations/{location_id}", headers=admin_auth_header)
+
+    response = await client.get("/api/locations/", params={"bbox": "0,0,10,10"})
+    assert response.json()["locations"] == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+@pytest.mark.parametrize("bbox", ["1,2,3", "a,b,c,d", "10,0,0,10"])
+async def test_list_locations_invalid_bbox(client: AsyncClient, bbox):
+    response = await client.get("/api/locations/", params={"bbox": bbox})
+
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+@pytest.mark.parametrize(
+    "params",
+    [{"near": "1e100,1e100"}, {"near": "1,nan"}, {"bbox": "-1e7,0,10,10"}],
+)
+async def test_list_locations_rejects_out_of_range_coordinates(
+    client: AsyncClient, params
+):
+    response = await client.get("/api/locations/", params=params)
+
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_list_locations_near_far_point(client: AsyncClient, admin_auth_header):
+    for top, left in [(1.0, 1.0), (2.0, 2.0)]:
+        await client.post(
+            "/api/locations/",
+            json={"name": "Local", "description": "Desc", "top": top, "left": left},
+            headers=admin_auth_header,
+        )
+
+    response = await client.get(
+        "/api/locations/", params={"near": "1000000,1000000", "limit": 100}
+    )
+
+    assert response.status_code == 200
+    assert [loc["top"] for loc in response.json()["locations"]] == [2.0, 1.0]
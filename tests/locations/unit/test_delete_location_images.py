@@ -20,58 +20,57 @@ def mock_location():
     """Mock de uma localização."""
     location = Mock(spec=models.Location)
     location.id = 1
-    location.images = ["image1.jpg", "image2.jpg"]
     return location
 
+
+def _result(location, gallery):
+    """Resultado que serve tanto à busca do local quanto à da galeria sem comentário."""
+    result = MagicMock()
+    result.unique.return_value.scalar_one_or_none.return_value = location
+    result.scalars.return_value.all.return_value = gallery
+    return result
+
 class TestDeleteLocationImages:
     """Testes para delete_location com remoção de imagens."""
 
     @pytest.mark.asyncio
     async def test_delete_location_with_images(self, mock_db, mock_location):
-        """Testa se as imagens são deletadas ao excluir a localização."""
-        mock_result = MagicMock()
-        mock_result.unique.return_value.scalar_one_or_none.return_value = mock_location
-        mock_db.execute = AsyncMock(return_value=mock_result)
-
-        with patch("acesso_livre_api.src.locations.service.delete_images") as mock_delete_images:
-            mock_delete_images.return_value = True
+        """Testa se a remoção das imagens é enfileirada ao excluir a localização."""
+        mock_db.execute = AsyncMock(
+            return_value=_result(mock_location, ["image1.jpg", "image2.jpg"])
+        )
 
+        with patch("acesso_livre_api.src.locations.service.release_objects", new_callable=AsyncMock) as mock_release:
             result = await delete_location(mock_db, location_id=1)
 
             assert result is True
-            mock_delete_images.assert_awaited_once_with(["image1.jpg", "image2.jpg"])
+            mock_release.assert_awaited_once_with(mock_db, ["image1.jpg", "image2.jpg"])
             mock_db.delete.assert_awaited_once_with(mock_location)
             mock_db.commit.assert_awaited_once()
 
     @pytest.mark.asyncio
     async def test_delete_location_without_images(self, mock_db, mock_location):
         """Testa exclusão de localização sem imagens."""
-        mock_location.images = []
-        mock_result = MagicMock()
-        mock_result.unique.return_value.scalar_one_or_none.return_value = mock_location
-        mock_db.execute = AsyncMock(return_value=mock_result)
+        mock_db.execute = AsyncMock(return_value=_result(mock_location, []))
 
-        with patch("acesso_livre_api.src.locations.service.delete_images") as mock_delete_images:
+        with patch("acesso_livre_api.src.locations.service.release_objects", new_callable=AsyncMock) as mock_release:
             result = await delete_location(mock_db, location_id=1)
 
             assert result is True
-            mock_delete_images.assert_not_called()
+            mock_release.assert_not_awaited()
             mock_db.delete.assert_awaited_once_with(mock_location)
             mock_db.commit.assert_awaited_once()
 
     @pytest.mark.asyncio
-    async def test_delete_location_image_deletion_failure(self, mock_db, mock_location):
-        """Testa se a exclusão da localização prossegue mesmo se a deleção de imagens falhar."""
-        mock_result = MagicMock()
-        mock_result.unique.return_value.scalar_one_or_none.return_value = mock_location
-        mock_db.execute = AsyncMock(return_value=mock_result)
-
-        with patch("acesso_livre_api.src.locations.service.delete_images") as mock_delete_images:
-            mock_delete_images.side_effect = Exception("Storage error")
+    async def test_delete_location_does_not_call_storage_in_request(self, mock_db, mock_location):
+        """Testa que a exclusão não espera pelo storage: a remoção fica no outbox."""
+        mock_db.execute = AsyncMock(return_value=_result(mock_location, ["image1.jpg"]))
 
+        with patch("acesso_livre_api.src.locations.service.release_objects", new_callable=AsyncMock) as mock_release, \
+             patch("acesso_livre_api.storage.delete_image.remove_objects") as mock_remove:
             result = await delete_location(mock_db, location_id=1)
 
             assert result is True
-            mock_delete_images.assert_awaited_once()
-            mock_db.delete.assert_awaited_once_with(mock_location)
-            mock_db.commit.assert_awaited_once()
\ No newline at end of file
+            mock_release.assert_awaited_once()
+            mock_remove.assert_not_called()
+            mock_db.commit.assert_awaited_once()
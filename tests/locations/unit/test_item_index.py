@@ -0,0 +1,70 @@
+"""Testes unitários para o índice bitmap de itens de acessibilidade."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from acesso_livre_api.src.locations.item_index import (
+    AccessibilityItemBitmapIndex,
+    ensure_item_index,
+    item_index,
+)
+
+
+def _build_index(links: list[tuple[int, int]]):
+    index = AccessibilityItemBitmapIndex()
+    for location_id, item_id in links:
+        index.link(location_id, item_id)
+    return index
+
+
+def test_match_all_intersects_items():
+    index = _build_index([(1, 10), (1, 20), (2, 10), (3, 20), (3, 10), (4, 30)])
+
+    assert index.match_all([10, 20]) == [1, 3]
+
+
+def test_match_any_unites_items():
+    index = _build_index([(1, 10), (2, 20), (5, 30)])
+
+    assert index.match_any([10, 30]) == [1, 5]
+
+
+def test_unknown_item_matches_nothing():
+    index = _build_index([(1, 10)])
+
+    assert index.match_all([10, 99]) == []
+    assert index.match_any([99]) == []
+
+
+def test_unlink_and_remove_location():
+    index = _build_index([(1, 10), (2, 10), (2, 20)])
+
+    index.unlink(1, 10)
+    assert index.match_any([10]) == [2]
+
+    index.remove_location(2)
+    assert index.match_any([10, 20]) == []
+
+
+def test_large_location_ids():
+    index = _build_index([(100_000, 1), (3, 1)])
+
+    assert index.match_all([1]) == [3, 100_000]
+
+
+@pytest.mark.asyncio
+async def test_links_made_during_load_are_kept():
+    async def execute(stmt):
+        # Escritas concorrentes, depois da leitura do banco
+        item_index.link(3, 10)
+        item_index.remove_location(1)
+        result = MagicMock()
+        result.all.return_value = [(1, 10), (2, 10), (2, 20)]
+        return result
+
+    index = await ensure_item_index(MagicMock(execute=AsyncMock(side_effect=execute)))
+
+    assert index is item_index
+    assert index.match_any([10, 20]) == [2, 3]
+    assert not index.stale
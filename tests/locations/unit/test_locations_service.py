@@ -1,165 +1,213 @@
+import re
+from datetime import UTC, datetime
 from unittest.mock import MagicMock, AsyncMock, patch
 
 import pytest
-
-from acesso_livre_api.src.locations.service import update_location_average_rating, get_location_by_id
-from acesso_livre_api.src.locations import schemas
+import pytest_asyncio
+from sqlalchemy import delete, select
+from sqlalchemy.dialects import postgresql
+
+from acesso_livre_api.src.comments.models import Comment
+from acesso_livre_api.src.database import Base
+from acesso_livre_api.src.locations.service import (
+    _LOCATION_DETAIL_SQL,
+    ensure_location_exists,
+    get_location_by_id,
+    link_location_images,
+    update_location_average_rating,
+)
+from acesso_livre_api.src.locations import models, schemas
 from acesso_livre_api.src.comments.schemas import ImageResponse
+from tests.conftest import TestingSessionLocal, init_db, test_engine
+
+
+@pytest_asyncio.fixture(scope="function")
+async def session():
+    await init_db()
+    async with TestingSessionLocal() as db:
+        yield db
+
+    async with test_engine.begin() as conn:
+        for table in reversed(Base.metadata.sorted_tables):
+            await conn.execute(delete(table))
+
+
+async def _location_with_comments(db, ratings_by_status, images=None):
+    location = models.Location(name="Biblioteca", description="Central", top=1, left=1)
+    db.add(location)
+    await db.flush()
+    db.add_all(
+        [
+            models.LocationImage(location_id=location.id, path=path, position=position)
+            for position, path in enumerate(images or [])
+        ]
+    )
+    db.add_all(
+        [
+            Comment(
+                user_name="Ana",
+                rating=rating,
+                comment="Comentário",
+                location_id=location.id,
+                status=status,
+                created_at=datetime.now(UTC),
+            )
+            for status, ratings in ratings_by_status.items()
+            for rating in ratings
+        ]
+    )
+    await db.commit()
+    return location.id
+
+
+async def _location_row(db, location_id):
+    result = await db.execute(
+        select(models.Location.avg_rating).where(models.Location.id == location_id)
+    )
+    avg_rating = result.scalar_one()
+    result = await db.execute(
+        select(models.LocationImage.path, models.LocationImage.comment_id)
+        .where(models.LocationImage.location_id == location_id)
+        .order_by(models.LocationImage.position)
+    )
+    return avg_rating, [tuple(row) for row in result.all()]
+
+
+async def _approved_comment_id(db, location_id):
+    result = await db.execute(
+        select(Comment.id).where(Comment.location_id == location_id).limit(1)
+    )
+    return result.scalar_one()
 
 
 @pytest.mark.asyncio
-async def test_update_location_average_rating_first_comment():
-    mock_db = AsyncMock()
-    mock_location = MagicMock(avg_rating=None)
+async def test_update_location_average_rating_first_comment(session):
+    location_id = await _location_with_comments(session, {"approved": [5]})
 
-    mock_result = MagicMock()
-    mock_result.scalar_one_or_none.return_value = mock_location
+    await update_location_average_rating(session, location_id)
+    await session.commit()
 
-    # Mock for the count query - return 1 approved comment (the one being added)
-    mock_count_result = MagicMock()
-    mock_scalars = MagicMock()
-    mock_scalars.all.return_value = [MagicMock()]  # 1 approved comment
-    mock_count_result.scalars.return_value = mock_scalars
+    avg_rating, _ = await _location_row(session, location_id)
+    assert avg_rating == 5.0
 
-    # First execute returns the location, second returns the count result
-    mock_db.execute = AsyncMock(side_effect=[mock_result, mock_count_result])
 
-    await update_location_average_rating(mock_db, location_id=1, new_value=5.0)
+@pytest.mark.asyncio
+async def test_update_location_average_rating_ignores_unapproved_comments(session):
+    location_id = await _location_with_comments(
+        session, {"approved": [4, 5], "pending": [1]}
+    )
+
+    await update_location_average_rating(session, location_id)
+    await session.commit()
 
-    assert mock_location.avg_rating == 5.0
-    mock_db.commit.assert_awaited_once()
-    mock_db.refresh.assert_awaited_once_with(mock_location)
+    avg_rating, _ = await _location_row(session, location_id)
+    assert abs(avg_rating - 4.5) < 0.001
 
 
 @pytest.mark.asyncio
-async def test_update_location_average_rating_additional_comment():
-    mock_db = AsyncMock()
-    mock_location = MagicMock(avg_rating=4.0)
+async def test_update_location_average_rating_does_not_commit(session):
+    """Testa que a média é atualizada na transação do chamador."""
+    location_id = await _location_with_comments(session, {"approved": [3]})
 
-    mock_result = MagicMock()
-    mock_result.scalar_one_or_none.return_value = mock_location
+    await update_location_average_rating(session, location_id)
+    await session.rollback()
 
-    # Mock para a contagem de comentários
-    mock_count_result = MagicMock()
-    mock_scalars = MagicMock()
-    mock_scalars.all.return_value = [MagicMock(), MagicMock()]  # 2 comentários aprovados
-    mock_count_result.scalars.return_value = mock_scalars
+    avg_rating, _ = await _location_row(session, location_id)
+    assert avg_rating == 0.0
 
-    # O primeiro execute busca a localização, o segundo a contagem
-    mock_db.execute = AsyncMock(side_effect=[mock_result, mock_count_result])
 
-    await update_location_average_rating(mock_db, location_id=1, new_value=5.0)
-    assert abs(mock_location.avg_rating - 4.5) < 0.001
-    mock_db.commit.assert_awaited_once()
-    mock_db.refresh.assert_awaited_once_with(mock_location)
+@pytest.mark.asyncio
+async def test_update_location_average_rating_location_not_found(session):
+    await update_location_average_rating(session, 999)
+    await session.commit()
+
+    result = await session.execute(select(models.Location.id))
+    assert result.scalars().all() == []
 
 
 @pytest.mark.asyncio
-async def test_update_location_average_rating_location_not_found():
-    mock_db = AsyncMock()
-    mock_result = MagicMock()
-    mock_result.scalar_one_or_none.return_value = None
-    mock_db.execute = AsyncMock(return_value=mock_result)
+async def test_link_location_images_appends_without_duplicates(session):
+    location_id = await _location_with_comments(
+        session, {"approved": [5]}, images=["a.jpg"]
+    )
+    comment_id = await _approved_comment_id(session, location_id)
 
-    await update_location_average_rating(mock_db, location_id=999, new_value=5.0)
+    await link_location_images(
+        session, location_id, {"b.jpg": comment_id, "a.jpg": comment_id, "c.jpg": comment_id}
+    )
+    await session.commit()
 
-    mock_db.commit.assert_not_called()
-    mock_db.refresh.assert_not_called()
+    _, images = await _location_row(session, location_id)
+    assert images == [("a.jpg", None), ("b.jpg", comment_id), ("c.jpg", comment_id)]
 
 
 @pytest.mark.asyncio
-async def test_update_location_average_rating_handling_none_avg():
-    mock_db = AsyncMock()
-    mock_location = MagicMock(avg_rating=None)
+async def test_link_location_images_without_gallery(session):
+    location_id = await _location_with_comments(session, {"approved": [4]})
+    comment_id = await _approved_comment_id(session, location_id)
 
-    mock_result = MagicMock()
-    mock_result.scalar_one_or_none.return_value = mock_location
-
-    # Mock for the count query - return 1 approved comment (the one being added)
-    mock_count_result = MagicMock()
-    mock_scalars = MagicMock()
-    mock_scalars.all.return_value = [MagicMock()]  # 1 approved comment
-    mock_count_result.scalars.return_value = mock_scalars
+    await link_location_images(session, location_id, {"a.jpg": comment_id})
+    await session.commit()
 
-    # First execute returns the location, second returns the count result
-    mock_db.execute = AsyncMock(side_effect=[mock_result, mock_count_result])
-
-    await update_location_average_rating(mock_db, location_id=1, new_value=3.0)
-    assert mock_location.avg_rating == 3.0
-    mock_db.commit.assert_awaited_once()
-    mock_db.refresh.assert_awaited_once_with(mock_location)
+    _, images = await _location_row(session, location_id)
+    assert images == [("a.jpg", comment_id)]
 
 
 @pytest.mark.asyncio
-async def test_update_location_average_rating_db_error():
-    mock_db = AsyncMock()
-    mock_location = MagicMock(avg_rating=4.0)
-    mock_result = MagicMock()
-    mock_result.scalar_one_or_none.return_value = mock_location
-    mock_db.execute = AsyncMock(return_value=mock_result)
-    mock_db.commit = AsyncMock(side_effect=Exception("DB Error"))
+async def test_link_location_images_ignores_missing_location(session):
+    await link_location_images(session, None, {"a.jpg": 1})
+    await link_location_images(session, 999, {"a.jpg": 1})
+    await session.commit()
 
-    mock_db.rollback = AsyncMock()
+    result = await session.execute(select(models.LocationImage.id))
+    assert result.scalars().all() == []
 
-    from acesso_livre_api.src.locations.exceptions import LocationUpdateException
 
-    with pytest.raises(LocationUpdateException):
-        await update_location_average_rating(mock_db, location_id=1, new_value=5.0)
+@pytest.mark.asyncio
+async def test_deleting_comment_removes_its_gallery_rows(session):
+    """Testa que as imagens vindas de um comentário saem da galeria junto com ele."""
+    location_id = await _location_with_comments(
+        session, {"approved": [5]}, images=["legado.jpg"]
+    )
+    comment_id = await _approved_comment_id(session, location_id)
+    await link_location_images(session, location_id, {"c.jpg": comment_id})
+    await session.commit()
 
-    mock_db.rollback.assert_awaited_once()
+    await session.delete(await session.get(Comment, comment_id))
+    await session.commit()
+
+    _, images = await _location_row(session, location_id)
+    assert images == [("legado.jpg", None)]
 
 
 @pytest.mark.asyncio
-async def test_get_location_by_id_with_images():
-    """Testa se get_location_by_id retorna imagens com ID usando ImageResponse."""
-    mock_db = AsyncMock()
-    
-    # Mock location
-    mock_location = MagicMock()
-    mock_location.id = 1
-    mock_location.name = "Shopping Center"
-    mock_location.description = "Um shopping"
-    mock_location.top = 45.2
-    mock_location.left = 120.8
-    mock_location.images = ["path/to/image1.png", "path/to/image2.png"]
-    mock_location.avg_rating = 4.2
-    mock_location.accessibility_items = []
-    
-    # Mock comment
-    mock_comment = MagicMock()
-    mock_comment.images = ["path/to/comment-image.png"]
-    
-    # Mock db responses - precisa retornar os resultados corretamente
-    mock_location_result = MagicMock()
-    mock_location_result.unique.return_value.scalar_one_or_none.return_value = mock_location
-    
-    mock_comments_result = MagicMock()
-    mock_comments_result.scalars.return_value.all.return_value = [mock_comment]
-    
-    # Mock execute para retornar diferentes resultados
-    async def mock_execute_side_effect(stmt):
-        stmt_str = str(stmt).lower()
-        if "locations" in stmt_str:
-            return mock_location_result
-        elif "comments" in stmt_str:
-            return mock_comments_result
-        return mock_location_result
-
-    mock_db.execute = AsyncMock(side_effect=mock_execute_side_effect)
-    mock_db.refresh = AsyncMock()
-    
-    # Mock get_images_with_ids
+async def test_get_location_by_id_with_images(session):
+    """Testa se get_location_by_id retorna a galeria ordenada com ImageResponse."""
+    location_id = await _location_with_comments(
+        session, {"approved": [4]}, images=["path/to/image1.png", "path/to/image2.png"]
+    )
+    comment_id = await _approved_comment_id(session, location_id)
+    await link_location_images(
+        session, location_id, {"path/to/comment-image.png": comment_id}
+    )
+    await session.commit()
+
     mock_images_response = [
         ImageResponse(id="uuid1", url="https://example.com/image1.jpg"),
         ImageResponse(id="uuid2", url="https://example.com/image2.jpg"),
         ImageResponse(id="uuid3", url="https://example.com/comment-image.jpg"),
     ]
-    
-    with patch("acesso_livre_api.src.locations.service.get_images_with_ids", return_value=mock_images_response):
-        with patch("acesso_livre_api.src.locations.service.get_signed_urls", return_value=[]):
-            result = await get_location_by_id(mock_db, location_id=1)
-    
-    # Verificar se o resultado contém ImageResponse
+
+    with patch(
+        "acesso_livre_api.src.locations.service.get_images_with_ids",
+        return_value=mock_images_response,
+    ) as mock_get_images:
+        with patch("acesso_livre_api.src.locations.service.get_icon_urls", return_value=[]):
+            result = await get_location_by_id(session, location_id=location_id)
+
+    mock_get_images.assert_awaited_once_with(
+        session, ["path/to/image1.png", "path/to/image2.png", "path/to/comment-image.png"]
+    )
     assert isinstance(result, schemas.LocationDetailResponse)
     assert len(result.images) == 3
     assert all(isinstance(img, ImageResponse) for img in result.images)
@@ -168,44 +216,120 @@ async def test_get_location_by_id_with_images():
 
 
 @pytest.mark.asyncio
-async def test_get_location_by_id_no_images():
+async def test_get_location_by_id_no_images(session):
     """Testa se get_location_by_id retorna lista vazia quando não há imagens."""
-    mock_db = AsyncMock()
-    
-    # Mock location sem imagens
-    mock_location = MagicMock()
-    mock_location.id = 1
-    mock_location.name = "Local sem imagens"
-    mock_location.description = "Um local sem imagens"
-    mock_location.top = 10.0
-    mock_location.left = 20.0
-    mock_location.images = None
-    mock_location.avg_rating = None
-    mock_location.accessibility_items = []
-    
-    # Mock db responses
-    mock_location_result = MagicMock()
-    mock_location_result.unique.return_value.scalar_one_or_none.return_value = mock_location
-    
-    mock_comments_result = MagicMock()
-    mock_comments_result.scalars.return_value.all.return_value = []
-    
-    # Mock execute para retornar diferentes resultados
-    async def mock_execute_side_effect(stmt):
-        stmt_str = str(stmt).lower()
-        if "locations" in stmt_str:
-            return mock_location_result
-        elif "comments" in stmt_str:
-            return mock_comments_result
-        return mock_location_result
-
-    mock_db.execute = AsyncMock(side_effect=mock_execute_side_effect)
-    mock_db.refresh = AsyncMock()
-    
-    with patch("acesso_livre_api.src.locations.service.get_images_with_ids", return_value=[]):
-        with patch("acesso_livre_api.src.locations.service.get_signed_urls", return_value=[]):
-            result = await get_location_by_id(mock_db, location_id=1)
-    
+    location_id = await _location_with_comments(session, {})
+
+    with patch("acesso_livre_api.src.locations.service.get_images_with_ids") as mock_get_images:
+        with patch("acesso_livre_api.src.locations.service.get_icon_urls", return_value=[]):
+            result = await get_location_by_id(session, location_id=location_id)
+
+    mock_get_images.assert_not_called()
     assert isinstance(result, schemas.LocationDetailResponse)
     assert result.images == []
     assert result.avg_rating == 0.0
+
+
+@pytest.mark.asyncio
+async def test_get_location_by_id_postgres_single_query():
+    """Testa que no Postgres o detalhe do local é montado com uma única consulta."""
+    mock_db = AsyncMock()
+    mock_db.bind = MagicMock()
+    mock_db.bind.dialect.name = "postgresql"
+
+    mock_result = MagicMock()
+    mock_result.mappings.return_value.first.return_value = {
+        "id": 1,
+        "name": "Biblioteca",
+        "description": "Biblioteca central",
+        "top": 12.5,
+        "left": 30.0,
+        "avg_rating": 4.0,
+        "images": ["uuid1.png", "uuid2.png"],
+        "accessibility_items": [{"id": 3, "name": "Rampa", "icon_url": "rampa.png"}],
+    }
+    mock_db.execute = AsyncMock(return_value=mock_result)
+
+    mock_images_response = [
+        ImageResponse(id="uuid1", url="https://example.com/uuid1.png"),
+        ImageResponse(id="uuid2", url="https://example.com/uuid2.png"),
+    ]
+
+    with patch(
+        "acesso_livre_api.src.locations.service.get_images_with_ids",
+        return_value=mock_images_response,
+    ) as mock_get_images:
+        with patch(
+            "acesso_livre_api.src.locations.service.get_icon_urls",
+            return_value=["https://example.com/rampa.png"],
+        ):
+            result = await get_location_by_id(mock_db, location_id=1)
+
+    mock_db.execute.assert_awaited_once()
+    mock_db.refresh.assert_not_called()
+    mock_get_images.assert_awaited_once_with(mock_db, ["uuid1.png", "uuid2.png"])
+    assert result.avg_rating == 4.0
+    assert len(result.images) == 2
+    assert result.accessibility_items[0].icon_url == "https://example.com/rampa.png"
+
+
+def test_location_detail_sql_compiles_for_postgres():
+    """Testa que a consulta do Postgres compila e só referencia colunas existentes."""
+    compiled = _LOCATION_DETAIL_SQL.compile(dialect=postgresql.asyncpg.dialect())
+    sql = str(compiled)
+
+    assert list(compiled.params) == ["location_id"]
+    assert ":location_id" not in sql
+
+    aliases = {
+        alias: table for table, alias in re.findall(r"\b(?:FROM|JOIN) (\w+) (\w+)", sql)
+    }
+    assert set(aliases.values()) <= set(Base.metadata.tables)
+    for alias, column in re.findall(r"\b([a-z]{2,3})\.\"?(\w+)\"?", sql):
+        table = Base.metadata.tables[aliases[alias]]
+        assert column in table.c, f"{table.name}.{column}"
+
+
+@pytest.mark.asyncio
+async def test_get_location_by_id_postgres_not_found():
+    """Testa que a consulta única retorna 404 quando o local não existe."""
+    from acesso_livre_api.src.locations.exceptions import LocationNotFoundException
+
+    mock_db = AsyncMock()
+    mock_db.bind = MagicMock()
+    mock_db.bind.dialect.name = "postgresql"
+
+    mock_result = MagicMock()
+    mock_result.mappings.return_value.first.return_value = None
+    mock_db.execute = AsyncMock(return_value=mock_result)
+
+    with pytest.raises(LocationNotFoundException):
+        await get_location_by_id(mock_db, location_id=999)
+
+
+@pytest.mark.asyncio
+async def test_ensure_location_exists_uses_single_query():
+    """Testa que a validação de existência faz uma consulta e não assina imagens."""
+    mock_db = AsyncMock()
+    mock_result = MagicMock()
+    mock_result.scalar_one_or_none.return_value = 1
+    mock_db.execute = AsyncMock(return_value=mock_result)
+
+    with patch("acesso_livre_api.src.locations.service.get_images_with_ids") as mock_get_images:
+        await ensure_location_exists(mock_db, location_id=1)
+
+    mock_db.execute.assert_awaited_once()
+    mock_get_images.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_ensure_location_exists_not_found():
+    from acesso_livre_api.src.locations.exceptions import LocationNotFoundException
+
+    mock_db = AsyncMock()
+    mock_result = MagicMock()
+    mock_result.scalar_one_or_none.return_value = None
+    mock_db.execute = AsyncMock(return_value=mock_result)
+
+    with pytest.raises(LocationNotFoundException):
+        await ensure_location_exists(mock_db, location_id=999)
@@ -0,0 +1,85 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from acesso_livre_api.src.locations.search_index import (
+    InvertedIndex,
+    ensure_search_index,
+    search_index,
+    tokenize,
+)
+
+
+def test_tokenize_normalizes_accents_stopwords_and_plurals():
+    assert tokenize("Rampas de acesso no Elevador") == ["rampa", "acesso", "elevador"]
+    assert tokenize("Banheiro ACESSÍVEL") == ["banheiro", "acessivel"]
+    assert tokenize(None) == []
+
+
+def test_search_requires_all_terms_in_the_same_document():
+    index = InvertedIndex()
+    index.upsert_location(1, "Biblioteca Central", "Possui rampa")
+    index.upsert_location(2, "Praça", "Sem rampa")
+    index.upsert_comment(10, 2, "Banheiro bem sinalizado")
+
+    assert [location_id for location_id, _ in index.search("rampa")] == [1, 2]
+    assert index.search("rampa banheiro") == []
+    assert [location_id for location_id, _ in index.search("banheiro")] == [2]
+
+
+def test_search_ranks_name_above_description_and_comments():
+    index = InvertedIndex()
+    index.upsert_comment(10, 1, "Elevador quebrado")
+    index.upsert_location(2, "Mercado", "Tem elevador")
+    index.upsert_location(3, "Elevador Lacerda", "Cartão postal")
+
+    assert [location_id for location_id, _ in index.search("elevador")] == [3, 2, 1]
+
+
+def test_upsert_replaces_and_remove_location_drops_its_comments():
+    index = InvertedIndex()
+    index.upsert_location(1, "Teatro", "Piso tátil")
+    index.upsert_comment(10, 1, "Audiodescrição disponível")
+
+    index.upsert_location(1, "Teatro Municipal", "Rampa lateral")
+    assert index.search("tatil") == []
+    assert [location_id for location_id, _ in index.search("rampa")] == [1]
+
+    index.remove_location(1)
+    assert index.search("teatro") == []
+    assert index.search("audiodescricao") == []
+
+
+def test_remove_comment():
+    index = InvertedIndex()
+    index.upsert_comment(10, 1, "Vaga reservada")
+    index.remove_comment(10)
+    index.remove_comment(99)
+
+    assert index.search("vaga") == []
+
+
+@pytest.mark.asyncio
+async def test_writes_during_first_load_are_kept():
+    location_rows = MagicMock()
+    location_rows.all.return_value = [(1, "Teatro Municipal", None), (2, "Museu", None)]
+    comment_rows = MagicMock()
+    comment_rows.all.return_value = [(10, 2, "Rampa na entrada")]
+
+    results = iter([location_rows, comment_rows])
+
+    async def execute(stmt):
+        # Escritas concorrentes: os services só escrevem no índice ativo
+        if search_index.active:
+            search_index.upsert_location(1, "Teatro Nacional", None)
+            search_index.remove_comment(10)
+        return next(results)
+
+    assert not search_index.active
+    index = await ensure_search_index(MagicMock(execute=AsyncMock(side_effect=execute)))
+
+    assert index is search_index
+    assert [location_id for location_id, _ in index.search("nacional")] == [1]
+    assert index.search("municipal") == []
+    assert index.search("rampa") == []
+    assert [location_id for location_id, _ in index.search("museu")] == [2]
@@ -0,0 +1,185 @@
+"""Testes unitários para o índice espacial em grade."""
+
+import math
+import random
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from acesso_livre_api.src.locations.spatial_index import (
+    SpatialGridIndex,
+    ensure_spatial_index,
+    spatial_index,
+)
+
+
+def _build_index(points: dict[int, tuple[float, float]], cell_size: float = 10.0):
+    index = SpatialGridIndex(cell_size=cell_size)
+    for location_id, (top, left) in points.items():
+        index.upsert(location_id, top, left)
+    return index
+
+
+class TestQueryBbox:
+    def test_returns_only_points_inside(self):
+        index = _build_index({1: (5.0, 5.0), 2: (15.0, 25.0), 3: (50.0, 50.0)})
+
+        assert index.query_bbox(0.0, 0.0, 20.0, 30.0) == [1, 2]
+
+    def test_edges_are_inclusive(self):
+        index = _build_index({1: (10.0, 10.0)})
+
+        assert index.query_bbox(10.0, 10.0, 10.0, 10.0) == [1]
+
+    def test_negative_coordinates(self):
+        index = _build_index({1: (-5.0, -15.0), 2: (5.0, 5.0)})
+
+        assert index.query_bbox(-10.0, -20.0, 0.0, 0.0) == [1]
+
+    def test_huge_bbox_uses_occupied_cells(self):
+        index = _build_index({1: (1.0, 1.0), 2: (900.0, 900.0)})
+
+        assert index.query_bbox(-1e6, -1e6, 1e6, 1e6) == [1, 2]
+
+
+class TestIncrementalUpdates:
+    def test_upsert_moves_point(self):
+        index = _build_index({1: (5.0, 5.0)})
+
+        index.upsert(1, 95.0, 95.0)
+
+        assert index.query_bbox(0.0, 0.0, 10.0, 10.0) == []
+        assert index.query_bbox(90.0, 90.0, 100.0, 100.0) == [1]
+        assert len(index) == 1
+
+    def test_remove(self):
+        index = _build_index({1: (5.0, 5.0), 2: (6.0, 6.0)})
+
+        index.remove(1)
+        index.remove(999)
+
+        assert index.query_bbox(0.0, 0.0, 10.0, 10.0) == [2]
+
+    def test_clear_marks_unloaded(self):
+        index = _build_index({1: (5.0, 5.0)})
+        index.loaded = True
+
+        index.clear()
+
+        assert not index.loaded
+        assert len(index) == 0
+
+
+def _db_returning(rows, during_query=None):
+    """Sessão falsa cuja consulta devolve `rows`, executando `during_query` antes."""
+
+    async def execute(stmt):
+        if during_query:
+            during_query()
+        result = MagicMock()
+        result.all.return_value = rows
+        return result
+
+    return MagicMock(execute=AsyncMock(side_effect=execute))
+
+
+class TestReload:
+    @pytest.mark.asyncio
+    async def test_writes_during_load_are_kept(self):
+        def concurrent_writes():
+            spatial_index.upsert(3, 50.0, 50.0)
+            spatial_index.remove(2)
+
+        db = _db_returning([(1, 5.0, 5.0), (2, 15.0, 15.0)], concurrent_writes)
+
+        index = await ensure_spatial_index(db)
+
+        assert index is spatial_index
+        assert index.loaded
+        assert index.query_bbox(0.0, 0.0, 100.0, 100.0) == [1, 3]
+
+    @pytest.mark.asyncio
+    async def test_failed_load_keeps_previous_data(self):
+        spatial_index.upsert(1, 5.0, 5.0)
+        db = MagicMock(execute=AsyncMock(side_effect=RuntimeError("db down")))
+
+        with pytest.raises(RuntimeError):
+            await ensure_spatial_index(db)
+
+        assert not spatial_index.active
+        assert spatial_index.query_bbox(0.0, 0.0, 10.0, 10.0) == [1]
+
+    @pytest.mark.asyncio
+    async def test_reloads_after_ttl(self):
+        await ensure_spatial_index(_db_returning([(1, 5.0, 5.0)]))
+        db = _db_returning([(2, 5.0, 5.0)])
+
+        await ensure_spatial_index(db)
+        db.execute.assert_not_awaited()
+
+        spatial_index._loaded_at -= spatial_index.ttl
+        await ensure_spatial_index(db)
+
+        db.execute.assert_awaited_once()
+        assert spatial_index.query_bbox(0.0, 0.0, 10.0, 10.0) == [2]
+
+
+class TestNearest:
+    def test_orders_by_distance(self):
+        index = _build_index(
+            {1: (0.0, 0.0), 2: (3.0, 4.0), 3: (30.0, 40.0), 4: (1.0, 1.0)}
+        )
+
+        assert index.nearest(0.0, 0.0, 3) == [1, 4, 2]
+
+    def test_respects_candidates(self):
+        index = _build_index({1: (0.0, 0.0), 2: (3.0, 4.0), 3: (30.0, 40.0)})
+
+        assert index.nearest(0.0, 0.0, 2, candidates={2, 3}) == [2, 3]
+
+    def test_empty_index(self):
+        assert SpatialGridIndex().nearest(0.0, 0.0, 5) == []
+
+    def test_matches_brute_force(self):
+        rng = random.Random(42)
+        points = {
+            i: (rng.uniform(-200, 200), rng.uniform(-200, 200)) for i in range(1, 501)
+        }
+        index = _build_index(points, cell_size=7.0)
+
+        for _ in range(20):
+            top, left = rng.uniform(-250, 250), rng.uniform(-250, 250)
+            expected = sorted(
+                points,
+                key=lambda i: (math.hypot(points[i][0] - top, points[i][1] - left), i),
+            )[:10]
+            assert index.nearest(top, left, 10) == expected
+
+    def test_dense_grid_matches_brute_force(self):
+        rng = random.Random(7)
+        points = {i: (rng.uniform(0, 100), rng.uniform(0, 100)) for i in range(1, 2001)}
+        index = _build_index(points, cell_size=5.0)
+
+        for _ in range(20):
+            top, left = rng.uniform(0, 100), rng.uniform(0, 100)
+            expected = sorted(
+                points,
+                key=lambda i: (math.hypot(points[i][0] - top, points[i][1] - left), i),
+            )[:10]
+            assert index.nearest(top, left, 10) == expected
+
+    def test_far_point_does_not_walk_every_ring(self):
+        index = _build_index({1: (1.0, 1.0), 2: (2.0, 2.0)})
+
+        with patch.object(SpatialGridIndex, "_ring_cells") as ring_cells:
+            assert index.nearest(1e12, 1e12, 10) == [2, 1]
+
+        ring_cells.assert_not_called()
+
+    def test_fewer_candidates_than_requested(self):
+        index = _build_index({i: (float(i), float(i)) for i in range(1, 50)})
+
+        with patch.object(SpatialGridIndex, "_ring_cells") as ring_cells:
+            assert index.nearest(0.0, 0.0, 10, candidates={30, 5, 999}) == [5, 30]
+
+        ring_cells.assert_not_called()
@@ -0,0 +1,214 @@
+"""Testes da deduplicação de uploads por conteúdo."""
+
+import io
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+import pytest_asyncio
+from fastapi import UploadFile
+from PIL import Image
+from sqlalchemy import delete, select
+from starlette.datastructures import Headers
+
+from acesso_livre_api.storage import dedup
+from acesso_livre_api.storage import upload_image as upload_module
+from acesso_livre_api.storage.image_processing import process_image
+from acesso_livre_api.storage.models import StorageDeletion, StoredObject
+from tests.conftest import TestingSessionLocal, init_db
+
+
+@pytest_asyncio.fixture(scope="function")
+async def session():
+    await init_db()
+    async with TestingSessionLocal() as db:
+        yield db
+        await db.rollback()
+        await db.execute(delete(StoredObject))
+        await db.execute(delete(StorageDeletion))
+        await db.commit()
+
+
+@pytest.fixture
+def storage_requests():
+    """Storage em memória e pipeline no próprio processo."""
+    requests = []
+
+    def handler(request: httpx.Request):
+        requests.append(request)
+        return httpx.Response(200, json={"Key": request.url.path})
+
+    def client_factory():
+        return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    async def run_inline(*args):
+        return process_image(*args)
+
+    with (
+        patch.object(upload_module, "storage_http_client", client_factory),
+        patch.object(upload_module, "run_image_pipeline", run_inline),
+    ):
+        yield requests
+
+
+def _jpeg_file(color=(200, 30, 30)) -> UploadFile:
+    buffer = io.BytesIO()
+    Image.new("RGB", (64, 48), color).save(buffer, "JPEG")
+    content = buffer.getvalue()
+    return UploadFile(
+        file=io.BytesIO(content),
+        size=len(content),
+        filename="foto.jpg",
+        headers=Headers({"content-type": "image/jpeg"}),
+    )
+
+
+async def _objects(db) -> dict[str, int]:
+    db.expire_all()
+    result = await db.execute(select(StoredObject.path, StoredObject.refcount))
+    return dict(result.all())
+
+
+async def _pending(db) -> list[str]:
+    result = await db.execute(select(StorageDeletion.path).order_by(StorageDeletion.id))
+    return list(result.scalars())
+
+
+async def _register(db, path, refcount=1, with_variants=True):
+    await dedup.register_object(db, f"hash-{path}", with_variants, path)
+    if refcount > 1:
+        for _ in range(refcount - 1):
+            await dedup.acquire_object(db, f"hash-{path}", with_variants)
+
+
+class TestUploadDeduplication:
+    """Testes da deduplicação em upload_image/upload_images."""
+
+    @pytest.mark.asyncio
+    async def test_same_content_reuses_stored_object(self, session, storage_requests):
+        """Testa que o segundo upload do mesmo conteúdo não é processado nem enviado."""
+        first = await upload_module.upload_image(_jpeg_file(), db=session)
+        uploads_after_first = len(storage_requests)
+
+        second = await upload_module.upload_image(_jpeg_file(), db=session)
+
+        assert second == first
+        assert len(storage_requests) == uploads_after_first == 3
+        assert await _objects(session) == {first: 2}
+
+    @pytest.mark.asyncio
+    async def test_different_content_or_kind_is_stored_separately(
+        self, session, storage_requests
+    ):
+        """Testa que conteúdo diferente, ou o mesmo conteúdo como ícone, gera outro objeto."""
+        photo = await upload_module.upload_image(_jpeg_file(), db=session)
+        other = await upload_module.upload_image(_jpeg_file((0, 0, 255)), db=session)
+        icon = await upload_module.upload_image(
+            _jpeg_file(), with_variants=False, db=session
+        )
+
+        assert len({photo, other, icon}) == 3
+        assert await _objects(session) == {photo: 1, other: 1, icon: 1}
+
+    @pytest.mark.asyncio
+    async def test_upload_images_deduplicates_within_request(
+        self, session, storage_requests
+    ):
+        """Testa que uploads paralelos na mesma sessão compartilham o registro."""
+        paths = await upload_module.upload_images(
+            [_jpeg_file(), _jpeg_file((0, 0, 255))], db=session
+        )
+        again = await upload_module.upload_images([_jpeg_file()], db=session)
+
+        assert again == paths[:1]
+        assert (await _objects(session))[paths[0]] == 2
+
+    @pytest.mark.asyncio
+    async def test_upload_without_session_is_not_registered(
+        self, session, storage_requests
+    ):
+        await upload_module.upload_image(_jpeg_file())
+
+        assert await _objects(session) == {}
+
+    @pytest.mark.asyncio
+    async def test_rollback_discards_registration(self, session, storage_requests):
+        """Testa que o registro só vale se a transação do chamador for confirmada."""
+        await upload_module.upload_image(_jpeg_file(), db=session)
+        await session.rollback()
+
+        assert await _objects(session) == {}
+
+
+class TestReleaseObjects:
+    """Testes para release_objects."""
+
+    @pytest.mark.asyncio
+    async def test_decrements_without_enqueueing_while_referenced(self, session):
+        await _register(session, "a.jpg", refcount=2)
+
+        await dedup.release_objects(session, ["a.jpg"])
+        await session.commit()
+
+        assert await _objects(session) == {"a.jpg": 1}
+        assert await _pending(session) == []
+
+    @pytest.mark.asyncio
+    async def test_last_reference_enqueues_deletion(self, session):
+        await _register(session, "a.jpg", refcount=2)
+        await _register(session, "icone.png", with_variants=False)
+
+        await dedup.release_objects(session, ["a.jpg", "a.jpg", "icone.png"])
+        await session.commit()
+
+        assert await _objects(session) == {}
+        assert sorted(await _pending(session)) == [
+            "a.jpg",
+            "a_medium.webp",
+            "a_thumb.webp",
+            "icone.png",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_unmanaged_paths_are_enqueued_directly(self, session):
+        """Testa que caminhos anteriores à deduplicação continuam sendo removidos."""
+        await dedup.release_objects(session, ["legado.png"], include_variants=False)
+        await session.commit()
+
+        assert await _pending(session) == ["legado.png"]
+
+    @pytest.mark.asyncio
+    async def test_rollback_keeps_references(self, session):
+        await _register(session, "a.jpg")
+        await session.commit()
+
+        await dedup.release_objects(session, ["a.jpg"])
+        await session.rollback()
+
+        assert await _objects(session) == {"a.jpg": 1}
+        assert await _pending(session) == []
+
+
+class TestDiscardUnreferenced:
+    """Testes para discard_unreferenced."""
+
+    @pytest.mark.asyncio
+    async def test_removes_only_unregistered_paths(self, session):
+        await _register(session, "compartilhada.jpg")
+        await session.commit()
+
+        with patch.object(
+            dedup, "delete_images", new_callable=AsyncMock
+        ) as delete_images:
+            await dedup.discard_unreferenced(session, ["compartilhada.jpg", "nova.jpg"])
+
+        delete_images.assert_awaited_once_with(["nova.jpg"], bucket="bucket-name-test")
+
+    @pytest.mark.asyncio
+    async def test_nothing_to_discard(self, session):
+        with patch.object(
+            dedup, "delete_images", new_callable=AsyncMock
+        ) as delete_images:
+            await dedup.discard_unreferenced(session, [])
+
+        delete_images.assert_not_awaited()
@@ -0,0 +1,103 @@
+"""Testes unitários para a remoção em lote de imagens do storage."""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from acesso_livre_api.storage import delete_image as delete_module
+from acesso_livre_api.storage.delete_image import delete_image, delete_images
+
+
+class TestDeleteImages:
+    """Testes para delete_images."""
+
+    @pytest.mark.asyncio
+    async def test_removes_all_paths_in_one_call(self):
+        with patch.object(
+            delete_module, "remove_objects", new_callable=AsyncMock
+        ) as remove:
+            results = await delete_images(["a.jpg", "b.png"])
+
+        remove.assert_awaited_once_with(
+            [
+                "a.jpg",
+                "a_thumb.webp",
+                "a_medium.webp",
+                "b.png",
+                "b_thumb.webp",
+                "b_medium.webp",
+            ],
+            bucket=None,
+        )
+        assert all(results.values())
+        assert len(results) == 6
+
+    @pytest.mark.asyncio
+    async def test_groups_paths_in_chunks(self):
+        """Testa que 50 imagens (150 objetos com variantes) viram 2 chamadas."""
+        paths = [f"{i}.jpg" for i in range(50)]
+
+        with patch.object(
+            delete_module, "remove_objects", new_callable=AsyncMock
+        ) as remove:
+            results = await delete_images(paths)
+
+        assert remove.await_count == 2
+        sizes = sorted(len(call.args[0]) for call in remove.await_args_list)
+        assert sizes == [50, delete_module.REMOVE_BATCH_SIZE]
+        assert len(results) == 150
+
+    @pytest.mark.asyncio
+    async def test_reports_failure_per_path(self):
+        """Testa que a falha de um bloco marca apenas os caminhos daquele bloco."""
+        paths = [f"{i}.jpg" for i in range(5)]
+
+        async def remove(chunk, bucket=None):
+            if "3.jpg" in chunk:
+                raise Exception("storage indisponível")
+
+        with (
+            patch.object(delete_module, "REMOVE_BATCH_SIZE", 2),
+            patch.object(delete_module, "remove_objects", side_effect=remove),
+        ):
+            results = await delete_images(paths, include_variants=False)
+
+        assert results == {
+            "0.jpg": True,
+            "1.jpg": True,
+            "2.jpg": False,
+            "3.jpg": False,
+            "4.jpg": True,
+        }
+
+    @pytest.mark.asyncio
+    async def test_deduplicates_paths_and_uses_bucket(self):
+        with patch.object(
+            delete_module, "remove_objects", new_callable=AsyncMock
+        ) as remove:
+            results = await delete_images(
+                ["a.png", "a.png"], include_variants=False, bucket="icons"
+            )
+
+        remove.assert_awaited_once_with(["a.png"], bucket="icons")
+        assert results == {"a.png": True}
+
+    @pytest.mark.asyncio
+    async def test_empty_list_makes_no_request(self):
+        with patch.object(
+            delete_module, "remove_objects", new_callable=AsyncMock
+        ) as remove:
+            assert await delete_images([]) == {}
+
+        remove.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_delete_image_returns_result_of_single_path():
+    with patch.object(
+        delete_module,
+        "remove_objects",
+        new_callable=AsyncMock,
+        side_effect=Exception("erro"),
+    ):
+        assert await delete_image("a.jpg") is False
@@ -0,0 +1,266 @@
+"""Testes do GC de objetos órfãos do storage, contra um bucket em memória."""
+
+from datetime import UTC, datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import delete
+
+from acesso_livre_api.src.comments.models import Comment, CommentIcon
+from acesso_livre_api.src.config import settings
+from acesso_livre_api.src.database import Base
+from acesso_livre_api.src.locations.models import (
+    AccessibilityItem,
+    Location,
+    LocationImage,
+)
+from acesso_livre_api.storage import gc
+from acesso_livre_api.storage.models import StorageDeletion, StoredObject
+from tests.conftest import TestingSessionLocal, init_db, test_engine
+
+OLD = datetime.now(UTC) - timedelta(days=3)
+RECENT = datetime.now(UTC) - timedelta(minutes=5)
+
+
+class FakeBucket:
+    """Bucket em memória com a mesma paginação (limit/offset por pasta) do Supabase."""
+
+    def __init__(self, objects: dict[str, datetime | None]):
+        self.objects = dict(objects)
+        self.list_calls: list[tuple[str, int, int]] = []
+        self.removed: list[str] = []
+        self.fail_paths: set[str] = set()
+
+    async def list_page(self, prefix: str, limit: int, offset: int) -> list[dict]:
+        self.list_calls.append((prefix, limit, offset))
+        base = f"{prefix}/" if prefix else ""
+        entries: dict[str, dict] = {}
+        for path, created_at in self.objects.items():
+            if not path.startswith(base):
+                continue
+            name, _, rest = path[len(base) :].partition("/")
+            if rest:
+                entries[name] = {"name": name, "id": None}
+            else:
+                entries[name] = {
+                    "name": name,
+                    "id": path,
+                    "created_at": created_at.isoformat() if created_at else None,
+                }
+        names = sorted(entries)[offset : offset + limit]
+        return [entries[name] for name in names]
+
+    async def remove(self, paths: list[str]) -> dict[str, bool]:
+        results = {}
+        for path in paths:
+            results[path] = path not in self.fail_paths
+            if results[path]:
+                self.objects.pop(path, None)
+                self.removed.append(path)
+        return results
+
+
+@pytest_asyncio.fixture(scope="function")
+async def session():
+    await init_db()
+    async with TestingSessionLocal() as db:
+        location = Location(name="Biblioteca", description="Central", top=1, left=1)
+        db.add(location)
+        await db.flush()
+        db.add_all(
+            [
+                LocationImage(location_id=location.id, path="loc.jpg", position=0),
+                Comment(
+                    user_name="Ana",
+                    rating=5,
+                    comment="Ótimo",
+                    location_id=location.id,
+                    status="pending",
+                    images=["c1.jpg", "c2.png"],
+                    created_at=datetime.now(UTC),
+                ),
+                AccessibilityItem(name="Rampa", icon_url="rampa.png"),
+                CommentIcon(name="Elogio", icon_url="icons/elogio.png"),
+                StorageDeletion(bucket="bucket-name-test", path="saindo.jpg"),
+            ]
+        )
+        await db.commit()
+        yield db
+
+    async with test_engine.begin() as conn:
+        for table in reversed(Base.metadata.sorted_tables):
+            await conn.execute(delete(table))
+
+
+def _bucket() -> FakeBucket:
+    return FakeBucket(
+        {
+            "loc.jpg": OLD,
+            "loc_thumb.webp": OLD,
+            "loc_medium.webp": OLD,
+            "c1.jpg": OLD,
+            "c1_thumb.webp": OLD,
+            "c2.png": OLD,
+            "rampa.png": OLD,
+            "icons/elogio.png": OLD,
+            "icons/antigo.png": OLD,
+            "saindo.jpg": OLD,
+            "orfao.jpg": OLD,
+            "orfao_thumb.webp": OLD,
+            "upload-em-andamento.jpg": RECENT,
+            "sem-data.jpg": None,
+        }
+    )
+
+
+@pytest.mark.asyncio
+async def test_removes_old_unreferenced_objects(session):
+    bucket = _bucket()
+
+    report = await gc.collect_garbage(session, bucket)
+
+    assert sorted(bucket.removed) == ["icons/antigo.png", "orfao.jpg", "orfao_thumb.webp"]
+    assert report.scanned == 14
+    assert report.too_recent == 2
+    assert report.deleted == 3
+    assert report.failed == 0
+    assert "upload-em-andamento.jpg" in bucket.objects
+
+
+@pytest.mark.asyncio
+async def test_dry_run_only_reports(session):
+    bucket = _bucket()
+
+    report = await gc.collect_garbage(session, bucket, dry_run=True)
+
+    assert sorted(report.orphaned) == [
+        "icons/antigo.png",
+        "orfao.jpg",
+        "orfao_thumb.webp",
+    ]
+    assert report.deleted == 0
+    assert bucket.removed == []
+
+
+@pytest.mark.asyncio
+async def test_grace_period_protects_recent_uploads(session):
+    bucket = _bucket()
+
+    report = await gc.collect_garbage(session, bucket, grace_period=timedelta(0))
+
+    assert "upload-em-andamento.jpg" in report.orphaned
+    # Sem data de criação o objeto nunca é considerado antigo
+    assert "sem-data.jpg" not in report.orphaned
+
+
+@pytest.mark.asyncio
+async def test_lists_page_by_page_before_removing(session):
+    bucket = _bucket()
+
+    report = await gc.collect_garbage(session, bucket, page_size=4)
+
+    root_calls = [call for call in bucket.list_calls if call[0] == ""]
+    # 12 arquivos + a pasta "icons" na raiz
+    assert [offset for _, _, offset in root_calls] == [0, 4, 8, 12]
+    assert ("icons", 4, 0) in bucket.list_calls
+    assert report.scanned == 14
+    assert report.deleted == 3
+
+
+@pytest.mark.asyncio
+async def test_reports_failed_removals(session):
+    bucket = _bucket()
+    bucket.fail_paths = {"orfao.jpg"}
+
+    report = await gc.collect_garbage(session, bucket)
+
+    assert report.deleted == 2
+    assert report.failed == 1
+    assert "orfao.jpg" in bucket.objects
+
+
+@pytest.mark.asyncio
+async def test_referenced_paths_include_variants_icons_and_outbox(session):
+    referenced = await gc.referenced_paths(session)
+
+    assert {
+        "loc.jpg",
+        "loc_thumb.webp",
+        "c2_medium.webp",
+        "rampa.png",
+        "icons/elogio.png",
+        "saindo.jpg",
+    } <= referenced
+    assert "orfao.jpg" not in referenced
+
+
+@pytest.mark.asyncio
+async def test_referenced_paths_include_deduplicated_objects(session):
+    """Testa que objetos registrados na deduplicação não são coletados."""
+    session.add_all(
+        [
+            StoredObject(
+                bucket="bucket-name-test",
+                content_hash="a" * 64,
+                with_variants=True,
+                path="reutilizada.jpg",
+            ),
+            StoredObject(
+                bucket="bucket-name-test",
+                content_hash="b" * 64,
+                with_variants=False,
+                path="icons/reutilizado.png",
+            ),
+        ]
+    )
+    await session.commit()
+
+    referenced = await gc.referenced_paths(session)
+
+    assert {
+        "reutilizada.jpg",
+        "reutilizada_thumb.webp",
+        "icons/reutilizado.png",
+    } <= referenced
+    assert "icons/reutilizado_thumb.webp" not in referenced
+
+
+@pytest.mark.asyncio
+async def test_public_icon_bucket_only_keeps_icons(session):
+    """Testa que, no bucket público, só ícones e registros do próprio bucket contam."""
+    session.add_all(
+        [
+            StoredObject(
+                bucket="icones",
+                content_hash="c" * 64,
+                with_variants=False,
+                path="icons/registrado.png",
+            ),
+            StorageDeletion(bucket="icones", path="icons/saindo.png"),
+        ]
+    )
+    await session.commit()
+    bucket = FakeBucket(
+        {
+            "rampa.png": OLD,
+            "icons/elogio.png": OLD,
+            "icons/registrado.png": OLD,
+            "icons/saindo.png": OLD,
+            "icons/antigo.png": OLD,
+            "loc.jpg": OLD,
+            "saindo.jpg": OLD,
+        }
+    )
+
+    report = await gc.collect_garbage(session, bucket, bucket_name="icones")
+
+    assert sorted(bucket.removed) == ["icons/antigo.png", "loc.jpg", "saindo.jpg"]
+    assert report.referenced == 4
+
+
+def test_gc_scans_public_icon_bucket_when_configured():
+    with patch.object(settings, "public_bucket_name", "icones"):
+        assert gc.gc_bucket_names() == ["bucket-name-test", "icones"]
+    with patch.object(settings, "public_bucket_name", None):
+        assert gc.gc_bucket_names() == ["bucket-name-test"]
@@ -3,9 +3,15 @@ import pytest
 from unittest.mock import patch, MagicMock, AsyncMock
 import asyncio
 
+from jose import jwt
+
+from acesso_livre_api.src.config import settings
 from acesso_livre_api.storage.get_url import (
+    get_icon_url,
+    get_icon_urls,
     get_signed_url,
     get_signed_urls,
+    sign_url_locally,
     _url_cache,
     _cache_lock,
 )
@@ -112,28 +118,25 @@ class TestGetSignedUrlsCache:
         """Testa que múltiplas URLs usam o cache corretamente."""
         with patch("acesso_livre_api.storage.get_url.supabase_client") as mock_client:
             mock_storage = MagicMock()
-            call_count = [0]
-            
-            def mock_create_signed_url(path, expires):
-                call_count[0] += 1
-                return {"signedURL": f"https://url-{path}"}
-            
-            mock_storage.create_signed_url.side_effect = mock_create_signed_url
+            mock_storage.create_signed_urls.side_effect = lambda paths, expires: [
+                {"path": path, "signedURL": f"https://url-{path}", "error": None}
+                for path in paths
+            ]
             mock_client.return_value.storage.from_.return_value = mock_storage
 
             file_paths = ["img1.jpg", "img2.jpg", "img3.jpg"]
-            
+
             # Primeira chamada
             results1 = await get_signed_urls(file_paths)
-            first_call_count = call_count[0]
-            
+
             # Segunda chamada - deve usar cache
             results2 = await get_signed_urls(file_paths)
 
             assert len(results1) == 3
             assert results1 == results2
-            # Deve ter chamado Supabase apenas 3 vezes (primeira chamada)
-            assert call_count[0] == first_call_count  # Não aumentou na segunda chamada
+            # Uma única requisição ao Supabase para os três arquivos
+            mock_storage.create_signed_urls.assert_called_once_with(file_paths, 3600)
+            mock_storage.create_signed_url.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_empty_file_paths_returns_empty_list(self):
@@ -146,23 +149,116 @@ class TestGetSignedUrlsCache:
         """Testa cache parcial - alguns arquivos no cache, outros não."""
         with patch("acesso_livre_api.storage.get_url.supabase_client") as mock_client:
             mock_storage = MagicMock()
-            mock_storage.create_signed_url.side_effect = [
-                {"signedURL": "https://url-a.com"},
-                {"signedURL": "https://url-b.com"},
-                {"signedURL": "https://url-c.com"},
+            mock_storage.create_signed_urls.side_effect = lambda paths, expires: [
+                {"path": path, "signedURL": f"https://url-{path}", "error": None}
+                for path in paths
             ]
             mock_client.return_value.storage.from_.return_value = mock_storage
 
             # Primeira chamada com 2 arquivos
             await get_signed_urls(["a.jpg", "b.jpg"])
-            
+
             # Segunda chamada com 3 arquivos (2 cached, 1 novo)
-            mock_storage.create_signed_url.side_effect = [
-                {"signedURL": "https://url-c.com"},
+            results = await get_signed_urls(["a.jpg", "b.jpg", "c.jpg", "c.jpg"])
+
+            assert results == [
+                "https://url-a.jpg",  # do cache
+                "https://url-b.jpg",  # do cache
+                "https://url-c.jpg",  # nova chamada
+                "https://url-c.jpg",
             ]
-            results = await get_signed_urls(["a.jpg", "b.jpg", "c.jpg"])
+            assert mock_storage.create_signed_urls.call_args_list[1].args == (["c.jpg"], 3600)
+
+    @pytest.mark.asyncio
+    async def test_missing_files_return_none_and_are_not_cached(self):
+        """Testa que arquivos com erro no Supabase retornam None e não vão para o cache."""
+        with patch("acesso_livre_api.storage.get_url.supabase_client") as mock_client:
+            mock_storage = MagicMock()
+            mock_storage.create_signed_urls.return_value = [
+                {"path": "a.jpg", "signedURL": "https://url-a.com", "error": None},
+                {"path": "sumiu.jpg", "signedURL": None, "error": "Either the object does not exist"},
+            ]
+            mock_client.return_value.storage.from_.return_value = mock_storage
+
+            results = await get_signed_urls(["a.jpg", "sumiu.jpg"])
+
+        assert results == ["https://url-a.com", None]
+        assert "a.jpg:3600" in _url_cache
+        assert "sumiu.jpg:3600" not in _url_cache
+
+    @pytest.mark.asyncio
+    async def test_supabase_error_returns_none(self):
+        """Testa que falha na requisição retorna None para os arquivos não cacheados."""
+        with patch("acesso_livre_api.storage.get_url.supabase_client") as mock_client:
+            mock_storage = MagicMock()
+            mock_storage.create_signed_urls.side_effect = Exception("timeout")
+            mock_client.return_value.storage.from_.return_value = mock_storage
+
+            results = await get_signed_urls(["a.jpg", "b.jpg"])
+
+        assert results == [None, None]
+
+
+class TestGetIconUrls:
+    """Testes para a estratégia de URL dos ícones."""
+
+    @pytest.mark.asyncio
+    async def test_public_bucket_builds_urls_without_signing(self):
+        """Testa que, com bucket público, as URLs são montadas localmente."""
+        with patch.object(settings, "public_bucket_name", "icones"), \
+             patch("acesso_livre_api.storage.get_url.supabase_client") as mock_client:
+            results = await get_icon_urls(["rampa.png", "icons/elogio.png"])
+
+        assert results == [
+            "https://your-project.supabase.co/storage/v1/object/public/icones/rampa.png",
+            "https://your-project.supabase.co/storage/v1/object/public/icones/icons/elogio.png",
+        ]
+        mock_client.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_without_public_bucket_falls_back_to_signed_urls(self):
+        """Testa que, sem bucket público, os ícones continuam assinados."""
+        with patch("acesso_livre_api.storage.get_url.supabase_client") as mock_client:
+            mock_storage = MagicMock()
+            mock_storage.create_signed_urls.return_value = [
+                {"path": "rampa.png", "signedURL": "https://signed-url.com/rampa.png", "error": None}
+            ]
+            mock_client.return_value.storage.from_.return_value = mock_storage
+
+            result = await get_icon_url("rampa.png")
+
+        assert result == "https://signed-url.com/rampa.png"
+        mock_storage.create_signed_urls.assert_called_once_with(["rampa.png"], 3600)
+
+    @pytest.mark.asyncio
+    async def test_empty_list_returns_empty(self):
+        assert await get_icon_urls([]) == []
+
+
+class TestLocalSigning:
+    """Testes para a assinatura local de URLs."""
+
+    def test_sign_url_locally_matches_supabase_format(self):
+        with patch.object(settings, "storage_jwt_secret", "jwt-secret"):
+            url = sign_url_locally("icons/foto 1.jpg", expires_in=600)
+
+        base, token = url.split("?token=")
+        assert base == (
+            "https://your-project.supabase.co/storage/v1/object/sign/"
+            "bucket-name-test/icons/foto%201.jpg"
+        )
+        payload = jwt.decode(token, "jwt-secret", algorithms=["HS256"])
+        assert payload["url"] == "bucket-name-test/icons/foto 1.jpg"
+        assert payload["exp"] - payload["iat"] == 600
+
+    @pytest.mark.asyncio
+    async def test_get_signed_url_signs_locally_when_secret_configured(self):
+        """Testa que, com o secret configurado, o Supabase não é chamado."""
+        with patch.object(settings, "storage_jwt_secret", "jwt-secret"), \
+             patch("acesso_livre_api.storage.get_url.supabase_client") as mock_client:
+            urls = await get_signed_urls(["a.jpg", "b.jpg"])
+            cached = await get_signed_url("a.jpg")
 
-            assert len(results) == 3
-            assert results[0] == "https://url-a.com"  # do cache
-            assert results[1] == "https://url-b.com"  # do cache
-            assert results[2] == "https://url-c.com"  # nova chamada
+        mock_client.assert_not_called()
+        assert cached == urls[0]
+        assert "/object/sign/bucket-name-test/b.jpg?token=" in urls[1]
@@ -0,0 +1,93 @@
+"""Testes unitários para o pipeline de processamento de imagens."""
+
+import io
+
+import pytest
+from PIL import Image
+from pillow_heif import from_pillow
+
+from acesso_livre_api.storage.image_processing import (
+    InvalidImageError,
+    process_image,
+    variant_path,
+    with_variant_paths,
+)
+
+ORIENTATION = 0x0112
+GPS_INFO = 0x8825
+
+
+def _write(tmp_path, image: Image.Image, image_format: str, **params) -> str:
+    path = tmp_path / "source"
+    image.save(path, image_format, **params)
+    return str(path)
+
+
+def test_variant_paths():
+    assert variant_path("abc.jpg", "thumb") == "abc_thumb.webp"
+    assert with_variant_paths(["a.png"]) == ["a.png", "a_thumb.webp", "a_medium.webp"]
+
+
+def test_strips_exif_and_applies_orientation(tmp_path):
+    exif = Image.Exif()
+    exif[ORIENTATION] = 6  # rotação de 90° no sentido horário
+    exif[GPS_INFO] = {1: "S", 2: (23.0, 33.0, 0.0)}
+    source = _write(tmp_path, Image.new("RGB", (400, 200)), "JPEG", exif=exif)
+
+    files = process_image(source, str(tmp_path), "abc")
+
+    assert files[0].filename == "abc.jpg"
+    assert files[0].content_type == "image/jpeg"
+    with Image.open(files[0].path) as original:
+        assert original.size == (200, 400)
+        assert not original.getexif()
+
+
+def test_generates_webp_variants_with_bounded_size(tmp_path):
+    source = _write(tmp_path, Image.new("RGB", (3000, 1500)), "JPEG")
+
+    files = process_image(source, str(tmp_path), "abc")
+
+    names = {file.filename: file for file in files}
+    assert set(names) == {"abc.jpg", "abc_thumb.webp", "abc_medium.webp"}
+    with Image.open(names["abc_thumb.webp"].path) as thumb:
+        assert thumb.format == "WEBP"
+        assert thumb.size == (320, 160)
+    with Image.open(names["abc_medium.webp"].path) as medium:
+        assert medium.size == (1280, 640)
+
+
+def test_converts_heic_to_webp(tmp_path):
+    path = tmp_path / "source"
+    from_pillow(Image.new("RGB", (64, 64), (10, 120, 10))).save(str(path), format="HEIF")
+
+    files = process_image(str(path), str(tmp_path), "abc", with_variants=False)
+
+    assert [(f.filename, f.content_type) for f in files] == [("abc.webp", "image/webp")]
+    with Image.open(files[0].path) as original:
+        assert original.format == "WEBP"
+
+
+def test_keeps_png_transparency(tmp_path):
+    source = _write(tmp_path, Image.new("RGBA", (32, 32), (0, 0, 0, 0)), "PNG")
+
+    files = process_image(source, str(tmp_path), "abc", with_variants=False)
+
+    with Image.open(files[0].path) as original:
+        assert original.format == "PNG"
+        assert original.mode == "RGBA"
+
+
+def test_rejects_invalid_image(tmp_path):
+    path = tmp_path / "source"
+    path.write_bytes(b"not an image")
+
+    with pytest.raises(InvalidImageError):
+        process_image(str(path), str(tmp_path), "abc")
+
+
+def test_rejects_unsupported_format(tmp_path):
+    source = _write(tmp_path, Image.new("RGB", (8, 8)), "GIF")
+
+    with pytest.raises(InvalidImageError):
+        process_image(source, str(tmp_path), "abc")
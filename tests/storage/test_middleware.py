@@ -0,0 +1,94 @@
+"""Testes unitários para o middleware de limite do corpo multipart."""
+
+import pytest
+from fastapi import FastAPI, File, UploadFile
+from httpx import ASGITransport, AsyncClient
+
+from acesso_livre_api.storage.middleware import UploadSizeLimitMiddleware
+
+MAX_BODY_SIZE = 1024
+
+
+@pytest.fixture
+def app():
+    app = FastAPI()
+    app.add_middleware(UploadSizeLimitMiddleware, max_body_size=MAX_BODY_SIZE)
+    received = []
+
+    @app.post("/upload")
+    async def upload(image: UploadFile = File(...)):
+        received.append(await image.read())
+        return {"size": len(received[-1])}
+
+    @app.post("/json")
+    async def json_body(payload: dict):
+        return {"keys": len(payload)}
+
+    app.state.received = received
+    return app
+
+
+async def _post(app, **kwargs):
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        return await client.post(**kwargs)
+
+
+@pytest.mark.asyncio
+async def test_allows_multipart_within_limit(app):
+    response = await _post(
+        app, url="/upload", files={"image": ("a.jpg", b"x" * 100, "image/jpeg")}
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {"size": 100}
+
+
+@pytest.mark.asyncio
+async def test_rejects_declared_content_length_without_reaching_route(app):
+    """Testa que o Content-Length acima do limite é rejeitado antes do parse."""
+    response = await _post(
+        app, url="/upload", files={"image": ("a.jpg", b"x" * 2048, "image/jpeg")}
+    )
+
+    assert response.status_code == 413
+    assert "por requisição" in response.json()["detail"]
+    assert app.state.received == []
+
+
+@pytest.mark.asyncio
+async def test_rejects_streamed_body_without_content_length(app):
+    """Testa que corpos chunked são interrompidos ao ultrapassar o limite."""
+    boundary = "limite"
+    body = (
+        (
+            f"--{boundary}\r\n"
+            'Content-Disposition: form-data; name="image"; filename="a.jpg"\r\n'
+            "Content-Type: image/jpeg\r\n\r\n"
+        ).encode()
+        + b"x" * 2048
+        + f"\r\n--{boundary}--\r\n".encode()
+    )
+
+    async def chunks():
+        for start in range(0, len(body), 256):
+            yield body[start : start + 256]
+
+    response = await _post(
+        app,
+        url="/upload",
+        content=chunks(),
+        headers={"Content-Type": f"multipart/form-data; boundary={boundary}"},
+    )
+
+    assert response.status_code == 413
+    assert app.state.received == []
+
+
+@pytest.mark.asyncio
+async def test_ignores_non_multipart_requests(app):
+    payload = {f"chave{i}": "x" * 100 for i in range(20)}
+
+    response = await _post(app, url="/json", json=payload)
+
+    assert response.status_code == 200
@@ -0,0 +1,161 @@
+"""Testes do outbox de deleções do storage."""
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, patch
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import delete, select, update
+
+from acesso_livre_api.storage import delete_image, outbox
+from acesso_livre_api.storage.models import StorageDeletion
+from tests.conftest import TestingSessionLocal, init_db
+
+
+@pytest_asyncio.fixture(scope="function")
+async def session():
+    await init_db()
+    async with TestingSessionLocal() as db:
+        yield db
+        await db.execute(delete(StorageDeletion))
+        await db.commit()
+
+
+async def _pending(db) -> list[StorageDeletion]:
+    db.expire_all()
+    result = await db.execute(select(StorageDeletion).order_by(StorageDeletion.id))
+    return list(result.scalars().all())
+
+
+class TestEnqueueDeletions:
+    """Testes para enqueue_deletions."""
+
+    @pytest.mark.asyncio
+    async def test_enqueues_images_with_variants(self, session):
+        outbox.enqueue_deletions(session, ["a.jpg"])
+        await session.commit()
+
+        entries = await _pending(session)
+        assert [entry.path for entry in entries] == [
+            "a.jpg",
+            "a_thumb.webp",
+            "a_medium.webp",
+        ]
+        assert {entry.bucket for entry in entries} == {"bucket-name-test"}
+        assert all(entry.attempts == 0 for entry in entries)
+
+    @pytest.mark.asyncio
+    async def test_enqueues_without_variants_in_given_bucket(self, session):
+        outbox.enqueue_deletions(
+            session, ["icone.png", None], bucket="icons", include_variants=False
+        )
+        await session.commit()
+
+        entries = await _pending(session)
+        assert [(entry.bucket, entry.path) for entry in entries] == [
+            ("icons", "icone.png")
+        ]
+
+    @pytest.mark.asyncio
+    async def test_rollback_discards_enqueued_deletions(self, session):
+        """Testa que a remoção só acontece se a transação do chamador for confirmada."""
+        outbox.enqueue_deletions(session, ["a.jpg"])
+        await session.rollback()
+
+        assert await _pending(session) == []
+
+
+class TestProcessOutboxBatch:
+    """Testes para process_outbox_batch."""
+
+    @pytest.mark.asyncio
+    async def test_removes_in_one_call_per_bucket(self, session):
+        outbox.enqueue_deletions(session, ["a.jpg", "b.jpg"], include_variants=False)
+        outbox.enqueue_deletions(
+            session, ["icone.png"], bucket="icons", include_variants=False
+        )
+        await session.commit()
+
+        with patch.object(
+            delete_image, "remove_objects", new_callable=AsyncMock
+        ) as remove:
+            processed = await outbox.process_outbox_batch(session)
+
+        assert processed == 3
+        assert remove.await_count == 2
+        remove.assert_any_await(["a.jpg", "b.jpg"], bucket="bucket-name-test")
+        remove.assert_any_await(["icone.png"], bucket="icons")
+        assert await _pending(session) == []
+
+    @pytest.mark.asyncio
+    async def test_failure_reschedules_with_exponential_backoff(self, session):
+        outbox.enqueue_deletions(session, ["a.jpg"], include_variants=False)
+        await session.commit()
+
+        with patch.object(
+            delete_image,
+            "remove_objects",
+            new_callable=AsyncMock,
+            side_effect=Exception("storage indisponível"),
+        ):
+            assert await outbox.process_outbox_batch(session) == 1
+            # Ainda não venceu: nada a processar
+            assert await outbox.process_outbox_batch(session) == 0
+
+        [entry] = await _pending(session)
+        assert entry.attempts == 1
+        assert entry.last_error == "Falha na remoção do storage"
+        delay = entry.next_attempt_at.replace(tzinfo=UTC) - datetime.now(UTC)
+        assert timedelta(seconds=20) < delay <= outbox.backoff_delay(1)
+
+        # Quando a próxima tentativa vence, a remoção é feita e a linha sai do outbox
+        await session.execute(
+            update(StorageDeletion).values(next_attempt_at=datetime.now(UTC))
+        )
+        await session.commit()
+        with patch.object(
+            delete_image, "remove_objects", new_callable=AsyncMock
+        ) as remove:
+            assert await outbox.process_outbox_batch(session) == 1
+
+        remove.assert_awaited_once_with(["a.jpg"], bucket="bucket-name-test")
+        assert await _pending(session) == []
+
+    @pytest.mark.asyncio
+    async def test_respects_batch_size(self, session):
+        outbox.enqueue_deletions(
+            session, [f"{i}.jpg" for i in range(5)], include_variants=False
+        )
+        await session.commit()
+
+        with patch.object(delete_image, "remove_objects", new_callable=AsyncMock):
+            assert await outbox.process_outbox_batch(session, batch_size=2) == 2
+
+        assert len(await _pending(session)) == 3
+
+
+def test_backoff_delay_is_exponential_and_capped():
+    assert outbox.backoff_delay(1) == timedelta(seconds=30)
+    assert outbox.backoff_delay(2) == timedelta(seconds=60)
+    assert outbox.backoff_delay(3) == timedelta(seconds=120)
+    assert outbox.backoff_delay(20) == timedelta(seconds=outbox.BACKOFF_MAX_SECONDS)
+
+
+@pytest.mark.asyncio
+async def test_worker_drains_outbox_until_cancelled(session):
+    outbox.enqueue_deletions(session, ["a.jpg"], include_variants=False)
+    await session.commit()
+
+    with patch.object(delete_image, "remove_objects", new_callable=AsyncMock) as remove:
+        outbox.start_outbox_worker(TestingSessionLocal)
+        try:
+            for _ in range(50):
+                if remove.await_count:
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            await outbox.stop_outbox_worker()
+
+    remove.assert_awaited_once_with(["a.jpg"], bucket="bucket-name-test")
+    assert await _pending(session) == []
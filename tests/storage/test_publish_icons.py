@@ -0,0 +1,134 @@
+"""Testes da cópia dos ícones existentes para o bucket público."""
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import delete, select
+
+from acesso_livre_api.src.comments.models import CommentIcon
+from acesso_livre_api.src.database import Base
+from acesso_livre_api.src.locations.models import AccessibilityItem
+from acesso_livre_api.storage import publish_icons
+from acesso_livre_api.storage.models import StoredObject
+from tests.conftest import TestingSessionLocal, init_db, test_engine
+
+
+class FakeBucket:
+    """Bucket em memória com as operações usadas na cópia."""
+
+    def __init__(self, name: str, objects: dict[str, bytes] | None = None):
+        self.name = name
+        self.objects = dict(objects or {})
+        self.uploads: list[tuple[str, str]] = []
+        self.fail_paths: set[str] = set()
+
+    async def exists(self, path: str) -> bool:
+        return path in self.objects
+
+    async def download(self, path: str) -> bytes:
+        if path in self.fail_paths:
+            raise RuntimeError("timeout")
+        return self.objects[path]
+
+    async def upload(self, path: str, data: bytes, content_type: str) -> None:
+        if path in self.objects:
+            raise RuntimeError("Duplicate")
+        self.objects[path] = data
+        self.uploads.append((path, content_type))
+
+
+@pytest_asyncio.fixture(scope="function")
+async def session():
+    await init_db()
+    async with TestingSessionLocal() as db:
+        db.add_all(
+            [
+                AccessibilityItem(name="Rampa", icon_url="rampa.png"),
+                AccessibilityItem(name="Elevador", icon_url="compartilhado.png"),
+                CommentIcon(name="Elogio", icon_url="compartilhado.png"),
+                CommentIcon(name="Crítica", icon_url="icons/critica.svg"),
+                CommentIcon(name="Perdido", icon_url="perdido.png"),
+                StoredObject(
+                    bucket="privado",
+                    content_hash="a" * 64,
+                    with_variants=False,
+                    path="compartilhado.png",
+                    refcount=2,
+                ),
+            ]
+        )
+        await db.commit()
+        yield db
+
+    async with test_engine.begin() as conn:
+        for table in reversed(Base.metadata.sorted_tables):
+            await conn.execute(delete(table))
+
+
+def _buckets():
+    source = FakeBucket(
+        "privado",
+        {
+            "rampa.png": b"rampa",
+            "compartilhado.png": b"compartilhado",
+            "icons/critica.svg": b"<svg/>",
+            "foto.jpg": b"foto",
+        },
+    )
+    target = FakeBucket("publico", {"rampa.png": b"rampa"})
+    return source, target
+
+
+async def _registry(db):
+    result = await db.execute(select(StoredObject.bucket, StoredObject.path))
+    return result.all()
+
+
+@pytest.mark.asyncio
+async def test_copies_icons_missing_from_public_bucket(session):
+    source, target = _buckets()
+
+    report = await publish_icons.publish_icons(session, source, target)
+
+    assert report.copied == ["compartilhado.png", "icons/critica.svg"]
+    assert report.already_public == 1
+    assert report.missing == ["perdido.png"]
+    assert target.uploads == [
+        ("compartilhado.png", "image/png"),
+        ("icons/critica.svg", "image/svg+xml"),
+    ]
+    assert target.objects["compartilhado.png"] == b"compartilhado"
+    # Fotos não são ícones e ficam no bucket de imagens
+    assert "foto.jpg" not in target.objects
+    assert report.registrations_moved == 1
+    assert await _registry(session) == [("publico", "compartilhado.png")]
+
+
+@pytest.mark.asyncio
+async def test_dry_run_copies_nothing(session):
+    source, target = _buckets()
+
+    report = await publish_icons.publish_icons(session, source, target, dry_run=True)
+
+    assert report.copied == ["compartilhado.png", "icons/critica.svg"]
+    assert target.uploads == []
+    assert await _registry(session) == [("privado", "compartilhado.png")]
+
+
+@pytest.mark.asyncio
+async def test_failed_copy_keeps_registration_in_source_bucket(session):
+    source, target = _buckets()
+    source.fail_paths = {"compartilhado.png"}
+
+    report = await publish_icons.publish_icons(session, source, target)
+
+    assert report.failed == ["compartilhado.png"]
+    assert report.copied == ["icons/critica.svg"]
+    assert await _registry(session) == [("privado", "compartilhado.png")]
+
+    # Repetir a cópia só envia o que faltou
+    source.fail_paths = set()
+    report = await publish_icons.publish_icons(session, source, target)
+
+    assert report.copied == ["compartilhado.png"]
+    assert report.already_public == 2
+    assert await _registry(session) == [("publico", "compartilhado.png")]
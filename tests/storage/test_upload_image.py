@@ -0,0 +1,397 @@
+"""Testes unitários para o upload de imagens em streaming e seu pipeline."""
+
+import asyncio
+import io
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+from fastapi import UploadFile
+from PIL import Image
+from starlette.datastructures import Headers
+
+from acesso_livre_api.src.config import settings
+from acesso_livre_api.storage import upload_image as upload_module
+from acesso_livre_api.storage.exceptions import (
+    ImageTooLargeException,
+    InvalidImageException,
+    UnsupportedImageTypeException,
+    UploadTooLargeException,
+)
+from acesso_livre_api.storage.image_processing import (
+    InvalidImageError,
+    process_image,
+    shutdown_image_pool,
+)
+from acesso_livre_api.storage.upload_image import sniff_image_type, upload_image
+
+
+def _jpeg_bytes(size: tuple[int, int] = (64, 48)) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", size, (200, 30, 30)).save(buffer, "JPEG")
+    return buffer.getvalue()
+
+
+def _png_bytes() -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGBA", (32, 32), (0, 0, 0, 0)).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def _upload_file(content: bytes, content_type: str = "image/jpeg", size: int | None = -1):
+    return UploadFile(
+        file=io.BytesIO(content),
+        size=len(content) if size == -1 else size,
+        filename="foto.jpg",
+        headers=Headers({"content-type": content_type}),
+    )
+
+
+@pytest.fixture
+def storage_requests():
+    """Substitui o cliente HTTP do storage por um transport em memória."""
+    requests = []
+
+    async def handler(request: httpx.Request):
+        body = await request.aread()
+        requests.append((request, body))
+        return httpx.Response(200, json={"Key": request.url.path})
+
+    def client_factory():
+        return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    with patch.object(upload_module, "storage_http_client", client_factory):
+        yield requests
+
+
+@pytest.fixture
+def inline_pipeline():
+    """Executa o pipeline no próprio processo, sem subir o pool."""
+
+    async def run_inline(*args):
+        return process_image(*args)
+
+    with patch.object(upload_module, "run_image_pipeline", run_inline):
+        yield
+
+
+class TestUploadImage:
+    """Testes para upload_image."""
+
+    @pytest.mark.asyncio
+    async def test_streams_original_and_variants(self, storage_requests, inline_pipeline):
+        """Testa que o original sanitizado e as variantes são enviados ao storage."""
+        content = _jpeg_bytes((1600, 1200))
+        reads = []
+        file = _upload_file(content)
+        original_read = file.read
+
+        async def tracking_read(size: int = -1):
+            reads.append(size)
+            return await original_read(size)
+
+        file.read = tracking_read
+
+        filename = await upload_image(file)
+
+        image_id = filename.removesuffix(".jpg")
+        uploaded = {
+            request.url.path.rsplit("/", 1)[-1]: (request, body)
+            for request, body in storage_requests
+        }
+        assert set(uploaded) == {
+            f"{image_id}.jpg",
+            f"{image_id}_thumb.webp",
+            f"{image_id}_medium.webp",
+        }
+        for name, (request, body) in uploaded.items():
+            assert request.url.path.endswith(f"/bucket-name-test/{name}")
+            assert request.headers["content-length"] == str(len(body))
+            with Image.open(io.BytesIO(body)) as image:
+                assert image.format == ("JPEG" if name.endswith(".jpg") else "WEBP")
+        assert uploaded[f"{image_id}.jpg"][0].headers["content-type"] == "image/jpeg"
+        # Só os primeiros bytes são lidos para identificar o formato; o resto em blocos
+        assert reads[0] == upload_module.MAGIC_BYTES_SIZE
+        assert all(size == upload_module.UPLOAD_CHUNK_SIZE for size in reads[1:])
+
+    @pytest.mark.asyncio
+    async def test_without_variants_uploads_only_original(
+        self, storage_requests, inline_pipeline
+    ):
+        """Testa que ícones (with_variants=False) não geram variantes."""
+        filename = await upload_image(
+            _upload_file(_png_bytes(), content_type="image/png"), with_variants=False
+        )
+
+        assert filename.endswith(".png")
+        assert len(storage_requests) == 1
+
+    @pytest.mark.asyncio
+    async def test_rejects_unsupported_type_without_uploading(self, storage_requests):
+        """Testa que tipos não suportados são rejeitados antes do upload."""
+        with pytest.raises(UnsupportedImageTypeException) as exc_info:
+            await upload_image(_upload_file(b"%PDF-1.7", content_type="application/pdf"))
+
+        assert exc_info.value.status_code == 415
+        assert storage_requests == []
+
+    @pytest.mark.asyncio
+    async def test_rejects_fake_image_by_content(self, storage_requests):
+        """Testa que o content type declarado pelo cliente não é confiado."""
+        file = _upload_file(b"<html>" + b"x" * 4096, content_type="image/jpeg")
+        reads = []
+        original_read = file.read
+
+        async def tracking_read(size: int = -1):
+            reads.append(size)
+            return await original_read(size)
+
+        file.read = tracking_read
+
+        with pytest.raises(UnsupportedImageTypeException):
+            await upload_image(file)
+
+        assert reads == [upload_module.MAGIC_BYTES_SIZE]
+        assert storage_requests == []
+
+    @pytest.mark.asyncio
+    async def test_accepts_image_with_wrong_declared_type(
+        self, storage_requests, inline_pipeline
+    ):
+        """Testa que o formato real é usado mesmo com content type genérico."""
+        filename = await upload_image(
+            _upload_file(_png_bytes(), content_type="application/octet-stream"),
+            with_variants=False,
+        )
+
+        assert filename.endswith(".png")
+        assert storage_requests[0][0].headers["content-type"] == "image/png"
+
+    @pytest.mark.asyncio
+    async def test_rejects_declared_size_over_limit(self, storage_requests):
+        """Testa que o tamanho declarado acima do limite é rejeitado de imediato."""
+        file = _upload_file(b"x", size=upload_module.MAX_IMAGE_SIZE + 1)
+
+        with pytest.raises(ImageTooLargeException) as exc_info:
+            await upload_image(file)
+
+        assert exc_info.value.status_code == 413
+
+        assert storage_requests == []
+
+    @pytest.mark.asyncio
+    async def test_rejects_stream_over_limit_without_declared_size(
+        self, storage_requests
+    ):
+        """Testa que o limite também é aplicado durante o streaming."""
+        with (
+            patch.object(upload_module, "MAX_IMAGE_SIZE", 1024),
+            patch.object(upload_module, "UPLOAD_CHUNK_SIZE", 512),
+        ):
+            with pytest.raises(ImageTooLargeException):
+                await upload_image(_upload_file(b"\xff\xd8\xff" + b"x" * 2048, size=None))
+
+        assert storage_requests == []
+
+    @pytest.mark.asyncio
+    async def test_rejects_empty_file(self, storage_requests):
+        """Testa que arquivos vazios são rejeitados."""
+        with pytest.raises(UnsupportedImageTypeException):
+            await upload_image(_upload_file(b""))
+
+        assert storage_requests == []
+
+    @pytest.mark.asyncio
+    async def test_rejects_undecodable_image(self, storage_requests, inline_pipeline):
+        """Testa que arquivos que não são imagens válidas não chegam ao storage."""
+        with pytest.raises(InvalidImageException) as exc_info:
+            await upload_image(_upload_file(b"\xff\xd8\xff" + b"x" * 100))
+
+        assert exc_info.value.status_code == 422
+        assert isinstance(exc_info.value.__cause__, InvalidImageError)
+        assert storage_requests == []
+
+    @pytest.mark.asyncio
+    async def test_rejects_truncated_jpeg(self, storage_requests, inline_pipeline):
+        """Testa que um JPEG truncado (magic bytes válidos) é um erro do cliente."""
+        truncated = _jpeg_bytes((640, 480))[:200]
+
+        with pytest.raises(InvalidImageException) as exc_info:
+            await upload_image(_upload_file(truncated))
+
+        assert exc_info.value.status_code == 422
+        assert storage_requests == []
+
+    @pytest.mark.asyncio
+    async def test_storage_error_removes_uploaded_outputs(self, inline_pipeline):
+        """Testa que uma falha no envio de uma variante remove os arquivos já enviados."""
+
+        def handler(request: httpx.Request):
+            if request.url.path.endswith("_medium.webp"):
+                return httpx.Response(400)
+            return httpx.Response(200, json={"Key": request.url.path})
+
+        def client_factory():
+            return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+        with (
+            patch.object(upload_module, "storage_http_client", client_factory),
+            patch.object(
+                upload_module, "delete_images", new_callable=AsyncMock
+            ) as delete,
+        ):
+            with pytest.raises(httpx.HTTPStatusError):
+                await upload_image(_upload_file(_jpeg_bytes()))
+
+        deleted, kwargs = delete.await_args
+        assert sorted(path.rsplit(".", 1)[-1] for path in deleted[0]) == ["jpg", "webp"]
+        assert kwargs == {"include_variants": False, "bucket": "bucket-name-test"}
+
+    @pytest.mark.asyncio
+    async def test_icons_go_to_public_bucket(self, storage_requests, inline_pipeline):
+        """Testa que ícones (sem variantes) são enviados ao bucket público, se configurado."""
+        with patch.object(settings, "public_bucket_name", "icones"):
+            filename = await upload_image(
+                _upload_file(_png_bytes(), "image/png"), with_variants=False
+            )
+
+        [(request, _)] = storage_requests
+        assert request.url.path.endswith(f"/icones/{filename}")
+
+    @pytest.mark.asyncio
+    async def test_runs_pipeline_in_process_pool(self, storage_requests):
+        """Testa o pipeline real, executado no pool de processos."""
+        try:
+            filename = await upload_image(_upload_file(_jpeg_bytes()))
+        finally:
+            shutdown_image_pool()
+
+        assert filename.endswith(".jpg")
+        assert len(storage_requests) == 3
+
+
+class TestSniffImageType:
+    """Testes para a identificação do formato pelos magic bytes."""
+
+    @pytest.mark.parametrize(
+        "header, expected",
+        [
+            (b"\xff\xd8\xff\xe0\x00\x10JFIF\x00", "image/jpeg"),
+            (b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR", "image/png"),
+            (b"RIFF\x24\x00\x00\x00WEBPVP8 ", "image/webp"),
+            (b"\x00\x00\x00\x18ftypheic\x00\x00\x00\x00", "image/heic"),
+            (b"\x00\x00\x00\x18ftypmif1\x00\x00\x00\x00", "image/heif"),
+            (b"RIFF\x24\x00\x00\x00WAVEfmt ", None),
+            (b"\x00\x00\x00\x18ftypisom\x00\x00\x00\x00", None),
+            (b"GIF89a\x01\x00\x01\x00", None),
+            (b"%PDF-1.7", None),
+            (b"", None),
+        ],
+    )
+    def test_detects_format(self, header, expected):
+        assert sniff_image_type(header) == expected
+
+    def test_detects_images_generated_by_pillow(self):
+        """Testa a detecção nos cabeçalhos reais gerados pelo Pillow."""
+        webp = io.BytesIO()
+        Image.new("RGB", (8, 8)).save(webp, "WEBP")
+
+        size = upload_module.MAGIC_BYTES_SIZE
+        assert sniff_image_type(_jpeg_bytes()[:size]) == "image/jpeg"
+        assert sniff_image_type(_png_bytes()[:size]) == "image/png"
+        assert sniff_image_type(webp.getvalue()[:size]) == "image/webp"
+
+
+class TestUploadImages:
+    """Testes para upload_images (uploads paralelos, tudo ou nada)."""
+
+    @pytest.mark.asyncio
+    async def test_uploads_concurrently_with_bounded_limit(self):
+        """Testa que os uploads rodam em paralelo respeitando o limite."""
+        running = 0
+        max_running = 0
+
+        async def fake_store(file, with_variants, db):
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return f"{file.filename}.stored", True
+
+        files = [_upload_file(b"x") for _ in range(8)]
+        for i, file in enumerate(files):
+            file.filename = f"foto{i}.jpg"
+
+        with patch.object(upload_module, "_store_image", side_effect=fake_store):
+            result = await upload_module.upload_images(files)
+
+        assert result == [f"foto{i}.jpg.stored" for i in range(8)]
+        assert 1 < max_running <= upload_module._semaphore._value
+
+    @pytest.mark.asyncio
+    async def test_failure_removes_already_uploaded_images(self):
+        """Testa que uma falha remove as imagens já enviadas e propaga o erro."""
+
+        async def fake_store(file, with_variants, db):
+            if file.filename == "ruim.jpg":
+                raise ValueError("Unsupported file type")
+            return f"{file.filename}.stored", True
+
+        files = [_upload_file(b"x"), _upload_file(b"x"), _upload_file(b"x")]
+        files[1].filename = "ruim.jpg"
+
+        with (
+            patch.object(upload_module, "_store_image", side_effect=fake_store),
+            patch.object(
+                upload_module, "delete_images", new_callable=AsyncMock
+            ) as mock_delete,
+        ):
+            with pytest.raises(ValueError, match="Unsupported file type"):
+                await upload_module.upload_images(files)
+
+        mock_delete.assert_awaited_once_with(["foto.jpg.stored", "foto.jpg.stored"])
+
+    @pytest.mark.asyncio
+    async def test_failure_keeps_reused_objects(self):
+        """Testa que objetos reutilizados pela deduplicação não são removidos numa falha."""
+
+        async def fake_store(file, with_variants, db):
+            if file.filename == "ruim.jpg":
+                raise ValueError("Unsupported file type")
+            return f"{file.filename}.stored", file.filename == "nova.jpg"
+
+        files = [_upload_file(b"x"), _upload_file(b"x"), _upload_file(b"x")]
+        files[0].filename = "nova.jpg"
+        files[1].filename = "ruim.jpg"
+
+        with (
+            patch.object(upload_module, "_store_image", side_effect=fake_store),
+            patch.object(
+                upload_module, "delete_images", new_callable=AsyncMock
+            ) as mock_delete,
+        ):
+            with pytest.raises(ValueError):
+                await upload_module.upload_images(files)
+
+        mock_delete.assert_awaited_once_with(["nova.jpg.stored"])
+
+    @pytest.mark.asyncio
+    async def test_rejects_request_total_over_limit_before_uploading(self):
+        """Testa que o limite por requisição é validado antes de qualquer upload."""
+        size = upload_module.MAX_IMAGE_SIZE
+        files = [_upload_file(b"x", size=size) for _ in range(4)]
+
+        with patch.object(
+            upload_module, "_store_image", new_callable=AsyncMock
+        ) as upload:
+            with pytest.raises(UploadTooLargeException) as exc_info:
+                await upload_module.upload_images(files)
+
+        assert exc_info.value.status_code == 413
+        upload.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_empty_list_returns_empty(self):
+        """Testa que nenhuma imagem resulta em lista vazia."""
+        assert await upload_module.upload_images([]) == []
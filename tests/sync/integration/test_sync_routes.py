@@ -0,0 +1,184 @@
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, patch
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+
+from acesso_livre_api.src.comments.models import Comment, CommentIcon
+from acesso_livre_api.src.locations.models import AccessibilityItem, Location
+
+YESTERDAY = datetime.now(UTC) - timedelta(days=1)
+# Cursor anterior às alterações feitas durante o teste, mas posterior aos dados "antigos"
+CURSOR = (datetime.now(UTC) - timedelta(hours=1)).isoformat()
+
+
+@pytest.fixture(autouse=True)
+def mock_storage_urls():
+    with (
+        patch(
+            "acesso_livre_api.src.sync.service.get_icon_urls",
+            new=AsyncMock(
+                side_effect=lambda paths: [f"https://cdn/{path}" for path in paths]
+            ),
+        ),
+        patch(
+            "acesso_livre_api.src.sync.service.sign_image_paths",
+            new=AsyncMock(
+                side_effect=lambda db, paths: {
+                    path: f"https://signed/{path}" for path in paths
+                }
+            ),
+        ),
+    ):
+        yield
+
+
+@pytest_asyncio.fixture
+async def old_data(client: AsyncClient, db_session):
+    """Local, item, ícone e comentário aprovado alterados pela última vez ontem."""
+    naive_yesterday = YESTERDAY.replace(tzinfo=None)
+    item = AccessibilityItem(
+        name="Rampa", icon_url="rampa.svg", updated_at=naive_yesterday
+    )
+    icon = CommentIcon(name="Elogio", icon_url="elogio.svg", updated_at=naive_yesterday)
+    location = Location(
+        name="Biblioteca",
+        description="Biblioteca central",
+        top=10.0,
+        left=20.0,
+        avg_rating=5.0,
+        updated_at=naive_yesterday,
+    )
+    db_session.add_all([item, icon, location])
+    await db_session.flush()
+    comment = Comment(
+        user_name="Usuário",
+        rating=5,
+        comment="Muito acessível",
+        location_id=location.id,
+        status="approved",
+        images=["foto.jpg"],
+        created_at=YESTERDAY,
+        updated_at=YESTERDAY,
+        comment_icons=[icon],
+    )
+    db_session.add(comment)
+    await db_session.commit()
+    return {"item": item, "icon": icon, "location": location, "comment": comment}
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_sync_without_cursor_returns_everything(client: AsyncClient, old_data):
+    response = await client.get("/api/sync")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["full"] is True
+    assert [location["id"] for location in data["locations"]] == [old_data["location"].id]
+    assert data["accessibility_items"] == [
+        {"id": old_data["item"].id, "name": "Rampa", "icon_url": "https://cdn/rampa.svg"}
+    ]
+    assert data["comment_icons"] == [
+        {
+            "id": old_data["icon"].id,
+            "name": "Elogio",
+            "icon_url": "https://cdn/elogio.svg",
+        }
+    ]
+    [comment] = data["comments"]
+    assert comment["id"] == old_data["comment"].id
+    assert comment["comment_icon_ids"] == [old_data["icon"].id]
+    assert comment["images"][0]["url"] == "https://signed/foto.jpg"
+    assert data["deleted"] == {
+        "locations": [],
+        "accessibility_items": [],
+        "comment_icons": [],
+        "comments": [],
+    }
+    cursor = datetime.fromisoformat(data["cursor"])
+    assert cursor < datetime.now(UTC)
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_sync_with_cursor_returns_only_changes(
+    client: AsyncClient, db_session, old_data
+):
+    db_session.add(Location(name="Nova", description="d", top=1.0, left=1.0))
+    # Comentários pendentes não são sincronizados
+    db_session.add(
+        Comment(
+            user_name="Usuário",
+            rating=3,
+            comment="Aguardando moderação",
+            location_id=old_data["location"].id,
+            status="pending",
+            images=[],
+            created_at=datetime.now(UTC),
+        )
+    )
+    await db_session.commit()
+
+    response = await client.get("/api/sync", params={"since": CURSOR})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["full"] is False
+    assert [location["name"] for location in data["locations"]] == ["Nova"]
+    assert data["accessibility_items"] == []
+    assert data["comment_icons"] == []
+    assert data["comments"] == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_sync_linking_item_bumps_location(
+    client: AsyncClient, old_data, admin_auth_header
+):
+    location_id = old_data["location"].id
+    item_id = old_data["item"].id
+
+    response = await client.post(
+        f"/api/locations/{location_id}/accessibility-items/{item_id}",
+        headers=admin_auth_header,
+    )
+    assert response.status_code == 200
+
+    data = (await client.get("/api/sync", params={"since": CURSOR})).json()
+    assert [location["id"] for location in data["locations"]] == [location_id]
+    assert data["locations"][0]["accessibility_item_ids"] == [item_id]
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_sync_reports_deletions(client: AsyncClient, old_data, admin_auth_header):
+    comment_id = old_data["comment"].id
+    icon_id = old_data["icon"].id
+    location_id = old_data["location"].id
+
+    assert (
+        await client.delete(f"/api/comments/icons/{icon_id}", headers=admin_auth_header)
+    ).status_code == 200
+    assert (
+        await client.delete(f"/api/locations/{location_id}", headers=admin_auth_header)
+    ).status_code == 200
+
+    data = (await client.get("/api/sync", params={"since": CURSOR})).json()
+    assert data["deleted"]["comment_icons"] == [icon_id]
+    assert data["deleted"]["comments"] == [comment_id]
+    assert data["deleted"]["locations"] == [location_id]
+    assert data["locations"] == []
+    assert data["comments"] == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_sync_rejects_future_cursor(client: AsyncClient):
+    future = (datetime.now(UTC) + timedelta(hours=1)).isoformat()
+
+    response = await client.get("/api/sync", params={"since": future})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Cursor de sincronização inválido"
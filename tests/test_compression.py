@@ -0,0 +1,150 @@
+import gzip
+from unittest.mock import patch
+
+import brotli
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+from httpx import ASGITransport, AsyncClient
+
+from acesso_livre_api.src.compression import (
+    CompressionMiddleware,
+    PrecompressedBody,
+    negotiate_encoding,
+)
+from acesso_livre_api.src.locations import models
+
+LARGE_TEXT = "acessibilidade " * 200
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, expected",
+    [
+        (None, None),
+        ("", None),
+        ("identity", None),
+        ("gzip", "gzip"),
+        ("gzip, deflate, br", "br"),
+        ("br;q=0.5, gzip", "gzip"),
+        ("br;q=0, gzip;q=0", None),
+        ("*", "br"),
+        ("*;q=0.1, gzip;q=0", "br"),
+        ("GZIP;Q=0.8", "gzip"),
+        ("br;q=abc, gzip;q=0.2", "gzip"),
+    ],
+)
+def test_negotiate_encoding(accept_encoding, expected):
+    assert negotiate_encoding(accept_encoding) == expected
+
+
+@pytest.fixture
+def compressed_client():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+
+    @app.get("/large", response_class=PlainTextResponse)
+    async def large():
+        return LARGE_TEXT
+
+    @app.get("/small", response_class=PlainTextResponse)
+    async def small():
+        return "ok"
+
+    @app.get("/precompressed")
+    async def precompressed():
+        return PrecompressedBody.build(LARGE_TEXT.encode(), minimum_size=1024).response(
+            "gzip"
+        )
+
+    return AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "accept_encoding, encoding, decompress",
+    [("br", "br", brotli.decompress), ("gzip", "gzip", gzip.decompress)],
+)
+async def test_middleware_compresses_large_responses(
+    compressed_client, accept_encoding, encoding, decompress
+):
+    async with compressed_client as client:
+        async with client.stream(
+            "GET", "/large", headers={"Accept-Encoding": accept_encoding}
+        ) as response:
+            raw = b"".join([chunk async for chunk in response.aiter_raw()])
+
+    assert response.headers["content-encoding"] == encoding
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) == len(raw) < len(LARGE_TEXT)
+    assert decompress(raw) == LARGE_TEXT.encode()
+
+
+@pytest.mark.asyncio
+async def test_middleware_skips_small_and_identity_responses(compressed_client):
+    async with compressed_client as client:
+        small = await client.get("/small", headers={"Accept-Encoding": "br, gzip"})
+        identity = await client.get("/large", headers={"Accept-Encoding": "identity"})
+
+    assert "content-encoding" not in small.headers
+    assert small.text == "ok"
+    assert "content-encoding" not in identity.headers
+    assert identity.text == LARGE_TEXT
+
+
+@pytest.mark.asyncio
+async def test_middleware_keeps_precompressed_responses(compressed_client):
+    async with compressed_client as client:
+        # O cliente aceita brotli, mas a resposta já veio comprimida em gzip
+        response = await client.get(
+            "/precompressed", headers={"Accept-Encoding": "br, gzip"}
+        )
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.text == LARGE_TEXT
+
+
+def test_precompressed_body_below_minimum_size_is_not_encoded():
+    snapshot = PrecompressedBody.build(b'{"ids":[]}', minimum_size=1024)
+
+    response = snapshot.response("br, gzip")
+
+    assert snapshot.encoded == {}
+    assert response.body == b'{"ids":[]}'
+    assert "content-encoding" not in response.headers
+
+
+def test_precompressed_body_picks_accepted_encoding():
+    body = LARGE_TEXT.encode()
+    snapshot = PrecompressedBody.build(body, minimum_size=1024)
+
+    assert brotli.decompress(snapshot.response("gzip, br").body) == body
+    assert gzip.decompress(snapshot.response("gzip").body) == body
+    assert snapshot.response(None).body == body
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_map_snapshot_is_compressed_once_per_cache_fill(
+    client: AsyncClient, db_session
+):
+    db_session.add_all(
+        models.Location(name=f"Local {i}", description="d", top=float(i), left=float(i))
+        for i in range(100)
+    )
+    await db_session.commit()
+
+    with patch(
+        "acesso_livre_api.src.compression.brotli.compress", wraps=brotli.compress
+    ) as mock_compress:
+        first = await client.get("/api/locations/map", headers={"Accept-Encoding": "br"})
+        second = await client.get("/api/locations/map", headers={"Accept-Encoding": "br"})
+        plain = await client.get(
+            "/api/locations/map", headers={"Accept-Encoding": "identity"}
+        )
+
+    assert first.headers["content-encoding"] == "br"
+    assert second.headers["content-encoding"] == "br"
+    assert "content-encoding" not in plain.headers
+    assert first.json() == second.json() == plain.json()
+    assert len(plain.json()["ids"]) == 100
+    mock_compress.assert_called_once()
@@ -0,0 +1,45 @@
+import json
+from datetime import UTC, datetime
+
+import pytest
+from httpx import AsyncClient
+
+from acesso_livre_api.src.comments import schemas as comment_schemas
+from acesso_livre_api.src.locations import schemas as location_schemas
+from acesso_livre_api.src.responses import ORJSONResponse
+
+
+def test_render_model_matches_model_dump_json():
+    model = comment_schemas.CommentResponseWithLocationId(
+        id=1,
+        user_name="Usuário",
+        rating=5,
+        comment="Ótimo acesso, rampa e piso tátil",
+        images=["https://storage/a.jpg"],
+        created_at=datetime(2026, 1, 2, 3, 4, 5, tzinfo=UTC),
+        location_id=7,
+    )
+
+    response = ORJSONResponse(model)
+
+    assert response.body == model.model_dump_json().encode()
+    assert response.headers["content-type"] == "application/json"
+
+
+def test_render_plain_content_with_orjson():
+    response = ORJSONResponse({"detail": "Descrição", "ids": {1: [2.5, None]}})
+
+    assert json.loads(response.body) == {"detail": "Descrição", "ids": {"1": [2.5, None]}}
+    # Sem escapes ASCII, como o JSONResponse do Starlette
+    assert "Descrição".encode() in response.body
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_list_locations_serialized_directly(client: AsyncClient, created_location):
+    response = await client.get("/api/locations/")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    body = location_schemas.LocationListResponse.model_validate_json(response.content)
+    assert [location.id for location in body.locations] == [created_location["id"]]